@@ -22,7 +22,9 @@ echo "Experiments complete. Regenerating figures..."
 echo "========================================"
 echo ""
 
-# Regenerate all figures using visualizer
+# Regenerate all figures using visualizer. Figures are rendered in parallel and
+# only when their input data changed (hashes in outputs/full_experiment/figures/.figure_hashes.json);
+# delete that file or pass force=True to generate_all_plots to re-render everything.
 echo "Running visualizer..."
 uv run python -c "
 import logging
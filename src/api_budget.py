@@ -0,0 +1,80 @@
+"""
+Global API concurrency budget shared by all thread pools of a run.
+
+Pipelines nest thread pools: large_scale/main.py runs several topics (and
+Step 2 and Step 3 of a topic) at the same time, and the VotingExecutor runs
+many LLM methods at once, some of which (ChatGPT**) fan out over voters in
+their own pool. Wrapping the one OpenAI client in a BudgetedClient caps the
+number of in-flight requests across all of them, so more concurrency adds
+queued work rather than load.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+
+class _BudgetedResponses:
+    def __init__(self, responses, budget: "BudgetedClient"):
+        self._responses = responses
+        self._budget = budget
+    
+    def create(self, *args, **kwargs):
+        with self._budget.slot():
+            return self._responses.create(*args, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(self._responses, name)
+
+
+class _Slot:
+    def __init__(self, budget: "BudgetedClient"):
+        self._budget = budget
+    
+    def __enter__(self):
+        start = time.time()
+        self._budget._semaphore.acquire()
+        self._budget._record_wait(time.time() - start)
+    
+    def __exit__(self, *exc):
+        self._budget._semaphore.release()
+        return False
+
+
+class BudgetedClient:
+    """
+    OpenAI client proxy that limits concurrent responses.create calls.
+    
+    All other attributes are passed through to the wrapped client.
+    """
+    
+    def __init__(self, client: OpenAI, max_concurrent: int):
+        """
+        Args:
+            client: OpenAI client to wrap
+            max_concurrent: Maximum number of in-flight API requests
+        """
+        self._client = client
+        self.max_concurrent = max_concurrent
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.wait_seconds = 0.0
+        self.responses = _BudgetedResponses(client.responses, self)
+    
+    def slot(self) -> _Slot:
+        """Context manager holding one unit of the budget (for non-responses calls)."""
+        return _Slot(self)
+    
+    def _record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.wait_seconds += seconds
+    
+    def __getattr__(self, name):
+        return getattr(self._client, name)
@@ -0,0 +1,11 @@
+"""
+Offline benchmarking module.
+
+Key components:
+- config: Benchmark defaults (stand-in server behaviour, output paths)
+- llm_standin: Deterministic local stand-in for the OpenAI Responses/Embeddings API
+- throughput: End-to-end throughput harness driving the pipelines against the stand-in
+- profiles: Seeded synthetic preference profiles (uniform, Mallows, degenerate)
+- microbench: Compute-core microbenchmarks with history and regression comparison
+- import_budget: Cold-start import-time and heavy-dependency budget for the CLI entry modules
+"""
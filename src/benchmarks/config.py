@@ -0,0 +1,93 @@
+"""
+Configuration for offline benchmarks.
+"""
+
+from pathlib import Path
+
+# =============================================================================
+# Paths
+# =============================================================================
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+OUTPUT_DIR = PROJECT_ROOT / "outputs" / "benchmarks"
+
+# =============================================================================
+# LLM Stand-in Server
+# =============================================================================
+STANDIN_HOST = "127.0.0.1"
+STANDIN_PORT = 8765
+STANDIN_SEED = 42
+
+# Latent utility model: personas and statements are points in a low-dimensional
+# space; utility = scaled dot product + per-call noise
+LATENT_DIM = 8
+UTILITY_NOISE_SD = 0.15
+
+# Latency: log-normal with the given median (seconds) and sigma
+LATENCY_MEDIAN = 0.5
+LATENCY_SIGMA = 0.4
+LATENCY_MAX = 10.0
+
+# Failure injection (fractions of requests)
+ERROR_RATE = 0.0          # HTTP 500
+RATE_LIMIT_RATE = 0.0     # HTTP 429
+DEGENERACY_RATE = 0.05    # Ranking-type answers that echo presentation order
+
+# Prompt caching simulation (mirrors provider behaviour)
+CACHE_MIN_TOKENS = 1024
+CACHE_BLOCK_TOKENS = 128
+CHARS_PER_TOKEN = 4
+
+EMBEDDING_DIM = 1536
+
+# =============================================================================
+# Throughput Harness
+# =============================================================================
+BENCH_N_VOTERS = 20
+BENCH_N_STATEMENTS = 100
+BENCH_MAX_WORKERS = 20
+BENCH_PIPELINES = ["run_test", "preferences_iterative", "likert"]
+
+# =============================================================================
+# Microbenchmarks
+# =============================================================================
+MICROBENCH_SEED = 42
+MICROBENCH_SIZES = [20, 100, 200, 1000]          # n_voters == n_alternatives
+MICROBENCH_PROFILE_KINDS = ["uniform", "mallows", "degenerate"]
+MALLOWS_PHI = 0.8                                # Dispersion (0 = identical, 1 = uniform)
+DEGENERATE_FRACTION = 0.9                        # Voters echoing the presentation order
+
+# Largest size each case runs at by default (flow-based cases are O(m) max-flows)
+MICROBENCH_SIZE_LIMITS = {
+    "compute_pvc": 1000,
+    "biclique_pvc": 200,
+    "precompute_all_epsilons": 200,
+    "critical_epsilon_custom": 1000,
+    "insertion_epsilon": 1000,
+    "extract_subprofile": 1000,
+    "votekit_rules": 200,
+    "collect_all_results": 20,
+}
+
+MICROBENCH_REPEATS = 5
+MICROBENCH_TIME_BUDGET = 30.0                    # Max seconds per case/size before fewer repeats
+MICROBENCH_HISTORY_PATH = OUTPUT_DIR / "microbench_history.jsonl"
+REGRESSION_THRESHOLD = 0.15                      # Flag cases >15% slower than baseline
+REGRESSION_MIN_SECONDS = 0.005                   # Ignore differences below timer noise
+
+# =============================================================================
+# Import-time Budgets
+# =============================================================================
+# Cold-start import time (seconds, best of IMPORT_BUDGET_REPEATS fresh
+# interpreters) allowed for each CLI entry module
+IMPORT_TIME_BUDGETS = {
+    "src.degeneracy_mitigation.run_test": 0.5,
+    "src.sample_alt_voters.generate_statements": 0.5,
+    "src.full_experiment.run_multi_persona": 0.5,
+    "src.sample_alt_voters.run_experiment": 1.0,
+    "src.full_experiment.run_experiment": 1.0,
+    "src.sampling_experiment.run_experiment": 1.0,
+}
+IMPORT_BUDGET_REPEATS = 5
+
+# Packages no entry module may load at import time (only the code that uses them)
+IMPORT_FORBIDDEN_MODULES = ["openai", "votekit", "pandas", "matplotlib", "seaborn", "scipy", "sklearn"]
@@ -0,0 +1,151 @@
+"""
+Cold-start import budget for the CLI entry modules.
+
+Imports each entry module in fresh interpreters and checks two things:
+- the best import time over IMPORT_BUDGET_REPEATS runs stays within its
+  budget in IMPORT_TIME_BUDGETS
+- none of IMPORT_FORBIDDEN_MODULES (openai, votekit, pandas, matplotlib,
+  ...) is loaded just by importing the module; those belong inside the
+  functions that use them
+
+Exits with status 1 when any module is over budget or loads a forbidden
+package, so it can gate CI or a pre-commit hook.
+
+Usage:
+    uv run python -m src.benchmarks.import_budget
+    uv run python -m src.benchmarks.import_budget --modules src.full_experiment.run_multi_persona
+    uv run python -m src.benchmarks.import_budget --forbidden-only
+"""
+
+import argparse
+import json
+import logging
+import math
+import subprocess
+import sys
+from typing import Dict, List
+
+from .config import (
+    PROJECT_ROOT,
+    IMPORT_TIME_BUDGETS,
+    IMPORT_BUDGET_REPEATS,
+    IMPORT_FORBIDDEN_MODULES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Runs in the child interpreter; interpreter startup itself is not timed
+_PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+seconds = time.perf_counter() - start
+loaded = sorted({name.split(".")[0] for name in sys.modules} & set(sys.argv[2:]))
+print(json.dumps({"seconds": seconds, "loaded": loaded}))
+"""
+
+
+def probe_import(module: str, forbidden: List[str] = IMPORT_FORBIDDEN_MODULES) -> Dict:
+    """
+    Import a module in a fresh interpreter.
+    
+    Args:
+        module: Dotted module name
+        forbidden: Top-level packages to report if loaded
+    
+    Returns:
+        Dict with "seconds" (import time) and "loaded" (forbidden packages
+        present in sys.modules afterwards)
+    """
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE, module, *forbidden],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr.strip()}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def check_budgets(
+    budgets: Dict[str, float] = IMPORT_TIME_BUDGETS,
+    repeats: int = IMPORT_BUDGET_REPEATS,
+    forbidden: List[str] = IMPORT_FORBIDDEN_MODULES
+) -> List[Dict]:
+    """
+    Measure every module against its budget.
+    
+    Args:
+        budgets: Module -> allowed cold-start import time (seconds)
+        repeats: Fresh interpreters per module (the fastest run counts)
+        forbidden: Packages no module may load at import time
+    
+    Returns:
+        One row per module with its best time, budget, forbidden packages
+        loaded and status ("ok", "slow", "heavy" or "error")
+    """
+    rows = []
+    for module, budget in budgets.items():
+        try:
+            runs = [probe_import(module, forbidden) for _ in range(repeats)]
+        except RuntimeError as e:
+            logger.error(str(e))
+            rows.append({"module": module, "seconds": None, "budget": budget, "loaded": [], "status": "error"})
+            continue
+        
+        seconds = min(run["seconds"] for run in runs)
+        loaded = runs[0]["loaded"]
+        if loaded:
+            status = "heavy"
+        elif seconds > budget:
+            status = "slow"
+        else:
+            status = "ok"
+        rows.append({"module": module, "seconds": seconds, "budget": budget, "loaded": loaded, "status": status})
+    return rows
+
+
+def print_report(rows: List[Dict]) -> None:
+    """Print a per-module table of import times and budget status."""
+    width = max(len(r["module"]) for r in rows)
+    print(f"{'module':<{width}}  {'import':>8}  {'budget':>8}  status")
+    for r in rows:
+        seconds = f"{r['seconds']:.3f}s" if r["seconds"] is not None else "-"
+        budget = f"{r['budget']:.2f}s" if math.isfinite(r["budget"]) else "-"
+        status = r["status"]
+        if r["loaded"]:
+            status += f" (loads {', '.join(r['loaded'])})"
+        print(f"{r['module']:<{width}}  {seconds:>8}  {budget:>8}  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import budget for the CLI entry modules")
+    parser.add_argument('--modules', nargs='+', choices=list(IMPORT_TIME_BUDGETS),
+                        default=list(IMPORT_TIME_BUDGETS), help='Entry modules to check (default: all)')
+    parser.add_argument('--repeats', type=int, default=IMPORT_BUDGET_REPEATS,
+                        help='Fresh interpreters per module (the fastest run counts)')
+    parser.add_argument('--forbidden-only', action='store_true',
+                        help='Only check for forbidden packages (one run per module, no time budget)')
+    
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    budgets = {m: IMPORT_TIME_BUDGETS[m] for m in args.modules}
+    if args.forbidden_only:
+        budgets = {m: float("inf") for m in budgets}
+        args.repeats = 1
+    
+    rows = check_budgets(budgets, repeats=args.repeats)
+    print_report(rows)
+    
+    if any(r["status"] != "ok" for r in rows):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,673 @@
+"""
+Deterministic local stand-in for the OpenAI Responses and Embeddings APIs.
+
+Serves the subset of the API the experiment code uses (POST /v1/responses,
+POST /v1/embeddings) so pipelines can be driven end to end offline, with
+reproducible latency, error and degeneracy behaviour.
+
+Answers come from a seeded latent utility model: every persona and every
+statement text is mapped to a point in a small latent space, and a persona's
+utility for a statement is their scaled dot product plus a little per-call
+noise. The same persona therefore gives consistent answers across calls and
+across prompt formats. Noise and degeneracy are drawn per (prompt, attempt),
+so a retried prompt draws again; latency and injected 429/500 errors are
+drawn from the seed and the request's arrival number. Recognised prompt types:
+
+- Top-K/bottom-K selection, final ranking and repair (degeneracy_mitigation)
+- Scoring and dedup re-scoring (Approach B)
+- Single Likert rating, pairwise preference, insertion position, chunk
+  ranking and batch position assignment (full_experiment / large_scale)
+
+Unrecognised prompts get an empty JSON object. Provider prompt caching is
+simulated (cached_tokens in usage) from previously seen input prefixes.
+
+Usage:
+    uv run python -m src.benchmarks.llm_standin --port 8765 --latency-median 0.5
+    # then point a client at it:
+    OpenAI(base_url="http://127.0.0.1:8765/v1", api_key="standin")
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import struct
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .config import (
+    STANDIN_HOST,
+    STANDIN_PORT,
+    STANDIN_SEED,
+    LATENT_DIM,
+    UTILITY_NOISE_SD,
+    LATENCY_MEDIAN,
+    LATENCY_SIGMA,
+    LATENCY_MAX,
+    ERROR_RATE,
+    RATE_LIMIT_RATE,
+    DEGENERACY_RATE,
+    CACHE_MIN_TOKENS,
+    CACHE_BLOCK_TOKENS,
+    CHARS_PER_TOKEN,
+    EMBEDDING_DIM,
+)
+
+logger = logging.getLogger(__name__)
+
+# Likert cut points on the standardized utility (roughly equal-mass bins)
+LIKERT_CUTS = [-0.85, -0.25, 0.25, 0.85]
+
+# How many past responses to keep for previous_response_id lookups
+MAX_STORED_RESPONSES = 20000
+
+CODE_LINE_RE = re.compile(r'^([A-Za-z0-9]{4}): "(.*)"$', re.MULTILINE)
+NUMBERED_LINE_RE = re.compile(r'^(\d+)\. (.*)$', re.MULTILINE)
+LETTERED_LINE_RE = re.compile(r'^([A-Z]+)\. (.*)$', re.MULTILINE)
+PERSONA_PATTERNS = [
+    re.compile(r"defined by the following persona:\n(.*?)\n\nYou must evaluate", re.DOTALL),
+    re.compile(r"with the following characteristics:\n(.*?)\n\nGiven the topic", re.DOTALL),
+]
+
+
+@dataclass
+class StandInConfig:
+    """Behaviour knobs for the stand-in server."""
+    seed: int = STANDIN_SEED
+    latent_dim: int = LATENT_DIM
+    noise_sd: float = UTILITY_NOISE_SD
+    latency_median: float = LATENCY_MEDIAN
+    latency_sigma: float = LATENCY_SIGMA
+    latency_max: float = LATENCY_MAX
+    error_rate: float = ERROR_RATE
+    rate_limit_rate: float = RATE_LIMIT_RATE
+    degeneracy_rate: float = DEGENERACY_RATE
+    embedding_dim: int = EMBEDDING_DIM
+
+
+# =============================================================================
+# Latent utility model
+# =============================================================================
+
+def _seed_for(*parts) -> int:
+    """Stable 64-bit seed from arbitrary string-able parts."""
+    digest = hashlib.sha256("\x1f".join(str(p) for p in parts).encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+class LatentUtilityModel:
+    """Seeded persona/statement latent vectors with memoized lookups."""
+    
+    def __init__(self, seed: int, dim: int, noise_sd: float):
+        self.seed = seed
+        self.dim = dim
+        self.noise_sd = noise_sd
+        self._vectors: dict[tuple[str, str], list[float]] = {}
+        self._lock = threading.Lock()
+    
+    def _vector(self, kind: str, text: str) -> list[float]:
+        key = (kind, text)
+        with self._lock:
+            vec = self._vectors.get(key)
+        if vec is None:
+            rng = random.Random(_seed_for(self.seed, kind, text))
+            vec = [rng.gauss(0.0, 1.0) for _ in range(self.dim)]
+            with self._lock:
+                self._vectors[key] = vec
+        return vec
+    
+    def utilities(self, persona: str, statements: list[str], call_key: str) -> list[float]:
+        """
+        Standardized utilities of a persona for each statement.
+        
+        Args:
+            persona: Persona text
+            statements: Statement texts
+            call_key: Per-call key (seeds the noise: the same prompt and
+                attempt number always get the same answer)
+        
+        Returns:
+            One utility per statement, approximately N(0, 1).
+        """
+        p = self._vector("persona", persona)
+        rng = random.Random(_seed_for(self.seed, "noise", call_key))
+        scale = 1.0 / math.sqrt(self.dim)
+        out = []
+        for text in statements:
+            s = self._vector("statement", text)
+            u = scale * sum(a * b for a, b in zip(p, s))
+            out.append(u + rng.gauss(0.0, self.noise_sd))
+        return out
+
+
+# =============================================================================
+# Prompt parsing and answering
+# =============================================================================
+
+def _message_text(message) -> str:
+    """Flatten a Responses API input message's content to text."""
+    content = message.get("content", "") if isinstance(message, dict) else str(message)
+    if isinstance(content, list):
+        return "\n".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content
+
+
+def _find_persona(text: str) -> str:
+    for pattern in PERSONA_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group(1).strip()
+    # Unknown layout: the whole system/context text stands in for the persona
+    return text[:2000]
+
+
+def _listed_codes(user: str, known: dict[str, str]) -> list[str]:
+    """Codes presented in a prompt: 'code: "text"' lines, else comma-separated known codes."""
+    codes = CODE_LINE_RE.findall(user)
+    if codes:
+        return [c for c, _ in codes]
+    for line in user.splitlines():
+        parts = [p.strip() for p in line.split(",")]
+        if parts and all(p in known for p in parts if p) and any(parts):
+            return [p for p in parts if p]
+    return []
+
+
+class StandInModel:
+    """Turns a Responses API request into a persona-consistent JSON answer."""
+    
+    def __init__(self, config: StandInConfig):
+        self.config = config
+        self.latent = LatentUtilityModel(config.seed, config.latent_dim, config.noise_sd)
+        self._history: OrderedDict[str, list] = OrderedDict()
+        self._attempts: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def remember(self, response_id: str, messages: list) -> None:
+        with self._lock:
+            self._history[response_id] = messages
+            while len(self._history) > MAX_STORED_RESPONSES:
+                self._history.popitem(last=False)
+    
+    def conversation(self, body: dict) -> list:
+        """Full message list, including any previous_response_id context."""
+        messages = body.get("input", [])
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        prev = body.get("previous_response_id")
+        if prev:
+            with self._lock:
+                messages = self._history.get(prev, []) + messages
+        return messages
+    
+    def _attempt(self, call_key: str) -> int:
+        """How many times this exact prompt was answered before (0 for the first call)."""
+        with self._lock:
+            attempt = self._attempts.pop(call_key, 0)
+            self._attempts[call_key] = attempt + 1
+            while len(self._attempts) > MAX_STORED_RESPONSES:
+                self._attempts.popitem(last=False)
+        return attempt
+    
+    def answer(self, messages: list) -> tuple[str, str, str]:
+        """
+        Produce an answer for a conversation.
+        
+        Returns:
+            Tuple of (output_text, task_name, persona).
+        """
+        texts = [_message_text(m) for m in messages]
+        full = "\n\n".join(texts)
+        user = texts[-1] if texts else ""
+        persona = _find_persona(full)
+        
+        # Code -> text catalog from anywhere in the conversation
+        known = dict(CODE_LINE_RE.findall(full))
+        # Retries send the identical prompt: key each one by its attempt so it draws again
+        prompt_key = hashlib.sha256(full.encode()).hexdigest()
+        call_key = f"{prompt_key}:{self._attempt(prompt_key)}"
+        rng = random.Random(_seed_for(self.config.seed, "call", call_key))
+        degenerate = rng.random() < self.config.degeneracy_rate
+        
+        def ranked(codes: list[str]) -> list[str]:
+            utils = self.latent.utilities(persona, [known.get(c, c) for c in codes], call_key)
+            return [c for _, c in sorted(zip(utils, codes), key=lambda x: -x[0])]
+        
+        if '"top_fill"' in user:
+            remaining = [c.strip() for c in user.split("remaining codes")[-1].split("\n")[1].split(",")]
+            n_top = int(re.search(r"(\d+) more TOP", user).group(1))
+            n_bottom = int(re.search(r"(\d+) more BOTTOM", user).group(1))
+            order = ranked([c for c in remaining if c])
+            top_fill = order[:n_top]
+            bottom_rest = [c for c in order if c not in top_fill]
+            bottom_fill = bottom_rest[len(bottom_rest) - n_bottom:] if n_bottom else []
+            if "least preferred first" in user:
+                bottom_fill = bottom_fill[::-1]
+            return json.dumps({"top_fill": top_fill, "bottom_fill": bottom_fill}), "repair", persona
+        
+        match = re.search(r'"top_(\d+)"', user)
+        if match:
+            k = int(match.group(1))
+            codes = _listed_codes(user, known)
+            order = codes if degenerate else ranked(codes)
+            top, bottom = order[:k], order[-k:]
+            least_first = "least preferred first" in user
+            if least_first and not degenerate:
+                bottom = bottom[::-1]
+            return json.dumps({f"top_{k}": top, f"bottom_{k}": bottom}), "top_bottom", persona
+        
+        if '"ranking"' in user:
+            codes = _listed_codes(user, known)
+            if not codes:
+                # Numbered chunk ("0. text") answered with indices
+                items = NUMBERED_LINE_RE.findall(user)
+                utils = self.latent.utilities(persona, [t for _, t in items], call_key)
+                order = [int(i) for _, i in sorted(zip(utils, [i for i, _ in items]), key=lambda x: -x[0])]
+                return json.dumps({"ranking": order}), "rank_chunk", persona
+            order = codes if degenerate else ranked(codes)
+            return json.dumps({"ranking": order}), "final_ranking", persona
+
+        if '"positions"' in user and "NEW STATEMENTS" in user:
+            head, tail = user.split("NEW STATEMENTS", 1)
+            existing = [t for _, t in NUMBERED_LINE_RE.findall(head.split("LEAST preferred:")[-1])]
+            new_items = LETTERED_LINE_RE.findall(tail)
+            utils = self.latent.utilities(persona, existing + [t for _, t in new_items], call_key)
+            u_existing = utils[:len(existing)]
+            positions = {
+                label: sum(1 for u in u_existing if u > u_new)
+                for (label, _), u_new in zip(new_items, utils[len(existing):])
+            }
+            return json.dumps({"positions": positions}), "merge", persona
+        
+        if '"hash1": score1' in user:
+            codes = _listed_codes(user, known)
+            if not codes:
+                codes = [c for c in re.findall(r"\b[A-Za-z0-9]{4}\b", user) if c in known]
+            utils = self.latent.utilities(persona, [known.get(c, c) for c in codes], call_key)
+            scores = {c: round(max(-100.0, min(100.0, 40.0 * u)), 1) for c, u in zip(codes, utils)}
+            return json.dumps(scores), "scoring", persona
+        
+        stmt_a = re.search(r"Statement A: (.*)", user)
+        stmt_b = re.search(r"Statement B: (.*)", user)
+        if '"preference"' in user and stmt_a and stmt_b:
+            ua, ub = self.latent.utilities(persona, [stmt_a.group(1), stmt_b.group(1)], call_key)
+            return json.dumps({"preference": "A" if ua >= ub else "B"}), "pairwise", persona
+        
+        new_stmt = re.search(r"NEW STATEMENT to insert: (.*)", user)
+        if '"position"' in user and new_stmt:
+            listing = user.split("NEW STATEMENT")[0].split("LEAST preferred:")[-1]
+            texts_sorted = [t for _, t in NUMBERED_LINE_RE.findall(listing)]
+            utils = self.latent.utilities(persona, texts_sorted + [new_stmt.group(1)], call_key)
+            u_new = utils[-1]
+            position = sum(1 for u in utils[:-1] if u > u_new)
+            return json.dumps({"position": position}), "insertion", persona
+        
+        if '"rating"' in user:
+            stmt = re.search(r"Statement: (.*)", user)
+            u = self.latent.utilities(persona, [stmt.group(1) if stmt else user], call_key)[0]
+            rating = 1 + sum(1 for cut in LIKERT_CUTS if u > cut)
+            return json.dumps({"rating": rating}), "likert", persona
+        
+        return "{}", "unknown", persona
+    
+    def embedding(self, text: str) -> list[float]:
+        """Unit-norm pseudo-embedding of a text."""
+        rng = random.Random(_seed_for(self.config.seed, "embedding", text))
+        vec = [rng.gauss(0.0, 1.0) for _ in range(self.config.embedding_dim)]
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+
+# =============================================================================
+# Server bookkeeping
+# =============================================================================
+
+class PrefixCache:
+    """Simulates provider prompt caching over block-aligned input prefixes."""
+    
+    def __init__(self):
+        self._seen: set[str] = set()
+        self._lock = threading.Lock()
+    
+    def lookup_and_store(self, text: str) -> int:
+        """Return cached tokens for this input and remember its prefixes."""
+        block_chars = CACHE_BLOCK_TOKENS * CHARS_PER_TOKEN
+        n_blocks = len(text) // block_chars
+        keys = [
+            hashlib.sha1(text[:(i + 1) * block_chars].encode()).hexdigest()
+            for i in range(n_blocks)
+        ]
+        with self._lock:
+            hit = 0
+            for i, key in enumerate(keys):
+                if key in self._seen:
+                    hit = i + 1
+                else:
+                    break
+            self._seen.update(keys)
+        cached = hit * CACHE_BLOCK_TOKENS
+        return cached if cached >= CACHE_MIN_TOKENS else 0
+
+
+class ServerStats:
+    """Thread-safe request counters and per-persona timing."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self) -> None:
+        with getattr(self, "_lock", threading.Lock()):
+            self.requests = 0
+            self.by_task: dict[str, int] = {}
+            self.errors = 0
+            self.rate_limited = 0
+            self.input_tokens = 0
+            self.cached_input_tokens = 0
+            self.output_tokens = 0
+            self.persona_first: dict[str, float] = {}
+            self.persona_last: dict[str, float] = {}
+            self.started = time.time()
+    
+    def record(self, task: str, persona: str, t_start: float, t_end: float,
+               input_tokens: int, cached: int, output_tokens: int) -> None:
+        key = hashlib.sha1(persona.encode()).hexdigest()[:16]
+        with self._lock:
+            self.requests += 1
+            self.by_task[task] = self.by_task.get(task, 0) + 1
+            self.input_tokens += input_tokens
+            self.cached_input_tokens += cached
+            self.output_tokens += output_tokens
+            self.persona_first[key] = min(self.persona_first.get(key, t_start), t_start)
+            self.persona_last[key] = max(self.persona_last.get(key, t_end), t_end)
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            spans = sorted(
+                self.persona_last[k] - self.persona_first[k] for k in self.persona_first
+            )
+            elapsed = time.time() - self.started
+            return {
+                "requests": self.requests,
+                "by_task": dict(self.by_task),
+                "errors": self.errors,
+                "rate_limited": self.rate_limited,
+                "input_tokens": self.input_tokens,
+                "cached_input_tokens": self.cached_input_tokens,
+                "output_tokens": self.output_tokens,
+                "elapsed": elapsed,
+                "requests_per_sec": self.requests / elapsed if elapsed > 0 else 0.0,
+                "n_personas": len(spans),
+                "persona_span_p50": _percentile(spans, 50),
+                "persona_span_p99": _percentile(spans, 99),
+            }
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of a sorted list (0.0 if empty)."""
+    if not values:
+        return 0.0
+    idx = min(len(values) - 1, max(0, math.ceil(q / 100 * len(values)) - 1))
+    return values[idx]
+
+
+def _n_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """HTTP server holding the model, cache, stats and config."""
+    
+    daemon_threads = True
+    request_queue_size = 1024
+    
+    def __init__(self, address: tuple[str, int], config: StandInConfig):
+        super().__init__(address, StandInHandler)
+        self.config = config
+        self.model = StandInModel(config)
+        self.cache = PrefixCache()
+        self.stats = ServerStats()
+        self._counter = 0
+        self._requests = 0
+        self._counter_lock = threading.Lock()
+    
+    def next_id(self, prefix: str) -> str:
+        with self._counter_lock:
+            self._counter += 1
+            return f"{prefix}_{self._counter:012d}"
+    
+    def next_request(self) -> int:
+        """Arrival number of a request (seeds its latency and failure draws)."""
+        with self._counter_lock:
+            self._requests += 1
+            return self._requests
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Request handler for /v1/responses, /v1/embeddings and /stats."""
+    
+    server: StandInServer
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):  # noqa: A002 - signature fixed by base class
+        logger.debug(format % args)
+    
+    def _send_json(self, status: int, payload: dict, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            self._send_json(200, self.server.stats.snapshot())
+        elif self.path.rstrip("/") == "/health":
+            self._send_json(200, {"status": "ok", "config": asdict(self.server.config)})
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+    
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.split("?")[0].rstrip("/")
+        
+        if path == "/stats/reset":
+            self.server.stats.reset()
+            self._send_json(200, {"status": "reset"})
+            return
+        
+        if path.endswith("/responses"):
+            self._handle_responses(body)
+        elif path.endswith("/embeddings"):
+            self._handle_embeddings(body)
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+    
+    def _inject_failure(self) -> bool:
+        """Sleep for a sampled latency; return True if a failure was sent."""
+        config = self.server.config
+        rng = random.Random(_seed_for(config.seed, "transport", self.server.next_request()))
+        latency = min(config.latency_max, config.latency_median * math.exp(rng.gauss(0.0, config.latency_sigma)))
+        time.sleep(latency)
+        
+        roll = rng.random()
+        if roll < config.rate_limit_rate:
+            with self.server.stats._lock:
+                self.server.stats.rate_limited += 1
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit reached (stand-in)", "type": "rate_limit_error",
+                           "code": "rate_limit_exceeded"}},
+                headers={"Retry-After": "1"},
+            )
+            return True
+        if roll < config.rate_limit_rate + config.error_rate:
+            with self.server.stats._lock:
+                self.server.stats.errors += 1
+            self._send_json(500, {"error": {"message": "Internal error (stand-in)", "type": "server_error"}})
+            return True
+        return False
+    
+    def _handle_responses(self, body: dict) -> None:
+        t_start = time.time()
+        if self._inject_failure():
+            return
+        
+        model = self.server.model
+        messages = model.conversation(body)
+        try:
+            output_text, task, persona = model.answer(messages)
+        except (AttributeError, IndexError, ValueError) as e:
+            logger.warning(f"Could not interpret prompt ({e}); answering with empty JSON")
+            output_text, task, persona = "{}", "unknown", ""
+        
+        response_id = self.server.next_id("resp")
+        model.remember(response_id, messages + [{"role": "assistant", "content": output_text}])
+        
+        input_text = "\n\n".join(_message_text(m) for m in messages)
+        input_tokens = _n_tokens(input_text)
+        cached = self.server.cache.lookup_and_store(input_text)
+        output_tokens = _n_tokens(output_text)
+        
+        self.server.stats.record(task, persona, t_start, time.time(),
+                                 input_tokens, cached, output_tokens)
+        
+        self._send_json(200, {
+            "id": response_id,
+            "object": "response",
+            "created_at": int(t_start),
+            "status": "completed",
+            "model": body.get("model", "standin"),
+            "output": [{
+                "type": "message",
+                "id": self.server.next_id("msg"),
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": output_text, "annotations": []}],
+            }],
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "temperature": body.get("temperature", 1.0),
+            "top_p": 1.0,
+            "error": None,
+            "incomplete_details": None,
+            "instructions": None,
+            "metadata": {},
+            "previous_response_id": body.get("previous_response_id"),
+            "usage": {
+                "input_tokens": input_tokens,
+                "input_tokens_details": {"cached_tokens": cached},
+                "output_tokens": output_tokens,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": input_tokens + output_tokens,
+            },
+        })
+    
+    def _handle_embeddings(self, body: dict) -> None:
+        if self._inject_failure():
+            return
+        
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        as_base64 = body.get("encoding_format") == "base64"
+        
+        data = []
+        for i, text in enumerate(inputs):
+            vec = self.server.model.embedding(str(text))
+            if as_base64:
+                vec = base64.b64encode(struct.pack(f"<{len(vec)}f", *vec)).decode()
+            data.append({"object": "embedding", "index": i, "embedding": vec})
+        
+        n_tokens = sum(_n_tokens(str(t)) for t in inputs)
+        with self.server.stats._lock:
+            self.server.stats.requests += 1
+            self.server.stats.by_task["embedding"] = self.server.stats.by_task.get("embedding", 0) + 1
+        
+        self._send_json(200, {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "standin"),
+            "usage": {"prompt_tokens": n_tokens, "total_tokens": n_tokens},
+        })
+
+
+def start_server(
+    config: StandInConfig | None = None,
+    host: str = STANDIN_HOST,
+    port: int = STANDIN_PORT
+) -> tuple[StandInServer, threading.Thread]:
+    """
+    Start the stand-in server on a background thread.
+    
+    Args:
+        config: Server behaviour (defaults from benchmarks.config)
+        host: Bind address
+        port: Port (0 picks a free port)
+    
+    Returns:
+        Tuple of (server, thread). Call server.shutdown() to stop it.
+    """
+    server = StandInServer((host, port), config or StandInConfig())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    logger.info(f"LLM stand-in listening on http://{host}:{server.server_address[1]}/v1")
+    return server, thread
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the deterministic local LLM stand-in server"
+    )
+    parser.add_argument('--host', default=STANDIN_HOST, help=f'Bind address (default: {STANDIN_HOST})')
+    parser.add_argument('--port', type=int, default=STANDIN_PORT, help=f'Port (default: {STANDIN_PORT})')
+    parser.add_argument('--seed', type=int, default=STANDIN_SEED, help='Latent model seed')
+    parser.add_argument('--latency-median', type=float, default=LATENCY_MEDIAN,
+                        help='Median per-request latency in seconds')
+    parser.add_argument('--latency-sigma', type=float, default=LATENCY_SIGMA,
+                        help='Log-normal sigma of per-request latency')
+    parser.add_argument('--error-rate', type=float, default=ERROR_RATE, help='Fraction of HTTP 500 responses')
+    parser.add_argument('--rate-limit-rate', type=float, default=RATE_LIMIT_RATE,
+                        help='Fraction of HTTP 429 responses')
+    parser.add_argument('--degeneracy-rate', type=float, default=DEGENERACY_RATE,
+                        help='Fraction of ranking answers that echo presentation order')
+    
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    config = StandInConfig(
+        seed=args.seed,
+        latency_median=args.latency_median,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        degeneracy_rate=args.degeneracy_rate,
+    )
+    server = StandInServer((args.host, args.port), config)
+    logger.info(f"LLM stand-in listening on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
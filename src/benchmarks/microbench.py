@@ -0,0 +1,451 @@
+"""
+Microbenchmarks for the pure-compute core.
+
+Times the functions every experiment runs thousands of times on seeded
+synthetic profiles (see profiles.py) at 20x20, 100x100, 200x200 and
+1000x1000, appends the results to a JSONL history file and compares each
+run against a baseline run from that history.
+
+Cases:
+- compute_pvc: src.compute_pvc.compute_pvc
+- biclique_pvc: large_scale.biclique.compute_proportional_veto_core
+- precompute_all_epsilons: sampling_experiment.epsilon_calculator
+- critical_epsilon_custom: compute_critical_epsilon_custom (m_override = m - 1)
+- insertion_epsilon: InsertionEpsilonProfile.epsilon for a statement inserted
+  at seeded positions (the cached profile is built outside the timer)
+- extract_subprofile: sampling_experiment.data_loader (n/5 x m/5 subprofile)
+- run_schulze / run_borda / run_irv / run_plurality / run_veto_by_consumption:
+  sampling_experiment.voting_methods
+- collect_all_results: sample_alt_voters.results_aggregator over a synthetic
+  results tree
+
+Usage:
+    uv run python -m src.benchmarks.microbench
+    uv run python -m src.benchmarks.microbench --cases compute_pvc biclique_pvc --sizes 100 200
+    uv run python -m src.benchmarks.microbench --compare-only          # latest vs previous
+    uv run python -m src.benchmarks.microbench --baseline 69e0dc4 --fail-on-regression
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from .config import (
+    PROJECT_ROOT,
+    MICROBENCH_SEED,
+    MICROBENCH_SIZES,
+    MICROBENCH_PROFILE_KINDS,
+    MICROBENCH_SIZE_LIMITS,
+    MICROBENCH_REPEATS,
+    MICROBENCH_TIME_BUDGET,
+    MICROBENCH_HISTORY_PATH,
+    REGRESSION_THRESHOLD,
+    REGRESSION_MIN_SECONDS,
+)
+from .profiles import make_profile, to_voter_rankings
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Cases
+# =============================================================================
+# Each case takes (preferences, work_dir) and returns a zero-argument callable
+# to time. Setup (format conversion, fixture files) happens outside the timer.
+
+def _case_compute_pvc(preferences: list[list[str]], work_dir: Path) -> Callable:
+    from src.compute_pvc import compute_pvc
+    alternatives = [str(i) for i in range(len(preferences))]
+    return lambda: compute_pvc(preferences, alternatives)
+
+
+def _case_biclique_pvc(preferences: list[list[str]], work_dir: Path) -> Callable:
+    from src.large_scale.biclique import compute_proportional_veto_core
+    profile = to_voter_rankings(preferences)
+    return lambda: compute_proportional_veto_core(profile)
+
+
+def _case_precompute_all_epsilons(preferences: list[list[str]], work_dir: Path) -> Callable:
+    from src.sampling_experiment.epsilon_calculator import precompute_all_epsilons
+    return lambda: precompute_all_epsilons(preferences)
+
+
+def _case_critical_epsilon_custom(preferences: list[list[str]], work_dir: Path) -> Callable:
+    from src.sampling_experiment.epsilon_calculator import compute_critical_epsilon_custom
+    alternatives = [str(i) for i in range(len(preferences))]
+    m_override = max(1, len(alternatives) - 1)
+    return lambda: compute_critical_epsilon_custom(preferences, alternatives, "0", m_override=m_override)
+
+
+def _case_insertion_epsilon(preferences: list[list[str]], work_dir: Path) -> Callable:
+    from src.sampling_experiment.epsilon_calculator import InsertionEpsilonProfile
+    profile = InsertionEpsilonProfile(preferences)
+    rng = random.Random(MICROBENCH_SEED)
+    voters = list(range(profile.n_voters))
+    positions = [rng.randint(0, profile.n_alternatives) for _ in voters]
+    return lambda: profile.epsilon(voters, positions, m_override=profile.n_alternatives)
+
+
+def _case_extract_subprofile(preferences: list[list[str]], work_dir: Path) -> Callable:
+    from src.sampling_experiment.data_loader import extract_subprofile
+    n_alts, n_voters = len(preferences), len(preferences[0])
+    rng = random.Random(MICROBENCH_SEED)
+    voters = sorted(rng.sample(range(n_voters), max(2, n_voters // 5)))
+    alts = sorted(rng.sample(range(n_alts), max(2, n_alts // 5)))
+    return lambda: extract_subprofile(preferences, voters, alts)
+
+
+def _voting_case(name: str) -> Callable:
+    def case(preferences: list[list[str]], work_dir: Path) -> Callable:
+        from src.sampling_experiment import voting_methods
+        rule = getattr(voting_methods, name)
+        return lambda: rule(preferences)
+    return case
+
+
+def _write_results_tree(root: Path, preferences: list[list[str]]) -> None:
+    """Write a synthetic Phase 2 results tree shaped like the real one."""
+    from src.sample_alt_voters.config import (
+        TOPICS, TOPIC_SHORT_NAMES, ALT_DISTRIBUTIONS,
+        N_REPS_UNIFORM, N_REPS_CLUSTERED, N_SAMPLES_PER_REP, IDEOLOGY_CLUSTERS,
+    )
+    rng = random.Random(MICROBENCH_SEED)
+    methods = ["schulze", "borda", "irv", "plurality", "veto_by_consumption",
+               "chatgpt", "chatgpt_rankings", "chatgpt_personas"]
+    n_alts = len(preferences)
+    
+    def write_rep(rep_dir: Path) -> None:
+        for i in range(N_SAMPLES_PER_REP):
+            mini_dir = rep_dir / f"mini_rep{i}"
+            mini_dir.mkdir(parents=True, exist_ok=True)
+            results = {
+                m: {"winner": str(rng.randrange(n_alts)), "epsilon": rng.random() * 0.2,
+                    "full_winner_idx": str(rng.randrange(n_alts))}
+                for m in methods
+            }
+            with open(mini_dir / "results.json", "w") as f:
+                json.dump({"mini_rep_id": i, "results": results}, f)
+    
+    for topic_slug in TOPICS:
+        topic_short = TOPIC_SHORT_NAMES.get(topic_slug, topic_slug)
+        for alt_dist in ALT_DISTRIBUTIONS:
+            for rep_id in range(N_REPS_UNIFORM):
+                write_rep(root / topic_short / "uniform" / alt_dist / f"rep{rep_id}")
+            for rep_id in range(N_REPS_CLUSTERED):
+                cluster = IDEOLOGY_CLUSTERS[rep_id] if rep_id < len(IDEOLOGY_CLUSTERS) else f"cluster{rep_id}"
+                write_rep(root / topic_short / "clustered" / alt_dist / f"rep{rep_id}_{cluster}")
+
+
+def _case_collect_all_results(preferences: list[list[str]], work_dir: Path) -> Callable:
+    from src.sample_alt_voters import results_aggregator
+    root = work_dir / "data"
+    _write_results_tree(root, preferences)
+    
+    def run():
+        saved = results_aggregator.PHASE2_DATA_DIR
+        results_aggregator.PHASE2_DATA_DIR = root
+        try:
+            return results_aggregator.collect_all_results()
+        finally:
+            results_aggregator.PHASE2_DATA_DIR = saved
+    
+    return run
+
+
+CASES: dict[str, Callable] = {
+    "compute_pvc": _case_compute_pvc,
+    "biclique_pvc": _case_biclique_pvc,
+    "precompute_all_epsilons": _case_precompute_all_epsilons,
+    "critical_epsilon_custom": _case_critical_epsilon_custom,
+    "insertion_epsilon": _case_insertion_epsilon,
+    "extract_subprofile": _case_extract_subprofile,
+    "run_schulze": _voting_case("run_schulze"),
+    "run_borda": _voting_case("run_borda"),
+    "run_irv": _voting_case("run_irv"),
+    "run_plurality": _voting_case("run_plurality"),
+    "run_veto_by_consumption": _voting_case("run_veto_by_consumption"),
+    "collect_all_results": _case_collect_all_results,
+}
+
+# Cases whose cost does not depend on the profile kind
+KIND_INDEPENDENT_CASES = {"collect_all_results"}
+
+
+def _size_limit(case: str) -> int:
+    if case.startswith("run_"):
+        return MICROBENCH_SIZE_LIMITS["votekit_rules"]
+    return MICROBENCH_SIZE_LIMITS.get(case, max(MICROBENCH_SIZES))
+
+
+# =============================================================================
+# Timing
+# =============================================================================
+
+def time_callable(
+    fn: Callable,
+    repeats: int = MICROBENCH_REPEATS,
+    time_budget: float = MICROBENCH_TIME_BUDGET
+) -> dict:
+    """
+    Time a callable: one run, then further runs while within the time budget.
+    
+    Args:
+        fn: Zero-argument callable
+        repeats: Maximum number of timed runs
+        time_budget: Stop repeating once this many seconds have been spent
+    
+    Returns:
+        Dict with median, min, max and repeats.
+    """
+    times = []
+    spent = 0.0
+    while len(times) < repeats and (not times or spent + times[-1] <= time_budget):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        spent += elapsed
+    return {
+        "median": statistics.median(times),
+        "min": min(times),
+        "max": max(times),
+        "repeats": len(times),
+    }
+
+
+def run_suite(
+    cases: list[str],
+    sizes: list[int],
+    kinds: list[str],
+    all_sizes: bool = False,
+    repeats: int = MICROBENCH_REPEATS
+) -> dict[str, dict]:
+    """
+    Run the selected cases over the selected profile sizes and kinds.
+    
+    Args:
+        cases: Case names (keys of CASES)
+        sizes: Profile sizes (n_voters = n_alternatives)
+        kinds: Profile kinds (see profiles.make_profile)
+        all_sizes: Ignore MICROBENCH_SIZE_LIMITS
+        repeats: Maximum timed runs per case
+    
+    Returns:
+        Dict mapping "case/kind/size" to timing dicts.
+    """
+    results = {}
+    profiles: dict[tuple[str, int], list[list[str]]] = {}
+    
+    for size in sizes:
+        for kind in kinds:
+            for case in cases:
+                if not all_sizes and size > _size_limit(case):
+                    continue
+                if case in KIND_INDEPENDENT_CASES and kind != kinds[0]:
+                    continue
+                if (kind, size) not in profiles:
+                    profiles[(kind, size)] = make_profile(kind, size, size)
+                
+                key = f"{case}/{kind}/{size}"
+                with tempfile.TemporaryDirectory() as tmp:
+                    try:
+                        fn = CASES[case](profiles[(kind, size)], Path(tmp))
+                        results[key] = time_callable(fn, repeats=repeats)
+                    except Exception as e:
+                        logger.error(f"{key} failed: {e}")
+                        results[key] = {"error": str(e)}
+                        continue
+                logger.info(f"{key}: median {results[key]['median'] * 1000:.2f} ms "
+                            f"({results[key]['repeats']} runs)")
+        # Free the large profiles once a size is done
+        profiles.clear()
+    
+    return results
+
+
+# =============================================================================
+# History and Regression Comparison
+# =============================================================================
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def load_history(path: Path = MICROBENCH_HISTORY_PATH) -> list[dict]:
+    """Load all recorded runs (oldest first)."""
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(record: dict, path: Path = MICROBENCH_HISTORY_PATH) -> None:
+    """Append one run record to the history file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def find_baseline(history: list[dict], ref: str | None) -> dict | None:
+    """
+    Pick a baseline run from history.
+    
+    Args:
+        history: Runs, oldest first (the current run must not be included)
+        ref: None for the most recent run, a git commit prefix, or a
+            (negative) index into history
+    
+    Returns:
+        The baseline record, or None if not found.
+    """
+    if not history:
+        return None
+    if ref is None:
+        return history[-1]
+    try:
+        return history[int(ref)]
+    except (ValueError, IndexError):
+        pass
+    for record in reversed(history):
+        if record.get("git_commit") and record["git_commit"].startswith(ref):
+            return record
+    return None
+
+
+def compare_runs(
+    baseline: dict,
+    current: dict,
+    threshold: float = REGRESSION_THRESHOLD,
+    min_seconds: float = REGRESSION_MIN_SECONDS
+) -> list[dict]:
+    """
+    Compare per-case median times of two runs.
+    
+    A case is a regression when it is more than `threshold` slower (relative)
+    AND more than `min_seconds` slower (absolute); improvements symmetric.
+    
+    Args:
+        baseline: Baseline run record
+        current: Current run record
+        threshold: Relative change that counts as significant
+        min_seconds: Absolute change below which differences are noise
+    
+    Returns:
+        One row per case in the current run with baseline, current, ratio and status.
+    """
+    rows = []
+    for key, cur in current["results"].items():
+        base = baseline["results"].get(key)
+        if "median" not in cur:
+            rows.append({"case": key, "status": "error"})
+            continue
+        if not base or "median" not in base:
+            rows.append({"case": key, "current": cur["median"], "status": "new"})
+            continue
+        ratio = cur["median"] / base["median"] if base["median"] > 0 else float("inf")
+        diff = cur["median"] - base["median"]
+        if ratio > 1 + threshold and diff > min_seconds:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold) and -diff > min_seconds:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({"case": key, "baseline": base["median"], "current": cur["median"],
+                     "ratio": ratio, "status": status})
+    return rows
+
+
+def print_comparison(rows: list[dict], baseline: dict, current: dict) -> None:
+    print(f"\nBaseline: {baseline.get('git_commit')} ({baseline.get('timestamp')})")
+    print(f"Current:  {current.get('git_commit')} ({current.get('timestamp')})\n")
+    print(f"{'Case':<48} {'Baseline ms':>12} {'Current ms':>12} {'Ratio':>7}  Status")
+    for row in rows:
+        base = f"{row['baseline'] * 1000:.2f}" if "baseline" in row else "-"
+        cur = f"{row['current'] * 1000:.2f}" if "current" in row else "-"
+        ratio = f"{row['ratio']:.2f}" if "ratio" in row else "-"
+        print(f"{row['case']:<48} {base:>12} {cur:>12} {ratio:>7}  {row['status']}")
+    n_reg = sum(1 for r in rows if r["status"] == "regression")
+    n_imp = sum(1 for r in rows if r["status"] == "improvement")
+    print(f"\n{n_reg} regression(s), {n_imp} improvement(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the pure-compute core")
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES),
+                        help='Cases to run (default: all)')
+    parser.add_argument('--sizes', nargs='+', type=int, default=MICROBENCH_SIZES,
+                        help=f'Profile sizes (default: {MICROBENCH_SIZES})')
+    parser.add_argument('--kinds', nargs='+', choices=MICROBENCH_PROFILE_KINDS,
+                        default=MICROBENCH_PROFILE_KINDS, help='Profile kinds (default: all)')
+    parser.add_argument('--all-sizes', action='store_true',
+                        help='Run every case at every size (ignores per-case size limits)')
+    parser.add_argument('--repeats', type=int, default=MICROBENCH_REPEATS, help='Max timed runs per case')
+    parser.add_argument('--history', type=Path, default=MICROBENCH_HISTORY_PATH, help='History file (JSONL)')
+    parser.add_argument('--no-save', action='store_true', help='Do not append this run to the history')
+    parser.add_argument('--baseline', type=str, default=None,
+                        help='Baseline run: git commit prefix or history index (default: previous run)')
+    parser.add_argument('--compare-only', action='store_true',
+                        help='Compare the latest recorded run against the baseline without running')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='Relative slowdown counted as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Exit with status 1 if any regression is found')
+    
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    history = load_history(args.history)
+    
+    if args.compare_only:
+        if len(history) < 2 and args.baseline is None:
+            print("Need at least two recorded runs to compare.")
+            return
+        current, history = history[-1], history[:-1]
+    else:
+        current = {
+            "timestamp": datetime.now().isoformat(),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": MICROBENCH_SEED,
+            "results": run_suite(args.cases, args.sizes, args.kinds, args.all_sizes, args.repeats),
+        }
+        if not args.no_save:
+            append_history(current, args.history)
+            logger.info(f"Appended run to {args.history}")
+    
+    baseline = find_baseline(history, args.baseline)
+    if baseline is None:
+        print("No baseline run found; nothing to compare.")
+        return
+    
+    rows = compare_runs(baseline, current, threshold=args.threshold)
+    print_comparison(rows, baseline, current)
+    
+    if args.fail_on_regression and any(r["status"] == "regression" for r in rows):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
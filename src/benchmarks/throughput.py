@@ -0,0 +1,319 @@
+"""
+End-to-end throughput harness against the local LLM stand-in.
+
+Starts the stand-in server (or uses one given by --base-url), points an
+OpenAI client at it and drives the real pipeline code:
+
+- run_test: degeneracy_mitigation Approach A* (iterative top-K/bottom-K)
+- preferences_iterative: sample_alt_voters.build_full_preferences_iterative
+- likert: full_experiment.build_full_likert
+
+For each pipeline it reports API calls/s, p50/p99 voter completion time
+(first request to last response per persona, measured at the server),
+client CPU seconds and peak RSS, and writes a JSON report to
+outputs/benchmarks/.
+
+Usage:
+    uv run python -m src.benchmarks.throughput
+    uv run python -m src.benchmarks.throughput --pipelines likert --voters 50 --latency-median 0.2
+    uv run python -m src.benchmarks.throughput --base-url http://127.0.0.1:8765
+"""
+
+import argparse
+import json
+import logging
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+from openai import OpenAI
+
+from .config import (
+    OUTPUT_DIR,
+    STANDIN_HOST,
+    STANDIN_PORT,
+    STANDIN_SEED,
+    LATENCY_MEDIAN,
+    LATENCY_SIGMA,
+    ERROR_RATE,
+    RATE_LIMIT_RATE,
+    DEGENERACY_RATE,
+    BENCH_N_VOTERS,
+    BENCH_N_STATEMENTS,
+    BENCH_MAX_WORKERS,
+    BENCH_PIPELINES,
+)
+from src.degeneracy_mitigation.config import K_TOP_BOTTOM, N_ROUNDS
+
+logger = logging.getLogger(__name__)
+
+# Pipelines that rank through the iterative top-K/bottom-K schedule
+ITERATIVE_PIPELINES = ("run_test", "preferences_iterative")
+
+BENCH_TOPIC = "What should guide laws concerning abortion?"
+
+_AGES = ["22", "34", "47", "58", "71"]
+_JOBS = ["nurse", "farmer", "software engineer", "teacher", "retired machinist", "pastor", "lawyer", "student"]
+_VALUES = ["personal liberty", "religious tradition", "public health", "fiscal restraint",
+           "community", "equality", "family", "scientific evidence"]
+_REGIONS = ["rural Texas", "Chicago", "coastal Oregon", "suburban Atlanta", "upstate New York"]
+_STANCES = ["should be decided by", "must protect", "ought to balance", "needs to prioritize", "cannot ignore"]
+_SUBJECTS = ["individual conscience", "medical evidence", "the rights of the unborn", "state legislatures",
+             "women's health", "religious communities", "voters directly", "doctors and patients"]
+
+
+def make_synthetic_inputs(
+    n_voters: int,
+    n_statements: int,
+    seed: int = STANDIN_SEED
+) -> tuple[list[str], list[dict]]:
+    """
+    Generate seeded synthetic personas and statements.
+    
+    Args:
+        n_voters: Number of persona strings
+        n_statements: Number of statement dicts
+        seed: Random seed
+    
+    Returns:
+        Tuple of (personas, statements).
+    """
+    rng = random.Random(seed)
+    personas = [
+        f"Person {i}: a {rng.choice(_AGES)}-year-old {rng.choice(_JOBS)} from {rng.choice(_REGIONS)} "
+        f"who values {rng.choice(_VALUES)} and {rng.choice(_VALUES)}."
+        for i in range(n_voters)
+    ]
+    statements = [
+        {"statement": f"Statement {i}: abortion law {rng.choice(_STANCES)} {rng.choice(_SUBJECTS)}, "
+                      f"with attention to {rng.choice(_VALUES)}."}
+        for i in range(n_statements)
+    ]
+    return personas, statements
+
+
+# =============================================================================
+# Stand-in server control
+# =============================================================================
+
+def _get_json(url: str) -> dict:
+    with urllib.request.urlopen(url, timeout=10) as resp:
+        return json.loads(resp.read())
+
+
+def _post(url: str) -> None:
+    req = urllib.request.Request(url, data=b"{}", method="POST",
+                                 headers={"Content-Type": "application/json"})
+    urllib.request.urlopen(req, timeout=10).close()
+
+
+def launch_standin(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    """Start the stand-in in a subprocess and wait until it answers /health."""
+    cmd = [
+        sys.executable, "-m", "src.benchmarks.llm_standin",
+        "--host", STANDIN_HOST, "--port", str(args.port),
+        "--seed", str(args.seed),
+        "--latency-median", str(args.latency_median),
+        "--latency-sigma", str(args.latency_sigma),
+        "--error-rate", str(args.error_rate),
+        "--rate-limit-rate", str(args.rate_limit_rate),
+        "--degeneracy-rate", str(args.degeneracy_rate),
+    ]
+    proc = subprocess.Popen(cmd)
+    base_url = f"http://{STANDIN_HOST}:{args.port}"
+    
+    for _ in range(100):
+        try:
+            _get_json(f"{base_url}/health")
+            return proc, base_url
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError(f"LLM stand-in did not start on {base_url}")
+
+
+# =============================================================================
+# Pipelines
+# =============================================================================
+
+def run_pipeline(
+    name: str,
+    client: OpenAI,
+    personas: list[str],
+    statements: list[dict],
+    max_workers: int,
+    work_dir: Path
+) -> None:
+    """Run one pipeline end to end against the given client."""
+    if name == "run_test":
+        from src.degeneracy_mitigation.run_test import run_approach_a_star
+        run_approach_a_star(
+            client, personas, statements, BENCH_TOPIC, "low",
+            work_dir / "approach_a_star", max_workers=max_workers,
+        )
+    elif name == "preferences_iterative":
+        from src.sample_alt_voters.preference_builder_iterative import build_full_preferences_iterative
+        build_full_preferences_iterative(
+            personas, statements, BENCH_TOPIC, client,
+            max_workers=max_workers, show_progress=False,
+        )
+    elif name == "likert":
+        from src.full_experiment.preference_builder import build_full_likert
+        build_full_likert(personas, statements, BENCH_TOPIC, client, max_workers=max_workers)
+    else:
+        raise ValueError(f"Unknown pipeline: {name}")
+
+
+def _client_usage() -> tuple[float, float]:
+    """Return (CPU seconds, peak RSS in MB) for this process."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime, usage.ru_maxrss / 1024
+
+
+def benchmark_pipeline(
+    name: str,
+    base_url: str,
+    personas: list[str],
+    statements: list[dict],
+    max_workers: int
+) -> dict:
+    """
+    Run one pipeline and collect throughput metrics.
+    
+    Args:
+        name: Pipeline name (see BENCH_PIPELINES)
+        base_url: Stand-in server root URL
+        personas: Voter personas
+        statements: Statement dicts
+        max_workers: Worker threads passed to the pipeline
+    
+    Returns:
+        Metrics dictionary.
+    """
+    client = OpenAI(base_url=f"{base_url}/v1", api_key="standin", max_retries=5)
+    _post(f"{base_url}/stats/reset")
+    cpu_before, _ = _client_usage()
+    start = time.time()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        run_pipeline(name, client, personas, statements, max_workers, Path(tmp))
+    
+    wall = time.time() - start
+    cpu_after, peak_rss_mb = _client_usage()
+    server = _get_json(f"{base_url}/stats")
+    
+    metrics = {
+        "pipeline": name,
+        "n_voters": len(personas),
+        "n_statements": len(statements),
+        "max_workers": max_workers,
+        "wall_seconds": wall,
+        "api_calls": server["requests"],
+        "calls_per_sec": server["requests"] / wall if wall > 0 else 0.0,
+        "calls_by_task": server["by_task"],
+        "server_errors": server["errors"],
+        "rate_limited": server["rate_limited"],
+        "voter_completion_p50": server["persona_span_p50"],
+        "voter_completion_p99": server["persona_span_p99"],
+        "input_tokens": server["input_tokens"],
+        "cached_input_tokens": server["cached_input_tokens"],
+        "output_tokens": server["output_tokens"],
+        "client_cpu_seconds": cpu_after - cpu_before,
+        "client_peak_rss_mb": peak_rss_mb,
+    }
+    
+    logger.info(
+        f"{name}: {metrics['api_calls']} calls in {wall:.1f}s "
+        f"({metrics['calls_per_sec']:.1f}/s), voter p99 {metrics['voter_completion_p99']:.1f}s, "
+        f"CPU {metrics['client_cpu_seconds']:.1f}s, peak RSS {peak_rss_mb:.0f} MB"
+    )
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Throughput harness for the LLM pipelines against the local stand-in"
+    )
+    parser.add_argument('--pipelines', nargs='+', choices=BENCH_PIPELINES, default=BENCH_PIPELINES,
+                        help='Pipelines to run (default: all)')
+    parser.add_argument('--voters', type=int, default=BENCH_N_VOTERS, help='Number of voters')
+    parser.add_argument('--statements', type=int, default=BENCH_N_STATEMENTS, help='Number of statements')
+    parser.add_argument('--max-workers', type=int, default=BENCH_MAX_WORKERS, help='Pipeline worker threads')
+    parser.add_argument('--base-url', type=str, default=None,
+                        help='Use an already running stand-in (e.g. http://127.0.0.1:8765)')
+    parser.add_argument('--port', type=int, default=STANDIN_PORT, help='Port for the launched stand-in')
+    parser.add_argument('--seed', type=int, default=STANDIN_SEED, help='Seed for inputs and stand-in')
+    parser.add_argument('--latency-median', type=float, default=LATENCY_MEDIAN)
+    parser.add_argument('--latency-sigma', type=float, default=LATENCY_SIGMA)
+    parser.add_argument('--error-rate', type=float, default=ERROR_RATE)
+    parser.add_argument('--rate-limit-rate', type=float, default=RATE_LIMIT_RATE)
+    parser.add_argument('--degeneracy-rate', type=float, default=DEGENERACY_RATE)
+    parser.add_argument('--output', type=Path, default=None, help='Report path (default: outputs/benchmarks/...)')
+    
+    args = parser.parse_args()
+    
+    # Every top-K/bottom-K round removes 2K statements and the last round ranks the rest,
+    # which needs at least K statements (shorter rankings read as presentation order)
+    min_statements = 2 * K_TOP_BOTTOM * (N_ROUNDS - 1) + K_TOP_BOTTOM
+    iterative = [name for name in args.pipelines if name in ITERATIVE_PIPELINES]
+    if iterative and args.statements < min_statements:
+        parser.error(
+            f"--statements must be at least {min_statements} for {', '.join(iterative)} "
+            f"({N_ROUNDS - 1} rounds of top/bottom {K_TOP_BOTTOM}, then a final ranking of at least {K_TOP_BOTTOM})"
+        )
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    personas, statements = make_synthetic_inputs(args.voters, args.statements, args.seed)
+    
+    proc = None
+    base_url = args.base_url
+    if base_url is None:
+        proc, base_url = launch_standin(args)
+    
+    try:
+        results = [
+            benchmark_pipeline(name, base_url, personas, statements, args.max_workers)
+            for name in args.pipelines
+        ]
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "standin": _get_json(f"{base_url}/health")["config"] if args.base_url else {
+            "seed": args.seed,
+            "latency_median": args.latency_median,
+            "latency_sigma": args.latency_sigma,
+            "error_rate": args.error_rate,
+            "rate_limit_rate": args.rate_limit_rate,
+            "degeneracy_rate": args.degeneracy_rate,
+        },
+        "results": results,
+    }
+    
+    output_path = args.output or OUTPUT_DIR / f"throughput_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"\n{'Pipeline':<24} {'Calls':>7} {'Calls/s':>8} {'Voter p99':>10} {'CPU s':>7} {'RSS MB':>7}")
+    for r in results:
+        print(f"{r['pipeline']:<24} {r['api_calls']:>7} {r['calls_per_sec']:>8.1f} "
+              f"{r['voter_completion_p99']:>10.1f} {r['client_cpu_seconds']:>7.1f} {r['client_peak_rss_mb']:>7.0f}")
+    print(f"\nReport saved to {output_path}")
+
+
+if __name__ == '__main__':
+    main()
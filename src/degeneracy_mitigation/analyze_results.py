@@ -6,6 +6,7 @@ Computes:
 - Unique rankings count
 - Correlation between Approach A and B
 - Comparison across reasoning effort levels
+- Comparison of standard vs prefix-stable (cached) prompt layouts
 """
 
 import argparse
@@ -187,6 +188,51 @@ def analyze_condition(results_dir: Path) -> dict:
     }
 
 
+def compare_layouts(output_dir: Path = OUTPUT_DIR) -> dict:
+    """
+    Compare standard vs cached prompt layouts for every approach and effort.
+    
+    Cached-layout results live next to the standard ones with a '_cached'
+    suffix (e.g. approach_a_cached/low). Only conditions run under both
+    layouts are compared.
+    
+    Args:
+        output_dir: Base output directory
+    
+    Returns:
+        Dict keyed by approach then effort, with per-layout degeneracy,
+        validity, retries, latency and cached-token ratio.
+    """
+    comparison = {}
+    
+    for approach in ['approach_a', 'approach_a_star', 'approach_b']:
+        for effort in REASONING_EFFORTS:
+            dirs = {
+                'standard': output_dir / approach / effort,
+                'cached': output_dir / f'{approach}_cached' / effort,
+            }
+            if not all(d.exists() for d in dirs.values()):
+                continue
+            
+            entry = {}
+            for layout, results_dir in dirs.items():
+                stats = load_stats(results_dir)
+                degeneracy = compute_degeneracy_stats(load_rankings(results_dir))
+                api_stats = stats.get('api_stats', {})
+                entry[layout] = {
+                    'degenerate_rate': degeneracy['degenerate_rate'],
+                    'valid_count': stats.get('valid_count'),
+                    'total_retries': stats.get('total_retries', stats.get('total_dedup_rounds')),
+                    'avg_latency': api_stats.get('avg'),
+                    'n_calls': api_stats.get('count'),
+                    'cached_ratio': api_stats.get('cached_ratio'),
+                }
+            comparison.setdefault(approach, {})[effort] = entry
+            logger.info(f"Compared layouts for {approach} ({effort})")
+    
+    return comparison
+
+
 def analyze_all(output_dir: Path = OUTPUT_DIR) -> dict:
     """
     Analyze all results in the output directory.
@@ -201,6 +247,7 @@ def analyze_all(output_dir: Path = OUTPUT_DIR) -> dict:
         'approach_a': {},
         'approach_b': {},
         'correlations': {},
+        'layouts': {},
     }
     
     # Analyze Approach A (iterative ranking)
@@ -231,6 +278,8 @@ def analyze_all(output_dir: Path = OUTPUT_DIR) -> dict:
             results['correlations'][effort] = corr
             logger.info(f"Computed correlation for {effort}: {corr.get('mean_correlation', 'N/A')}")
     
+    results['layouts'] = compare_layouts(output_dir)
+    
     return results
 
 
@@ -296,6 +345,24 @@ def print_summary(analysis: dict) -> None:
             
             print(f"{effort:<10} {mean_str:<15} {std_str:<10} {n:<10}")
     
+    # Prompt layout comparison
+    if analysis.get('layouts'):
+        print("\n### Prompt Layout: standard vs cached")
+        print("-" * 70)
+        print(f"{'Condition':<24} {'Layout':<10} {'Degen %':<10} {'Retries':<10} {'Avg s':<10} {'Cached %':<10}")
+        print("-" * 70)
+        
+        for approach, efforts in analysis['layouts'].items():
+            for effort, entry in efforts.items():
+                for layout, data in entry.items():
+                    avg = data.get('avg_latency')
+                    cached = data.get('cached_ratio')
+                    avg_str = f"{avg:.2f}" if avg is not None else "N/A"
+                    cached_str = f"{cached*100:.1f}%" if cached is not None else "N/A"
+                    print(f"{approach + ' (' + effort + ')':<24} {layout:<10} "
+                          f"{data['degenerate_rate']*100:<10.1f} {str(data.get('total_retries')):<10} "
+                          f"{avg_str:<10} {cached_str:<10}")
+    
     print("\n" + "=" * 70)
     
     # Success criteria check
@@ -8,6 +8,8 @@ import logging
 import threading
 from pathlib import Path
 
+from src.typed_responses import format_stats
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -36,6 +38,14 @@ N_ROUNDS = 5       # 5 rounds total (100 -> 80 -> 60 -> 40 -> 20)
 # Retry parameters
 MAX_RETRIES = 3    # Max retries on degenerate/invalid output
 
+# Local repair parameters (top-K/bottom-K rounds)
+# When a round output is structurally invalid but not degenerate, keep the
+# valid picks and ask only for the missing slots instead of re-asking the
+# whole round.
+ENABLE_LOCAL_REPAIR = True
+MAX_REPAIR_ATTEMPTS = 2          # Repair follow-ups per full attempt
+MIN_REPAIR_KEEP_FRACTION = 0.5   # Min fraction of 2K slots that must survive
+
 # Scoring dedup parameters
 MAX_DEDUP_ROUNDS = 3  # Max rounds to resolve duplicate scores
 
@@ -90,6 +100,27 @@ Do not include explanations, commentary, or extra text."""
 RANKING_TASK = "rank statements by preference"
 SCORING_TASK = "score statements by preference"
 
+# Prefix-stable ("cached") layout: the topic and a fixed, code-keyed statement
+# catalog come first (identical across all voters), then the persona
+# (identical across a voter's rounds). Only the per-round user message varies,
+# so providers can serve the long prefix from their prompt cache.
+CACHED_SYSTEM_PROMPT_TEMPLATE = """Topic: "{topic}"
+
+Statement catalog ({n} statements, identified by 4-letter codes; catalog order carries no meaning):
+{catalog}
+
+You are simulating a single, internally consistent person defined by the following persona:
+{persona}
+
+You must evaluate each statement solely through the lens of this persona's values, background, beliefs, and preferences.
+
+Your task is to {task_description} and return valid JSON only.
+Do not include explanations, commentary, or extra text."""
+
+# Prompt layouts: "standard" embeds persona + shuffled statements in every call,
+# "cached" uses CACHED_SYSTEM_PROMPT_TEMPLATE with a short per-round suffix
+PROMPT_LAYOUTS = ["standard", "cached"]
+
 # =============================================================================
 # Parallelization
 # =============================================================================
@@ -98,29 +129,50 @@ MAX_WORKERS = 20  # Maximum parallel API calls
 # =============================================================================
 # API Timing Tracker
 # =============================================================================
+def extract_usage(response) -> dict:
+    """Extract input, cached-input and output token counts from a Responses API result."""
+    usage = getattr(response, "usage", None)
+    details = getattr(usage, "input_tokens_details", None)
+    return {
+        "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+        "cached_input_tokens": getattr(details, "cached_tokens", 0) or 0,
+        "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+    }
+
+
 class APITimer:
-    """Thread-safe tracker for API call timing."""
+    """Thread-safe tracker for API call timing and input token usage."""
     LOG_INTERVAL = 50
     
     def __init__(self):
         self._times = []
         self._lock = threading.Lock()
         self._call_count = 0
+        self._input_tokens = 0
+        self._cached_input_tokens = 0
     
-    def record(self, duration: float) -> None:
-        """Record an API call duration."""
+    def record(self, duration: float, input_tokens: int = 0, cached_input_tokens: int = 0) -> None:
+        """Record an API call duration and (optionally) its input token usage."""
         with self._lock:
             self._times.append(duration)
             self._call_count += 1
+            self._input_tokens += input_tokens
+            self._cached_input_tokens += cached_input_tokens
             
             if self._call_count % self.LOG_INTERVAL == 0:
                 avg = sum(self._times) / len(self._times)
                 logger.info(
                     f"[API Stats] {len(self._times)} calls, avg {avg:.2f}s/call"
                 )
+                format_stats.log_stats()
+    
+    def record_response(self, response, duration: float) -> None:
+        """Record an API call duration together with the response's token usage."""
+        usage = extract_usage(response)
+        self.record(duration, usage["input_tokens"], usage["cached_input_tokens"])
     
     def get_stats(self) -> dict:
-        """Get current timing statistics."""
+        """Get current timing and cached-token statistics."""
         with self._lock:
             if not self._times:
                 return {"count": 0, "avg": 0, "total": 0}
@@ -128,13 +180,21 @@ class APITimer:
                 "count": len(self._times),
                 "avg": sum(self._times) / len(self._times),
                 "total": sum(self._times),
+                "input_tokens": self._input_tokens,
+                "cached_input_tokens": self._cached_input_tokens,
+                "cached_ratio": (
+                    self._cached_input_tokens / self._input_tokens
+                    if self._input_tokens else 0.0
+                ),
             }
     
     def reset(self) -> None:
-        """Reset all tracked times."""
+        """Reset all tracked times and token counts."""
         with self._lock:
             self._times = []
             self._call_count = 0
+            self._input_tokens = 0
+            self._cached_input_tokens = 0
 
 
 # Global timer instance
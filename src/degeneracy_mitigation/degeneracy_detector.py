@@ -136,6 +136,45 @@ def validate_top_bottom_k(
     return True, ""
 
 
+def salvage_top_bottom_k(
+    top_k: list[str],
+    bottom_k: list[str],
+    valid_hashes: set[str],
+    k: int = K_TOP_BOTTOM
+) -> tuple[list[str], list[str]]:
+    """
+    Keep the structurally valid portion of a top-K/bottom-K output.
+    
+    Drops unknown hashes, repeated hashes (first occurrence wins) and any
+    hash that appears in both lists (its side is ambiguous), then truncates
+    each list to k items. Relative order of surviving items is preserved.
+    
+    Args:
+        top_k: Raw top K hash strings from the model
+        bottom_k: Raw bottom K hash strings from the model
+        valid_hashes: Set of valid hash strings for this round
+        k: Expected number of items per list
+    
+    Returns:
+        Tuple of (kept_top, kept_bottom), each with at most k items.
+    """
+    overlap = set(top_k) & set(bottom_k)
+    
+    def _clean(items: list[str]) -> list[str]:
+        kept = []
+        seen = set()
+        for h in items:
+            if not isinstance(h, str) or h not in valid_hashes:
+                continue
+            if h in overlap or h in seen:
+                continue
+            seen.add(h)
+            kept.append(h)
+        return kept[:k]
+    
+    return _clean(top_k), _clean(bottom_k)
+
+
 def validate_final_ranking(ranking: list[str], valid_hashes: set[str]) -> tuple[bool, str]:
     """
     Validate final round ranking (all remaining statements).
@@ -323,6 +362,12 @@ if __name__ == "__main__":
     assert "duplicates" in msg
     print("  validate_top_bottom_k: PASS")
     
+    # Test salvage_top_bottom_k
+    top, bottom = salvage_top_bottom_k(["a", "a", "zz", "c"], ["c", "i", "j"], valid, k=3)
+    assert top == ["a"], top
+    assert bottom == ["i", "j"], bottom
+    print("  salvage_top_bottom_k: PASS")
+    
     # Test validate_final_ranking
     valid = {"a", "b", "c"}
     ok, msg = validate_final_ranking(["a", "b", "c"], valid)
@@ -10,15 +10,20 @@ Key features:
 - 4-letter hash identifiers to disentangle from rank positions
 - Degeneracy detection with retry logic
 - Validation of structural correctness
+- Local repair of near-valid top-K/bottom-K outputs (only the missing
+  slots are re-asked; degenerate outputs still trigger a full retry)
 """
 
+from __future__ import annotations
+
 import json
 import logging
 import random
 import time
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from openai import OpenAI
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 from .config import (
     MODEL,
@@ -26,17 +31,29 @@ from .config import (
     K_TOP_BOTTOM,
     N_ROUNDS,
     MAX_RETRIES,
+    ENABLE_LOCAL_REPAIR,
+    MAX_REPAIR_ATTEMPTS,
+    MIN_REPAIR_KEEP_FRACTION,
     HASH_SEED,
     SYSTEM_PROMPT_TEMPLATE,
     RANKING_TASK,
     api_timer,
+    extract_usage,
 )
 from .hash_identifiers import id_to_hash, hash_to_id, build_hash_lookup
+from .prompt_layout import (
+    build_cached_system_prompt,
+    build_cached_top_bottom_prompt,
+    build_cached_final_ranking_prompt,
+    catalog_order,
+)
+from src.typed_responses import format_stats, parse_response, ranking_schema, top_bottom_schema
 from .degeneracy_detector import (
     is_partial_degenerate,
     is_degenerate,
     validate_top_bottom_k,
     validate_final_ranking,
+    salvage_top_bottom_k,
 )
 
 logger = logging.getLogger(__name__)
@@ -122,15 +139,74 @@ Return JSON: {{"ranking": ["most_preferred", "second", ..., "least_preferred"]}}
     return prompt
 
 
-def call_api_for_top_bottom(
+def build_repair_prompt(
+    kept_top: list[str],
+    kept_bottom: list[str],
+    remaining_codes: list[str],
+    n_top_missing: int,
+    n_bottom_missing: int,
+    problem: str,
+    bottom_least_first: bool = False
+) -> str:
+    """
+    Build a follow-up prompt asking only for the missing top/bottom slots.
+    
+    Sent as a continuation of the failed round (previous_response_id), so the
+    statement texts are already in context and only codes are listed here.
+    
+    Args:
+        kept_top: Valid top picks kept from the previous answer (in order)
+        kept_bottom: Valid bottom picks kept from the previous answer (in order)
+        remaining_codes: Codes that are still unplaced, in presentation order
+        n_top_missing: Number of top slots to fill
+        n_bottom_missing: Number of bottom slots to fill
+        problem: Short description of what was wrong with the previous answer
+        bottom_least_first: True if bottom lists are ordered least preferred first (A*)
+    
+    Returns:
+        The user prompt string.
+    """
+    bottom_order = "least preferred first" if bottom_least_first else "least preferred last"
+    
+    prompt = f"""Your previous answer could not be used as-is ({problem}).
+
+These picks are kept:
+- TOP (most preferred first): {json.dumps(kept_top)}
+- BOTTOM ({bottom_order}): {json.dumps(kept_bottom)}
+
+Fill ONLY the missing slots:
+- {n_top_missing} more TOP code(s): the statements you prefer next after the kept TOP picks (most preferred first)
+- {n_bottom_missing} more BOTTOM code(s): the statements you dislike next after the kept BOTTOM picks ({bottom_order})
+
+Choose only from these remaining codes (statements shown earlier):
+{", ".join(remaining_codes)}
+
+Do NOT repeat kept codes and do NOT use a code in both lists.
+
+Return JSON: {{"top_fill": ["code1", ...], "bottom_fill": ["code1", ...]}}"""
+    
+    return prompt
+
+
+def _response_meta(response: Any, latency: float) -> dict:
+    """Extract response id, token usage and latency from a Responses API result."""
+    return {
+        "response_id": getattr(response, "id", None),
+        **extract_usage(response),
+        "latency": latency,
+    }
+
+
+def request_top_bottom(
     client: OpenAI,
     system_prompt: str,
     user_prompt: str,
     reasoning_effort: str,
-    k: int = K_TOP_BOTTOM
-) -> tuple[list[str], list[str]]:
+    k: int = K_TOP_BOTTOM,
+    codes: list[str] | None = None
+) -> tuple[list[str], list[str], dict]:
     """
-    Make API call to get top-K and bottom-K selections.
+    Make API call to get top-K and bottom-K selections, with call metadata.
     
     Args:
         client: OpenAI client
@@ -138,13 +214,16 @@ def call_api_for_top_bottom(
         user_prompt: User prompt with statements
         reasoning_effort: "minimal", "low", or "medium"
         k: Expected count for each list
+        codes: Hashes the picks must come from (None = any string)
     
     Returns:
-        Tuple of (top_k, bottom_k) lists of hash strings.
+        Tuple of (top_k, bottom_k, meta) where meta holds the response id,
+        token usage and latency of the call.
     
     Raises:
         Exception on API or parsing error.
     """
+    schema = top_bottom_schema(f"top_{k}", f"bottom_{k}", codes, k, k)
     start_time = time.time()
     
     response = client.responses.create(
@@ -155,24 +234,241 @@ def call_api_for_top_bottom(
         ],
         temperature=TEMPERATURE,
         reasoning={"effort": reasoning_effort},
+        text=schema.text_format,
     )
     
-    api_timer.record(time.time() - start_time)
+    latency = time.time() - start_time
+    api_timer.record_response(response, latency)
+    
+    picks = parse_response(response, schema)
+    
+    return picks.top, picks.bottom, _response_meta(response, latency)
+
+
+def call_api_for_top_bottom(
+    client: OpenAI,
+    system_prompt: str,
+    user_prompt: str,
+    reasoning_effort: str,
+    k: int = K_TOP_BOTTOM,
+    codes: list[str] | None = None
+) -> tuple[list[str], list[str]]:
+    """
+    Make API call to get top-K and bottom-K selections.
     
-    # Parse response
-    result = json.loads(response.output_text)
+    Args:
+        client: OpenAI client
+        system_prompt: System prompt with persona
+        user_prompt: User prompt with statements
+        reasoning_effort: "minimal", "low", or "medium"
+        k: Expected count for each list
+        codes: Hashes the picks must come from (None = any string)
     
-    top_k = result.get(f"top_{k}", result.get("top_10", []))
-    bottom_k = result.get(f"bottom_{k}", result.get("bottom_10", []))
+    Returns:
+        Tuple of (top_k, bottom_k) lists of hash strings.
     
+    Raises:
+        Exception on API or parsing error.
+    """
+    top_k, bottom_k, _ = request_top_bottom(
+        client, system_prompt, user_prompt, reasoning_effort, k, codes
+    )
     return top_k, bottom_k
 
 
+def call_api_for_repair(
+    client: OpenAI,
+    user_prompt: str,
+    previous_response_id: str,
+    reasoning_effort: str,
+    remaining_codes: list[str] | None = None,
+    n_top_missing: int | None = None,
+    n_bottom_missing: int | None = None
+) -> tuple[list[str], list[str], dict]:
+    """
+    Make a follow-up API call asking only for the missing top/bottom slots.
+    
+    Args:
+        client: OpenAI client
+        user_prompt: Repair prompt from build_repair_prompt
+        previous_response_id: Id of the response being repaired
+        reasoning_effort: "minimal", "low", or "medium"
+        remaining_codes: Unplaced hashes the fills must come from
+        n_top_missing: Number of top slots to fill
+        n_bottom_missing: Number of bottom slots to fill
+    
+    Returns:
+        Tuple of (top_fill, bottom_fill, meta).
+    
+    Raises:
+        Exception on API or parsing error.
+    """
+    schema = top_bottom_schema("top_fill", "bottom_fill", remaining_codes, n_top_missing, n_bottom_missing)
+    start_time = time.time()
+    
+    response = client.responses.create(
+        model=MODEL,
+        previous_response_id=previous_response_id,
+        input=[{"role": "user", "content": user_prompt}],
+        temperature=TEMPERATURE,
+        reasoning={"effort": reasoning_effort},
+        text=schema.text_format,
+    )
+    
+    latency = time.time() - start_time
+    api_timer.record_response(response, latency)
+    
+    fills = parse_response(response, schema)
+    
+    return fills.top, fills.bottom, _response_meta(response, latency)
+
+
+def repair_top_bottom(
+    client: OpenAI,
+    top_k: list[str],
+    bottom_k: list[str],
+    presentation_order: list[str],
+    previous_response_id: str,
+    reasoning_effort: str,
+    problem: str,
+    k: int = K_TOP_BOTTOM,
+    bottom_least_first: bool = False,
+    max_attempts: int = MAX_REPAIR_ATTEMPTS
+) -> tuple[list[str], list[str], list[dict]] | None:
+    """
+    Repair a near-valid top-K/bottom-K output by re-asking only missing slots.
+    
+    The valid portion of the answer is kept (see salvage_top_bottom_k) and the
+    model is asked, in a continuation of the same conversation, to fill the
+    remaining slots from the unplaced codes. Fills rank just after the kept
+    picks: appended to top, and placed on the inner side of bottom.
+    
+    Args:
+        client: OpenAI client
+        top_k: Raw top K output that failed validation
+        bottom_k: Raw bottom K output that failed validation
+        presentation_order: Order of hashes as presented this round
+        previous_response_id: Id of the failed response
+        reasoning_effort: Reasoning effort level
+        problem: Validation error message for the failed output
+        k: Number to select for top/bottom
+        bottom_least_first: True if bottom lists are ordered least preferred first (A*)
+        max_attempts: Maximum number of repair follow-ups
+    
+    Returns:
+        Tuple of (top_k, bottom_k, repair_calls) with the merged lists and
+        per-call metadata, or None if too little of the output survived
+        to be worth repairing.
+    """
+    valid_hashes = set(presentation_order)
+    kept_top, kept_bottom = salvage_top_bottom_k(top_k, bottom_k, valid_hashes, k)
+    
+    if len(kept_top) + len(kept_bottom) < MIN_REPAIR_KEEP_FRACTION * 2 * k:
+        return None
+    
+    repair_calls = []
+    
+    for attempt in range(max_attempts):
+        n_top_missing = k - len(kept_top)
+        n_bottom_missing = k - len(kept_bottom)
+        if n_top_missing == 0 and n_bottom_missing == 0:
+            break
+        
+        placed = set(kept_top) | set(kept_bottom)
+        remaining = [h for h in presentation_order if h not in placed]
+        
+        user_prompt = build_repair_prompt(
+            kept_top, kept_bottom, remaining,
+            n_top_missing, n_bottom_missing, problem, bottom_least_first
+        )
+        
+        try:
+            top_fill, bottom_fill, meta = call_api_for_repair(
+                client, user_prompt, previous_response_id, reasoning_effort,
+                remaining, n_top_missing, n_bottom_missing
+            )
+        except Exception as e:
+            logger.warning(f"Exception on repair attempt {attempt + 1}: {e}")
+            break
+        
+        repair_calls.append(meta)
+        previous_response_id = meta["response_id"]
+        
+        # Accept only fills that are unplaced, unique and within the slot budget
+        remaining_set = set(remaining)
+        new_top = []
+        for h in top_fill:
+            if h in remaining_set and len(new_top) < n_top_missing:
+                remaining_set.discard(h)
+                new_top.append(h)
+        new_bottom = []
+        for h in bottom_fill:
+            if h in remaining_set and len(new_bottom) < n_bottom_missing:
+                remaining_set.discard(h)
+                new_bottom.append(h)
+        
+        kept_top = kept_top + new_top
+        if bottom_least_first:
+            kept_bottom = kept_bottom + new_bottom
+        else:
+            kept_bottom = new_bottom + kept_bottom
+        
+        problem = (
+            f"still missing {k - len(kept_top)} top and "
+            f"{k - len(kept_bottom)} bottom codes"
+        )
+    
+    return kept_top, kept_bottom, repair_calls
+
+
+def _call_cost(meta: dict) -> int:
+    """Billable-at-full-rate tokens of a call (uncached input + output)."""
+    return meta["input_tokens"] - meta["cached_input_tokens"] + meta["output_tokens"]
+
+
+def estimate_repair_savings(full_calls: list[dict], repair_calls: list[dict], repaired: bool) -> dict:
+    """
+    Estimate token and latency savings of local repair for one round.
+    
+    A successful repair is credited with avoiding one full re-ask, priced at
+    the mean of this round's full calls. All repair calls are charged, so a
+    failed repair shows up as a negative saving.
+    
+    Args:
+        full_calls: Metadata of the full top-K/bottom-K calls made this round
+        repair_calls: Metadata of all repair calls made this round
+        repaired: Whether a repair produced the accepted round output
+    
+    Returns:
+        Dict with call counts, repair cost and estimated savings.
+    """
+    if full_calls:
+        full_tokens = sum(_call_cost(c) for c in full_calls) / len(full_calls)
+        full_latency = sum(c["latency"] for c in full_calls) / len(full_calls)
+    else:
+        full_tokens, full_latency = 0.0, 0.0
+    
+    repair_tokens = sum(_call_cost(c) for c in repair_calls)
+    repair_latency = sum(c["latency"] for c in repair_calls)
+    avoided = 1 if repaired else 0
+    
+    return {
+        "n_full_calls": len(full_calls),
+        "n_repair_calls": len(repair_calls),
+        "repaired": repaired,
+        "full_call_tokens": full_tokens,
+        "repair_tokens": repair_tokens,
+        "tokens_saved": avoided * full_tokens - repair_tokens,
+        "latency_saved": avoided * full_latency - repair_latency,
+    }
+
+
 def call_api_for_final_ranking(
     client: OpenAI,
     system_prompt: str,
     user_prompt: str,
-    reasoning_effort: str
+    reasoning_effort: str,
+    codes: list[str] | None = None
 ) -> list[str]:
     """
     Make API call to get final ranking of remaining statements.
@@ -182,6 +478,7 @@ def call_api_for_final_ranking(
         system_prompt: System prompt with persona
         user_prompt: User prompt with statements
         reasoning_effort: "minimal", "low", or "medium"
+        codes: Hashes to rank (the ranking must have one entry per code)
     
     Returns:
         List of hash strings in preference order (most to least preferred).
@@ -189,6 +486,7 @@ def call_api_for_final_ranking(
     Raises:
         Exception on API or parsing error.
     """
+    schema = ranking_schema(codes)
     start_time = time.time()
     
     response = client.responses.create(
@@ -199,15 +497,12 @@ def call_api_for_final_ranking(
         ],
         temperature=TEMPERATURE,
         reasoning={"effort": reasoning_effort},
+        text=schema.text_format,
     )
     
-    api_timer.record(time.time() - start_time)
-    
-    # Parse response
-    result = json.loads(response.output_text)
-    ranking = result.get("ranking", [])
+    api_timer.record_response(response, time.time() - start_time)
     
-    return ranking
+    return parse_response(response, schema)
 
 
 def get_top_bottom_with_retry(
@@ -218,10 +513,16 @@ def get_top_bottom_with_retry(
     presentation_order: list[str],
     reasoning_effort: str,
     k: int = K_TOP_BOTTOM,
-    max_retries: int = MAX_RETRIES
-) -> tuple[list[str], list[str], int, bool]:
+    max_retries: int = MAX_RETRIES,
+    repair: bool = ENABLE_LOCAL_REPAIR,
+    catalog: list[tuple[str, str]] | None = None
+) -> tuple[list[str], list[str], int, bool, dict]:
     """
-    Get top-K/bottom-K with validation and retry logic.
+    Get top-K/bottom-K with validation, local repair and retry logic.
+    
+    Structurally invalid outputs (a few duplicates, overlaps or unknown codes)
+    are repaired in place when enough of the answer survives; degenerate
+    outputs and unrepairable ones fall back to a full retry.
     
     Args:
         client: OpenAI client
@@ -232,42 +533,118 @@ def get_top_bottom_with_retry(
         reasoning_effort: Reasoning effort level
         k: Number to select for top/bottom
         max_retries: Maximum retry attempts
+        repair: Whether to attempt local repair before a full retry
+        catalog: Statement catalog for the prefix-stable layout (None = standard layout)
     
     Returns:
-        Tuple of (top_k, bottom_k, retry_count, is_valid).
+        Tuple of (top_k, bottom_k, retry_count, is_valid, repair_info).
+    """
+    if catalog is not None:
+        system_prompt = build_cached_system_prompt(persona, topic, catalog, RANKING_TASK)
+        user_prompt = build_cached_top_bottom_prompt(presentation_order, k, bottom_least_first=False)
+        extra_orders = [catalog_order(catalog, set(presentation_order))]
+    else:
+        system_prompt = build_system_prompt(persona)
+        user_prompt = build_top_bottom_prompt(topic, statements, k)
+        extra_orders = []
+    
+    return _top_bottom_with_retry(
+        client=client,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        presentation_order=presentation_order,
+        reasoning_effort=reasoning_effort,
+        k=k,
+        max_retries=max_retries,
+        repair=repair,
+        bottom_least_first=False,
+        extra_orders=extra_orders,
+    )
+
+
+def _top_bottom_with_retry(
+    client: OpenAI,
+    system_prompt: str,
+    user_prompt: str,
+    presentation_order: list[str],
+    reasoning_effort: str,
+    k: int,
+    max_retries: int,
+    repair: bool,
+    bottom_least_first: bool,
+    extra_orders: list[list[str]] = ()
+) -> tuple[list[str], list[str], int, bool, dict]:
+    """
+    Shared retry loop for the A and A* top-K/bottom-K rounds.
+    
+    Degeneracy is checked against the presentation order and any extra
+    orders the model saw (e.g. the catalog order of the cached layout).
     """
-    system_prompt = build_system_prompt(persona)
-    user_prompt = build_top_bottom_prompt(topic, statements, k)
     valid_hashes = set(presentation_order)
+    degeneracy_orders = [presentation_order, *extra_orders]
+    
+    def _is_degenerate(top: list[str], bottom: list[str]) -> bool:
+        return any(is_partial_degenerate(top, bottom, order) for order in degeneracy_orders)
     
     top_k, bottom_k = None, None
+    full_calls = []
+    repair_calls = []
+    
+    def _result(attempt: int, is_valid: bool, repaired: bool = False) -> tuple:
+        repair_info = estimate_repair_savings(full_calls, repair_calls, repaired)
+        return top_k or [], bottom_k or [], attempt, is_valid, repair_info
     
     for attempt in range(max_retries + 1):
         try:
-            top_k, bottom_k = call_api_for_top_bottom(
-                client, system_prompt, user_prompt, reasoning_effort, k
+            top_k, bottom_k, meta = request_top_bottom(
+                client, system_prompt, user_prompt, reasoning_effort, k, presentation_order
             )
+            full_calls.append(meta)
+            
+            # Degenerate outputs are never repaired
+            if _is_degenerate(top_k, bottom_k):
+                logger.warning(f"Degenerate output on attempt {attempt + 1}")
+                continue
             
             # Validate structural correctness
             is_valid, error_msg = validate_top_bottom_k(top_k, bottom_k, valid_hashes, k)
             if not is_valid:
+                format_stats.record_failure("top_bottom", error_msg)
                 logger.warning(f"Validation failed on attempt {attempt + 1}: {error_msg}")
-                continue
+                if not repair:
+                    continue
             
-            # Check for degeneracy
-            if is_partial_degenerate(top_k, bottom_k, presentation_order):
-                logger.warning(f"Degenerate output on attempt {attempt + 1}")
-                continue
+                repaired = repair_top_bottom(
+                    client, top_k, bottom_k, presentation_order,
+                    meta["response_id"], reasoning_effort, error_msg,
+                    k=k, bottom_least_first=bottom_least_first,
+                )
+                if repaired is None:
+                    logger.warning(f"Output on attempt {attempt + 1} not repairable, retrying in full")
+                    continue
+                
+                top_k, bottom_k, calls = repaired
+                repair_calls.extend(calls)
+                
+                is_valid, error_msg = validate_top_bottom_k(top_k, bottom_k, valid_hashes, k)
+                if not is_valid:
+                    logger.warning(f"Repair failed on attempt {attempt + 1}: {error_msg}")
+                    continue
+                if _is_degenerate(top_k, bottom_k):
+                    logger.warning(f"Degenerate output after repair on attempt {attempt + 1}")
+                    continue
+                
+                return _result(attempt, True, repaired=True)
             
             # Success!
-            return top_k, bottom_k, attempt, True
+            return _result(attempt, True)
             
         except Exception as e:
             logger.warning(f"Exception on attempt {attempt + 1}: {e}")
     
     # All retries exhausted - return last result (may be invalid)
     logger.error(f"All {max_retries + 1} attempts failed for top-bottom selection")
-    return top_k or [], bottom_k or [], max_retries, False
+    return _result(max_retries, False)
 
 
 def get_final_ranking_with_retry(
@@ -277,7 +654,8 @@ def get_final_ranking_with_retry(
     statements: list[tuple[str, str]],
     presentation_order: list[str],
     reasoning_effort: str,
-    max_retries: int = MAX_RETRIES
+    max_retries: int = MAX_RETRIES,
+    catalog: list[tuple[str, str]] | None = None
 ) -> tuple[list[str], int, bool]:
     """
     Get final ranking with validation and retry logic.
@@ -290,30 +668,38 @@ def get_final_ranking_with_retry(
         presentation_order: Order of hashes as presented
         reasoning_effort: Reasoning effort level
         max_retries: Maximum retry attempts
+        catalog: Statement catalog for the prefix-stable layout (None = standard layout)
     
     Returns:
         Tuple of (ranking, retry_count, is_valid).
     """
-    system_prompt = build_system_prompt(persona)
-    user_prompt = build_final_ranking_prompt(topic, statements)
     valid_hashes = set(presentation_order)
+    if catalog is not None:
+        system_prompt = build_cached_system_prompt(persona, topic, catalog, RANKING_TASK)
+        user_prompt = build_cached_final_ranking_prompt(presentation_order)
+        degeneracy_orders = [presentation_order, catalog_order(catalog, valid_hashes)]
+    else:
+        system_prompt = build_system_prompt(persona)
+        user_prompt = build_final_ranking_prompt(topic, statements)
+        degeneracy_orders = [presentation_order]
     
     ranking = None
     
     for attempt in range(max_retries + 1):
         try:
             ranking = call_api_for_final_ranking(
-                client, system_prompt, user_prompt, reasoning_effort
+                client, system_prompt, user_prompt, reasoning_effort, presentation_order
             )
             
             # Validate structural correctness
             is_valid, error_msg = validate_final_ranking(ranking, valid_hashes)
             if not is_valid:
+                format_stats.record_failure("ranking", error_msg)
                 logger.warning(f"Validation failed on attempt {attempt + 1}: {error_msg}")
                 continue
             
             # Check for degeneracy
-            if is_degenerate(ranking, presentation_order):
+            if any(is_degenerate(ranking, order) for order in degeneracy_orders):
                 logger.warning(f"Degenerate output on attempt {attempt + 1}")
                 continue
             
@@ -335,7 +721,9 @@ def iterative_rank(
     topic: str,
     reasoning_effort: str,
     voter_seed: int,
-    hash_seed: int = HASH_SEED
+    hash_seed: int = HASH_SEED,
+    repair: bool = ENABLE_LOCAL_REPAIR,
+    catalog: list[tuple[str, str]] | None = None
 ) -> dict:
     """
     Build full ranking through 5 rounds of top-K/bottom-K selection.
@@ -351,6 +739,8 @@ def iterative_rank(
         reasoning_effort: "minimal", "low", or "medium"
         voter_seed: Seed for per-voter randomization
         hash_seed: Seed for hash generation
+        repair: Whether to locally repair near-valid top-K/bottom-K outputs
+        catalog: Statement catalog for the prefix-stable layout (None = standard layout)
     
     Returns:
         Dictionary with:
@@ -358,6 +748,7 @@ def iterative_rank(
         - 'round_details': Per-round metadata
         - 'total_retries': Total retries across all rounds
         - 'all_valid': True if all rounds succeeded
+        - 'repair_summary': Repair call counts and estimated savings
     """
     n = len(statements)
     remaining_ids = list(range(n))
@@ -394,13 +785,15 @@ def iterative_rank(
         
         if round_num < N_ROUNDS:
             # Rounds 1-4: Get top 10 and bottom 10
-            top_k_hashes, bottom_k_hashes, retries, is_valid = get_top_bottom_with_retry(
+            top_k_hashes, bottom_k_hashes, retries, is_valid, repair_info = get_top_bottom_with_retry(
                 client=client,
                 persona=persona,
                 topic=topic,
                 statements=round_statements,
                 presentation_order=presentation_order,
                 reasoning_effort=reasoning_effort,
+                repair=repair,
+                catalog=catalog,
             )
             
             round_info['type'] = 'top_bottom'
@@ -408,6 +801,7 @@ def iterative_rank(
             round_info['is_valid'] = is_valid
             round_info['top_k'] = top_k_hashes
             round_info['bottom_k'] = bottom_k_hashes
+            round_info['repair'] = repair_info
             
             total_retries += retries
             if not is_valid:
@@ -434,6 +828,7 @@ def iterative_rank(
                 statements=round_statements,
                 presentation_order=presentation_order,
                 reasoning_effort=reasoning_effort,
+                catalog=catalog,
             )
             
             round_info['type'] = 'final_ranking'
@@ -458,6 +853,27 @@ def iterative_rank(
         'round_details': round_details,
         'total_retries': total_retries,
         'all_valid': all_valid,
+        'repair_summary': summarize_repairs(round_details),
+    }
+
+
+def summarize_repairs(round_details: list[dict]) -> dict:
+    """
+    Sum per-round repair info into totals for a voter.
+    
+    Args:
+        round_details: Round dicts, each optionally carrying a 'repair' entry
+    
+    Returns:
+        Dict with total repair calls, repaired rounds and estimated savings.
+    """
+    repairs = [r['repair'] for r in round_details if r.get('repair')]
+    return {
+        'n_repair_calls': sum(r['n_repair_calls'] for r in repairs),
+        'n_repaired_rounds': sum(1 for r in repairs if r['repaired']),
+        'repair_tokens': sum(r['repair_tokens'] for r in repairs),
+        'tokens_saved': sum(r['tokens_saved'] for r in repairs),
+        'latency_saved': sum(r['latency_saved'] for r in repairs),
     }
 
 
@@ -468,7 +884,9 @@ def rank_voter(
     statements: list[dict],
     topic: str,
     reasoning_effort: str,
-    hash_seed: int = HASH_SEED
+    hash_seed: int = HASH_SEED,
+    repair: bool = ENABLE_LOCAL_REPAIR,
+    catalog: list[tuple[str, str]] | None = None
 ) -> dict:
     """
     Rank statements for a single voter.
@@ -483,6 +901,8 @@ def rank_voter(
         topic: Topic question
         reasoning_effort: Reasoning effort level
         hash_seed: Seed for hash generation
+        repair: Whether to locally repair near-valid top-K/bottom-K outputs
+        catalog: Statement catalog for the prefix-stable layout (None = standard layout)
     
     Returns:
         Result dict from iterative_rank with voter_idx added.
@@ -495,6 +915,8 @@ def rank_voter(
         reasoning_effort=reasoning_effort,
         voter_seed=voter_idx,
         hash_seed=hash_seed,
+        repair=repair,
+        catalog=catalog,
     )
     result['voter_idx'] = voter_idx
     return result
@@ -8,15 +8,18 @@ easier to output the worst statement first rather than "reserving space" for it.
 Key differences from Approach A:
 - Bottom-K prompt: "least preferred first" (most disliked first)
 - Assembly logic: append instead of prepend for bottom rankings
+- Local repair fills bottom slots on the inner (appended) side
 """
 
-import json
+from __future__ import annotations
+
 import logging
 import random
 import time
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from openai import OpenAI
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 from .config import (
     MODEL,
@@ -24,18 +27,25 @@ from .config import (
     K_TOP_BOTTOM,
     N_ROUNDS,
     MAX_RETRIES,
+    ENABLE_LOCAL_REPAIR,
     HASH_SEED,
     SYSTEM_PROMPT_TEMPLATE,
     RANKING_TASK,
     api_timer,
 )
 from .hash_identifiers import id_to_hash, hash_to_id, build_hash_lookup
+from .prompt_layout import (
+    build_cached_system_prompt,
+    build_cached_top_bottom_prompt,
+    build_cached_final_ranking_prompt,
+    catalog_order,
+)
 from .degeneracy_detector import (
-    is_partial_degenerate,
     is_degenerate,
-    validate_top_bottom_k,
     validate_final_ranking,
 )
+from .iterative_ranking import _top_bottom_with_retry, summarize_repairs
+from src.typed_responses import format_stats, parse_response, ranking_schema, top_bottom_schema
 
 logger = logging.getLogger(__name__)
 
@@ -128,7 +138,8 @@ def call_api_for_top_bottom(
     system_prompt: str,
     user_prompt: str,
     reasoning_effort: str,
-    k: int = K_TOP_BOTTOM
+    k: int = K_TOP_BOTTOM,
+    codes: list[str] | None = None
 ) -> tuple[list[str], list[str]]:
     """
     Make API call to get top-K and bottom-K selections.
@@ -139,6 +150,7 @@ def call_api_for_top_bottom(
         user_prompt: User prompt with statements
         reasoning_effort: "minimal", "low", or "medium"
         k: Expected count for each list
+        codes: Hashes the picks must come from (None = any string)
     
     Returns:
         Tuple of (top_k, bottom_k) lists of hash strings.
@@ -146,6 +158,7 @@ def call_api_for_top_bottom(
     Raises:
         Exception on API or parsing error.
     """
+    schema = top_bottom_schema(f"top_{k}", f"bottom_{k}", codes, k, k)
     start_time = time.time()
     
     response = client.responses.create(
@@ -156,24 +169,22 @@ def call_api_for_top_bottom(
         ],
         temperature=TEMPERATURE,
         reasoning={"effort": reasoning_effort},
+        text=schema.text_format,
     )
     
-    api_timer.record(time.time() - start_time)
+    api_timer.record_response(response, time.time() - start_time)
     
-    # Parse response
-    result = json.loads(response.output_text)
+    picks = parse_response(response, schema)
     
-    top_k = result.get(f"top_{k}", result.get("top_10", []))
-    bottom_k = result.get(f"bottom_{k}", result.get("bottom_10", []))
-    
-    return top_k, bottom_k
+    return picks.top, picks.bottom
 
 
 def call_api_for_final_ranking(
     client: OpenAI,
     system_prompt: str,
     user_prompt: str,
-    reasoning_effort: str
+    reasoning_effort: str,
+    codes: list[str] | None = None
 ) -> list[str]:
     """
     Make API call to get final ranking of remaining statements.
@@ -183,6 +194,7 @@ def call_api_for_final_ranking(
         system_prompt: System prompt with persona
         user_prompt: User prompt with statements
         reasoning_effort: "minimal", "low", or "medium"
+        codes: Hashes to rank (the ranking must have one entry per code)
     
     Returns:
         List of hash strings in preference order (most to least preferred).
@@ -190,6 +202,7 @@ def call_api_for_final_ranking(
     Raises:
         Exception on API or parsing error.
     """
+    schema = ranking_schema(codes)
     start_time = time.time()
     
     response = client.responses.create(
@@ -200,15 +213,12 @@ def call_api_for_final_ranking(
         ],
         temperature=TEMPERATURE,
         reasoning={"effort": reasoning_effort},
+        text=schema.text_format,
     )
     
-    api_timer.record(time.time() - start_time)
+    api_timer.record_response(response, time.time() - start_time)
     
-    # Parse response
-    result = json.loads(response.output_text)
-    ranking = result.get("ranking", [])
-    
-    return ranking
+    return parse_response(response, schema)
 
 
 def get_top_bottom_with_retry(
@@ -219,10 +229,12 @@ def get_top_bottom_with_retry(
     presentation_order: list[str],
     reasoning_effort: str,
     k: int = K_TOP_BOTTOM,
-    max_retries: int = MAX_RETRIES
-) -> tuple[list[str], list[str], int, bool]:
+    max_retries: int = MAX_RETRIES,
+    repair: bool = ENABLE_LOCAL_REPAIR,
+    catalog: list[tuple[str, str]] | None = None
+) -> tuple[list[str], list[str], int, bool, dict]:
     """
-    Get top-K/bottom-K with validation and retry logic.
+    Get top-K/bottom-K with validation, local repair and retry logic.
     
     Args:
         client: OpenAI client
@@ -233,42 +245,33 @@ def get_top_bottom_with_retry(
         reasoning_effort: Reasoning effort level
         k: Number to select for top/bottom
         max_retries: Maximum retry attempts
+        repair: Whether to attempt local repair before a full retry
+        catalog: Statement catalog for the prefix-stable layout (None = standard layout)
     
     Returns:
-        Tuple of (top_k, bottom_k, retry_count, is_valid).
+        Tuple of (top_k, bottom_k, retry_count, is_valid, repair_info).
     """
-    system_prompt = build_system_prompt(persona)
-    user_prompt = build_top_bottom_prompt(topic, statements, k)
-    valid_hashes = set(presentation_order)
-    
-    top_k, bottom_k = None, None
-    
-    for attempt in range(max_retries + 1):
-        try:
-            top_k, bottom_k = call_api_for_top_bottom(
-                client, system_prompt, user_prompt, reasoning_effort, k
-            )
-            
-            # Validate structural correctness
-            is_valid, error_msg = validate_top_bottom_k(top_k, bottom_k, valid_hashes, k)
-            if not is_valid:
-                logger.warning(f"Validation failed on attempt {attempt + 1}: {error_msg}")
-                continue
-            
-            # Check for degeneracy
-            if is_partial_degenerate(top_k, bottom_k, presentation_order):
-                logger.warning(f"Degenerate output on attempt {attempt + 1}")
-                continue
-            
-            # Success!
-            return top_k, bottom_k, attempt, True
-            
-        except Exception as e:
-            logger.warning(f"Exception on attempt {attempt + 1}: {e}")
-    
-    # All retries exhausted - return last result (may be invalid)
-    logger.error(f"All {max_retries + 1} attempts failed for top-bottom selection")
-    return top_k or [], bottom_k or [], max_retries, False
+    if catalog is not None:
+        system_prompt = build_cached_system_prompt(persona, topic, catalog, RANKING_TASK)
+        user_prompt = build_cached_top_bottom_prompt(presentation_order, k, bottom_least_first=True)
+        extra_orders = [catalog_order(catalog, set(presentation_order))]
+    else:
+        system_prompt = build_system_prompt(persona)
+        user_prompt = build_top_bottom_prompt(topic, statements, k)
+        extra_orders = []
+    
+    return _top_bottom_with_retry(
+        client=client,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        presentation_order=presentation_order,
+        reasoning_effort=reasoning_effort,
+        k=k,
+        max_retries=max_retries,
+        repair=repair,
+        bottom_least_first=True,
+        extra_orders=extra_orders,
+    )
 
 
 def get_final_ranking_with_retry(
@@ -278,7 +281,8 @@ def get_final_ranking_with_retry(
     statements: list[tuple[str, str]],
     presentation_order: list[str],
     reasoning_effort: str,
-    max_retries: int = MAX_RETRIES
+    max_retries: int = MAX_RETRIES,
+    catalog: list[tuple[str, str]] | None = None
 ) -> tuple[list[str], int, bool]:
     """
     Get final ranking with validation and retry logic.
@@ -291,30 +295,38 @@ def get_final_ranking_with_retry(
         presentation_order: Order of hashes as presented
         reasoning_effort: Reasoning effort level
         max_retries: Maximum retry attempts
+        catalog: Statement catalog for the prefix-stable layout (None = standard layout)
     
     Returns:
         Tuple of (ranking, retry_count, is_valid).
     """
-    system_prompt = build_system_prompt(persona)
-    user_prompt = build_final_ranking_prompt(topic, statements)
     valid_hashes = set(presentation_order)
+    if catalog is not None:
+        system_prompt = build_cached_system_prompt(persona, topic, catalog, RANKING_TASK)
+        user_prompt = build_cached_final_ranking_prompt(presentation_order)
+        degeneracy_orders = [presentation_order, catalog_order(catalog, valid_hashes)]
+    else:
+        system_prompt = build_system_prompt(persona)
+        user_prompt = build_final_ranking_prompt(topic, statements)
+        degeneracy_orders = [presentation_order]
     
     ranking = None
     
     for attempt in range(max_retries + 1):
         try:
             ranking = call_api_for_final_ranking(
-                client, system_prompt, user_prompt, reasoning_effort
+                client, system_prompt, user_prompt, reasoning_effort, presentation_order
             )
             
             # Validate structural correctness
             is_valid, error_msg = validate_final_ranking(ranking, valid_hashes)
             if not is_valid:
+                format_stats.record_failure("ranking", error_msg)
                 logger.warning(f"Validation failed on attempt {attempt + 1}: {error_msg}")
                 continue
             
             # Check for degeneracy
-            if is_degenerate(ranking, presentation_order):
+            if any(is_degenerate(ranking, order) for order in degeneracy_orders):
                 logger.warning(f"Degenerate output on attempt {attempt + 1}")
                 continue
             
@@ -336,7 +348,9 @@ def iterative_rank(
     topic: str,
     reasoning_effort: str,
     voter_seed: int,
-    hash_seed: int = HASH_SEED
+    hash_seed: int = HASH_SEED,
+    repair: bool = ENABLE_LOCAL_REPAIR,
+    catalog: list[tuple[str, str]] | None = None
 ) -> dict:
     """
     Build full ranking through 5 rounds of top-K/bottom-K selection (A* variant).
@@ -355,6 +369,8 @@ def iterative_rank(
         reasoning_effort: "minimal", "low", or "medium"
         voter_seed: Seed for per-voter randomization
         hash_seed: Seed for hash generation
+        repair: Whether to locally repair near-valid top-K/bottom-K outputs
+        catalog: Statement catalog for the prefix-stable layout (None = standard layout)
     
     Returns:
         Dictionary with:
@@ -362,6 +378,7 @@ def iterative_rank(
         - 'round_details': Per-round metadata
         - 'total_retries': Total retries across all rounds
         - 'all_valid': True if all rounds succeeded
+        - 'repair_summary': Repair call counts and estimated savings
     """
     n = len(statements)
     remaining_ids = list(range(n))
@@ -398,13 +415,15 @@ def iterative_rank(
         
         if round_num < N_ROUNDS:
             # Rounds 1-4: Get top 10 and bottom 10
-            top_k_hashes, bottom_k_hashes, retries, is_valid = get_top_bottom_with_retry(
+            top_k_hashes, bottom_k_hashes, retries, is_valid, repair_info = get_top_bottom_with_retry(
                 client=client,
                 persona=persona,
                 topic=topic,
                 statements=round_statements,
                 presentation_order=presentation_order,
                 reasoning_effort=reasoning_effort,
+                repair=repair,
+                catalog=catalog,
             )
             
             round_info['type'] = 'top_bottom'
@@ -412,6 +431,7 @@ def iterative_rank(
             round_info['is_valid'] = is_valid
             round_info['top_k'] = top_k_hashes
             round_info['bottom_k'] = bottom_k_hashes
+            round_info['repair'] = repair_info
             
             total_retries += retries
             if not is_valid:
@@ -439,6 +459,7 @@ def iterative_rank(
                 statements=round_statements,
                 presentation_order=presentation_order,
                 reasoning_effort=reasoning_effort,
+                catalog=catalog,
             )
             
             round_info['type'] = 'final_ranking'
@@ -463,6 +484,7 @@ def iterative_rank(
         'round_details': round_details,
         'total_retries': total_retries,
         'all_valid': all_valid,
+        'repair_summary': summarize_repairs(round_details),
     }
 
 
@@ -473,7 +495,9 @@ def rank_voter(
     statements: list[dict],
     topic: str,
     reasoning_effort: str,
-    hash_seed: int = HASH_SEED
+    hash_seed: int = HASH_SEED,
+    repair: bool = ENABLE_LOCAL_REPAIR,
+    catalog: list[tuple[str, str]] | None = None
 ) -> dict:
     """
     Rank statements for a single voter (A* variant).
@@ -488,6 +512,8 @@ def rank_voter(
         topic: Topic question
         reasoning_effort: Reasoning effort level
         hash_seed: Seed for hash generation
+        repair: Whether to locally repair near-valid top-K/bottom-K outputs
+        catalog: Statement catalog for the prefix-stable layout (None = standard layout)
     
     Returns:
         Result dict from iterative_rank with voter_idx added.
@@ -500,6 +526,8 @@ def rank_voter(
         reasoning_effort=reasoning_effort,
         voter_seed=voter_idx,
         hash_seed=hash_seed,
+        repair=repair,
+        catalog=catalog,
     )
     result['voter_idx'] = voter_idx
     return result
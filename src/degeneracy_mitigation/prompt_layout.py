@@ -0,0 +1,190 @@
+"""
+Prefix-stable prompt layout for the iterative and scoring rankers.
+
+The standard layout puts the persona in the system prompt and a freshly
+shuffled statement list in every user prompt, so no two calls share a
+prefix and provider prompt caching never applies. The cached layout
+instead sends:
+
+- System prompt: topic + fixed, code-keyed statement catalog (identical for
+  every voter) followed by the persona (identical for all of a voter's rounds)
+- User prompt: a short per-round suffix with the shuffled presentation order
+  of the remaining codes and the task instructions
+
+Per-round shuffling is kept (it lives in the suffix), so degeneracy is still
+checked against the presentation order; catalog order is checked as well
+since the model now also sees the statements in that fixed order.
+"""
+
+from .config import (
+    K_TOP_BOTTOM,
+    HASH_SEED,
+    CACHED_SYSTEM_PROMPT_TEMPLATE,
+)
+from .hash_identifiers import id_to_hash
+
+
+def build_statement_catalog(
+    statements: list[dict],
+    hash_seed: int = HASH_SEED
+) -> list[tuple[str, str]]:
+    """
+    Build the fixed statement catalog shared by every voter and round.
+    
+    Entries are sorted by hash code, so catalog position is unrelated to
+    both the statement index and any voter's presentation order.
+    
+    Args:
+        statements: List of statement dicts with 'statement' key
+        hash_seed: Seed for hash generation
+    
+    Returns:
+        List of (hash, text) tuples in catalog order.
+    """
+    catalog = [
+        (id_to_hash(sid, hash_seed), stmt['statement'])
+        for sid, stmt in enumerate(statements)
+    ]
+    return sorted(catalog, key=lambda entry: entry[0])
+
+
+def catalog_order(catalog: list[tuple[str, str]], codes: set[str]) -> list[str]:
+    """Return the given codes in catalog order (for degeneracy checks)."""
+    return [h for h, _ in catalog if h in codes]
+
+
+def build_cached_system_prompt(
+    persona: str,
+    topic: str,
+    catalog: list[tuple[str, str]],
+    task_description: str
+) -> str:
+    """
+    Build the prefix-stable system prompt (catalog first, then persona).
+    
+    Args:
+        persona: Persona string
+        topic: The topic question
+        catalog: Statement catalog from build_statement_catalog
+        task_description: RANKING_TASK or SCORING_TASK
+    
+    Returns:
+        The system prompt string.
+    """
+    catalog_lines = "\n".join(f"{h}: \"{text}\"" for h, text in catalog)
+    return CACHED_SYSTEM_PROMPT_TEMPLATE.format(
+        topic=topic,
+        n=len(catalog),
+        catalog=catalog_lines,
+        persona=persona,
+        task_description=task_description,
+    )
+
+
+def build_cached_top_bottom_prompt(
+    presentation_order: list[str],
+    k: int = K_TOP_BOTTOM,
+    bottom_least_first: bool = False
+) -> str:
+    """
+    Build the per-round suffix for top-K/bottom-K selection.
+    
+    Args:
+        presentation_order: Remaining codes, shuffled for this round
+        k: Number to select for top and bottom
+        bottom_least_first: True for the A* variant ("least preferred first")
+    
+    Returns:
+        The user prompt string.
+    """
+    n = len(presentation_order)
+    bottom_order = "least preferred first" if bottom_least_first else "least preferred last"
+    
+    prompt = f"""Consider ONLY these {n} statements from the catalog:
+{", ".join(presentation_order)}
+
+From these {n} statements, identify:
+1. Your TOP {k} most preferred (in order, most preferred first)
+2. Your BOTTOM {k} least preferred (in order, {bottom_order})
+
+IMPORTANT: Do NOT simply list codes in the order they appear above or in the catalog.
+Your preferences should reflect your persona's values and background.
+
+Return JSON: {{"top_{k}": ["code1", "code2", ...], "bottom_{k}": ["code1", "code2", ...]}}"""
+    
+    return prompt
+
+
+def build_cached_final_ranking_prompt(presentation_order: list[str]) -> str:
+    """
+    Build the per-round suffix for the final round (rank all remaining).
+    
+    Args:
+        presentation_order: Remaining codes, shuffled for this round
+    
+    Returns:
+        The user prompt string.
+    """
+    n = len(presentation_order)
+    
+    prompt = f"""Consider ONLY these {n} statements from the catalog:
+{", ".join(presentation_order)}
+
+Rank ALL of these statements from most to least preferred.
+
+IMPORTANT: Do NOT simply list codes in the order they appear above or in the catalog.
+Your preferences should reflect your persona's values and background.
+
+Return JSON: {{"ranking": ["most_preferred", "second", ..., "least_preferred"]}}"""
+    
+    return prompt
+
+
+def build_cached_scoring_prompt(presentation_order: list[str]) -> str:
+    """
+    Build the per-voter suffix for scoring all statements.
+    
+    Args:
+        presentation_order: All codes, shuffled for this voter
+    
+    Returns:
+        The user prompt string.
+    """
+    prompt = f"""Score each of these {len(presentation_order)} catalog statements, in this order:
+{", ".join(presentation_order)}
+
+Score each statement based on how much you agree with it:
+- +100 = strongly agree/support
+- 0 = neutral
+- -100 = strongly disagree/oppose
+
+IMPORTANT:
+- Do NOT output duplicate scores. Each statement must have a unique score.
+- Decimal points are allowed if necessary (e.g., 75.5).
+
+Return JSON: {{"hash1": score1, "hash2": score2, ...}}"""
+    
+    return prompt
+
+
+def build_cached_dedup_prompt(codes: list[str]) -> str:
+    """
+    Build the suffix for re-scoring catalog statements with duplicate scores.
+    
+    Args:
+        codes: Codes that had duplicate scores
+    
+    Returns:
+        The user prompt string.
+    """
+    prompt = f"""The following catalog statements previously received the same score.
+Please re-score them with UNIQUE scores to differentiate your preference.
+
+{", ".join(codes)}
+
+Use the same scale (-100 to +100, decimals allowed).
+Each statement must have a unique score.
+
+Return JSON: {{"hash1": score1, "hash2": score2, ...}}"""
+    
+    return prompt
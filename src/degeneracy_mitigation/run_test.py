@@ -5,6 +5,8 @@ Run either Approach A (iterative ranking) or Approach B (scoring)
 across reasoning effort levels.
 """
 
+from __future__ import annotations
+
 import argparse
 import json
 import logging
@@ -13,10 +15,12 @@ import sys
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
-from openai import OpenAI
 from tqdm import tqdm
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 from .config import (
     MODEL,
@@ -33,11 +37,15 @@ from .config import (
     TOPIC_SLUGS,
     TOPIC_QUESTIONS,
     HASH_SEED,
+    ENABLE_LOCAL_REPAIR,
+    PROMPT_LAYOUTS,
     api_timer,
 )
 from .iterative_ranking import rank_voter
 from .iterative_ranking_star import rank_voter as rank_voter_star
 from .scoring_ranking import score_voter
+from .prompt_layout import build_statement_catalog
+from src.typed_responses import format_stats
 
 # Configure logging
 logging.basicConfig(
@@ -128,6 +136,34 @@ def load_voters_for_rep(topic: str, rep: int, personas: list[str]) -> list[str]:
     return [personas[i] for i in indices]
 
 
+def aggregate_repair_stats(results: list[dict]) -> dict:
+    """
+    Sum per-voter local repair summaries into run-level statistics.
+    
+    Args:
+        results: Per-voter result dicts from rank_voter
+    
+    Returns:
+        Dict with total repair calls, repaired rounds and estimated savings.
+    """
+    summaries = [r['repair_summary'] for r in results if r.get('repair_summary')]
+    totals = {
+        'n_repair_calls': sum(s['n_repair_calls'] for s in summaries),
+        'n_repaired_rounds': sum(s['n_repaired_rounds'] for s in summaries),
+        'repair_tokens': sum(s['repair_tokens'] for s in summaries),
+        'tokens_saved': sum(s['tokens_saved'] for s in summaries),
+        'latency_saved': sum(s['latency_saved'] for s in summaries),
+    }
+    # Per-round view: a voter has N_ROUNDS - 1 top/bottom rounds
+    n_rounds = sum(
+        1 for r in results for rd in r.get('round_details', []) if 'repair' in rd
+    )
+    totals['n_top_bottom_rounds'] = n_rounds
+    totals['tokens_saved_per_round'] = totals['tokens_saved'] / n_rounds if n_rounds else 0
+    totals['latency_saved_per_round'] = totals['latency_saved'] / n_rounds if n_rounds else 0
+    return totals
+
+
 def run_approach_a(
     client: OpenAI,
     voters: list[str],
@@ -135,7 +171,9 @@ def run_approach_a(
     topic_question: str,
     reasoning_effort: str,
     output_dir: Path,
-    max_workers: int = MAX_WORKERS
+    max_workers: int = MAX_WORKERS,
+    repair: bool = ENABLE_LOCAL_REPAIR,
+    catalog: list[tuple[str, str]] | None = None
 ) -> dict:
     """
     Run Approach A (iterative ranking) for all voters.
@@ -148,6 +186,8 @@ def run_approach_a(
         reasoning_effort: Reasoning effort level
         output_dir: Directory to save results
         max_workers: Maximum parallel workers
+        repair: Whether to locally repair near-valid top-K/bottom-K outputs
+        catalog: Statement catalog for the prefix-stable layout (None = standard layout)
     
     Returns:
         Statistics dictionary.
@@ -169,6 +209,8 @@ def run_approach_a(
             topic=topic_question,
             reasoning_effort=reasoning_effort,
             hash_seed=HASH_SEED,
+            repair=repair,
+            catalog=catalog,
         )
     
     # Run in parallel
@@ -214,6 +256,7 @@ def run_approach_a(
     
     stats = {
         'approach': 'A',
+        'layout': 'cached' if catalog is not None else 'standard',
         'reasoning_effort': reasoning_effort,
         'n_voters': len(voters),
         'n_statements': len(statements),
@@ -222,7 +265,9 @@ def run_approach_a(
         'total_retries': total_retries,
         'voters_with_retries': voters_with_retries,
         'retry_distribution': retry_dist,
+        'repair_stats': aggregate_repair_stats(results),
         'api_stats': api_timer.get_stats(),
+        'format_stats': format_stats.get_stats(),
     }
     
     # Save results
@@ -245,6 +290,8 @@ def run_approach_a(
     logger.info(f"Results saved to {output_dir}")
     logger.info(f"  Valid: {valid_count}/{len(voters)}")
     logger.info(f"  Total retries: {total_retries}")
+    logger.info(f"  Repaired rounds: {stats['repair_stats']['n_repaired_rounds']}, "
+                f"est. tokens saved: {stats['repair_stats']['tokens_saved']:.0f}")
     
     return stats
 
@@ -256,7 +303,9 @@ def run_approach_a_star(
     topic_question: str,
     reasoning_effort: str,
     output_dir: Path,
-    max_workers: int = MAX_WORKERS
+    max_workers: int = MAX_WORKERS,
+    repair: bool = ENABLE_LOCAL_REPAIR,
+    catalog: list[tuple[str, str]] | None = None
 ) -> dict:
     """
     Run Approach A* (iterative ranking with "least preferred first" for bottom-K).
@@ -273,6 +322,8 @@ def run_approach_a_star(
         reasoning_effort: Reasoning effort level
         output_dir: Directory to save results
         max_workers: Maximum parallel workers
+        repair: Whether to locally repair near-valid top-K/bottom-K outputs
+        catalog: Statement catalog for the prefix-stable layout (None = standard layout)
     
     Returns:
         Statistics dictionary.
@@ -294,6 +345,8 @@ def run_approach_a_star(
             topic=topic_question,
             reasoning_effort=reasoning_effort,
             hash_seed=HASH_SEED,
+            repair=repair,
+            catalog=catalog,
         )
     
     # Run in parallel
@@ -339,6 +392,7 @@ def run_approach_a_star(
     
     stats = {
         'approach': 'A*',
+        'layout': 'cached' if catalog is not None else 'standard',
         'reasoning_effort': reasoning_effort,
         'n_voters': len(voters),
         'n_statements': len(statements),
@@ -347,7 +401,9 @@ def run_approach_a_star(
         'total_retries': total_retries,
         'voters_with_retries': voters_with_retries,
         'retry_distribution': retry_dist,
+        'repair_stats': aggregate_repair_stats(results),
         'api_stats': api_timer.get_stats(),
+        'format_stats': format_stats.get_stats(),
     }
     
     # Save results
@@ -370,6 +426,8 @@ def run_approach_a_star(
     logger.info(f"Results saved to {output_dir}")
     logger.info(f"  Valid: {valid_count}/{len(voters)}")
     logger.info(f"  Total retries: {total_retries}")
+    logger.info(f"  Repaired rounds: {stats['repair_stats']['n_repaired_rounds']}, "
+                f"est. tokens saved: {stats['repair_stats']['tokens_saved']:.0f}")
     
     return stats
 
@@ -381,7 +439,8 @@ def run_approach_b(
     topic_question: str,
     reasoning_effort: str,
     output_dir: Path,
-    max_workers: int = MAX_WORKERS
+    max_workers: int = MAX_WORKERS,
+    catalog: list[tuple[str, str]] | None = None
 ) -> dict:
     """
     Run Approach B (scoring) for all voters.
@@ -394,6 +453,7 @@ def run_approach_b(
         reasoning_effort: Reasoning effort level
         output_dir: Directory to save results
         max_workers: Maximum parallel workers
+        catalog: Statement catalog for the prefix-stable layout (None = standard layout)
     
     Returns:
         Statistics dictionary.
@@ -414,6 +474,7 @@ def run_approach_b(
             topic=topic_question,
             reasoning_effort=reasoning_effort,
             hash_seed=HASH_SEED,
+            catalog=catalog,
         )
     
     # Run in parallel
@@ -455,6 +516,7 @@ def run_approach_b(
     
     stats = {
         'approach': 'B',
+        'layout': 'cached' if catalog is not None else 'standard',
         'reasoning_effort': reasoning_effort,
         'n_voters': len(voters),
         'n_statements': len(statements),
@@ -463,6 +525,7 @@ def run_approach_b(
         'total_dedup_rounds': total_dedup_rounds,
         'voters_needing_dedup': voters_needing_dedup,
         'api_stats': api_timer.get_stats(),
+        'format_stats': format_stats.get_stats(),
     }
     
     # Save results
@@ -518,6 +581,18 @@ def main():
         default=MAX_WORKERS,
         help=f'Maximum parallel workers (default: {MAX_WORKERS})'
     )
+    parser.add_argument(
+        '--no-repair',
+        action='store_true',
+        help='Disable local repair of near-valid top-K/bottom-K outputs (always re-ask the full round)'
+    )
+    parser.add_argument(
+        '--layout',
+        choices=PROMPT_LAYOUTS,
+        default='standard',
+        help='Prompt layout: standard (persona + shuffled statements per call) or '
+             'cached (stable catalog/persona prefix, short per-round suffix)'
+    )
     parser.add_argument(
         '--output-dir', '-o',
         type=Path,
@@ -536,6 +611,7 @@ def main():
         logger.error("OPENAI_API_KEY not found in environment")
         sys.exit(1)
     
+    from openai import OpenAI
     client = OpenAI(api_key=api_key)
     
     # Load data
@@ -552,6 +628,10 @@ def main():
     
     topic_question = TOPIC_QUESTIONS.get(args.topic, args.topic)
     
+    # Prefix-stable layout: one catalog shared by every voter and approach
+    catalog = build_statement_catalog(statements, HASH_SEED) if args.layout == 'cached' else None
+    layout_suffix = '_cached' if args.layout == 'cached' else ''
+    
     # Determine which reasoning efforts to test
     if args.reasoning_effort == 'all':
         efforts = REASONING_EFFORTS
@@ -568,9 +648,10 @@ def main():
     
     for effort in efforts:
         api_timer.reset()  # Reset timer for each condition
+        format_stats.reset()
         
         if run_ranking:
-            output_dir = args.output_dir / 'approach_a' / effort
+            output_dir = args.output_dir / f'approach_a{layout_suffix}' / effort
             stats = run_approach_a(
                 client=client,
                 voters=voters,
@@ -579,12 +660,15 @@ def main():
                 reasoning_effort=effort,
                 output_dir=output_dir,
                 max_workers=args.max_workers,
+                repair=not args.no_repair,
+                catalog=catalog,
             )
             all_stats.append(stats)
         
         if run_ranking_star:
             api_timer.reset()
-            output_dir = args.output_dir / 'approach_a_star' / effort
+            format_stats.reset()
+            output_dir = args.output_dir / f'approach_a_star{layout_suffix}' / effort
             stats = run_approach_a_star(
                 client=client,
                 voters=voters,
@@ -593,12 +677,15 @@ def main():
                 reasoning_effort=effort,
                 output_dir=output_dir,
                 max_workers=args.max_workers,
+                repair=not args.no_repair,
+                catalog=catalog,
             )
             all_stats.append(stats)
         
         if run_scoring:
             api_timer.reset()
-            output_dir = args.output_dir / 'approach_b' / effort
+            format_stats.reset()
+            output_dir = args.output_dir / f'approach_b{layout_suffix}' / effort
             stats = run_approach_b(
                 client=client,
                 voters=voters,
@@ -607,16 +694,18 @@ def main():
                 reasoning_effort=effort,
                 output_dir=output_dir,
                 max_workers=args.max_workers,
+                catalog=catalog,
             )
             all_stats.append(stats)
     
     # Save summary
-    summary_path = args.output_dir / 'summary.json'
+    summary_path = args.output_dir / f'summary{layout_suffix}.json'
     with open(summary_path, 'w') as f:
         json.dump({
             'timestamp': datetime.now().isoformat(),
             'topic': args.topic,
             'rep': args.rep,
+            'layout': args.layout,
             'n_voters': len(voters),
             'n_statements': len(statements),
             'stats': all_stats,
@@ -12,14 +12,16 @@ Key features:
 - Iterative dedup for any duplicate scores
 """
 
-import json
+from __future__ import annotations
+
 import logging
 import random
 import time
 from collections import Counter
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from openai import OpenAI
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 from .config import (
     MODEL,
@@ -31,7 +33,13 @@ from .config import (
     api_timer,
 )
 from .hash_identifiers import id_to_hash, build_hash_lookup
+from .prompt_layout import (
+    build_cached_system_prompt,
+    build_cached_scoring_prompt,
+    build_cached_dedup_prompt,
+)
 from .degeneracy_detector import validate_scores
+from src.typed_responses import format_stats, parse_response, scores_schema
 
 logger = logging.getLogger(__name__)
 
@@ -114,16 +122,20 @@ def call_api_for_scores(
     client: OpenAI,
     system_prompt: str,
     user_prompt: str,
-    reasoning_effort: str
+    reasoning_effort: str,
+    codes: list[str]
 ) -> dict[str, float]:
     """
     Make API call to get scores for statements.
     
+    The response is constrained to a score for exactly the given codes.
+    
     Args:
         client: OpenAI client
         system_prompt: System prompt with persona
         user_prompt: User prompt with statements
         reasoning_effort: "minimal", "low", or "medium"
+        codes: Hashes of the statements to score
     
     Returns:
         Dictionary mapping hash to score.
@@ -131,6 +143,7 @@ def call_api_for_scores(
     Raises:
         Exception on API or parsing error.
     """
+    schema = scores_schema(codes)
     start_time = time.time()
     
     response = client.responses.create(
@@ -141,17 +154,12 @@ def call_api_for_scores(
         ],
         temperature=TEMPERATURE,
         reasoning={"effort": reasoning_effort},
+        text=schema.text_format,
     )
     
-    api_timer.record(time.time() - start_time)
-    
-    # Parse response
-    result = json.loads(response.output_text)
-    
-    # Convert all values to float
-    scores = {k: float(v) for k, v in result.items()}
+    api_timer.record_response(response, time.time() - start_time)
     
-    return scores
+    return parse_response(response, schema)
 
 
 def find_duplicate_scores(scores: dict[str, float]) -> list[str]:
@@ -176,7 +184,8 @@ def score_with_dedup(
     topic: str,
     reasoning_effort: str,
     voter_seed: int,
-    hash_seed: int = HASH_SEED
+    hash_seed: int = HASH_SEED,
+    catalog: list[tuple[str, str]] | None = None
 ) -> dict:
     """
     Score statements, then resolve any duplicates with follow-up rounds.
@@ -191,6 +200,7 @@ def score_with_dedup(
         reasoning_effort: "minimal", "low", or "medium"
         voter_seed: Seed for per-voter randomization
         hash_seed: Seed for hash generation
+        catalog: Statement catalog for the prefix-stable layout (None = standard layout)
     
     Returns:
         Dictionary with:
@@ -217,20 +227,29 @@ def score_with_dedup(
     ]
     valid_hashes = set(h for h, _ in stmt_with_hashes)
     
-    system_prompt = build_system_prompt(persona)
+    if catalog is not None:
+        system_prompt = build_cached_system_prompt(persona, topic, catalog, SCORING_TASK)
+    else:
+        system_prompt = build_system_prompt(persona)
     
     round_details = []
     dedup_rounds = 0
     
     # Round 1: Score all statements
-    user_prompt = build_scoring_prompt(topic, stmt_with_hashes)
+    if catalog is not None:
+        user_prompt = build_cached_scoring_prompt([h for h, _ in stmt_with_hashes])
+    else:
+        user_prompt = build_scoring_prompt(topic, stmt_with_hashes)
     
     try:
-        scores = call_api_for_scores(client, system_prompt, user_prompt, reasoning_effort)
+        scores = call_api_for_scores(
+            client, system_prompt, user_prompt, reasoning_effort, [h for h, _ in stmt_with_hashes]
+        )
         
         # Validate scores
         is_valid, error_msg = validate_scores(scores, valid_hashes)
         if not is_valid:
+            format_stats.record_failure("scores", error_msg)
             logger.warning(f"Initial scoring validation failed: {error_msg}")
             # Try to continue anyway if we have most scores
         
@@ -265,10 +284,15 @@ def score_with_dedup(
         dup_statements = [(h, text) for h, text in stmt_with_hashes if h in duplicates]
         
         # Make dedup API call
-        dedup_prompt = build_dedup_prompt(dup_statements)
+        if catalog is not None:
+            dedup_prompt = build_cached_dedup_prompt([h for h, _ in dup_statements])
+        else:
+            dedup_prompt = build_dedup_prompt(dup_statements)
         
         try:
-            new_scores = call_api_for_scores(client, system_prompt, dedup_prompt, reasoning_effort)
+            new_scores = call_api_for_scores(
+                client, system_prompt, dedup_prompt, reasoning_effort, [h for h, _ in dup_statements]
+            )
             
             # Update scores
             for h, score in new_scores.items():
@@ -331,7 +355,8 @@ def score_voter(
     statements: list[dict],
     topic: str,
     reasoning_effort: str,
-    hash_seed: int = HASH_SEED
+    hash_seed: int = HASH_SEED,
+    catalog: list[tuple[str, str]] | None = None
 ) -> dict:
     """
     Score statements for a single voter.
@@ -346,6 +371,7 @@ def score_voter(
         topic: Topic question
         reasoning_effort: Reasoning effort level
         hash_seed: Seed for hash generation
+        catalog: Statement catalog for the prefix-stable layout (None = standard layout)
     
     Returns:
         Result dict from score_with_dedup with voter_idx added.
@@ -358,6 +384,7 @@ def score_voter(
         reasoning_effort=reasoning_effort,
         voter_seed=voter_idx,
         hash_seed=hash_seed,
+        catalog=catalog,
     )
     result['voter_idx'] = voter_idx
     return result
@@ -0,0 +1,271 @@
+"""
+Incremental, parallel figure rendering.
+
+Plotting entry points used to re-render every figure serially after every
+run, even when only one topic's data had changed. A FigureBuild collects
+figure jobs (a module-level plot function plus the exact arguments it
+would be called with) and records, per output file, a SHA-256 of the code
+that draws it and its arguments (the input data and every rendering
+parameter). The code is the source of the plot function's module and of
+every repo module that module imports directly, so edits to shared plot
+helpers, styling constants in a config module or the statistics behind the
+error bars also mark the figure stale. On run() only figures whose hash
+changed or whose file is missing are rendered, in a process pool whose
+workers use the Agg backend.
+
+Hashes are kept in a manifest next to the figures, so refreshing the plots
+after a partial rerun re-renders just the figures whose data changed.
+
+Usage:
+    build = FigureBuild(figures_dir)
+    build.add(plot_epsilon_barplot, clustered, title="...", output_path=figures_dir / "epsilon_barplot.png")
+    build.run()
+"""
+
+import ast
+import functools
+import hashlib
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".figure_hashes.json"
+
+# Top-level package of the repo: imports from it count as figure code
+_ROOT_PACKAGE = __name__.split(".")[0]
+
+
+def _canonical(obj: Any) -> Any:
+    """JSON fallback for hashing numpy values, paths and other objects."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    return str(obj)
+
+
+def _module_source(name: str) -> Optional[str]:
+    """Source of a Python module by name (None if it is not a .py module)."""
+    module = sys.modules.get(name)
+    if module is not None:
+        path = getattr(module, "__file__", None)
+    else:
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            return None
+        path = spec.origin if spec is not None else None
+    if not path or not path.endswith(".py"):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _code_sources(module_name: str) -> Dict[str, str]:
+    """
+    Sources of a plot module and of the repo modules it imports directly.
+    
+    Args:
+        module_name: Module of the plot function
+    
+    Returns:
+        Module name -> source (empty if the module's source is unavailable)
+    """
+    source = _module_source(module_name)
+    if source is None:
+        return {}
+    module = sys.modules.get(module_name)
+    package = getattr(module, "__package__", None) or module_name.rpartition(".")[0]
+    
+    names = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            try:
+                base = importlib.util.resolve_name("." * node.level + (node.module or ""), package)
+            except (ImportError, ValueError):
+                continue
+            names.add(base)
+            # "from .pkg import module" imports modules too
+            names.update(f"{base}.{alias.name}" for alias in node.names)
+    
+    sources = {module_name: source}
+    for name in sorted(names):
+        if name.split(".")[0] == _ROOT_PACKAGE and name not in sources and name != __name__:
+            dependency = _module_source(name)
+            if dependency is not None:
+                sources[name] = dependency
+    return sources
+
+
+@dataclass
+class FigureJob:
+    """One figure: func(*args, **kwargs) writes kwargs["output_path"]."""
+    func: Callable
+    args: tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def output_path(self) -> Path:
+        return Path(self.kwargs["output_path"])
+    
+    def input_hash(self) -> str:
+        """Hash of the code drawing the figure, its data and rendering parameters."""
+        payload = json.dumps(
+            {
+                "func": f"{self.func.__module__}.{self.func.__qualname__}",
+                "code": _code_sources(self.func.__module__),
+                "args": self.args,
+                "kwargs": self.kwargs,
+            },
+            sort_keys=True,
+            default=_canonical
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _init_worker() -> None:
+    """Select the non-interactive backend before any pyplot import."""
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _render(job: FigureJob) -> None:
+    job.output_path.parent.mkdir(parents=True, exist_ok=True)
+    job.func(*job.args, **job.kwargs)
+
+
+class FigureBuild:
+    """Collects figure jobs and renders the stale ones in parallel."""
+    
+    def __init__(self, figures_dir: Path, max_workers: Optional[int] = None, force: bool = False):
+        """
+        Args:
+            figures_dir: Root directory of the figures (holds the hash manifest)
+            max_workers: Rendering processes (None = CPU count, 0 = render in-process)
+            force: Re-render every figure regardless of its recorded hash
+        """
+        self.figures_dir = Path(figures_dir)
+        self.manifest_path = self.figures_dir / MANIFEST_FILENAME
+        self.max_workers = max_workers
+        self.force = force
+        self.jobs: List[FigureJob] = []
+    
+    def add(self, func: Callable, *args, **kwargs) -> None:
+        """Queue func(*args, **kwargs); kwargs must include output_path."""
+        if kwargs.get("output_path") is None:
+            raise ValueError(f"Figure job for {func.__name__} needs an output_path")
+        self.jobs.append(FigureJob(func, args, kwargs))
+    
+    def _key(self, path: Path) -> str:
+        try:
+            return str(path.resolve().relative_to(self.figures_dir.resolve()))
+        except ValueError:
+            return str(path.resolve())
+    
+    def _load_manifest(self) -> Dict[str, str]:
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable figure manifest {self.manifest_path}: {e}")
+            return {}
+    
+    def _save_manifest(self, manifest: Dict[str, str]) -> None:
+        self.figures_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+    
+    def stale_jobs(self) -> List[tuple]:
+        """(job, key, hash) for every queued figure that needs rendering."""
+        manifest = {} if self.force else self._load_manifest()
+        stale = []
+        seen = set()
+        for job in self.jobs:
+            key = self._key(job.output_path)
+            if key in seen:
+                logger.warning(f"Figure {key} queued more than once; keeping the first job")
+                continue
+            seen.add(key)
+            digest = job.input_hash()
+            if manifest.get(key) != digest or not job.output_path.exists():
+                stale.append((job, key, digest))
+        return stale
+    
+    def run(self) -> Dict[str, int]:
+        """
+        Render the stale figures.
+        
+        Returns:
+            Counts of "rendered", "skipped" and "failed" figures
+        """
+        stale = self.stale_jobs()
+        manifest = self._load_manifest()
+        n_unique = len({self._key(job.output_path) for job in self.jobs})
+        counts = {"rendered": 0, "skipped": n_unique - len(stale), "failed": 0}
+        logger.info(f"Figures: {len(stale)} stale, {counts['skipped']} up to date")
+        
+        def record(key: str, digest: str, error: Optional[BaseException]) -> None:
+            if error is None:
+                manifest[key] = digest
+                counts["rendered"] += 1
+            else:
+                manifest.pop(key, None)
+                counts["failed"] += 1
+                logger.error(f"Failed to render {key}: {error}")
+        
+        in_process = stale if self.max_workers == 0 else []
+        if stale and self.max_workers != 0:
+            # spawn, not fork: the parent may already hold a non-Agg pyplot state
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            ) as executor:
+                futures = {executor.submit(_render, job): (job, key, digest) for job, key, digest in stale}
+                for future in as_completed(futures):
+                    job, key, digest = futures[future]
+                    error = future.exception()
+                    if isinstance(error, BrokenProcessPool):
+                        in_process.append((job, key, digest))
+                    else:
+                        record(key, digest, error)
+            if in_process:
+                logger.warning(f"Process pool unusable, rendering {len(in_process)} figure(s) in-process")
+        
+        if in_process:
+            _init_worker()
+            for job, key, digest in in_process:
+                try:
+                    _render(job)
+                    record(key, digest, None)
+                except Exception as e:
+                    record(key, digest, e)
+        
+        if stale:
+            self._save_manifest(manifest)
+        self.jobs = []
+        logger.info(
+            f"Figures: {counts['rendered']} rendered, {counts['skipped']} skipped, "
+            f"{counts['failed']} failed"
+        )
+        return counts
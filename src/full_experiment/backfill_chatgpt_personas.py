@@ -1,26 +1,27 @@
 """
 Backfill chatgpt_with_personas for existing results that don't have it.
 
+Samples run concurrently and completed samples are recorded in a manifest,
+so an interrupted backfill resumes where it stopped (see maintenance_pass.py).
+
 Usage:
     uv run python -m src.full_experiment.backfill_chatgpt_personas
+    uv run python -m src.full_experiment.backfill_chatgpt_personas --dry-run
 """
 
-import json
+import argparse
 import logging
 import sys
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List
 from dotenv import load_dotenv
-from openai import OpenAI
 
 load_dotenv()
 
-from .config import OUTPUT_DIR, ABLATIONS
-from .data_loader import load_all_statements
-from .voting_runner import (
-    run_chatgpt_with_personas,
-    compute_epsilon_for_winner,
-)
+from .config import OUTPUT_DIR, MAX_WORKERS
+from .maintenance_pass import MaintenancePass, MethodCall, SampleContext, run_maintenance_pass
+from .voting_runner import run_chatgpt_with_personas
 
 logger = logging.getLogger(__name__)
 
@@ -57,64 +58,6 @@ def setup_logging(output_dir: Path) -> None:
     logger.info(f"Logging to {log_file}")
 
 
-def load_statements_and_personas_for_ablation(rep_dir: Path, ablation: str, topic_slug: str):
-    """
-    Load statements and personas for a specific ablation.
-    
-    For 'full' ablation: load filtered statements based on filter_assignments.json
-    For 'no_filtering': load all bridging statements
-    For 'no_bridging': load original Polis statements (not bridging statements)
-    
-    Returns:
-        (stmt_dicts, all_personas) tuple
-    """
-    if ablation == "no_bridging":
-        # no_bridging uses original Polis statements, not bridging statements
-        # Load sampled indices from rep_dir
-        indices_path = rep_dir / "sampled_indices.json"
-        if not indices_path.exists():
-            return None, None
-        
-        with open(indices_path) as f:
-            sampled_indices = json.load(f)
-        
-        # Load original statements from Polis data
-        all_entries = load_all_statements(topic_slug)
-        
-        # Get sampled entries
-        all_personas = [all_entries[i]["persona"] for i in sampled_indices]
-        stmt_dicts = [{"statement": all_entries[i]["statement"]} for i in sampled_indices]
-        
-        return stmt_dicts, all_personas
-    else:
-        bridging_path = rep_dir / "bridging_statements.json"
-    
-        if not bridging_path.exists():
-            return None, None
-        
-        with open(bridging_path) as f:
-            bridging_statements = json.load(f)
-        
-        all_personas = [s.get("persona", f"Voter {i}") for i, s in enumerate(bridging_statements)]
-        stmt_dicts = [{"statement": s["statement"]} for s in bridging_statements]
-        
-        # For 'full' ablation, filter statements based on filter_assignments
-        if ablation == "full":
-            filter_path = rep_dir / "filter_assignments.json"
-            if filter_path.exists():
-                with open(filter_path) as f:
-                    assignments = json.load(f)
-                kept_indices = sorted([
-                    a["statement_idx"]
-                    for a in assignments
-                    if a["keep"] == 1
-                ])
-                if len(stmt_dicts) > len(kept_indices):
-                    stmt_dicts = [stmt_dicts[i] for i in kept_indices]
-        
-        return stmt_dicts, all_personas
-
-
 def needs_backfill(results: dict) -> bool:
     """
     Check if a results dict needs backfill.
@@ -134,188 +77,68 @@ def needs_backfill(results: dict) -> bool:
     return False
 
 
-def process_sample_dir(
-    sample_dir: Path,
-    stmt_dicts: list,
-    all_personas: list,
-    openai_client: OpenAI,
-    data_dir: Path
-) -> tuple:
-    """
-    Process a single sample directory.
-    
-    Returns:
-        (updated: bool, skipped: bool, error: bool)
-    """
-    results_path = sample_dir / "results.json"
-    if not results_path.exists():
-        return False, False, False
+class BackfillChatgptPersonasPass(MaintenancePass):
+    """Run chatgpt_with_personas where it is missing or has a null epsilon."""
+    name = "backfill_chatgpt_personas"
     
-    with open(results_path) as f:
-        results = json.load(f)
+    def __init__(self, openai_client):
+        self.openai_client = openai_client
     
-    # Check if needs backfill
-    if not needs_backfill(results):
-        return False, True, False  # skipped
-    
-    # Load sampled persona indices (try both naming conventions)
-    indices_path = sample_dir / "sampled_persona_indices.json"
-    if not indices_path.exists():
-        indices_path = sample_dir / "persona_indices.json"
-    if not indices_path.exists():
-        # For 20-persona samples, all personas are used (indices 0-19)
-        # Check if we have preferences to determine the number of voters
-        prefs_path = sample_dir / "sampled_preferences.json"
-        if not prefs_path.exists():
-            prefs_path = sample_dir / "preferences.json"
-        if prefs_path.exists():
-            with open(prefs_path) as f:
-                sampled_prefs = json.load(f)
-            # Use indices based on number of voters in preferences
-            sampled_indices = list(range(len(sampled_prefs)))
-        else:
-            logger.warning(f"  Missing indices and preferences: {sample_dir}")
-            return False, False, True
-    else:
-        with open(indices_path) as f:
-            sampled_indices = json.load(f)
-    
-    # Load sampled preferences for epsilon computation
-    prefs_path = sample_dir / "sampled_preferences.json"
-    if not prefs_path.exists():
-        prefs_path = sample_dir / "preferences.json"
-    if not prefs_path.exists():
-        logger.warning(f"  Missing preferences: {sample_dir}")
-        return False, False, True
-    
-    with open(prefs_path) as f:
-        sampled_prefs = json.load(f)
-    
-    # Get personas for sampled voters
-    try:
-        sampled_personas = [all_personas[i] for i in sampled_indices]
-    except IndexError:
-        # If indices are out of range, use available personas
-        sampled_personas = all_personas[:len(sampled_indices)]
-    
-    # Run chatgpt_with_personas
-    try:
-        rel_path = sample_dir.relative_to(data_dir)
-        logger.info(f"  Running: {rel_path}")
-        result = run_chatgpt_with_personas(stmt_dicts, sampled_personas, openai_client)
-        
-        # Compute epsilon
-        winner = result.get("winner")
-        if winner is not None:
-            try:
-                epsilon = compute_epsilon_for_winner(sampled_prefs, winner)
-                result["epsilon"] = epsilon
-            except Exception as e:
-                logger.warning(f"    Epsilon computation failed: {e}")
-                result["epsilon"] = None
-        else:
-            result["epsilon"] = None
-        
-        # Update results
-        results["chatgpt_with_personas"] = result
-        
-        with open(results_path, 'w') as f:
-            json.dump(results, f, indent=2)
-        
-        logger.info(f"    Winner={winner}, epsilon={result.get('epsilon')}")
-        return True, False, False  # updated
-        
-    except Exception as e:
-        logger.error(f"    Error: {e}")
-        return False, False, True  # error
+    def plan(self, sample: SampleContext) -> List[MethodCall]:
+        if not needs_backfill(sample.results):
+            return []
+        return [MethodCall("chatgpt_with_personas", run_chatgpt_with_personas,
+                           (sample.stmt_dicts, sample.personas, self.openai_client))]
 
 
-def backfill_chatgpt_with_personas(output_dir: Path = OUTPUT_DIR):
-    """Backfill chatgpt_with_personas for all samples missing it or with null epsilon."""
-    openai_client = OpenAI(timeout=60.0)
-    data_dir = output_dir / "data"
+def backfill_chatgpt_with_personas(
+    output_dir: Path = OUTPUT_DIR,
+    max_workers: int = MAX_WORKERS,
+    dry_run: bool = False,
+    restart: bool = False
+) -> Dict[str, int]:
+    """
+    Backfill chatgpt_with_personas for all samples missing it or with null epsilon.
     
-    updated_count = 0
-    skipped_count = 0
-    error_count = 0
+    Args:
+        output_dir: Experiment output directory
+        max_workers: Maximum concurrent API calls
+        dry_run: Only report how many samples and calls the backfill would make
+        restart: Ignore the manifest and revisit samples completed earlier
+    
+    Returns:
+        Pass counts (see run_maintenance_pass)
+    """
+    openai_client = None
+    if not dry_run:
+        from openai import OpenAI
+        openai_client = OpenAI(timeout=60.0)
     
     logger.info("=" * 60)
     logger.info("Starting backfill of chatgpt_with_personas")
     logger.info("(includes 20-persona data and fixing null epsilon samples)")
     logger.info("=" * 60)
     
-    for topic_dir in sorted(data_dir.iterdir()):
-        if not topic_dir.is_dir() or topic_dir.name.startswith("pvc"):
-            continue
-        
-        logger.info(f"\nProcessing topic: {topic_dir.name}")
-        
-        for rep_dir in sorted(topic_dir.glob("rep*")):
-            # Process each ablation separately
-            for ablation in ABLATIONS:
-                # Load statements and personas for this ablation
-                stmt_dicts, all_personas = load_statements_and_personas_for_ablation(
-                    rep_dir, ablation, topic_dir.name
-                )
-                if stmt_dicts is None:
-                    continue
-                
-                # Determine base directory for this ablation
-                if ablation == "full":
-                    ablation_base = rep_dir
-                else:
-                    ablation_base = rep_dir / f"ablation_{ablation}"
-                
-                if not ablation_base.exists():
-                    continue
-                
-                # Process 20-persona samples (directly in ablation_base/sample*)
-                for sample_dir in sorted(ablation_base.glob("sample*")):
-                    if not sample_dir.is_dir():
-                        continue
-                    updated, skipped, error = process_sample_dir(
-                        sample_dir, stmt_dicts, all_personas, openai_client, data_dir
-                    )
-                    if updated:
-                        updated_count += 1
-                    if skipped:
-                        skipped_count += 1
-                    if error:
-                        error_count += 1
-                
-                # Process 5-persona and 10-persona subdirectories
-                for n_personas_dir in ["5-personas", "10-personas"]:
-                    personas_dir = ablation_base / n_personas_dir
-                    
-                    if not personas_dir.exists():
-                        continue
-                    
-                    for sample_dir in sorted(personas_dir.glob("sample*")):
-                        if not sample_dir.is_dir():
-                            continue
-                        updated, skipped, error = process_sample_dir(
-                            sample_dir, stmt_dicts, all_personas, openai_client, data_dir
-                        )
-                        if updated:
-                            updated_count += 1
-                        if skipped:
-                            skipped_count += 1
-                        if error:
-                            error_count += 1
-    
-    logger.info("")
-    logger.info("=" * 60)
-    logger.info(f"Backfill complete!")
-    logger.info(f"  Updated: {updated_count}")
-    logger.info(f"  Skipped (already had valid data): {skipped_count}")
-    logger.info(f"  Errors: {error_count}")
-    logger.info("=" * 60)
+    return run_maintenance_pass(
+        BackfillChatgptPersonasPass(openai_client),
+        output_dir,
+        max_workers=max_workers,
+        dry_run=dry_run,
+        restart=restart
+    )
 
 
 def main():
-    setup_logging(OUTPUT_DIR)
+    parser = argparse.ArgumentParser(description="Backfill chatgpt_with_personas for existing results")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Output directory")
+    parser.add_argument("--max-workers", type=int, default=MAX_WORKERS, help="Maximum concurrent API calls")
+    parser.add_argument("--dry-run", action="store_true", help="Only report how many calls the backfill would make")
+    parser.add_argument("--restart", action="store_true", help="Ignore the manifest of completed samples")
+    args = parser.parse_args()
+    
+    setup_logging(args.output_dir)
     logger.info(f"Start time: {datetime.now().isoformat()}")
-    backfill_chatgpt_with_personas()
+    backfill_chatgpt_with_personas(args.output_dir, args.max_workers, dry_run=args.dry_run, restart=args.restart)
     logger.info(f"End time: {datetime.now().isoformat()}")
 
 
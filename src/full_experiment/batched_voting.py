@@ -0,0 +1,241 @@
+"""
+Batched traditional voting rules over stacked sub-profiles.
+
+A multi-persona sweep evaluates Schulze (RankedPairs), Borda, IRV and
+Plurality on dozens of small sub-profiles of the same rep: every
+(persona count, sample) pair is a subset of the rep's voters. Instead of
+building a VoteKit profile per sub-profile, the rep's position matrix is
+computed once and the sub-profiles are stacked into one
+(samples, voters, alternatives) tensor, padded to the largest persona count
+with zero-weight voters. Borda and Plurality scores, IRV rounds and the
+pairwise-majority tensor for RankedPairs are then single array operations
+over all samples; only RankedPairs' lock-in and veto by consumption still
+loop per sample.
+
+Ties are broken uniformly at random like VoteKit's tiebreak="random", but
+from a seeded generator so reruns reproduce the same winners.
+
+Usage:
+    batch = StackedProfiles(full_preferences, [indices_5, indices_10, ...])
+    results = evaluate_traditional_methods(batch, seed=42)
+    # results[i] = {"schulze": {"winner": "12", "epsilon": 0.0}, ...}
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.compute_pvc import compute_pvc
+from .epsilon_memo import EpsilonMemo
+
+logger = logging.getLogger(__name__)
+
+TRADITIONAL_METHODS = ["schulze", "borda", "irv", "plurality", "veto_by_consumption"]
+
+
+def _random_argmax(scores: np.ndarray, rng: np.random.Generator, valid: np.ndarray = None) -> np.ndarray:
+    """Row-wise argmax with uniformly random tie-breaking (invalid entries never win)."""
+    noise = rng.random(scores.shape)
+    scores = scores.astype(float)
+    if valid is not None:
+        scores = np.where(valid, scores, -np.inf)
+    best = scores.max(axis=1, keepdims=True)
+    return np.argmax(np.where(scores == best, noise, -1.0), axis=1)
+
+
+class StackedProfiles:
+    """Sub-profiles of one preference matrix, stacked for batched evaluation."""
+    
+    def __init__(self, preferences: Sequence[Sequence[str]], voter_subsets: List[List[int]]):
+        """
+        Args:
+            preferences: Full preference matrix [rank][voter]
+            voter_subsets: Voter indices of each sub-profile
+        """
+        self.preferences = preferences
+        self.voter_subsets = voter_subsets
+        
+        ranked = np.asarray(preferences, dtype=np.int64)       # (m, N) statement ids
+        self.alternatives = np.unique(ranked[:, 0])
+        lookup = {int(a): i for i, a in enumerate(self.alternatives)}
+        m, n_total = ranked.shape
+        
+        # positions[v, a] = rank voter v gives alternative a (0 = most preferred)
+        positions = np.empty((n_total, m), dtype=np.int32)
+        ranks = np.arange(m, dtype=np.int32)
+        for v in range(n_total):
+            positions[v, [lookup[int(a)] for a in ranked[:, v]]] = ranks
+        
+        n_max = max((len(s) for s in voter_subsets), default=0)
+        self.positions = np.full((len(voter_subsets), n_max, m), m, dtype=np.int32)
+        self.weights = np.zeros((len(voter_subsets), n_max))
+        for i, subset in enumerate(voter_subsets):
+            self.positions[i, :len(subset)] = positions[subset]
+            self.weights[i, :len(subset)] = 1.0
+    
+    @property
+    def n_samples(self) -> int:
+        return len(self.voter_subsets)
+    
+    @property
+    def n_alternatives(self) -> int:
+        return len(self.alternatives)
+    
+    def winner_labels(self, winners: np.ndarray) -> List[str]:
+        """Map alternative columns back to statement ids (as strings)."""
+        return [str(int(self.alternatives[w])) for w in winners]
+    
+    def sub_preferences(self, i: int) -> List[List[str]]:
+        """Preference matrix [rank][voter] of sub-profile i."""
+        subset = self.voter_subsets[i]
+        return [[row[v] for v in subset] for row in self.preferences]
+
+
+# =============================================================================
+# Rules
+# =============================================================================
+
+def batched_borda(batch: StackedProfiles, rng: np.random.Generator) -> np.ndarray:
+    """Borda winner column of every sub-profile."""
+    m = batch.n_alternatives
+    points = np.clip(m - 1 - batch.positions, 0, None)
+    scores = np.einsum("sv,sva->sa", batch.weights, points)
+    return _random_argmax(scores, rng)
+
+
+def batched_plurality(batch: StackedProfiles, rng: np.random.Generator) -> np.ndarray:
+    """Plurality winner column of every sub-profile."""
+    first = (batch.positions == 0)
+    scores = np.einsum("sv,sva->sa", batch.weights, first)
+    return _random_argmax(scores, rng)
+
+
+def batched_irv(batch: StackedProfiles, rng: np.random.Generator) -> np.ndarray:
+    """
+    Instant runoff winner column of every sub-profile.
+    
+    All samples advance one round at a time: each voter's vote goes to
+    their highest-ranked remaining alternative, a sample is decided once an
+    alternative holds a strict majority (or is the last one left), and
+    otherwise its weakest remaining alternative is eliminated.
+    """
+    s_count, _, m = batch.positions.shape
+    remaining = np.ones((s_count, m), dtype=bool)
+    winners = np.full(s_count, -1)
+    totals = batch.weights.sum(axis=1)
+    rows = np.arange(s_count)
+    
+    for _ in range(m):
+        active = winners < 0
+        if not active.any():
+            break
+        masked = np.where(remaining[:, None, :], batch.positions, m + 1)
+        top = masked.argmin(axis=2)                                   # (S, n)
+        tally = np.zeros((s_count, m))
+        np.add.at(tally, (np.repeat(rows, top.shape[1]), top.ravel()), batch.weights.ravel())
+        
+        leader = _random_argmax(tally, rng, remaining)
+        decided = active & ((tally[rows, leader] * 2 > totals) | (remaining.sum(axis=1) == 1))
+        winners[decided] = leader[decided]
+        
+        loser = _random_argmax(-tally, rng, remaining)
+        eliminate = active & ~decided
+        remaining[rows[eliminate], loser[eliminate]] = False
+    return winners
+
+
+def batched_ranked_pairs(batch: StackedProfiles, rng: np.random.Generator) -> np.ndarray:
+    """
+    RankedPairs (Condorcet) winner column of every sub-profile.
+    
+    The pairwise-majority margins of all samples come from one tensor
+    operation; pairs are then locked in order of decreasing margin (equal
+    margins in random order), skipping any pair that would close a cycle.
+    """
+    m = batch.n_alternatives
+    prefers = batch.positions[:, :, :, None] < batch.positions[:, :, None, :]    # (S, n, m, m)
+    support = np.einsum("sv,svab->sab", batch.weights, prefers)
+    margins = support - support.transpose(0, 2, 1)
+    
+    winners = np.empty(batch.n_samples, dtype=np.int64)
+    for i in range(batch.n_samples):
+        a_idx, b_idx = np.nonzero(margins[i] > 0)
+        order = rng.permutation(len(a_idx))
+        order = order[np.argsort(-margins[i][a_idx[order], b_idx[order]], kind="stable")]
+        
+        # reach[x, y]: y is reachable from x through locked pairs (x reaches itself)
+        reach = np.eye(m, dtype=bool)
+        beaten = np.zeros(m, dtype=bool)
+        for k in order:
+            a, b = a_idx[k], b_idx[k]
+            if reach[b, a]:
+                continue
+            reach[reach[:, a]] |= reach[b]
+            beaten[b] = True
+        winners[i] = _random_argmax(np.zeros((1, m)), rng, ~beaten[None, :])[0]
+    return winners
+
+
+BATCHED_RULES = {
+    "schulze": batched_ranked_pairs,
+    "borda": batched_borda,
+    "irv": batched_irv,
+    "plurality": batched_plurality,
+}
+
+
+# =============================================================================
+# Evaluation
+# =============================================================================
+
+def evaluate_traditional_methods(
+    batch: StackedProfiles,
+    seed: int = 42,
+    compute_epsilon: bool = True,
+    sample_dirs: Optional[List[Path]] = None
+) -> List[Dict[str, Dict]]:
+    """
+    Run every traditional method on every sub-profile.
+    
+    Args:
+        batch: Stacked sub-profiles
+        seed: Seed for random tie-breaking
+        compute_epsilon: Attach the critical epsilon of each winner
+            (computed once per distinct winner of a sample)
+        sample_dirs: Sample directory of each sub-profile, to persist its
+            epsilons in (see epsilon_memo.py)
+    
+    Returns:
+        Per sub-profile, {method: {"winner", "epsilon"}} in TRADITIONAL_METHODS order
+    """
+    rng = np.random.default_rng(seed)
+    results = [{} for _ in range(batch.n_samples)]
+    
+    for method, rule in BATCHED_RULES.items():
+        try:
+            winners = batch.winner_labels(rule(batch, rng))
+        except Exception as e:
+            logger.error(f"Batched {method} failed: {e}")
+            for sample_results in results:
+                sample_results[method] = {"winner": None, "error": str(e)}
+            continue
+        for sample_results, winner in zip(results, winners):
+            sample_results[method] = {"winner": winner}
+    
+    alternatives = [str(int(a)) for a in batch.alternatives]
+    for i, sample_results in enumerate(results):
+        sub_prefs = batch.sub_preferences(i)
+        try:
+            pvc = compute_pvc(sub_prefs, alternatives)
+            sample_results["veto_by_consumption"] = {"winner": pvc[0] if pvc else None}
+        except Exception as e:
+            logger.error(f"Veto by consumption failed: {e}")
+            sample_results["veto_by_consumption"] = {"winner": None, "error": str(e)}
+        
+        if compute_epsilon:
+            sample_dir = sample_dirs[i] if sample_dirs is not None else None
+            EpsilonMemo(sub_prefs, sample_dir).attach(sample_results)
+    
+    return results
@@ -2,16 +2,19 @@
 Generate bridging statements from personas synthesizing all statements.
 """
 
+from __future__ import annotations
+
 import json
 import logging
-from typing import List, Dict
+from typing import TYPE_CHECKING, List, Dict
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from openai import OpenAI
 
 import time
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 from .config import (
     BRIDGING_MODEL,
@@ -0,0 +1,159 @@
+"""
+Vectorized cluster-aware statistics for error bars.
+
+Plotters summarize, per voting method, values clustered by outer rep
+(method -> [[value per sample] per rep]): the rep means are the unit of
+analysis, and error bars come from their spread. summarize_clusters pads
+the clusters of all methods into one (method, cluster, sample) array with
+NaN and computes, in one pass over all methods, the grand mean of the
+cluster means, their standard error, the t-based confidence interval, the
+25th/75th percentiles and, optionally, a cluster-bootstrap percentile CI
+(clusters resampled with replacement, B resamples drawn at once from a
+seeded generator).
+
+Usage:
+    summaries = summarize_clusters(clustered_results, n_bootstrap=BOOTSTRAP_RESAMPLES)
+    summaries["borda"].mean, summaries["borda"].ci_half_width
+    summaries["borda"].boot_low, summaries["borda"].boot_high
+"""
+
+import warnings
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy import stats
+
+from .config import BOOTSTRAP_SEED
+
+
+@dataclass
+class ClusterSummary:
+    """Cluster-aware summary of one method's values (None where undefined)."""
+    mean: Optional[float]                   # Grand mean of the cluster means
+    n_clusters: int                         # Clusters with at least one value
+    se: Optional[float] = None              # Standard error of the cluster means
+    ci_half_width: Optional[float] = None   # t-distribution CI half width
+    p25: Optional[float] = None             # 25th percentile of the cluster means
+    p75: Optional[float] = None             # 75th percentile of the cluster means
+    boot_low: Optional[float] = None        # Cluster-bootstrap CI bounds
+    boot_high: Optional[float] = None
+
+
+def pad_clusters(clustered: List[List[List[Optional[float]]]]) -> np.ndarray:
+    """
+    Stack clustered values into a NaN-padded array.
+    
+    Args:
+        clustered: Per method, a list of clusters (lists of values; None = missing)
+    
+    Returns:
+        Array of shape (methods, max clusters, max cluster size)
+    """
+    n_clusters = max((len(clusters) for clusters in clustered), default=0)
+    n_samples = max((len(c) for clusters in clustered for c in clusters), default=0)
+    values = np.full((len(clustered), max(n_clusters, 1), max(n_samples, 1)), np.nan)
+    for i, clusters in enumerate(clustered):
+        for j, cluster in enumerate(clusters):
+            values[i, j, :len(cluster)] = [np.nan if v is None else v for v in cluster]
+    return values
+
+
+def _bootstrap_means(
+    cluster_means: np.ndarray,
+    n: np.ndarray,
+    n_bootstrap: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Grand means of cluster-bootstrap resamples.
+    
+    Args:
+        cluster_means: (methods, clusters) with each row's n valid means first
+        n: Valid clusters per method
+        n_bootstrap: Resamples per method
+        rng: Random generator
+    
+    Returns:
+        (methods, n_bootstrap) resampled grand means
+    """
+    n_methods, n_clusters = cluster_means.shape
+    # Each resample draws n clusters (with replacement) from the method's n
+    picks = (rng.random((n_methods, n_bootstrap, n_clusters)) * n[:, None, None]).astype(np.int64)
+    drawn = np.take_along_axis(np.nan_to_num(cluster_means)[:, None, :], picks, axis=2)
+    counted = np.arange(n_clusters)[None, None, :] < n[:, None, None]
+    return np.where(counted, drawn, 0.0).sum(axis=2) / np.maximum(n, 1)[:, None]
+
+
+def summarize_clusters(
+    clustered_by_method: Dict[str, List[List[Optional[float]]]],
+    confidence: float = 0.95,
+    n_bootstrap: int = 0,
+    seed: int = BOOTSTRAP_SEED
+) -> Dict[str, ClusterSummary]:
+    """
+    Cluster-aware summaries of every method at once.
+    
+    1. Average the samples within each cluster (outer rep); empty clusters are dropped
+    2. Summarize the cluster means of each method
+    
+    Args:
+        clustered_by_method: Method -> list of clusters (lists of values)
+        confidence: Confidence level of the t and bootstrap CIs
+        n_bootstrap: Cluster-bootstrap resamples (0 = no bootstrap CI)
+        seed: Seed of the bootstrap resampling
+    
+    Returns:
+        Method -> ClusterSummary (spread statistics need at least 2 clusters)
+    """
+    methods = list(clustered_by_method)
+    if not methods:
+        return {}
+    values = pad_clusters([clustered_by_method[m] for m in methods])
+    alpha = 1 - confidence
+    
+    with warnings.catch_warnings():
+        # All-NaN clusters and methods with fewer than 2 clusters
+        warnings.simplefilter("ignore", RuntimeWarning)
+        # Sorting moves the NaN means of empty/padded clusters to the end of each row
+        cluster_means = np.sort(np.nanmean(values, axis=2), axis=1)
+        n = (~np.isnan(cluster_means)).sum(axis=1)
+        grand_mean = np.nanmean(cluster_means, axis=1)
+        se = np.nanstd(cluster_means, axis=1, ddof=1) / np.sqrt(n)
+        t_val = stats.t.ppf(1 - alpha / 2, df=np.maximum(n - 1, 1))
+        p25, p75 = np.nanpercentile(cluster_means, [25, 75], axis=1)
+    
+    boot_low = boot_high = np.full(len(methods), np.nan)
+    if n_bootstrap > 0:
+        rng = np.random.default_rng(seed)
+        boot = _bootstrap_means(cluster_means, n, n_bootstrap, rng)
+        boot_low, boot_high = np.percentile(boot, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=1)
+    
+    summaries = {}
+    for i, method in enumerate(methods):
+        if n[i] == 0:
+            summaries[method] = ClusterSummary(mean=None, n_clusters=0)
+        elif n[i] < 2:
+            summaries[method] = ClusterSummary(mean=float(grand_mean[i]), n_clusters=1)
+        else:
+            summaries[method] = ClusterSummary(
+                mean=float(grand_mean[i]),
+                n_clusters=int(n[i]),
+                se=float(se[i]),
+                ci_half_width=float(t_val[i] * se[i]),
+                p25=float(p25[i]),
+                p75=float(p75[i]),
+                boot_low=float(boot_low[i]) if n_bootstrap > 0 else None,
+                boot_high=float(boot_high[i]) if n_bootstrap > 0 else None,
+            )
+    return summaries
+
+
+def summarize_cluster(
+    clustered_values: List[List[Optional[float]]],
+    confidence: float = 0.95,
+    n_bootstrap: int = 0,
+    seed: int = BOOTSTRAP_SEED
+) -> ClusterSummary:
+    """Cluster-aware summary of a single method's values."""
+    return summarize_clusters({None: clustered_values}, confidence, n_bootstrap, seed)[None]
@@ -7,6 +7,8 @@ import logging
 import threading
 from pathlib import Path
 
+from src.typed_responses import format_stats
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -158,6 +160,17 @@ ABLATIONS = [ABLATION_FULL, ABLATION_NO_BRIDGING, ABLATION_NO_FILTERING]
 # =============================================================================
 MAX_WORKERS = 50  # Maximum parallel API calls
 
+# =============================================================================
+# Error Bars
+# =============================================================================
+BOOTSTRAP_RESAMPLES = 10000  # Cluster-bootstrap resamples for bootstrap CIs
+BOOTSTRAP_SEED = BASE_SEED   # Seed of the bootstrap resampling
+
+# =============================================================================
+# Epsilon Memo
+# =============================================================================
+EPSILON_MEMO_FILENAME = "epsilons.json"  # Per-sample critical epsilons, next to results.json
+
 
 # =============================================================================
 # API Timing Tracker
@@ -187,6 +200,7 @@ class APITimer:
                     f"[API Stats] {total} calls, avg {avg:.2f}s/call, "
                     f"last {self.LOG_INTERVAL} avg {sum(self._times[-self.LOG_INTERVAL:]) / self.LOG_INTERVAL:.2f}s"
                 )
+                format_stats.log_stats()
     
     def get_stats(self) -> dict:
         """Get current timing statistics."""
@@ -0,0 +1,438 @@
+"""
+Load-once view of a full_experiment output tree for analysis and plotting.
+
+Every collect_* function in visualizer and epsilon_100 used to re-glob the
+rep*/sample* directories and re-open the same results.json,
+filter_assignments.json, Likert and preference files, so regenerating all
+figures read each file dozens of times. ExperimentDataset scans the tree
+lazily and memoizes every directory listing and parsed JSON file, so each
+file is read at most once per process, and the collectors become cheap
+queries on it. Epsilon-100 values are looked up in the rep/ablation's
+precomputed epsilon vector (see epsilon_100.py), which the flat, clustered
+and per-persona-count collectors all share.
+
+Why a memoized cache rather than tidy tables built at load: the collectors
+need method -> per-rep lists, with reps dropped according to which side
+files exist (Likert, filter assignments, preferences), and some values are
+expensive (epsilon-100 may have to be computed). Building samples x methods
+x metrics tables up front would pay for every metric of every ablation and
+persona count even when a script plots one figure, and pandas would become
+a hard dependency of every collector. The query methods derive each value on
+demand from the memoized files instead; table() builds the tidy DataFrame
+for ad-hoc analysis, once per set of arguments.
+
+Layout (under output_dir/data/):
+    {topic}/rep{i}/[ablation_{ablation}/][{n}-personas/]sample{j}/results.json
+    {topic}/rep{i}/[ablation_{ablation}/]filter_assignments.json
+
+Usage:
+    dataset = get_dataset(output_dir)
+    clustered = dataset.epsilon(topic, ablation="full")     # {method: [[eps per sample] per rep]}
+    df = dataset.table(ablations=["full"], persona_counts=[5, 10, 20])
+"""
+
+import json
+import logging
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import stats
+
+from .config import VOTING_METHODS, OUTPUT_DIR
+
+logger = logging.getLogger(__name__)
+
+# Persona count whose samples live directly in the rep (or ablation) directory
+DEFAULT_N_PERSONAS = 20
+
+# value(rep_dir, sample_dir, method, method_result) -> value or None to skip
+ValueFn = Callable[[Path, Path, str, Dict], Any]
+
+
+def flatten_clustered(clustered: Dict[str, List[List[Any]]]) -> Dict[str, List[Any]]:
+    """Concatenate per-rep lists into one list per method."""
+    return {
+        method: [value for rep_values in reps for value in rep_values]
+        for method, reps in clustered.items()
+    }
+
+
+class ClusterInfo:
+    """Statement clusters of one rep, from its filter_assignments.json."""
+    
+    def __init__(self, assignments: List[Dict]):
+        self.sizes: Dict[int, int] = {}
+        for assignment in assignments:
+            cluster_id = assignment["cluster_id"]
+            self.sizes[cluster_id] = self.sizes.get(cluster_id, 0) + 1
+        # Winner indices refer to the kept (filtered) statements, in original order
+        self.kept_indices = sorted(a["statement_idx"] for a in assignments if a["keep"] == 1)
+        self.stmt_to_cluster = {a["statement_idx"]: a["cluster_id"] for a in assignments}
+        self.sorted_sizes = sorted(self.sizes.values())
+    
+    def winner_cluster(self, winner, where: str) -> Optional[int]:
+        """Cluster id of a (filtered) winner index, or None with a warning."""
+        try:
+            winner_idx = int(winner)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid winner {winner!r} in {where}: {e}")
+            return None
+        if winner_idx >= len(self.kept_indices):
+            logger.warning(f"Winner index {winner_idx} out of range in {where}")
+            return None
+        original_idx = self.kept_indices[winner_idx]
+        cluster_id = self.stmt_to_cluster.get(original_idx)
+        if cluster_id is None:
+            logger.warning(f"Could not find cluster for statement {original_idx} in {where}")
+        return cluster_id
+
+
+class ExperimentDataset:
+    """Memoized scan of one full_experiment output directory."""
+    
+    def __init__(self, output_dir: Path = OUTPUT_DIR):
+        """
+        Args:
+            output_dir: Experiment output directory (containing data/)
+        """
+        self.output_dir = Path(output_dir)
+        self.data_dir = self.output_dir / "data"
+        self._globs: Dict[Tuple[Path, str], List[Path]] = {}
+        self._files: Dict[Path, Any] = {}
+        self._clusters: Dict[Path, Optional[ClusterInfo]] = {}
+        self._epsilon_100: Dict[Path, Dict[str, Optional[float]]] = {}
+        self._tables: Dict[tuple, Any] = {}
+    
+    # -------------------------------------------------------------------------
+    # File access
+    # -------------------------------------------------------------------------
+    
+    def _glob(self, directory: Path, pattern: str) -> List[Path]:
+        key = (directory, pattern)
+        if key not in self._globs:
+            self._globs[key] = sorted(directory.glob(pattern)) if directory.is_dir() else []
+        return self._globs[key]
+    
+    def load_json(self, path: Path) -> Any:
+        """Parsed contents of a JSON file (read once), or None if missing or unreadable."""
+        if path not in self._files:
+            data = None
+            if path.exists():
+                try:
+                    with open(path, 'r') as f:
+                        data = json.load(f)
+                except Exception as e:
+                    logger.warning(f"Failed to load {path}: {e}")
+            self._files[path] = data
+        return self._files[path]
+    
+    @property
+    def files_read(self) -> int:
+        """Number of distinct JSON files loaded so far."""
+        return len(self._files)
+    
+    # -------------------------------------------------------------------------
+    # Layout
+    # -------------------------------------------------------------------------
+    
+    def topics(self, topics: Optional[List[str]] = None) -> List[str]:
+        """Topic slugs present in the data directory (restricted to topics if given)."""
+        if not self.data_dir.exists():
+            logger.warning(f"Data directory not found: {self.data_dir}")
+            return []
+        if topics is None:
+            key = (self.data_dir, "*")
+            if key not in self._globs:
+                self._globs[key] = [d for d in self.data_dir.iterdir() if d.is_dir()]
+            return [d.name for d in self._globs[key]]
+        return [t for t in topics if (self.data_dir / t).exists()]
+    
+    def rep_dirs(self, topic_slug: str) -> List[Path]:
+        """Sorted rep directories of a topic."""
+        topic_dir = self.data_dir / topic_slug
+        if not topic_dir.exists():
+            logger.warning(f"Topic directory not found: {topic_dir}")
+            return []
+        return self._glob(topic_dir, "rep*")
+    
+    @staticmethod
+    def ablation_dir(rep_dir: Path, ablation: str) -> Path:
+        """Directory holding a rep's data for an ablation."""
+        return rep_dir if ablation == "full" else rep_dir / f"ablation_{ablation}"
+    
+    def sample_base(self, rep_dir: Path, ablation: str, n_personas: int = DEFAULT_N_PERSONAS) -> Path:
+        """Directory containing the sample* directories for an ablation and persona count."""
+        base_dir = self.ablation_dir(rep_dir, ablation)
+        if n_personas == DEFAULT_N_PERSONAS:
+            return base_dir
+        return base_dir / f"{n_personas}-personas"
+    
+    def rep_samples(
+        self,
+        topic_slug: str,
+        ablation: str = "full",
+        n_personas: int = DEFAULT_N_PERSONAS
+    ) -> List[Tuple[Path, List[Tuple[Path, Dict]]]]:
+        """
+        Samples with results, grouped by rep.
+        
+        Args:
+            topic_slug: Topic slug
+            ablation: Ablation type
+            n_personas: Number of sampled personas
+        
+        Returns:
+            List of (rep_dir, [(sample_dir, results), ...]) for reps whose
+            sample directory exists
+        """
+        grouped = []
+        for rep_dir in self.rep_dirs(topic_slug):
+            base = self.sample_base(rep_dir, ablation, n_personas)
+            if not base.exists():
+                continue
+            samples = []
+            for sample_dir in self._glob(base, "sample*"):
+                sample_results = self.load_json(sample_dir / "results.json")
+                if sample_results is not None:
+                    samples.append((sample_dir, sample_results))
+            grouped.append((rep_dir, samples))
+        return grouped
+    
+    def likert_path(self, rep_dir: Path, ablation: str) -> Path:
+        """Likert ratings file matching the statements an ablation voted on."""
+        if ablation == "no_filtering":
+            return rep_dir / "full_likert.json"
+        if ablation == "no_bridging":
+            return self.ablation_dir(rep_dir, ablation) / "full_likert.json"
+        return self.ablation_dir(rep_dir, ablation) / "filtered_likert.json"
+    
+    def clusters(self, rep_dir: Path, ablation: str) -> Optional[ClusterInfo]:
+        """Cluster metadata of a rep, or None without filter assignments."""
+        data_dir = self.ablation_dir(rep_dir, ablation)
+        if data_dir not in self._clusters:
+            assignments = self.load_json(data_dir / "filter_assignments.json")
+            info = None
+            if assignments is not None:
+                try:
+                    info = ClusterInfo(assignments)
+                except (KeyError, TypeError) as e:
+                    logger.warning(f"Failed to load filter assignments from {data_dir}: {e}")
+            self._clusters[data_dir] = info
+        return self._clusters[data_dir]
+    
+    # -------------------------------------------------------------------------
+    # Per-winner values
+    # -------------------------------------------------------------------------
+    
+    def _epsilon_value(self, rep_dir: Path, sample_dir: Path, method: str, result: Dict) -> Optional[float]:
+        return result.get("epsilon")
+    
+    def _likert_value(self, ablation: str, rep_dir: Path, sample_dir: Path, method: str, result: Dict) -> Optional[float]:
+        winner = result.get("winner")
+        if winner is None:
+            return None
+        likert = self.load_json(self.likert_path(rep_dir, ablation))
+        persona_indices = self.load_json(sample_dir / "persona_indices.json")
+        if likert is None or persona_indices is None:
+            return None
+        winner_idx = int(winner)
+        n_cols = len(likert[0]) if likert else 0
+        if winner_idx >= n_cols or (persona_indices and max(persona_indices) >= len(likert)):
+            logger.debug(f"Likert index out of bounds for {method} in {sample_dir}; skipping")
+            return None
+        # Average Likert rating for the winner across the sampled personas
+        return float(np.mean([likert[p_idx][winner_idx] for p_idx in persona_indices]))
+    
+    def _cluster_sizes_value(self, ablation: str, rep_dir: Path, sample_dir: Path, method: str, result: Dict) -> Optional[List[tuple]]:
+        winner = result.get("winner")
+        info = self.clusters(rep_dir, ablation)
+        if winner is None or info is None:
+            return None
+        winner_cluster_id = info.winner_cluster(winner, f"{method} in {sample_dir}")
+        if winner_cluster_id is None:
+            return None
+        return [(size, cluster_id == winner_cluster_id) for cluster_id, size in info.sizes.items()]
+    
+    def _percentile_value(self, ablation: str, rep_dir: Path, sample_dir: Path, method: str, result: Dict) -> Optional[float]:
+        winner = result.get("winner")
+        info = self.clusters(rep_dir, ablation)
+        if winner is None or info is None:
+            return None
+        winner_cluster_id = info.winner_cluster(winner, f"{method} in {sample_dir}")
+        if winner_cluster_id is None:
+            return None
+        return stats.percentileofscore(info.sorted_sizes, info.sizes[winner_cluster_id], kind='rank')
+    
+    def _epsilon_100_value(self, ablation: str, rep_dir: Path, sample_dir: Path, method: str, result: Dict) -> Optional[float]:
+        # Imported here: epsilon_100 imports this module for its collectors
+        from .epsilon_100 import get_full_preferences_path, epsilon_100_memo
+        
+        winner = result.get("winner")
+        if winner is None:
+            return None
+        prefs_path = get_full_preferences_path(rep_dir, ablation)
+        if prefs_path not in self._epsilon_100:
+            full_preferences = self.load_json(prefs_path)
+            if full_preferences is None:
+                return None
+            self._epsilon_100[prefs_path] = epsilon_100_memo(rep_dir, ablation, full_preferences).vector()
+        return self._epsilon_100[prefs_path].get(str(winner))
+    
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+    
+    def _by_rep(
+        self,
+        topic_slug: str,
+        ablation: str,
+        n_personas: int,
+        value: ValueFn,
+        rep_filter: Optional[Callable[[Path], bool]] = None
+    ) -> Dict[str, List[List[Any]]]:
+        """Apply value to every method result; method -> per-rep lists (empty reps dropped)."""
+        results = {method: [] for method in VOTING_METHODS}
+        for rep_dir, samples in self.rep_samples(topic_slug, ablation, n_personas):
+            if rep_filter is not None and not rep_filter(rep_dir):
+                continue
+            rep_results = {method: [] for method in VOTING_METHODS}
+            for sample_dir, sample_results in samples:
+                for method in VOTING_METHODS:
+                    if method not in sample_results:
+                        continue
+                    v = value(rep_dir, sample_dir, method, sample_results[method])
+                    if v is not None:
+                        rep_results[method].append(v)
+            for method in VOTING_METHODS:
+                if rep_results[method]:
+                    results[method].append(rep_results[method])
+        return results
+    
+    def epsilon(self, topic_slug: str, ablation: str = "full", n_personas: int = DEFAULT_N_PERSONAS) -> Dict[str, List[List[float]]]:
+        """Epsilon of each method's winner; method -> per-rep lists."""
+        return self._by_rep(topic_slug, ablation, n_personas, self._epsilon_value)
+    
+    def likert(self, topic_slug: str, ablation: str = "full") -> Dict[str, List[List[float]]]:
+        """Average Likert rating of each method's winner over the sampled personas."""
+        return self._by_rep(
+            topic_slug, ablation, DEFAULT_N_PERSONAS, partial(self._likert_value, ablation),
+            rep_filter=lambda rep_dir: self.load_json(self.likert_path(rep_dir, ablation)) is not None
+        )
+    
+    def cluster_sizes(self, topic_slug: str, ablation: str = "full") -> Dict[str, List[tuple]]:
+        """Per winner, every (cluster_size, is_winner_cluster) of its rep."""
+        clustered = self._by_rep(
+            topic_slug, ablation, DEFAULT_N_PERSONAS, partial(self._cluster_sizes_value, ablation),
+            rep_filter=lambda rep_dir: self.clusters(rep_dir, ablation) is not None
+        )
+        return {
+            method: [pair for rep_values in reps for pairs in rep_values for pair in pairs]
+            for method, reps in clustered.items()
+        }
+    
+    def winner_cluster_percentile(self, topic_slug: str, ablation: str = "full") -> Dict[str, List[List[float]]]:
+        """Percentile rank (0-100) of the winner's cluster size among the rep's clusters."""
+        return self._by_rep(
+            topic_slug, ablation, DEFAULT_N_PERSONAS, partial(self._percentile_value, ablation),
+            rep_filter=lambda rep_dir: self.clusters(rep_dir, ablation) is not None
+        )
+    
+    def epsilon_100(self, topic_slug: str, ablation: str = "full", n_personas: int = DEFAULT_N_PERSONAS) -> Dict[str, List[List[float]]]:
+        """Epsilon of each method's winner against all 100 personas."""
+        from .epsilon_100 import get_full_preferences_path
+        
+        def has_preferences(rep_dir: Path) -> bool:
+            prefs_path = get_full_preferences_path(rep_dir, ablation)
+            if self.load_json(prefs_path) is None:
+                logger.warning(f"Preferences file not found: {prefs_path}")
+                return False
+            return True
+        
+        return self._by_rep(
+            topic_slug, ablation, n_personas, partial(self._epsilon_100_value, ablation),
+            rep_filter=has_preferences
+        )
+    
+    def table(
+        self,
+        ablations: Optional[List[str]] = None,
+        persona_counts: Optional[List[int]] = None,
+        topics: Optional[List[str]] = None,
+        include_epsilon_100: bool = False
+    ):
+        """
+        Tidy pandas table with one row per (sample, method).
+        
+        Args:
+            ablations: Ablations to include (None = ["full"])
+            persona_counts: Persona counts to include (None = [20])
+            topics: Topics to include (None = all)
+            include_epsilon_100: Also compute the epsilon_100 column
+        
+        Returns:
+            DataFrame with columns topic, ablation, n_personas, rep, sample,
+            method, winner, epsilon, likert, winner_cluster_percentile
+            (and epsilon_100); a copy of the table built on the first call
+            with the same arguments
+        """
+        import pandas as pd
+        
+        key = (
+            tuple(ablations or ["full"]),
+            tuple(persona_counts or [DEFAULT_N_PERSONAS]),
+            tuple(self.topics(topics)),
+            include_epsilon_100,
+        )
+        if key in self._tables:
+            return self._tables[key].copy()
+        
+        rows = []
+        for ablation in ablations or ["full"]:
+            for n_personas in persona_counts or [DEFAULT_N_PERSONAS]:
+                for topic_slug in self.topics(topics):
+                    for rep_dir, samples in self.rep_samples(topic_slug, ablation, n_personas):
+                        for sample_dir, sample_results in samples:
+                            for method in VOTING_METHODS:
+                                result = sample_results.get(method)
+                                if result is None:
+                                    continue
+                                args = (rep_dir, sample_dir, method, result)
+                                row = {
+                                    "topic": topic_slug,
+                                    "ablation": ablation,
+                                    "n_personas": n_personas,
+                                    "rep": rep_dir.name,
+                                    "sample": sample_dir.name,
+                                    "method": method,
+                                    "winner": result.get("winner"),
+                                    "epsilon": result.get("epsilon"),
+                                    "likert": self._likert_value(ablation, *args),
+                                    "winner_cluster_percentile": self._percentile_value(ablation, *args),
+                                }
+                                if include_epsilon_100:
+                                    row["epsilon_100"] = self._epsilon_100_value(ablation, *args)
+                                rows.append(row)
+        self._tables[key] = pd.DataFrame(rows)
+        return self._tables[key].copy()
+
+
+_DATASETS: Dict[Path, ExperimentDataset] = {}
+
+
+def get_dataset(output_dir: Path = OUTPUT_DIR, refresh: bool = False) -> ExperimentDataset:
+    """
+    Shared dataset for an output directory.
+    
+    Args:
+        output_dir: Experiment output directory
+        refresh: Drop the cached scan (e.g. after new results were written)
+    
+    Returns:
+        The process-wide ExperimentDataset for output_dir
+    """
+    key = Path(output_dir).resolve()
+    if refresh or key not in _DATASETS:
+        _DATASETS[key] = ExperimentDataset(output_dir)
+    return _DATASETS[key]
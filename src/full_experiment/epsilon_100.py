@@ -9,16 +9,23 @@ Supports multiple persona counts (5, 10, 20) with corresponding directory struct
 - 20 personas: rep{i}/sample{j}/ (standard)
 - 10 personas: rep{i}/10-personas/sample{j}/
 - 5 personas: rep{i}/5-personas/sample{j}/
+
+The epsilon-100 of every alternative of a rep/ablation is computed once and
+stored next to its preferences file (e.g. filtered_preferences_epsilons.json),
+so the collectors, epsilon_zero_report and epsilon_100_plotter only look
+values up. precompute_epsilon_100_vectors fills the missing vectors in
+parallel before a report or plotting run.
 """
 
-import json
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Optional
-
-from pvc_toolbox import compute_critical_epsilon
+from typing import List, Dict, Optional, Tuple
 
-from .config import VOTING_METHODS, OUTPUT_DIR
+from .config import VOTING_METHODS, OUTPUT_DIR, ABLATIONS
+from .dataset import get_dataset, flatten_clustered
+from .epsilon_memo import EpsilonMemo
 
 logger = logging.getLogger(__name__)
 
@@ -113,16 +120,107 @@ def compute_epsilon_100_for_winner(
     """
     if winner is None:
         return None
+    return EpsilonMemo(full_preferences).get(winner)
+
+
+# =============================================================================
+# Epsilon-100 Vectors
+# =============================================================================
+
+def get_epsilon_100_vector_path(rep_dir: Path, ablation: str) -> Path:
+    """
+    Get the path of the epsilon-100 vector stored next to an ablation's preferences.
     
-    n_statements = len(full_preferences)
-    alternatives = [str(i) for i in range(n_statements)]
+    Args:
+        rep_dir: Path to the rep directory (e.g., data/topic/rep0)
+        ablation: Ablation type ('full', 'no_filtering', 'no_bridging')
     
-    try:
-        epsilon = compute_critical_epsilon(full_preferences, alternatives, winner)
-        return epsilon
-    except Exception as e:
-        logger.error(f"Epsilon-100 computation failed for winner {winner}: {e}")
-        return None
+    Returns:
+        Path to the epsilon vector JSON file
+    """
+    prefs_path = get_full_preferences_path(rep_dir, ablation)
+    return prefs_path.with_name(f"{prefs_path.stem}_epsilons.json")
+
+
+def epsilon_100_memo(
+    rep_dir: Path,
+    ablation: str,
+    full_preferences: List[List[str]]
+) -> EpsilonMemo:
+    """
+    Epsilon memo of a rep/ablation's 100-persona profile.
+    
+    Missing values are computed on request and persisted next to the
+    preferences file.
+    
+    Args:
+        rep_dir: Path to the rep directory
+        ablation: Ablation type
+        full_preferences: The ablation's preference matrix [rank][voter]
+    
+    Returns:
+        EpsilonMemo backed by the rep/ablation's vector file
+    """
+    path = get_epsilon_100_vector_path(rep_dir, ablation)
+    return EpsilonMemo(full_preferences, path.parent, filename=path.name)
+
+
+def _compute_epsilon_100_vector(rep_dir: Path, ablation: str, full_preferences: List[List[str]]) -> int:
+    """Compute and persist a rep/ablation's epsilon-100 vector; returns its length."""
+    return len(epsilon_100_memo(rep_dir, ablation, full_preferences).vector())
+
+
+def precompute_epsilon_100_vectors(
+    output_dir: Path = OUTPUT_DIR,
+    ablations: Optional[List[str]] = None,
+    topics: Optional[List[str]] = None,
+    max_workers: Optional[int] = None
+) -> int:
+    """
+    Compute the missing epsilon-100 vectors of every rep in parallel.
+    
+    Args:
+        output_dir: Output directory
+        ablations: Ablations to cover (None = all)
+        topics: List of topics to include (None = all)
+        max_workers: Worker processes (None = CPU count, 0 = in-process)
+    
+    Returns:
+        Number of vectors computed
+    """
+    dataset = get_dataset(output_dir)
+    jobs: List[Tuple[Path, str, List[List[str]]]] = []
+    for topic_slug in dataset.topics(topics):
+        for rep_dir in dataset.rep_dirs(topic_slug):
+            for ablation in ablations or ABLATIONS:
+                full_preferences = dataset.load_json(get_full_preferences_path(rep_dir, ablation))
+                if full_preferences is None:
+                    continue
+                if not epsilon_100_memo(rep_dir, ablation, full_preferences).is_complete():
+                    jobs.append((rep_dir, ablation, full_preferences))
+    
+    if not jobs:
+        return 0
+    logger.info(f"Computing {len(jobs)} epsilon-100 vectors...")
+    
+    if max_workers == 0:
+        for job in jobs:
+            _compute_epsilon_100_vector(*job)
+        return len(jobs)
+    
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = {executor.submit(_compute_epsilon_100_vector, *job): job for job in jobs}
+        for future in as_completed(futures):
+            rep_dir, ablation, _ = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                # The collectors compute the vector lazily if this failed
+                logger.error(f"Epsilon-100 vector failed for {rep_dir} ({ablation}): {e}")
+    return len(jobs)
 
 
 def collect_epsilon_100_for_topic(
@@ -141,49 +239,7 @@ def collect_epsilon_100_for_topic(
     Returns:
         Dict mapping method name to list of epsilon-100 values
     """
-    results = {method: [] for method in VOTING_METHODS}
-    
-    topic_dir = output_dir / "data" / topic_slug
-    
-    if not topic_dir.exists():
-        logger.warning(f"Topic directory not found: {topic_dir}")
-        return results
-    
-    # Iterate through all rep directories
-    for rep_dir in sorted(topic_dir.glob("rep*")):
-        # Load 100-persona preferences
-        prefs_path = get_full_preferences_path(rep_dir, ablation)
-        if not prefs_path.exists():
-            logger.warning(f"Preferences file not found: {prefs_path}")
-            continue
-        
-        with open(prefs_path, 'r') as f:
-            full_preferences = json.load(f)
-        
-        # Get sample results directory
-        sample_base = get_sample_results_dir(rep_dir, ablation)
-        
-        # Iterate through all sample directories
-        for sample_dir in sorted(sample_base.glob("sample*")):
-            results_file = sample_dir / "results.json"
-            if not results_file.exists():
-                continue
-            
-            with open(results_file, 'r') as f:
-                sample_results = json.load(f)
-            
-            # Compute epsilon-100 for each method's winner
-            for method in VOTING_METHODS:
-                if method in sample_results:
-                    winner = sample_results[method].get("winner")
-                    if winner is not None:
-                        epsilon_100 = compute_epsilon_100_for_winner(
-                            full_preferences, winner
-                        )
-                        if epsilon_100 is not None:
-                            results[method].append(epsilon_100)
-    
-    return results
+    return flatten_clustered(get_dataset(output_dir).epsilon_100(topic_slug, ablation))
 
 
 def collect_epsilon_100_clustered_for_topic(
@@ -204,54 +260,7 @@ def collect_epsilon_100_clustered_for_topic(
     Returns:
         Dict mapping method name to list of lists (outer: reps, inner: samples)
     """
-    results = {method: [] for method in VOTING_METHODS}
-    
-    topic_dir = output_dir / "data" / topic_slug
-    
-    if not topic_dir.exists():
-        logger.warning(f"Topic directory not found: {topic_dir}")
-        return results
-    
-    # Iterate through all rep directories
-    for rep_dir in sorted(topic_dir.glob("rep*")):
-        # Load 100-persona preferences
-        prefs_path = get_full_preferences_path(rep_dir, ablation)
-        if not prefs_path.exists():
-            continue
-        
-        with open(prefs_path, 'r') as f:
-            full_preferences = json.load(f)
-        
-        # Get sample results directory
-        sample_base = get_sample_results_dir(rep_dir, ablation)
-        
-        # Collect all samples for this rep
-        rep_results = {method: [] for method in VOTING_METHODS}
-        
-        for sample_dir in sorted(sample_base.glob("sample*")):
-            results_file = sample_dir / "results.json"
-            if not results_file.exists():
-                continue
-            
-            with open(results_file, 'r') as f:
-                sample_results = json.load(f)
-            
-            for method in VOTING_METHODS:
-                if method in sample_results:
-                    winner = sample_results[method].get("winner")
-                    if winner is not None:
-                        epsilon_100 = compute_epsilon_100_for_winner(
-                            full_preferences, winner
-                        )
-                        if epsilon_100 is not None:
-                            rep_results[method].append(epsilon_100)
-        
-        # Add this rep's results to the clustered results
-        for method in VOTING_METHODS:
-            if rep_results[method]:
-                results[method].append(rep_results[method])
-    
-    return results
+    return get_dataset(output_dir).epsilon_100(topic_slug, ablation)
 
 
 def collect_all_epsilon_100(
@@ -272,20 +281,9 @@ def collect_all_epsilon_100(
     """
     all_results = {method: [] for method in VOTING_METHODS}
     
-    data_dir = output_dir / "data"
-    if not data_dir.exists():
-        logger.warning(f"Data directory not found: {data_dir}")
-        return all_results
-    
-    # Get all topic directories
-    if topics is None:
-        topic_dirs = [d for d in data_dir.iterdir() if d.is_dir()]
-    else:
-        topic_dirs = [data_dir / t for t in topics if (data_dir / t).exists()]
-    
-    for topic_dir in topic_dirs:
+    for topic_slug in get_dataset(output_dir).topics(topics):
         topic_results = collect_epsilon_100_for_topic(
-            topic_dir.name, output_dir, ablation
+            topic_slug, output_dir, ablation
         )
         for method in VOTING_METHODS:
             all_results[method].extend(topic_results[method])
@@ -311,20 +309,9 @@ def collect_all_epsilon_100_clustered(
     """
     all_results = {method: [] for method in VOTING_METHODS}
     
-    data_dir = output_dir / "data"
-    if not data_dir.exists():
-        logger.warning(f"Data directory not found: {data_dir}")
-        return all_results
-    
-    # Get all topic directories
-    if topics is None:
-        topic_dirs = [d for d in data_dir.iterdir() if d.is_dir()]
-    else:
-        topic_dirs = [data_dir / t for t in topics if (data_dir / t).exists()]
-    
-    for topic_dir in topic_dirs:
+    for topic_slug in get_dataset(output_dir).topics(topics):
         topic_results = collect_epsilon_100_clustered_for_topic(
-            topic_dir.name, output_dir, ablation
+            topic_slug, output_dir, ablation
         )
         for method in VOTING_METHODS:
             all_results[method].extend(topic_results[method])
@@ -355,52 +342,7 @@ def collect_epsilon_100_for_n_personas_topic(
     Returns:
         Dict mapping method name to list of epsilon-100 values
     """
-    results = {method: [] for method in VOTING_METHODS}
-    
-    topic_dir = output_dir / "data" / topic_slug
-    
-    if not topic_dir.exists():
-        logger.warning(f"Topic directory not found: {topic_dir}")
-        return results
-    
-    # Iterate through all rep directories
-    for rep_dir in sorted(topic_dir.glob("rep*")):
-        # Load 100-persona preferences
-        prefs_path = get_full_preferences_path(rep_dir, ablation)
-        if not prefs_path.exists():
-            logger.warning(f"Preferences file not found: {prefs_path}")
-            continue
-        
-        with open(prefs_path, 'r') as f:
-            full_preferences = json.load(f)
-        
-        # Get sample results directory for this persona count
-        sample_base = get_sample_results_dir_for_n_personas(rep_dir, ablation, n_personas)
-        
-        if not sample_base.exists():
-            continue
-        
-        # Iterate through all sample directories
-        for sample_dir in sorted(sample_base.glob("sample*")):
-            results_file = sample_dir / "results.json"
-            if not results_file.exists():
-                continue
-            
-            with open(results_file, 'r') as f:
-                sample_results = json.load(f)
-            
-            # Compute epsilon-100 for each method's winner
-            for method in VOTING_METHODS:
-                if method in sample_results:
-                    winner = sample_results[method].get("winner")
-                    if winner is not None:
-                        epsilon_100 = compute_epsilon_100_for_winner(
-                            full_preferences, winner
-                        )
-                        if epsilon_100 is not None:
-                            results[method].append(epsilon_100)
-    
-    return results
+    return flatten_clustered(get_dataset(output_dir).epsilon_100(topic_slug, ablation, n_personas))
 
 
 def collect_epsilon_100_for_n_personas_clustered_topic(
@@ -421,57 +363,7 @@ def collect_epsilon_100_for_n_personas_clustered_topic(
     Returns:
         Dict mapping method name to list of lists (outer: reps, inner: samples)
     """
-    results = {method: [] for method in VOTING_METHODS}
-    
-    topic_dir = output_dir / "data" / topic_slug
-    
-    if not topic_dir.exists():
-        logger.warning(f"Topic directory not found: {topic_dir}")
-        return results
-    
-    # Iterate through all rep directories
-    for rep_dir in sorted(topic_dir.glob("rep*")):
-        # Load 100-persona preferences
-        prefs_path = get_full_preferences_path(rep_dir, ablation)
-        if not prefs_path.exists():
-            continue
-        
-        with open(prefs_path, 'r') as f:
-            full_preferences = json.load(f)
-        
-        # Get sample results directory for this persona count
-        sample_base = get_sample_results_dir_for_n_personas(rep_dir, ablation, n_personas)
-        
-        if not sample_base.exists():
-            continue
-        
-        # Collect all samples for this rep
-        rep_results = {method: [] for method in VOTING_METHODS}
-        
-        for sample_dir in sorted(sample_base.glob("sample*")):
-            results_file = sample_dir / "results.json"
-            if not results_file.exists():
-                continue
-            
-            with open(results_file, 'r') as f:
-                sample_results = json.load(f)
-            
-            for method in VOTING_METHODS:
-                if method in sample_results:
-                    winner = sample_results[method].get("winner")
-                    if winner is not None:
-                        epsilon_100 = compute_epsilon_100_for_winner(
-                            full_preferences, winner
-                        )
-                        if epsilon_100 is not None:
-                            rep_results[method].append(epsilon_100)
-        
-        # Add this rep's results to the clustered results
-        for method in VOTING_METHODS:
-            if rep_results[method]:
-                results[method].append(rep_results[method])
-    
-    return results
+    return get_dataset(output_dir).epsilon_100(topic_slug, ablation, n_personas)
 
 
 def collect_all_epsilon_100_for_n_personas(
@@ -494,20 +386,9 @@ def collect_all_epsilon_100_for_n_personas(
     """
     all_results = {method: [] for method in VOTING_METHODS}
     
-    data_dir = output_dir / "data"
-    if not data_dir.exists():
-        logger.warning(f"Data directory not found: {data_dir}")
-        return all_results
-    
-    # Get all topic directories
-    if topics is None:
-        topic_dirs = [d for d in data_dir.iterdir() if d.is_dir()]
-    else:
-        topic_dirs = [data_dir / t for t in topics if (data_dir / t).exists()]
-    
-    for topic_dir in topic_dirs:
+    for topic_slug in get_dataset(output_dir).topics(topics):
         topic_results = collect_epsilon_100_for_n_personas_topic(
-            topic_dir.name, n_personas, output_dir, ablation
+            topic_slug, n_personas, output_dir, ablation
         )
         for method in VOTING_METHODS:
             all_results[method].extend(topic_results[method])
@@ -535,23 +416,11 @@ def collect_all_epsilon_100_for_n_personas_clustered(
     """
     all_results = {method: [] for method in VOTING_METHODS}
     
-    data_dir = output_dir / "data"
-    if not data_dir.exists():
-        logger.warning(f"Data directory not found: {data_dir}")
-        return all_results
-    
-    # Get all topic directories
-    if topics is None:
-        topic_dirs = [d for d in data_dir.iterdir() if d.is_dir()]
-    else:
-        topic_dirs = [data_dir / t for t in topics if (data_dir / t).exists()]
-    
-    for topic_dir in topic_dirs:
+    for topic_slug in get_dataset(output_dir).topics(topics):
         topic_results = collect_epsilon_100_for_n_personas_clustered_topic(
-            topic_dir.name, n_personas, output_dir, ablation
+            topic_slug, n_personas, output_dir, ablation
         )
         for method in VOTING_METHODS:
             all_results[method].extend(topic_results[method])
     
-    return all_results
-
+    return all_results
\ No newline at end of file
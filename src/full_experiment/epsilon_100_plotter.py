@@ -15,18 +15,20 @@ import pandas as pd
 import seaborn as sns
 
 from .config import VOTING_METHODS, OUTPUT_DIR, TOPIC_SHORT_NAMES, TOPIC_DISPLAY_NAMES
+from src.figure_build import FigureBuild
 from .visualizer import (
     METHOD_COLORS,
     METHOD_NAMES,
     BARPLOT_METHOD_ORDER,
-    compute_cluster_ci,
 )
+from .cluster_stats import summarize_clusters
 from .epsilon_100 import (
     collect_all_epsilon_100,
     collect_all_epsilon_100_clustered,
     collect_epsilon_100_for_topic,
     collect_all_epsilon_100_for_n_personas,
     collect_all_epsilon_100_for_n_personas_clustered,
+    precompute_epsilon_100_vectors,
     PERSONA_COUNTS,
 )
 
@@ -55,10 +57,12 @@ def plot_epsilon_100_barplot(
     n_clusters_list = []
     
     # Use custom order for bar plots
+    summaries = summarize_clusters(clustered_results)
     for method in BARPLOT_METHOD_ORDER:
         clusters = clustered_results.get(method, [])
         if clusters:
-            mean, ci, n_clusters = compute_cluster_ci(clusters)
+            summary = summaries[method]
+            mean, ci, n_clusters = summary.mean, summary.ci_half_width, summary.n_clusters
             if mean is not None:
                 methods.append(METHOD_NAMES.get(method, method))
                 means.append(mean)
@@ -231,11 +235,12 @@ def plot_epsilon_100_multi_persona_barplot(
         
         means = []
         cis = []
+        summaries = summarize_clusters(clustered_results)
         
         for method in BARPLOT_METHOD_ORDER:
             clusters = clustered_results.get(method, [])
             if clusters:
-                mean, ci, _ = compute_cluster_ci(clusters)
+                mean, ci = summaries[method].mean, summaries[method].ci_half_width
                 means.append(mean if mean is not None else 0)
                 cis.append(ci if ci is not None else 0)
             else:
@@ -369,7 +374,9 @@ def plot_epsilon_100_multi_persona_stripplot(
 def generate_epsilon_100_plots(
     output_dir: Path = OUTPUT_DIR,
     topics: Optional[List[str]] = None,
-    ablations: Optional[List[str]] = None
+    ablations: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    force: bool = False
 ) -> None:
     """
     Generate epsilon-100 plots for all ablations.
@@ -378,13 +385,18 @@ def generate_epsilon_100_plots(
         output_dir: Output directory
         topics: List of topics (None = auto-detect)
         ablations: List of ablations to plot
+        max_workers: Rendering processes (None = CPU count, 0 = in-process)
+        force: Re-render every figure, even if its inputs are unchanged
     """
     figures_dir = output_dir / "figures"
     figures_dir.mkdir(parents=True, exist_ok=True)
+    build = FigureBuild(figures_dir, max_workers=max_workers, force=force)
     
     if ablations is None:
         ablations = ["full", "no_bridging", "no_filtering"]
     
+    precompute_epsilon_100_vectors(output_dir, ablations, topics)
+    
     for ablation in ablations:
         logger.info(f"Generating epsilon-100 plots for ablation: {ablation}")
         
@@ -407,14 +419,16 @@ def generate_epsilon_100_plots(
         logger.info(f"  Collected {total_samples} epsilon-100 values")
         
         # Generate barplot
-        plot_epsilon_100_barplot(
+        build.add(
+            plot_epsilon_100_barplot,
             clustered_results,
             title=f"Average Epsilon (100 Personas) by Voting Method{ablation_label}",
             output_path=aggregate_dir / "epsilon_100_barplot.png"
         )
         
         # Generate stripplot
-        plot_epsilon_100_stripplot(
+        build.add(
+            plot_epsilon_100_stripplot,
             flat_results,
             title=f"Epsilon (100 Personas) Distribution by Voting Method{ablation_label}",
             output_path=aggregate_dir / "epsilon_100_stripplot.png"
@@ -440,12 +454,14 @@ def generate_epsilon_100_plots(
             topic_results = collect_epsilon_100_for_topic(topic, output_dir, ablation)
             
             # Per-topic epsilon-100 strip plot
-            plot_epsilon_100_stripplot(
+            build.add(
+                plot_epsilon_100_stripplot,
                 topic_results,
                 title=f"Epsilon (100 Personas): {display_name}{ablation_label}",
                 output_path=topic_dir / "epsilon_100_stripplot.png"
             )
     
+    build.run()
     logger.info("Epsilon-100 plot generation complete!")
 
 
@@ -453,7 +469,9 @@ def generate_multi_persona_epsilon_100_plots(
     output_dir: Path = OUTPUT_DIR,
     topics: Optional[List[str]] = None,
     ablations: Optional[List[str]] = None,
-    persona_counts: Optional[List[int]] = None
+    persona_counts: Optional[List[int]] = None,
+    max_workers: Optional[int] = None,
+    force: bool = False
 ) -> None:
     """
     Generate multi-persona comparison plots for epsilon-100.
@@ -463,9 +481,12 @@ def generate_multi_persona_epsilon_100_plots(
         topics: List of topics (None = auto-detect)
         ablations: List of ablations to plot
         persona_counts: List of persona counts to compare (default: [5, 10, 20])
+        max_workers: Rendering processes (None = CPU count, 0 = in-process)
+        force: Re-render every figure, even if its inputs are unchanged
     """
     figures_dir = output_dir / "figures"
     figures_dir.mkdir(parents=True, exist_ok=True)
+    build = FigureBuild(figures_dir, max_workers=max_workers, force=force)
     
     if ablations is None:
         ablations = ["full"]
@@ -473,6 +494,8 @@ def generate_multi_persona_epsilon_100_plots(
     if persona_counts is None:
         persona_counts = PERSONA_COUNTS
     
+    precompute_epsilon_100_vectors(output_dir, ablations, topics)
+    
     for ablation in ablations:
         logger.info(f"Generating multi-persona epsilon-100 plots for ablation: {ablation}")
         
@@ -510,19 +533,22 @@ def generate_multi_persona_epsilon_100_plots(
             continue
         
         # Generate multi-persona barplot
-        plot_epsilon_100_multi_persona_barplot(
+        build.add(
+            plot_epsilon_100_multi_persona_barplot,
             clustered_results_by_n,
             title=f"Average Epsilon (100 Personas) by Persona Count{ablation_label}",
             output_path=aggregate_dir / "epsilon_100_multi_persona_barplot.png"
         )
         
         # Generate multi-persona stripplot
-        plot_epsilon_100_multi_persona_stripplot(
+        build.add(
+            plot_epsilon_100_multi_persona_stripplot,
             flat_results_by_n,
             title=f"Epsilon (100 Personas) Distribution by Persona Count{ablation_label}",
             output_path=aggregate_dir / "epsilon_100_multi_persona_stripplot.png"
         )
     
+    build.run()
     logger.info("Multi-persona epsilon-100 plot generation complete!")
 
 
@@ -0,0 +1,233 @@
+"""
+Per-profile memo of critical epsilons.
+
+Every voting method of a sample used to compute the epsilon of its own
+winner, so a winner shared by Schulze, Borda and ChatGPT was computed three
+times, and maintenance passes (rerun_gpt_voting, backfill_chatgpt_personas)
+recomputed it again on every run. An EpsilonMemo serves the epsilons of one
+preference profile:
+
+- values are keyed by (profile content hash, alternative) and shared by
+  every memo of the same profile in the process
+- with a sample directory, values are persisted to epsilons.json next to
+  results.json (tagged with the profile hash, so an edited profile is never
+  served stale values) and later passes read them instead of recomputing;
+  writes merge with the file under an exclusive lock, so processes sharing
+  a sample directory never drop each other's values, and the file is read
+  again before computing, so values another process stored meanwhile are
+  reused
+- only the alternatives that are still missing are ever computed
+
+Usage:
+    memo = EpsilonMemo(sampled_prefs, sample_dir)
+    results = memo.attach(results)   # sets results[method]["epsilon"]
+    epsilon = memo.get("12")
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .config import EPSILON_MEMO_FILENAME
+
+logger = logging.getLogger(__name__)
+
+# (profile hash, alternative) -> epsilon, shared by all memos in this process
+_cache: Dict[Tuple[str, str], float] = {}
+_cache_lock = threading.Lock()
+
+
+def profile_hash(preferences: List[List[str]]) -> str:
+    """SHA-256 of a preference matrix [rank][voter]."""
+    payload = json.dumps(preferences, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EpsilonMemo:
+    """Critical epsilons of one preference profile, computed at most once."""
+    
+    def __init__(
+        self,
+        preferences: List[List[str]],
+        sample_dir: Optional[Path] = None,
+        filename: str = EPSILON_MEMO_FILENAME
+    ):
+        """
+        Args:
+            preferences: Preference matrix [rank][voter]
+            sample_dir: Directory to persist the epsilons in (None = process memory only)
+            filename: Name of the memo file in sample_dir
+        """
+        self.preferences = preferences
+        self.profile_hash = profile_hash(preferences)
+        self.path = Path(sample_dir) / filename if sample_dir is not None else None
+        self.alternatives = [str(i) for i in range(len(preferences))]
+        self._lock = threading.Lock()
+        self._loaded = False
+    
+    def __getstate__(self):
+        # Memos are sent to worker processes with their sample's tasks
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+    
+    def _read_file(self, warn: bool = True) -> Dict[str, float]:
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable epsilon memo {self.path}: {e}")
+            return {}
+        if data.get("profile_hash") != self.profile_hash:
+            if warn:
+                logger.warning(f"Epsilon memo {self.path} is for a different profile; recomputing")
+            return {}
+        return data.get("epsilons", {})
+    
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock on the memo file across processes."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(f"{self.path.name}.lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    
+    def _write_file(self) -> None:
+        # Read-merge-replace under the lock: other processes may be adding values
+        with self._file_lock():
+            epsilons = {**self._read_file(warn=False), **self._known()}
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "w") as f:
+                json.dump({
+                    "profile_hash": self.profile_hash,
+                    "epsilons": dict(sorted(epsilons.items(), key=lambda kv: int(kv[0]))),
+                }, f, indent=2)
+            os.replace(tmp, self.path)
+    
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        self._store(self._read_file())
+    
+    # -------------------------------------------------------------------------
+    # Values
+    # -------------------------------------------------------------------------
+    
+    def _store(self, epsilons: Dict[str, float]) -> None:
+        with _cache_lock:
+            for alternative, epsilon in epsilons.items():
+                if epsilon is not None:
+                    _cache[(self.profile_hash, str(alternative))] = epsilon
+    
+    def _known(self) -> Dict[str, float]:
+        with _cache_lock:
+            return {
+                a: _cache[(self.profile_hash, a)]
+                for a in self.alternatives
+                if (self.profile_hash, a) in _cache
+            }
+    
+    def _compute(self, alternatives: List[str]) -> Dict[str, float]:
+        from pvc_toolbox import compute_critical_epsilon
+        
+        epsilons = {}
+        for alternative in alternatives:
+            try:
+                epsilons[alternative] = compute_critical_epsilon(
+                    self.preferences, self.alternatives, alternative
+                )
+            except Exception as e:
+                # Failures are not memoized, so the next request retries
+                logger.error(f"Epsilon computation failed for winner {alternative}: {e}")
+        return epsilons
+    
+    def seed(self, results: Dict[str, Dict]) -> None:
+        """Record the epsilons already attached to results computed on this profile."""
+        self._store({
+            r["winner"]: r["epsilon"]
+            for r in results.values()
+            if isinstance(r, dict) and r.get("winner") is not None and r.get("epsilon") is not None
+        })
+    
+    def get_many(self, alternatives: Iterable[Optional[str]]) -> Dict[str, Optional[float]]:
+        """
+        Epsilons of several alternatives, computing only the missing ones.
+        
+        Args:
+            alternatives: Alternatives (statement indices as strings); None is ignored
+        
+        Returns:
+            Dict mapping each alternative to its epsilon (None if it could not be computed)
+        """
+        wanted = list(dict.fromkeys(str(a) for a in alternatives if a is not None))
+        with self._lock:
+            self._load()
+            known = self._known()
+            missing = [a for a in wanted if a not in known]
+            if missing and self.path is not None:
+                # Another process sharing the file may have stored them since the first load
+                self._store(self._read_file(warn=False))
+                known = self._known()
+                missing = [a for a in wanted if a not in known]
+            if missing:
+                computed = self._compute(missing)
+                self._store(computed)
+                known.update(computed)
+                if computed and self.path is not None:
+                    self._write_file()
+        return {a: known.get(a) for a in wanted}
+    
+    def get(self, alternative: Optional[str]) -> Optional[float]:
+        """Epsilon of one alternative (None for no alternative or a failed computation)."""
+        if alternative is None:
+            return None
+        return self.get_many([alternative])[str(alternative)]
+    
+    def is_complete(self) -> bool:
+        """Whether the epsilon of every alternative is already known."""
+        with self._lock:
+            self._load()
+            return len(self._known()) == len(self.alternatives)
+    
+    def vector(self) -> Dict[str, Optional[float]]:
+        """Epsilons of every alternative of the profile."""
+        return self.get_many(self.alternatives)
+    
+    def attach(self, results: Dict[str, Dict]) -> Dict[str, Dict]:
+        """
+        Set the "epsilon" of every method result from its winner.
+        
+        All winners are looked up together, so a winner shared by several
+        methods is computed once.
+        
+        Args:
+            results: Method name -> result dict with a "winner" key
+        
+        Returns:
+            The same dict, with "epsilon" set on every result
+        """
+        epsilons = self.get_many(r.get("winner") for r in results.values())
+        for result in results.values():
+            winner = result.get("winner")
+            result["epsilon"] = epsilons.get(str(winner)) if winner is not None else None
+        return results
@@ -25,6 +25,7 @@ from .visualizer import (
 from .epsilon_100 import (
     collect_epsilon_100_for_topic,
     collect_all_epsilon_100,
+    precompute_epsilon_100_vectors,
 )
 
 logger = logging.getLogger(__name__)
@@ -306,6 +307,8 @@ def generate_epsilon_100_report(
     if topics is None:
         topics = ALL_TOPICS
     
+    precompute_epsilon_100_vectors(output_dir, ABLATIONS, topics)
+    
     # Collect data
     aggregate_data = collect_epsilon_100_zero_proportions_by_ablation(output_dir, topics)
     topic_data = collect_epsilon_100_zero_proportions_by_topic(output_dir, topics)
@@ -2,6 +2,7 @@
 Generate multi-persona barplots with different error bar types:
 - Standard Error (SE)
 - Interquartile Range (25th-75th percentile)
+- Cluster-bootstrap 95% confidence interval
 
 Usage:
     uv run python -m src.full_experiment.generate_errorbar_variants
@@ -14,7 +15,8 @@ from typing import Dict, List, Optional, Tuple
 import matplotlib.pyplot as plt
 import numpy as np
 
-from .config import OUTPUT_DIR, ABLATIONS
+from .config import OUTPUT_DIR, ABLATIONS, BOOTSTRAP_RESAMPLES
+from .cluster_stats import summarize_cluster, summarize_clusters
 from .visualizer import (
     BARPLOT_METHOD_ORDER,
     METHOD_NAMES,
@@ -37,61 +39,21 @@ def compute_cluster_se(clustered_values: List[List[float]]) -> Tuple[Optional[fl
     Returns:
         Tuple of (grand_mean, standard_error, n_clusters)
     """
-    if not clustered_values:
-        return None, None, 0
-    
-    # Compute mean within each cluster
-    cluster_means = []
-    for cluster in clustered_values:
-        valid = [v for v in cluster if v is not None]
-        if valid:
-            cluster_means.append(np.mean(valid))
-    
-    if not cluster_means:
-        return None, None, 0
-    
-    n = len(cluster_means)
-    
-    if n < 2:
-        return np.mean(cluster_means), None, n
-    
-    grand_mean = np.mean(cluster_means)
-    se = np.std(cluster_means, ddof=1) / np.sqrt(n)
-    
-    return grand_mean, se, n
+    summary = summarize_cluster(clustered_values)
+    return summary.mean, summary.se, summary.n_clusters
 
 
 def compute_cluster_iqr(clustered_values: List[List[float]]) -> Tuple[Optional[float], Optional[float], Optional[float], int]:
     """
     Compute cluster-aware IQR (25th and 75th percentiles).
     
+    Uses the mean as center (not median) for consistency with other plots.
+    
     Returns:
-        Tuple of (median, p25, p75, n_clusters)
+        Tuple of (mean, p25, p75, n_clusters)
     """
-    if not clustered_values:
-        return None, None, None, 0
-    
-    # Compute mean within each cluster
-    cluster_means = []
-    for cluster in clustered_values:
-        valid = [v for v in cluster if v is not None]
-        if valid:
-            cluster_means.append(np.mean(valid))
-    
-    if not cluster_means:
-        return None, None, None, 0
-    
-    n = len(cluster_means)
-    
-    if n < 2:
-        return np.mean(cluster_means), None, None, n
-    
-    # Use mean as center (not median) for consistency with other plots
-    grand_mean = np.mean(cluster_means)
-    p25 = np.percentile(cluster_means, 25)
-    p75 = np.percentile(cluster_means, 75)
-    
-    return grand_mean, p25, p75, n
+    summary = summarize_cluster(clustered_values)
+    return summary.mean, summary.p25, summary.p75, summary.n_clusters
 
 
 def plot_multi_persona_barplot_se(
@@ -121,11 +83,12 @@ def plot_multi_persona_barplot_se(
         
         means = []
         ses = []
+        summaries = summarize_clusters(clustered_results)
         
         for method in BARPLOT_METHOD_ORDER:
             clusters = clustered_results.get(method, [])
             if clusters:
-                mean, se, _ = compute_cluster_se(clusters)
+                mean, se = summaries[method].mean, summaries[method].se
                 means.append(mean if mean is not None else 0)
                 ses.append(se if se is not None else 0)
             else:
@@ -195,11 +158,13 @@ def plot_multi_persona_barplot_iqr(
         means = []
         lower_errs = []
         upper_errs = []
+        summaries = summarize_clusters(clustered_results)
         
         for method in BARPLOT_METHOD_ORDER:
             clusters = clustered_results.get(method, [])
             if clusters:
-                mean, p25, p75, _ = compute_cluster_iqr(clusters)
+                summary = summaries[method]
+                mean, p25, p75 = summary.mean, summary.p25, summary.p75
                 if mean is not None:
                     means.append(mean)
                     # Error bars: distance from mean to percentiles (ensure non-negative)
@@ -249,12 +214,85 @@ def plot_multi_persona_barplot_iqr(
     plt.close()
 
 
+def plot_multi_persona_barplot_bootstrap(
+    results_by_n_personas: Dict[int, Dict[str, List[List[float]]]],
+    title: str,
+    output_path: Path,
+    n_bootstrap: int = BOOTSTRAP_RESAMPLES
+) -> None:
+    """Plot multi-persona barplot with cluster-bootstrap 95% CI bars."""
+    
+    fig, ax = plt.subplots(figsize=(14, 6))
+    
+    persona_counts = sorted(results_by_n_personas.keys())
+    n_bars = len(persona_counts)
+    n_methods = len(BARPLOT_METHOD_ORDER)
+    
+    x = np.arange(n_methods)
+    bar_width = 0.8 / n_bars
+    
+    persona_colors = {
+        5: '#3498db',   # blue
+        10: '#e67e22',  # orange
+        20: '#27ae60',  # green
+    }
+    
+    for i, n_personas in enumerate(persona_counts):
+        clustered_results = results_by_n_personas[n_personas]
+        
+        means = []
+        lower_errs = []
+        upper_errs = []
+        summaries = summarize_clusters(clustered_results, n_bootstrap=n_bootstrap)
+        
+        for method in BARPLOT_METHOD_ORDER:
+            summary = summaries.get(method)
+            if summary is not None and summary.mean is not None:
+                means.append(summary.mean)
+                # Percentile CIs can be asymmetric around the mean
+                lower_errs.append(max(0, summary.mean - summary.boot_low) if summary.boot_low is not None else 0)
+                upper_errs.append(max(0, summary.boot_high - summary.mean) if summary.boot_high is not None else 0)
+            else:
+                means.append(0)
+                lower_errs.append(0)
+                upper_errs.append(0)
+        
+        offset = (i - (n_bars - 1) / 2) * bar_width
+        color = persona_colors.get(n_personas, '#333333')
+        
+        ax.bar(
+            x + offset,
+            means,
+            bar_width,
+            yerr=[lower_errs, upper_errs],
+            capsize=3,
+            color=color,
+            alpha=0.8,
+            label=f'{n_personas} personas'
+        )
+    
+    ax.set_xlabel("Voting Method", fontsize=12)
+    ax.set_ylabel("Average Epsilon (ε) [bootstrap 95% CI]", fontsize=12)
+    ax.set_title(title, fontsize=14)
+    ax.set_xticks(x)
+    ax.set_xticklabels([METHOD_NAMES.get(m, m) for m in BARPLOT_METHOD_ORDER], rotation=45, ha='right')
+    ax.grid(True, alpha=0.3, axis='y')
+    ax.legend(loc='upper right')
+    
+    plt.tight_layout()
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    logger.info(f"Saved bootstrap CI barplot to {output_path}")
+    plt.close()
+
+
 def generate_all_errorbar_variants(
     output_dir: Path = OUTPUT_DIR,
     ablations: Optional[List[str]] = None,
     persona_counts: Optional[List[int]] = None
 ) -> None:
-    """Generate SE and IQR variants for all ablations."""
+    """Generate SE, IQR and bootstrap CI variants for all ablations."""
     
     if ablations is None:
         ablations = ABLATIONS
@@ -301,6 +339,13 @@ def generate_all_errorbar_variants(
                 output_path=figures_dir / "epsilon_multi_persona_barplot_iqr.png"
             )
         
+            # Generate bootstrap CI variant
+            plot_multi_persona_barplot_bootstrap(
+                clustered_results_by_n,
+                title=f"Average Epsilon by Persona Count{ablation_label} (bootstrap 95% CI)",
+                output_path=figures_dir / "epsilon_multi_persona_barplot_bootstrap.png"
+            )
+        
         # Collect epsilon-100 data
         logger.info("Collecting epsilon-100 data...")
         clustered_100_by_n = {}
@@ -331,6 +376,13 @@ def generate_all_errorbar_variants(
                 output_path=figures_dir / "epsilon_100_multi_persona_barplot_iqr.png"
             )
     
+            # Generate bootstrap CI variant
+            plot_multi_persona_barplot_bootstrap(
+                clustered_100_by_n,
+                title=f"Average Epsilon (100 Personas) by Persona Count{ablation_label} (bootstrap 95% CI)",
+                output_path=figures_dir / "epsilon_100_multi_persona_barplot_bootstrap.png"
+            )
+    
     logger.info("\n" + "="*60)
     logger.info("All error bar variant plots generated!")
     logger.info("="*60)
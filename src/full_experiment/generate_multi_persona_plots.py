@@ -10,6 +10,9 @@ Usage:
 
 import logging
 from pathlib import Path
+from typing import Optional
+
+from src.figure_build import FigureBuild
 
 from .config import OUTPUT_DIR, ALL_TOPICS
 from .visualizer import (
@@ -35,7 +38,8 @@ def generate_multi_persona_epsilon_plots(
     output_dir: Path = OUTPUT_DIR,
     topics: list = None,
     ablation: str = "full",
-    persona_counts: list = None
+    persona_counts: list = None,
+    build: Optional[FigureBuild] = None
 ) -> None:
     """
     Generate multi-persona comparison plots for epsilon (N personas).
@@ -45,12 +49,16 @@ def generate_multi_persona_epsilon_plots(
         topics: List of topics (None = all)
         ablation: Ablation type
         persona_counts: List of persona counts to compare
+        build: Figure build to queue the plots on (None = render them now)
     """
     if persona_counts is None:
         persona_counts = PERSONA_COUNTS
     
     figures_dir = output_dir / "figures" / ablation / "aggregate"
     figures_dir.mkdir(parents=True, exist_ok=True)
+    own_build = build is None
+    if own_build:
+        build = FigureBuild(output_dir / "figures")
     
     ablation_label = f" ({ablation.replace('_', ' ')})" if ablation != "full" else ""
     
@@ -83,7 +91,8 @@ def generate_multi_persona_epsilon_plots(
     
     # Generate barplot
     logger.info("Generating epsilon barplot...")
-    plot_epsilon_multi_persona_barplot(
+    build.add(
+        plot_epsilon_multi_persona_barplot,
         clustered_results_by_n,
         title=f"Average Epsilon by Persona Count{ablation_label}",
         output_path=figures_dir / "epsilon_multi_persona_barplot.png"
@@ -91,12 +100,15 @@ def generate_multi_persona_epsilon_plots(
     
     # Generate stripplot
     logger.info("Generating epsilon stripplot...")
-    plot_epsilon_multi_persona_stripplot(
+    build.add(
+        plot_epsilon_multi_persona_stripplot,
         flat_results_by_n,
         title=f"Epsilon Distribution by Persona Count{ablation_label}",
         output_path=figures_dir / "epsilon_multi_persona_stripplot.png"
     )
     
+    if own_build:
+        build.run()
     logger.info("Epsilon multi-persona plots complete!")
 
 
@@ -104,7 +116,8 @@ def generate_multi_persona_epsilon_100_plots_wrapper(
     output_dir: Path = OUTPUT_DIR,
     topics: list = None,
     ablation: str = "full",
-    persona_counts: list = None
+    persona_counts: list = None,
+    build: Optional[FigureBuild] = None
 ) -> None:
     """
     Generate multi-persona comparison plots for epsilon-100.
@@ -114,6 +127,7 @@ def generate_multi_persona_epsilon_100_plots_wrapper(
         topics: List of topics (None = all)
         ablation: Ablation type
         persona_counts: List of persona counts to compare
+        build: Figure build to queue the plots on (None = render them now)
     """
     from .epsilon_100_plotter import (
         plot_epsilon_100_multi_persona_barplot,
@@ -125,6 +139,9 @@ def generate_multi_persona_epsilon_100_plots_wrapper(
     
     figures_dir = output_dir / "figures" / ablation / "aggregate"
     figures_dir.mkdir(parents=True, exist_ok=True)
+    own_build = build is None
+    if own_build:
+        build = FigureBuild(output_dir / "figures")
     
     ablation_label = f" ({ablation.replace('_', ' ')})" if ablation != "full" else ""
     
@@ -157,7 +174,8 @@ def generate_multi_persona_epsilon_100_plots_wrapper(
     
     # Generate barplot
     logger.info("Generating epsilon-100 barplot...")
-    plot_epsilon_100_multi_persona_barplot(
+    build.add(
+        plot_epsilon_100_multi_persona_barplot,
         clustered_results_by_n,
         title=f"Average Epsilon (100 Personas) by Persona Count{ablation_label}",
         output_path=figures_dir / "epsilon_100_multi_persona_barplot.png"
@@ -165,12 +183,15 @@ def generate_multi_persona_epsilon_100_plots_wrapper(
     
     # Generate stripplot
     logger.info("Generating epsilon-100 stripplot...")
-    plot_epsilon_100_multi_persona_stripplot(
+    build.add(
+        plot_epsilon_100_multi_persona_stripplot,
         flat_results_by_n,
         title=f"Epsilon (100 Personas) Distribution by Persona Count{ablation_label}",
         output_path=figures_dir / "epsilon_100_multi_persona_stripplot.png"
     )
     
+    if own_build:
+        build.run()
     logger.info("Epsilon-100 multi-persona plots complete!")
 
 
@@ -188,7 +209,8 @@ def main():
         topics = ALL_TOPICS
         logger.info("Using default topics list")
     
-    # Generate plots for all ablations
+    # Queue plots for all ablations, then render the stale ones in parallel
+    build = FigureBuild(output_dir / "figures")
     for ablation in ABLATIONS:
         logger.info("=" * 60)
         logger.info(f"Generating multi-persona plots for ablation: {ablation}")
@@ -200,7 +222,8 @@ def main():
             output_dir=output_dir,
             topics=topics,
             ablation=ablation,
-            persona_counts=[5, 10, 20]
+            persona_counts=[5, 10, 20],
+            build=build
         )
         
         # Generate epsilon-100 plots (computed against 100 personas)
@@ -209,9 +232,12 @@ def main():
             output_dir=output_dir,
             topics=topics,
             ablation=ablation,
-            persona_counts=[5, 10, 20]
+            persona_counts=[5, 10, 20],
+            build=build
         )
     
+    build.run()
+    
     logger.info("=" * 60)
     logger.info("All multi-persona plots generated for all ablations!")
     logger.info("=" * 60)
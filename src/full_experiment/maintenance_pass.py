@@ -0,0 +1,377 @@
+"""
+Parallel, resumable maintenance passes over existing sample results.
+
+Maintenance scripts (rerun_gpt_voting, backfill_chatgpt_personas) revisit
+every sample directory of the output tree, run a few LLM methods and merge
+the new results into results.json. A MaintenancePass only declares which
+method calls a sample needs; run_maintenance_pass does the rest:
+
+- walks the tree once (every topic, rep, ablation and persona count) into a
+  work queue of samples, loading each ablation's statements only once
+- runs the method calls of all samples in a thread pool bounded by
+  max_workers, then attaches the critical epsilon of each new winner from
+  the sample's epsilon memo (winners already scored are not recomputed)
+- writes results.json with write-then-rename once all of a sample's calls
+  have finished, so a crash never leaves a half-written file
+- records fully successful samples in a manifest
+  (outputs/full_experiment/maintenance/<pass name>.json) and skips them
+  when the pass is resumed
+- in dry-run mode, only reports how many samples and calls the pass would run
+
+Usage:
+    class MyPass(MaintenancePass):
+        name = "my_pass"
+        def plan(self, sample):
+            return [MethodCall("chatgpt", run_chatgpt, (sample.stmt_dicts, self.client))]
+    
+    run_maintenance_pass(MyPass(), output_dir, dry_run=True)
+"""
+
+import json
+import logging
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .config import ABLATIONS, MAX_WORKERS
+from .data_loader import load_all_statements
+from .epsilon_memo import EpsilonMemo
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_DIRNAME = "maintenance"
+PERSONA_COUNT_DIRS = ["5-personas", "10-personas"]
+
+
+@dataclass
+class SampleContext:
+    """Everything a pass needs to plan the calls for one sample directory."""
+    sample_dir: Path
+    rel_path: str                   # Relative to the data directory (manifest key)
+    results: Dict                   # Current contents of results.json
+    preferences: List[List[str]]    # Sampled preference matrix [rank][voter]
+    stmt_dicts: List[Dict]          # Statements shown to the LLM methods
+    personas: List[str]             # Personas of the sampled voters
+
+
+@dataclass
+class MethodCall:
+    """One LLM method to run for a sample: func(*args) returns a result dict with "winner"."""
+    method: str
+    func: Callable[..., Dict]
+    args: tuple = ()
+
+
+class MaintenancePass:
+    """Base class: subclasses set name and implement plan()."""
+    name: str = "maintenance"
+    
+    def plan(self, sample: SampleContext) -> List[MethodCall]:
+        """Calls to run for this sample (empty = nothing to do)."""
+        raise NotImplementedError
+
+
+# =============================================================================
+# Loading
+# =============================================================================
+
+def load_statements_and_personas_for_ablation(rep_dir: Path, ablation: str, topic_slug: str):
+    """
+    Load statements and personas for a specific ablation.
+    
+    For 'full' ablation: load filtered statements based on filter_assignments.json
+    For 'no_filtering': load all bridging statements
+    For 'no_bridging': load original Polis statements (not bridging statements)
+    
+    Returns:
+        (stmt_dicts, all_personas) tuple
+    """
+    if ablation == "no_bridging":
+        # no_bridging uses original Polis statements, not bridging statements
+        indices_path = rep_dir / "sampled_indices.json"
+        if not indices_path.exists():
+            return None, None
+        
+        with open(indices_path) as f:
+            sampled_indices = json.load(f)
+        
+        all_entries = load_all_statements(topic_slug)
+        
+        all_personas = [all_entries[i]["persona"] for i in sampled_indices]
+        stmt_dicts = [{"statement": all_entries[i]["statement"]} for i in sampled_indices]
+        
+        return stmt_dicts, all_personas
+    else:
+        bridging_path = rep_dir / "bridging_statements.json"
+        
+        if not bridging_path.exists():
+            return None, None
+        
+        with open(bridging_path) as f:
+            bridging_statements = json.load(f)
+        
+        all_personas = [s.get("persona", f"Voter {i}") for i, s in enumerate(bridging_statements)]
+        stmt_dicts = [{"statement": s["statement"]} for s in bridging_statements]
+        
+        # For 'full' ablation, filter statements based on filter_assignments
+        if ablation == "full":
+            filter_path = rep_dir / "filter_assignments.json"
+            if filter_path.exists():
+                with open(filter_path) as f:
+                    assignments = json.load(f)
+                kept_indices = sorted([
+                    a["statement_idx"]
+                    for a in assignments
+                    if a["keep"] == 1
+                ])
+                if len(stmt_dicts) > len(kept_indices):
+                    stmt_dicts = [stmt_dicts[i] for i in kept_indices]
+        
+        return stmt_dicts, all_personas
+
+
+def load_sample_data(sample_dir: Path) -> Tuple[Optional[List[List[str]]], Optional[List[int]]]:
+    """
+    Load preferences and persona indices for a sample.
+    
+    Returns:
+        (preferences, persona_indices) tuple
+    """
+    # Load sampled preferences
+    prefs_path = sample_dir / "sampled_preferences.json"
+    if not prefs_path.exists():
+        prefs_path = sample_dir / "preferences.json"
+    if not prefs_path.exists():
+        return None, None
+    
+    with open(prefs_path) as f:
+        preferences = json.load(f)
+    
+    # Load sampled persona indices
+    indices_path = sample_dir / "sampled_persona_indices.json"
+    if not indices_path.exists():
+        indices_path = sample_dir / "persona_indices.json"
+    if not indices_path.exists():
+        # For 20-persona samples, infer from preferences
+        n_voters = len(preferences[0]) if preferences else 0
+        persona_indices = list(range(n_voters))
+    else:
+        with open(indices_path) as f:
+            persona_indices = json.load(f)
+    
+    return preferences, persona_indices
+
+
+def iter_sample_dirs(data_dir: Path, ablations: List[str] = ABLATIONS) -> Iterator[Tuple[Path, List[Dict], List[str]]]:
+    """
+    Walk every sample directory of the output tree.
+    
+    Yields:
+        (sample_dir, stmt_dicts, all_personas) for every sample directory of
+        every topic, rep, ablation and persona count
+    """
+    for topic_dir in sorted(data_dir.iterdir()):
+        if not topic_dir.is_dir() or topic_dir.name.startswith("pvc"):
+            continue
+        
+        for rep_dir in sorted(topic_dir.glob("rep*")):
+            for ablation in ablations:
+                stmt_dicts, all_personas = load_statements_and_personas_for_ablation(
+                    rep_dir, ablation, topic_dir.name
+                )
+                if stmt_dicts is None:
+                    continue
+                
+                ablation_base = rep_dir if ablation == "full" else rep_dir / f"ablation_{ablation}"
+                if not ablation_base.exists():
+                    continue
+                
+                # 20-persona samples live directly in ablation_base, the others in subdirectories
+                for base in [ablation_base] + [ablation_base / d for d in PERSONA_COUNT_DIRS]:
+                    for sample_dir in sorted(base.glob("sample*")):
+                        if sample_dir.is_dir():
+                            yield sample_dir, stmt_dicts, all_personas
+
+
+# =============================================================================
+# Manifest and writes
+# =============================================================================
+
+def atomic_write_json(data, path: Path, indent: Optional[int] = 2) -> None:
+    """Write JSON to a temporary file next to path, then rename it over path."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class PassManifest:
+    """Sample directories a pass has completed, persisted after every sample."""
+    
+    def __init__(self, path: Path, restart: bool = False):
+        """
+        Args:
+            path: Manifest file
+            restart: Ignore (and overwrite) previously completed samples
+        """
+        self.path = path
+        self.completed: Set[str] = set()
+        if path.exists() and not restart:
+            with open(path) as f:
+                self.completed = set(json.load(f).get("completed", []))
+    
+    def __contains__(self, rel_path: str) -> bool:
+        return rel_path in self.completed
+    
+    def add(self, rel_path: str) -> None:
+        self.completed.add(rel_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json({"completed": sorted(self.completed)}, self.path, indent=None)
+
+
+# =============================================================================
+# Running a pass
+# =============================================================================
+
+@dataclass
+class _PendingSample:
+    context: SampleContext
+    calls: List[MethodCall]
+    new_results: Dict[str, Dict] = field(default_factory=dict)
+    failed: bool = False
+
+
+def run_maintenance_pass(
+    mpass: MaintenancePass,
+    output_dir: Path,
+    ablations: List[str] = ABLATIONS,
+    max_workers: int = MAX_WORKERS,
+    dry_run: bool = False,
+    restart: bool = False
+) -> Dict[str, int]:
+    """
+    Run a maintenance pass over every sample directory.
+    
+    Args:
+        mpass: The pass (decides which calls each sample needs)
+        output_dir: Experiment output directory (contains data/)
+        ablations: Ablations to visit
+        max_workers: Maximum concurrent method calls
+        dry_run: Only count the samples and calls the pass would run
+        restart: Ignore the manifest and revisit completed samples
+    
+    Returns:
+        Counts of "samples", "planned", "calls", "updated", "skipped",
+        "resumed" (completed in an earlier run) and "errors"
+    """
+    data_dir = output_dir / "data"
+    manifest = PassManifest(output_dir / MANIFEST_DIRNAME / f"{mpass.name}.json", restart=restart)
+    counts = Counter(samples=0, planned=0, calls=0, updated=0, skipped=0, resumed=0, errors=0)
+    calls_by_method = Counter()
+    
+    # Build the work queue
+    queue: List[_PendingSample] = []
+    for sample_dir, stmt_dicts, all_personas in iter_sample_dirs(data_dir, ablations):
+        results_path = sample_dir / "results.json"
+        if not results_path.exists():
+            continue
+        counts["samples"] += 1
+        
+        rel_path = str(sample_dir.relative_to(data_dir))
+        if rel_path in manifest:
+            counts["resumed"] += 1
+            continue
+        
+        with open(results_path) as f:
+            results = json.load(f)
+        
+        preferences, persona_indices = load_sample_data(sample_dir)
+        if preferences is None:
+            logger.warning(f"  Missing preferences: {sample_dir}")
+            counts["errors"] += 1
+            continue
+        
+        # Get personas for sampled voters
+        try:
+            personas = [all_personas[i] for i in persona_indices]
+        except IndexError:
+            personas = all_personas[:len(persona_indices)]
+        
+        context = SampleContext(sample_dir, rel_path, results, preferences, stmt_dicts, personas)
+        calls = mpass.plan(context)
+        if not calls:
+            counts["skipped"] += 1
+            continue
+        
+        queue.append(_PendingSample(context, calls))
+        counts["planned"] += 1
+        counts["calls"] += len(calls)
+        calls_by_method.update(call.method for call in calls)
+    
+    logger.info(
+        f"{mpass.name}: {counts['samples']} samples, {counts['planned']} to update "
+        f"({counts['calls']} calls: {dict(calls_by_method)}), {counts['skipped']} up to date, "
+        f"{counts['resumed']} already completed"
+    )
+    if dry_run or not queue:
+        return dict(counts)
+    
+    remaining = {id(pending): len(pending.calls) for pending in queue}
+    
+    def finish(pending: _PendingSample) -> None:
+        context = pending.context
+        if not pending.new_results:
+            counts["errors"] += 1
+            return
+        memo = EpsilonMemo(context.preferences, context.sample_dir)
+        memo.seed(context.results)
+        try:
+            memo.attach(pending.new_results)
+        except Exception as e:
+            logger.warning(f"    Epsilon computation failed for {context.rel_path}: {e}")
+            for result in pending.new_results.values():
+                result.setdefault("epsilon", None)
+        # Merge in call order so results.json key order does not depend on timing
+        context.results.update({
+            call.method: pending.new_results[call.method]
+            for call in pending.calls
+            if call.method in pending.new_results
+        })
+        atomic_write_json(context.results, context.sample_dir / "results.json")
+        counts["updated"] += 1
+        if pending.failed or any("error" in r for r in pending.new_results.values()):
+            counts["errors"] += 1
+        else:
+            manifest.add(context.rel_path)
+        logger.info(f"  {context.rel_path}: " + ", ".join(
+            f"{m}={r.get('winner')} (eps={r.get('epsilon')})" for m, r in pending.new_results.items()
+        ))
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(call.func, *call.args): (pending, call)
+            for pending in queue
+            for call in pending.calls
+        }
+        for future in as_completed(futures):
+            pending, call = futures[future]
+            try:
+                pending.new_results[call.method] = future.result()
+            except Exception as e:
+                logger.error(f"    {pending.context.rel_path} {call.method} failed: {e}")
+                pending.failed = True
+            
+            remaining[id(pending)] -= 1
+            if remaining[id(pending)] == 0:
+                finish(pending)
+    
+    logger.info(
+        f"{mpass.name} complete: {counts['updated']} updated, {counts['skipped']} up to date, "
+        f"{counts['resumed']} already completed, {counts['errors']} with errors"
+    )
+    return dict(counts)
@@ -4,16 +4,19 @@ Build preference profiles and Likert ratings using LLM-based ranking.
 Uses the hybrid insertion sort from large_scale for efficient ranking.
 """
 
+from __future__ import annotations
+
 import json
 import logging
-from typing import List, Dict
+from typing import TYPE_CHECKING, List, Dict
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from openai import OpenAI
 
 import time
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 from .config import (
     MODEL,
@@ -25,6 +28,7 @@ from .config import (
 
 # Import the hybrid insertion sort from large_scale
 from src.large_scale.insertion_ranking import get_preference_matrix_hybrid
+from src.typed_responses import LIKERT_RATING, parse_response
 
 logger = logging.getLogger(__name__)
 
@@ -141,17 +145,12 @@ Return only the JSON, no additional text."""
             {"role": "user", "content": user_prompt}
         ],
         temperature=TEMPERATURE,
-        reasoning={"effort": "minimal"}
+        reasoning={"effort": "minimal"},
+        text=LIKERT_RATING.text_format,
     )
     api_timer.record(time.time() - start_time)
     
-    result = json.loads(response.output_text)
-    rating = result.get("rating", 3)
-    
-    # Ensure valid range
-    rating = max(1, min(5, int(rating)))
-    
-    return rating
+    return parse_response(response, LIKERT_RATING)
 
 
 def build_full_likert(
@@ -4,22 +4,31 @@ Main experiment orchestration script.
 Usage:
     uv run python -m src.full_experiment.run_experiment --test
     uv run python -m src.full_experiment.run_experiment
+    
+    # Split across machines sharing the output dir (static shard, or dynamic claiming)
+    uv run python -m src.full_experiment.run_experiment --shard 0/4
+    uv run python -m src.full_experiment.run_experiment --claim
 """
 
+from __future__ import annotations
+
 import argparse
 import json
 import logging
 import sys
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 from dotenv import load_dotenv
-from openai import OpenAI
 
 # Load environment variables from .env file
 load_dotenv()
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 from .config import (
     OUTPUT_DIR,
+    MAX_WORKERS,
     ALL_TOPICS,
     TEST_TOPICS,
     N_STATEMENT_REPS,
@@ -69,15 +78,19 @@ from .statement_filter import (
     save_filtered_likert,
     load_filtered_likert,
 )
+from .epsilon_memo import EpsilonMemo
 from .voting_runner import (
     sample_personas_for_voting,
     extract_sampled_preferences,
-    run_all_voting_methods,
+    voting_method_tasks,
     save_voting_results,
     save_sampled_persona_indices,
     save_sampled_preferences,
 )
-from .visualizer import generate_all_plots
+from src.api_budget import BudgetedClient
+from src.sampling_experiment.voting_executor import VotingExecutor
+from src.typed_responses import format_stats
+from src.work_claims import CLAIMS_DIRNAME, Shard, WorkClaims, add_distribution_args, run_grid
 
 
 def setup_logging(output_dir: Path, test_mode: bool = False) -> None:
@@ -278,6 +291,9 @@ def run_single_experiment(
     # =========================================================================
     logger.info("Steps 5-7: Running voting methods...")
     
+    # Collect every pending sample's methods, then evaluate them all at once
+    pending_samples = {}
+    epsilon_finalizers = {}
     for sample_idx in range(n_persona_samples):
         sample_dir = data_dir / f"sample{sample_idx}"
         
@@ -285,7 +301,7 @@ def run_single_experiment(
             logger.info(f"  Sample {sample_idx}: cached, skipping")
             continue
         
-        logger.info(f"  Sample {sample_idx}: Running...")
+        logger.info(f"  Sample {sample_idx}: Queued...")
         
         # Sample personas
         sample_seed = seed * 100 + sample_idx
@@ -302,18 +318,22 @@ def run_single_experiment(
         save_sampled_persona_indices(sampled_persona_indices, sample_dir)
         save_sampled_preferences(sampled_prefs, sample_dir)
         
-        # Run voting methods
-        results = run_all_voting_methods(
+        pending_samples[sample_dir] = voting_method_tasks(
             sampled_prefs, filtered_stmt_dicts, openai_client
         )
+        epsilon_finalizers[sample_dir] = EpsilonMemo(sampled_prefs, sample_dir).attach
         
-        # Save results
+    def save_sample(sample_dir: Path, results: Dict) -> None:
         save_voting_results(results, sample_dir)
-        
-        logger.info(f"    Winners: " + ", ".join(
+        logger.info(f"    {sample_dir.name} winners: " + ", ".join(
             f"{m}={r.get('winner')}" for m, r in results.items()
         ))
     
+    if pending_samples:
+        with VotingExecutor() as executor:
+            executor.run(pending_samples, on_sample_done=save_sample,
+                         sample_finalizers=epsilon_finalizers)
+    
     logger.info(f"Completed: {topic_slug} rep{rep_idx} {ablation}")
 
 
@@ -322,10 +342,17 @@ def run_full_experiment(
     ablations: list,
     output_dir: Path,
     openai_client: OpenAI,
-    test_mode: bool = False
+    test_mode: bool = False,
+    shard: Optional[Shard] = None,
+    claims: Optional[WorkClaims] = None
 ) -> None:
     """
     Run the full experiment across all topics, repetitions, and ablations.
+    
+    The grid cell is a (topic, rep): its ablations share the rep's bridging
+    statements and preferences, so one worker runs them all. With a shard or
+    claims, other workers share the grid and plots are left to a final
+    unsharded run (or the plotting scripts).
     """
     logger = logging.getLogger(__name__)
     
@@ -341,34 +368,52 @@ def run_full_experiment(
     logger.info(f"Ablations: {ablations}")
     logger.info("=" * 80)
     
-    for topic_idx, topic_slug in enumerate(topics):
-        logger.info(f"\n{'#' * 80}")
-        logger.info(f"TOPIC {topic_idx + 1}/{len(topics)}: {topic_slug}")
-        logger.info(f"{'#' * 80}")
+    # Entries (persona + statement bundled) are loaded once per topic, on its first owned rep
+    entries_by_topic = {}
         
-        # Load all entries for this topic (each has persona + statement bundled)
-        all_entries = load_all_statements(topic_slug)
+    def run_rep(cell: Tuple[str, int]) -> None:
+        topic_slug, rep_idx = cell
+        if topic_slug not in entries_by_topic:
+            logger.info(f"\n{'#' * 80}")
+            logger.info(f"TOPIC {topics.index(topic_slug) + 1}/{len(topics)}: {topic_slug}")
+            logger.info(f"{'#' * 80}")
+            entries_by_topic[topic_slug] = load_all_statements(topic_slug)
         
-        for rep_idx in range(n_reps):
-            for ablation in ablations:
-                try:
-                    run_single_experiment(
-                        topic_slug,
-                        rep_idx,
-                        ablation,
-                        all_entries,
-                        openai_client,
-                        output_dir,
-                        n_persona_samples=n_samples
-                    )
-                except Exception as e:
-                    logger.error(f"Failed: {topic_slug} rep{rep_idx} {ablation}: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
+        for ablation in ablations:
+            try:
+                run_single_experiment(
+                    topic_slug,
+                    rep_idx,
+                    ablation,
+                    entries_by_topic[topic_slug],
+                    openai_client,
+                    output_dir,
+                    n_persona_samples=n_samples
+                )
+            except Exception as e:
+                logger.error(f"Failed: {topic_slug} rep{rep_idx} {ablation}: {e}")
+                import traceback
+                logger.error(traceback.format_exc())
+    
+    run_grid(
+        [(topic_slug, rep_idx) for topic_slug in topics for rep_idx in range(n_reps)],
+        key=lambda cell: f"{cell[0]}/rep{cell[1]}",
+        fn=run_rep,
+        shard=shard,
+        claims=claims
+    )
+    format_stats.log_stats()
+    
+    if shard is not None or claims is not None:
+        logger.info("\nSharded run: skipping plots (run once unsharded to generate them)")
+        logger.info("\nEXPERIMENT COMPLETE")
+        return
     
     # Generate plots
     logger.info("\nGenerating plots...")
     try:
+        # matplotlib/seaborn/scipy are only needed here
+        from .visualizer import generate_all_plots
         generate_all_plots(output_dir, topics, ablations)
     except Exception as e:
         logger.error(f"Plot generation failed: {e}")
@@ -402,6 +447,7 @@ def main():
         default=OUTPUT_DIR,
         help="Output directory"
     )
+    add_distribution_args(parser)
     
     args = parser.parse_args()
     
@@ -425,10 +471,19 @@ def main():
     logger.info(f"Ablations: {ablations}")
     
     # Create OpenAI client with 60s read timeout
-    openai_client = OpenAI(timeout=60.0)
+    from openai import OpenAI
+    openai_client = BudgetedClient(OpenAI(timeout=60.0), MAX_WORKERS)
     
     # Run experiment
-    run_full_experiment(topics, ablations, args.output_dir, openai_client, test_mode=args.test)
+    claims = WorkClaims(args.output_dir / CLAIMS_DIRNAME) if args.claim else None
+    try:
+        run_full_experiment(
+            topics, ablations, args.output_dir, openai_client, test_mode=args.test,
+            shard=args.shard, claims=claims
+        )
+    finally:
+        if claims is not None:
+            claims.close()
 
 
 if __name__ == "__main__":
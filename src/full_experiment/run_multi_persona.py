@@ -3,6 +3,10 @@ Run voting experiments with different persona counts (5, 10 personas).
 
 This script reuses existing preference profiles and runs voting methods
 with fewer personas than the standard 20, storing results in subdirectories.
+All persona counts of a rep are evaluated together: the rep is loaded once,
+samples are nested draws from one seeded stream, the traditional methods run
+as one batched job (see batched_voting.py) and the ChatGPT methods of every
+sample run concurrently.
 
 Usage:
     uv run python -m src.full_experiment.run_multi_persona
@@ -10,20 +14,25 @@ Usage:
     uv run python -m src.full_experiment.run_multi_persona --test
 """
 
+from __future__ import annotations
+
 import argparse
 import json
 import logging
 import sys
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-from openai import OpenAI
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 # Load environment variables from .env file
 load_dotenv()
 
 from .config import (
     OUTPUT_DIR,
+    MAX_WORKERS,
     ALL_TOPICS,
     TEST_TOPICS,
     N_PERSONA_SAMPLES,
@@ -34,14 +43,18 @@ from .config import (
     ABLATIONS,
 )
 from .voting_runner import (
-    sample_personas_for_voting,
+    sample_nested_personas,
     extract_sampled_preferences,
-    run_all_voting_methods,
+    voting_method_tasks,
     save_voting_results,
     save_sampled_persona_indices,
     save_sampled_preferences,
 )
+from .epsilon_memo import EpsilonMemo
+from .batched_voting import StackedProfiles, TRADITIONAL_METHODS, evaluate_traditional_methods
 from .data_loader import check_cache_exists
+from src.api_budget import BudgetedClient
+from src.sampling_experiment.voting_executor import VotingExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -153,41 +166,29 @@ def get_output_dir_for_n_personas(
         return base_dir / f"{n_personas}-personas"
 
 
-def run_multi_persona_voting(
-    topic_slug: str,
-    rep_idx: int,
-    ablation: str,
-    n_sample_personas: int,
-    output_dir: Path,
-    openai_client: OpenAI,
-    n_persona_samples: int = N_PERSONA_SAMPLES
-) -> None:
+def load_rep_inputs(rep_dir: Path, ablation: str) -> Optional[Tuple[List[List[str]], List[Dict], List[str]]]:
     """
-    Run voting experiments with a specific number of personas.
+    Load what every persona count of a rep/ablation shares.
     
     Args:
-        topic_slug: Topic slug
-        rep_idx: Repetition index (0-4)
+        rep_dir: Path to the rep directory
         ablation: Ablation type
-        n_sample_personas: Number of personas to sample (5, 10, or 20)
-        output_dir: Base output directory
-        openai_client: OpenAI client
-        n_persona_samples: Number of persona sampling repetitions (inner loop)
-    """
-    rep_dir = output_dir / "data" / topic_slug / f"rep{rep_idx}"
     
+    Returns:
+        Tuple of (full_preferences, stmt_dicts, all_personas), or None if
+        the preferences file does not exist
+    """
     # Get the filtered preferences
     prefs_path = get_filtered_preferences_path(rep_dir, ablation)
     if not prefs_path.exists():
         logger.warning(f"Preferences file not found: {prefs_path}")
-        return
+        return None
     
     with open(prefs_path, 'r') as f:
         full_preferences = json.load(f)
     
     # Get statements and personas for ChatGPT methods
     statements_path = get_filtered_statements_path(rep_dir, ablation)
-    all_personas = None
     if statements_path.exists():
         with open(statements_path, 'r') as f:
             bridging_statements = json.load(f)
@@ -217,61 +218,162 @@ def run_multi_persona_voting(
             if len(stmt_dicts) > len(kept_indices):
                 stmt_dicts = [stmt_dicts[i] for i in kept_indices]
     
-    # Get output directory for this persona count
-    data_dir = get_output_dir_for_n_personas(rep_dir, ablation, n_sample_personas)
-    data_dir.mkdir(parents=True, exist_ok=True)
+    return full_preferences, stmt_dicts, all_personas
+
+
+def run_multi_persona_rep(
+    topic_slug: str,
+    rep_idx: int,
+    ablation: str,
+    persona_counts: List[int],
+    output_dir: Path,
+    openai_client: OpenAI,
+    executor: VotingExecutor,
+    n_persona_samples: int = N_PERSONA_SAMPLES
+) -> None:
+    """
+    Run voting experiments for every persona count of one rep/ablation.
+    
+    The rep's inputs are loaded once. For each sample index, the persona
+    samples of all counts are nested draws from one seeded stream (the same
+    indices the per-count sampling produced). The traditional methods for
+    every pending (count, sample) are evaluated as one batched job over the
+    stacked sub-profiles while the ChatGPT methods of all of them run
+    concurrently on the executor.
+    
+    Args:
+        topic_slug: Topic slug
+        rep_idx: Repetition index (0-4)
+        ablation: Ablation type
+        persona_counts: Persona counts to run (e.g., [5, 10, 20])
+        output_dir: Base output directory
+        openai_client: OpenAI client
+        executor: Active VotingExecutor
+        n_persona_samples: Number of persona sampling repetitions (inner loop)
+    """
+    rep_dir = output_dir / "data" / topic_slug / f"rep{rep_idx}"
+    
+    inputs = load_rep_inputs(rep_dir, ablation)
+    if inputs is None:
+        return
+    full_preferences, stmt_dicts, all_personas = inputs
     
     logger.info(f"=" * 60)
     logger.info(f"Topic: {topic_slug}")
-    logger.info(f"Rep: {rep_idx}, Ablation: {ablation}, Personas: {n_sample_personas}")
-    logger.info(f"Output: {data_dir}")
+    logger.info(f"Rep: {rep_idx}, Ablation: {ablation}, Personas: {persona_counts}")
     logger.info(f"=" * 60)
     
     # Compute seed for this repetition
     seed = BASE_SEED + rep_idx
     
+    # Collect every pending (count, sample)
+    pending = []   # (sample_dir, sampled_prefs, persona indices, sampled personas)
     for sample_idx in range(n_persona_samples):
-        sample_dir = data_dir / f"sample{sample_idx}"
-        
-        if check_cache_exists(sample_dir, "results.json"):
-            logger.info(f"  Sample {sample_idx}: cached, skipping")
-            continue
-        
-        logger.info(f"  Sample {sample_idx}: Running with {n_sample_personas} personas...")
-        
-        # Sample personas
         sample_seed = seed * 100 + sample_idx
-        sampled_persona_indices = sample_personas_for_voting(
-            N_PERSONAS, n_sample_personas, sample_seed
-        )
+        samples_by_count = sample_nested_personas(N_PERSONAS, persona_counts, sample_seed)
         
-        # Extract preferences for sampled personas
-        sampled_prefs = extract_sampled_preferences(
-            full_preferences, sampled_persona_indices
-        )
+        for n_personas in persona_counts:
+            data_dir = get_output_dir_for_n_personas(rep_dir, ablation, n_personas)
+            sample_dir = data_dir / f"sample{sample_idx}"
         
-        # Extract persona descriptions for sampled voters
-        sampled_personas = None
-        if all_personas is not None:
+            if check_cache_exists(sample_dir, "results.json"):
+                logger.info(f"  {n_personas}-personas sample {sample_idx}: cached, skipping")
+                continue
+        
+            sampled_persona_indices = samples_by_count[n_personas]
+            sampled_prefs = extract_sampled_preferences(full_preferences, sampled_persona_indices)
             sampled_personas = [all_personas[i] for i in sampled_persona_indices]
         
-        # Save sampled data
-        save_sampled_persona_indices(sampled_persona_indices, sample_dir)
-        save_sampled_preferences(sampled_prefs, sample_dir)
+            # Save sampled data
+            save_sampled_persona_indices(sampled_persona_indices, sample_dir)
+            save_sampled_preferences(sampled_prefs, sample_dir)
         
-        # Run voting methods (with personas for chatgpt_with_personas)
-        results = run_all_voting_methods(
-            sampled_prefs, stmt_dicts, openai_client, personas=sampled_personas
-        )
+            pending.append((sample_dir, sampled_prefs, sampled_persona_indices, sampled_personas))
         
-        # Save results
+    if not pending:
+        logger.info(f"Completed: {topic_slug} rep{rep_idx} {ablation} (all cached)")
+        return
+    
+    logger.info(f"  Evaluating {len(pending)} pending samples...")
+    
+    # Traditional methods: one batched job over the stacked sub-profiles
+    batch = StackedProfiles(full_preferences, [indices for _, _, indices, _ in pending])
+    sample_dirs = [sample_dir for sample_dir, _, _, _ in pending]
+    traditional_future = executor.submit(
+        evaluate_traditional_methods, batch, seed, True, sample_dirs, cpu_bound=True
+    )
+    traditional_by_dir = {}
+    
+    def traditional_results(sample_dir: Path) -> Dict[str, Dict]:
+        if not traditional_by_dir:
+            try:
+                batch_results = traditional_future.result()
+            except Exception as e:
+                logger.error(f"Batched traditional methods failed: {e}")
+                batch_results = [
+                    {m: {"winner": None, "error": str(e), "epsilon": None} for m in TRADITIONAL_METHODS}
+                    for _ in pending
+                ]
+            traditional_by_dir.update(zip(sample_dirs, batch_results))
+        return traditional_by_dir[sample_dir]
+    
+    # ChatGPT methods: every pending sample at once
+    llm_tasks = {
+        sample_dir: [
+            task for task in voting_method_tasks(
+                sampled_prefs, stmt_dicts, openai_client, personas=sampled_personas
+            )
+            if not task.cpu_bound
+        ]
+        for sample_dir, sampled_prefs, _, sampled_personas in pending
+    }
+    # Epsilons of the ChatGPT winners. The batched job runs in another process and
+    # stores the traditional winners' epsilons in the same per-sample memo file;
+    # both merge into it under its lock, and a winner it already stored is reused
+    epsilon_finalizers = {
+        sample_dir: EpsilonMemo(sampled_prefs, sample_dir).attach
+        for sample_dir, sampled_prefs, _, _ in pending
+    }
+    
+    def save_sample(sample_dir: Path, llm_results: Dict) -> None:
+        results = {**traditional_results(sample_dir), **llm_results}
         save_voting_results(results, sample_dir)
-        
-        logger.info(f"    Winners: " + ", ".join(
+        logger.info(f"    {sample_dir.parent.name}/{sample_dir.name} winners: " + ", ".join(
             f"{m}={r.get('winner')}" for m, r in results.items()
         ))
     
-    logger.info(f"Completed: {topic_slug} rep{rep_idx} {ablation} {n_sample_personas}-personas")
+    executor.run(llm_tasks, on_sample_done=save_sample, sample_finalizers=epsilon_finalizers)
+    
+    logger.info(f"Completed: {topic_slug} rep{rep_idx} {ablation} {persona_counts}-personas")
+
+
+def run_multi_persona_voting(
+    topic_slug: str,
+    rep_idx: int,
+    ablation: str,
+    n_sample_personas: int,
+    output_dir: Path,
+    openai_client: OpenAI,
+    n_persona_samples: int = N_PERSONA_SAMPLES
+) -> None:
+    """
+    Run voting experiments with a specific number of personas.
+    
+    Args:
+        topic_slug: Topic slug
+        rep_idx: Repetition index (0-4)
+        ablation: Ablation type
+        n_sample_personas: Number of personas to sample (5, 10, or 20)
+        output_dir: Base output directory
+        openai_client: OpenAI client
+        n_persona_samples: Number of persona sampling repetitions (inner loop)
+    """
+    with VotingExecutor() as executor:
+        run_multi_persona_rep(
+            topic_slug, rep_idx, ablation, [n_sample_personas],
+            output_dir, openai_client, executor,
+            n_persona_samples=n_persona_samples
+        )
 
 
 def run_all_multi_persona_experiments(
@@ -307,38 +409,40 @@ def run_all_multi_persona_experiments(
     logger.info(f"Persona samples per rep: {n_persona_samples}")
     logger.info("=" * 80)
     
-    for topic_idx, topic_slug in enumerate(topics):
-        logger.info(f"\n{'#' * 80}")
-        logger.info(f"TOPIC {topic_idx + 1}/{len(topics)}: {topic_slug}")
-        logger.info(f"{'#' * 80}")
+    # One executor for the whole sweep: its thread and process pools are reused per rep
+    with VotingExecutor() as executor:
+        for topic_idx, topic_slug in enumerate(topics):
+            logger.info(f"\n{'#' * 80}")
+            logger.info(f"TOPIC {topic_idx + 1}/{len(topics)}: {topic_slug}")
+            logger.info(f"{'#' * 80}")
         
-        topic_dir = data_dir / topic_slug
-        if not topic_dir.exists():
-            logger.warning(f"Topic directory not found: {topic_dir}")
-            continue
+            topic_dir = data_dir / topic_slug
+            if not topic_dir.exists():
+                logger.warning(f"Topic directory not found: {topic_dir}")
+                continue
         
-        # Find available reps
-        rep_dirs = sorted(topic_dir.glob("rep*"))
+            # Find available reps
+            rep_dirs = sorted(topic_dir.glob("rep*"))
         
-        for rep_dir in rep_dirs:
-            rep_idx = int(rep_dir.name.replace("rep", ""))
+            for rep_dir in rep_dirs:
+                rep_idx = int(rep_dir.name.replace("rep", ""))
             
-            for ablation in ablations:
-                for n_personas in persona_counts:
+                for ablation in ablations:
                     try:
-                        run_multi_persona_voting(
+                        run_multi_persona_rep(
                             topic_slug,
                             rep_idx,
                             ablation,
-                            n_personas,
+                            persona_counts,
                             output_dir,
                             openai_client,
+                            executor,
                             n_persona_samples=n_persona_samples
                         )
                     except Exception as e:
                         logger.error(
                             f"Failed: {topic_slug} rep{rep_idx} {ablation} "
-                            f"{n_personas}-personas: {e}"
+                            f"{persona_counts}-personas: {e}"
                         )
                         import traceback
                         logger.error(traceback.format_exc())
@@ -405,7 +509,8 @@ def main():
     logger.info(f"Persona counts: {args.persona_counts}")
     
     # Create OpenAI client with 60s read timeout
-    openai_client = OpenAI(timeout=60.0)
+    from openai import OpenAI
+    openai_client = BudgetedClient(OpenAI(timeout=60.0), MAX_WORKERS)
     
     # Run experiments
     run_all_multi_persona_experiments(
@@ -2,20 +2,25 @@
 Filter similar statements using LLM-based clustering.
 """
 
+from __future__ import annotations
+
 import json
 import logging
-from typing import List, Dict, Tuple
+from typing import TYPE_CHECKING, List, Dict, Tuple
+from dataclasses import asdict
 from pathlib import Path
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from openai import OpenAI
 
 import time
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 from .config import (
     FILTERING_MODEL,
     TOPIC_QUESTIONS,
     api_timer,
 )
+from src.typed_responses import cluster_schema, format_stats, parse_response
 
 logger = logging.getLogger(__name__)
 
@@ -74,18 +79,19 @@ Rules:
 - Within each cluster, exactly ONE statement should have keep=1
 - The statement with keep=1 should be the clearest/most well-written in that cluster
 
-Return a JSON array with {len(statements)} objects. For example:
-[
+Return a JSON object whose "assignments" array has {len(statements)} objects. For example:
+{{"assignments": [
   {{"statement_idx": 0, "cluster_id": 0, "keep": 1}},
   {{"statement_idx": 1, "cluster_id": 0, "keep": 0}},
   {{"statement_idx": 2, "cluster_id": 1, "keep": 1}},
   ...
-]
+]}}
 
-Return only the JSON array, no other text."""
+Return only the JSON object, no other text."""
 
     logger.info(f"Clustering {len(statements)} statements...")
     
+    schema = cluster_schema(len(statements))
     start_time = time.time()
     response = openai_client.responses.create(
         model=FILTERING_MODEL,
@@ -93,13 +99,18 @@ Return only the JSON array, no other text."""
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ],
+        text=schema.text_format,
     )
     api_timer.record(time.time() - start_time)
     
-    assignments = json.loads(response.output_text)
+    assignments = [asdict(a) for a in parse_response(response, schema)]
     
-    # Validate assignments
-    _validate_assignments(assignments, len(statements))
+    # Validate assignments (one keep per cluster is beyond the schema)
+    try:
+        _validate_assignments(assignments, len(statements))
+    except ValueError as e:
+        format_stats.record_failure(schema.name, str(e))
+        raise
     
     # Log clustering statistics
     n_clusters = len(set(a["cluster_id"] for a in assignments))
@@ -2,17 +2,17 @@
 Visualization functions for experiment results.
 """
 
-import json
 import logging
 from pathlib import Path
 from typing import List, Dict, Optional
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
-from scipy import stats
 
 from .config import VOTING_METHODS, OUTPUT_DIR, TOPIC_SHORT_NAMES, TOPIC_DISPLAY_NAMES
-from .statement_filter import load_filter_assignments
+from .dataset import get_dataset, flatten_clustered
+from .cluster_stats import summarize_cluster, summarize_clusters
+from src.figure_build import FigureBuild
 
 logger = logging.getLogger(__name__)
 
@@ -69,41 +69,7 @@ def collect_results_for_topic(
     Returns:
         Dict mapping method name to list of epsilon values
     """
-    results = {method: [] for method in VOTING_METHODS}
-    
-    topic_dir = output_dir / "data" / topic_slug
-    
-    if not topic_dir.exists():
-        logger.warning(f"Topic directory not found: {topic_dir}")
-        return results
-    
-    # Iterate through all rep directories
-    for rep_dir in sorted(topic_dir.glob("rep*")):
-        # Handle ablation subdirectory
-        if ablation != "full":
-            data_dir = rep_dir / f"ablation_{ablation}"
-        else:
-            data_dir = rep_dir
-        
-        if not data_dir.exists():
-            continue
-        
-        # Iterate through all sample directories
-        for sample_dir in sorted(data_dir.glob("sample*")):
-            results_file = sample_dir / "results.json"
-            if not results_file.exists():
-                continue
-            
-            with open(results_file, 'r') as f:
-                sample_results = json.load(f)
-            
-            for method in VOTING_METHODS:
-                if method in sample_results:
-                    epsilon = sample_results[method].get("epsilon")
-                    if epsilon is not None:
-                        results[method].append(epsilon)
-    
-    return results
+    return flatten_clustered(get_dataset(output_dir).epsilon(topic_slug, ablation))
 
 
 def collect_results_clustered_for_topic(
@@ -122,49 +88,7 @@ def collect_results_clustered_for_topic(
     Returns:
         Dict mapping method name to list of lists: outer list = outer reps, inner list = samples within rep
     """
-    # Initialize with empty lists for each method
-    results = {method: [] for method in VOTING_METHODS}
-    
-    topic_dir = output_dir / "data" / topic_slug
-    
-    if not topic_dir.exists():
-        logger.warning(f"Topic directory not found: {topic_dir}")
-        return results
-    
-    # Iterate through all rep directories (outer loop)
-    for rep_dir in sorted(topic_dir.glob("rep*")):
-        # Handle ablation subdirectory
-        if ablation != "full":
-            data_dir = rep_dir / f"ablation_{ablation}"
-        else:
-            data_dir = rep_dir
-        
-        if not data_dir.exists():
-            continue
-        
-        # Collect all samples for this rep (inner loop)
-        rep_results = {method: [] for method in VOTING_METHODS}
-        
-        for sample_dir in sorted(data_dir.glob("sample*")):
-            results_file = sample_dir / "results.json"
-            if not results_file.exists():
-                continue
-            
-            with open(results_file, 'r') as f:
-                sample_results = json.load(f)
-            
-            for method in VOTING_METHODS:
-                if method in sample_results:
-                    epsilon = sample_results[method].get("epsilon")
-                    if epsilon is not None:
-                        rep_results[method].append(epsilon)
-        
-        # Add this rep's results to the main results
-        for method in VOTING_METHODS:
-            if rep_results[method]:  # Only add if we have samples
-                results[method].append(rep_results[method])
-    
-    return results
+    return get_dataset(output_dir).epsilon(topic_slug, ablation)
 
 
 def collect_all_results_clustered(
@@ -187,20 +111,9 @@ def collect_all_results_clustered(
     """
     all_results = {method: [] for method in VOTING_METHODS}
     
-    data_dir = output_dir / "data"
-    if not data_dir.exists():
-        logger.warning(f"Data directory not found: {data_dir}")
-        return all_results
-    
-    # Get all topic directories
-    if topics is None:
-        topic_dirs = [d for d in data_dir.iterdir() if d.is_dir()]
-    else:
-        topic_dirs = [data_dir / t for t in topics if (data_dir / t).exists()]
-    
-    for topic_dir in topic_dirs:
+    for topic_slug in get_dataset(output_dir).topics(topics):
         topic_results = collect_results_clustered_for_topic(
-            topic_dir.name, output_dir, ablation
+            topic_slug, output_dir, ablation
         )
         for method in VOTING_METHODS:
             all_results[method].extend(topic_results[method])
@@ -222,35 +135,8 @@ def compute_cluster_ci(clustered_values: List[List[float]], confidence: float =
     Returns:
         Tuple of (grand_mean, ci_half_width, n_clusters)
     """
-    if not clustered_values:
-        return None, None, 0
-    
-    # Step 1: Compute mean within each cluster
-    cluster_means = []
-    for cluster in clustered_values:
-        valid = [v for v in cluster if v is not None]
-        if valid:
-            cluster_means.append(np.mean(valid))
-    
-    if not cluster_means:
-        return None, None, 0
-    
-    n = len(cluster_means)
-    
-    if n < 2:
-        # Not enough clusters for CI, return mean with no CI
-        return np.mean(cluster_means), None, n
-    
-    # Step 2: Compute CI on cluster means
-    grand_mean = np.mean(cluster_means)
-    sem = np.std(cluster_means, ddof=1) / np.sqrt(n)
-    
-    # t-value for confidence interval
-    alpha = 1 - confidence
-    t_val = stats.t.ppf(1 - alpha / 2, df=n - 1)
-    ci_half_width = t_val * sem
-    
-    return grand_mean, ci_half_width, n
+    summary = summarize_cluster(clustered_values, confidence)
+    return summary.mean, summary.ci_half_width, summary.n_clusters
 
 
 def collect_all_results(
@@ -271,20 +157,9 @@ def collect_all_results(
     """
     all_results = {method: [] for method in VOTING_METHODS}
     
-    data_dir = output_dir / "data"
-    if not data_dir.exists():
-        logger.warning(f"Data directory not found: {data_dir}")
-        return all_results
-    
-    # Get all topic directories
-    if topics is None:
-        topic_dirs = [d for d in data_dir.iterdir() if d.is_dir()]
-    else:
-        topic_dirs = [data_dir / t for t in topics if (data_dir / t).exists()]
-    
-    for topic_dir in topic_dirs:
+    for topic_slug in get_dataset(output_dir).topics(topics):
         topic_results = collect_results_for_topic(
-            topic_dir.name, output_dir, ablation
+            topic_slug, output_dir, ablation
         )
         for method in VOTING_METHODS:
             all_results[method].extend(topic_results[method])
@@ -308,24 +183,10 @@ def collect_epsilon_by_topic(
     Returns:
         Dict mapping topic_slug to {method: [epsilon values]}
     """
-    results_by_topic = {}
-    
-    data_dir = output_dir / "data"
-    if not data_dir.exists():
-        return results_by_topic
-    
-    # Get all topic directories
-    if topics is None:
-        topic_dirs = [d for d in data_dir.iterdir() if d.is_dir()]
-    else:
-        topic_dirs = [data_dir / t for t in topics if (data_dir / t).exists()]
-    
-    for topic_dir in topic_dirs:
-        topic_slug = topic_dir.name
-        topic_results = collect_results_for_topic(topic_slug, output_dir, ablation)
-        results_by_topic[topic_slug] = topic_results
-    
-    return results_by_topic
+    return {
+        topic_slug: collect_results_for_topic(topic_slug, output_dir, ablation)
+        for topic_slug in get_dataset(output_dir).topics(topics)
+    }
 
 
 def collect_likert_by_topic(
@@ -344,24 +205,10 @@ def collect_likert_by_topic(
     Returns:
         Dict mapping topic_slug to {method: [Likert values]}
     """
-    results_by_topic = {}
-    
-    data_dir = output_dir / "data"
-    if not data_dir.exists():
-        return results_by_topic
-    
-    # Get all topic directories
-    if topics is None:
-        topic_dirs = [d for d in data_dir.iterdir() if d.is_dir()]
-    else:
-        topic_dirs = [data_dir / t for t in topics if (data_dir / t).exists()]
-    
-    for topic_dir in topic_dirs:
-        topic_slug = topic_dir.name
-        topic_results = collect_likert_for_topic(topic_slug, output_dir, ablation)
-        results_by_topic[topic_slug] = topic_results
-    
-    return results_by_topic
+    return {
+        topic_slug: collect_likert_for_topic(topic_slug, output_dir, ablation)
+        for topic_slug in get_dataset(output_dir).topics(topics)
+    }
 
 
 def collect_cluster_sizes_for_topic(
@@ -380,99 +227,7 @@ def collect_cluster_sizes_for_topic(
     Returns:
         Dict mapping method name to list of tuples: (cluster_size, is_winner_cluster)
     """
-    results = {method: [] for method in VOTING_METHODS}
-    
-    topic_dir = output_dir / "data" / topic_slug
-    
-    if not topic_dir.exists():
-        logger.warning(f"Topic directory not found: {topic_dir}")
-        return results
-    
-    # Iterate through all rep directories
-    for rep_dir in sorted(topic_dir.glob("rep*")):
-        # Handle ablation subdirectory
-        if ablation != "full":
-            data_dir = rep_dir / f"ablation_{ablation}"
-        else:
-            data_dir = rep_dir
-        
-        if not data_dir.exists():
-            continue
-        
-        # Load filter assignments (clustering data)
-        assignments_file = data_dir / "filter_assignments.json"
-        if not assignments_file.exists():
-            # Skip if no clustering data (e.g., for no_filtering ablation)
-            continue
-        
-        try:
-            assignments = load_filter_assignments(data_dir)
-        except Exception as e:
-            logger.warning(f"Failed to load filter assignments from {data_dir}: {e}")
-            continue
-        
-        # Compute cluster sizes: count statements per cluster_id
-        cluster_sizes = {}
-        for assignment in assignments:
-            cluster_id = assignment["cluster_id"]
-            cluster_sizes[cluster_id] = cluster_sizes.get(cluster_id, 0) + 1
-        
-        # Get kept_indices: sorted list of original statement indices where keep=1
-        kept_indices = sorted([
-            a["statement_idx"]
-            for a in assignments
-            if a["keep"] == 1
-        ])
-        
-        # Create mapping from statement_idx to cluster_id
-        stmt_to_cluster = {a["statement_idx"]: a["cluster_id"] for a in assignments}
-        
-        # Iterate through all sample directories
-        for sample_dir in sorted(data_dir.glob("sample*")):
-            results_file = sample_dir / "results.json"
-            if not results_file.exists():
-                continue
-            
-            try:
-                with open(results_file, 'r') as f:
-                    sample_results = json.load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load results from {results_file}: {e}")
-                continue
-            
-            # For each method, find which cluster contains the winner
-            for method in VOTING_METHODS:
-                if method not in sample_results:
-                    continue
-                
-                winner = sample_results[method].get("winner")
-                if winner is None:
-                    continue
-                
-                try:
-                    winner_idx = int(winner)
-                    # Map winner index (filtered) → original statement index
-                    if winner_idx >= len(kept_indices):
-                        logger.warning(f"Winner index {winner_idx} out of range for {method} in {sample_dir}")
-                        continue
-                    
-                    original_idx = kept_indices[winner_idx]
-                    winner_cluster_id = stmt_to_cluster.get(original_idx)
-                    
-                    if winner_cluster_id is None:
-                        logger.warning(f"Could not find cluster for statement {original_idx} in {sample_dir}")
-                        continue
-                    
-                    # Add all cluster sizes with flags
-                    for cluster_id, size in cluster_sizes.items():
-                        is_winner = (cluster_id == winner_cluster_id)
-                        results[method].append((size, is_winner))
-                
-                except (ValueError, KeyError, IndexError) as e:
-                    logger.warning(f"Error processing winner for {method} in {sample_dir}: {e}")
-                    continue
-    
-    return results
+    return get_dataset(output_dir).cluster_sizes(topic_slug, ablation)
 
 
 def collect_winner_cluster_percentile_clustered_for_topic(
@@ -494,111 +249,7 @@ def collect_winner_cluster_percentile_clustered_for_topic(
     Returns:
         Dict mapping method name to list of lists: outer list = outer reps, inner list = percentile rankings
     """
-    results = {method: [] for method in VOTING_METHODS}
-    
-    topic_dir = output_dir / "data" / topic_slug
-    
-    if not topic_dir.exists():
-        logger.warning(f"Topic directory not found: {topic_dir}")
-        return results
-    
-    # Iterate through all rep directories (outer loop)
-    for rep_dir in sorted(topic_dir.glob("rep*")):
-        # Handle ablation subdirectory
-        if ablation != "full":
-            data_dir = rep_dir / f"ablation_{ablation}"
-        else:
-            data_dir = rep_dir
-        
-        if not data_dir.exists():
-            continue
-        
-        # Load filter assignments (clustering data)
-        assignments_file = data_dir / "filter_assignments.json"
-        if not assignments_file.exists():
-            continue
-        
-        try:
-            assignments = load_filter_assignments(data_dir)
-        except Exception as e:
-            logger.warning(f"Failed to load filter assignments from {data_dir}: {e}")
-            continue
-        
-        # Compute cluster sizes: count statements per cluster_id
-        cluster_sizes = {}
-        for assignment in assignments:
-            cluster_id = assignment["cluster_id"]
-            cluster_sizes[cluster_id] = cluster_sizes.get(cluster_id, 0) + 1
-        
-        # Get kept_indices: sorted list of original statement indices where keep=1
-        kept_indices = sorted([
-            a["statement_idx"]
-            for a in assignments
-            if a["keep"] == 1
-        ])
-        
-        # Create mapping from statement_idx to cluster_id
-        stmt_to_cluster = {a["statement_idx"]: a["cluster_id"] for a in assignments}
-        
-        # Collect all samples for this rep
-        rep_results = {method: [] for method in VOTING_METHODS}
-        
-        # Iterate through all sample directories
-        for sample_dir in sorted(data_dir.glob("sample*")):
-            results_file = sample_dir / "results.json"
-            if not results_file.exists():
-                continue
-            
-            try:
-                with open(results_file, 'r') as f:
-                    sample_results = json.load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load results from {results_file}: {e}")
-                continue
-            
-            # Get all cluster sizes for this sample (sorted)
-            all_sizes = sorted(cluster_sizes.values())
-            
-            # For each method, find percentile of winner cluster
-            for method in VOTING_METHODS:
-                if method not in sample_results:
-                    continue
-                
-                winner = sample_results[method].get("winner")
-                if winner is None:
-                    continue
-                
-                try:
-                    winner_idx = int(winner)
-                    # Map winner index (filtered) → original statement index
-                    if winner_idx >= len(kept_indices):
-                        logger.warning(f"Winner index {winner_idx} out of range for {method} in {sample_dir}")
-                        continue
-                    
-                    original_idx = kept_indices[winner_idx]
-                    winner_cluster_id = stmt_to_cluster.get(original_idx)
-                    
-                    if winner_cluster_id is None:
-                        logger.warning(f"Could not find cluster for statement {original_idx} in {sample_dir}")
-                        continue
-                    
-                    winner_cluster_size = cluster_sizes[winner_cluster_id]
-                    
-                    # Compute percentile ranking (0-100)
-                    # percentileofscore gives the percentile where the score would fall
-                    percentile = stats.percentileofscore(all_sizes, winner_cluster_size, kind='rank')
-                    rep_results[method].append(percentile)
-                
-                except (ValueError, KeyError, IndexError) as e:
-                    logger.warning(f"Error processing winner for {method} in {sample_dir}: {e}")
-                    continue
-        
-        # Add this rep's results to the main results
-        for method in VOTING_METHODS:
-            if rep_results[method]:  # Only add if we have samples
-                results[method].append(rep_results[method])
-    
-    return results
+    return get_dataset(output_dir).winner_cluster_percentile(topic_slug, ablation)
 
 
 def collect_all_winner_cluster_percentile_clustered(
@@ -619,20 +270,9 @@ def collect_all_winner_cluster_percentile_clustered(
     """
     all_results = {method: [] for method in VOTING_METHODS}
     
-    data_dir = output_dir / "data"
-    if not data_dir.exists():
-        logger.warning(f"Data directory not found: {data_dir}")
-        return all_results
-    
-    # Get all topic directories
-    if topics is None:
-        topic_dirs = [d for d in data_dir.iterdir() if d.is_dir()]
-    else:
-        topic_dirs = [data_dir / t for t in topics if (data_dir / t).exists()]
-    
-    for topic_dir in topic_dirs:
+    for topic_slug in get_dataset(output_dir).topics(topics):
         topic_results = collect_winner_cluster_percentile_clustered_for_topic(
-            topic_dir.name, output_dir, ablation
+            topic_slug, output_dir, ablation
         )
         for method in VOTING_METHODS:
             all_results[method].extend(topic_results[method])
@@ -662,10 +302,12 @@ def plot_winner_cluster_percentile_barplot(
     n_clusters_list = []
     
     # Use custom order for bar plots
+    summaries = summarize_clusters(clustered_results)
     for method in BARPLOT_METHOD_ORDER:
         clusters = clustered_results.get(method, [])
         if clusters:
-            mean, ci, n_clusters = compute_cluster_ci(clusters)
+            summary = summaries[method]
+            mean, ci, n_clusters = summary.mean, summary.ci_half_width, summary.n_clusters
             if mean is not None:
                 methods.append(METHOD_NAMES.get(method, method))
                 means.append(mean)
@@ -741,20 +383,9 @@ def collect_all_cluster_sizes(
     """
     all_results = {method: [] for method in VOTING_METHODS}
     
-    data_dir = output_dir / "data"
-    if not data_dir.exists():
-        logger.warning(f"Data directory not found: {data_dir}")
-        return all_results
-    
-    # Get all topic directories
-    if topics is None:
-        topic_dirs = [d for d in data_dir.iterdir() if d.is_dir()]
-    else:
-        topic_dirs = [data_dir / t for t in topics if (data_dir / t).exists()]
-    
-    for topic_dir in topic_dirs:
+    for topic_slug in get_dataset(output_dir).topics(topics):
         topic_results = collect_cluster_sizes_for_topic(
-            topic_dir.name, output_dir, ablation
+            topic_slug, output_dir, ablation
         )
         for method in VOTING_METHODS:
             all_results[method].extend(topic_results[method])
@@ -916,10 +547,12 @@ def plot_epsilon_barplot(
     n_clusters_list = []
     
     # Use custom order for bar plots
+    summaries = summarize_clusters(clustered_results)
     for method in BARPLOT_METHOD_ORDER:
         clusters = clustered_results.get(method, [])
         if clusters:
-            mean, ci, n_clusters = compute_cluster_ci(clusters)
+            summary = summaries[method]
+            mean, ci, n_clusters = summary.mean, summary.ci_half_width, summary.n_clusters
             if mean is not None:
                 methods.append(METHOD_NAMES.get(method, method))
                 means.append(mean)
@@ -1357,76 +990,7 @@ def collect_likert_for_topic(
     Returns:
         Dict mapping method name to list of average Likert ratings
     """
-    results = {method: [] for method in VOTING_METHODS}
-    
-    topic_dir = output_dir / "data" / topic_slug
-    
-    if not topic_dir.exists():
-        return results
-    
-    for rep_dir in sorted(topic_dir.glob("rep*")):
-        if ablation != "full":
-            data_dir = rep_dir / f"ablation_{ablation}"
-        else:
-            data_dir = rep_dir
-        
-        if not data_dir.exists():
-            continue
-        
-        # Load Likert ratings - path depends on ablation type
-        if ablation == "full":
-            likert_file = data_dir / "filtered_likert.json"
-        elif ablation == "no_bridging":
-            likert_file = data_dir / "full_likert.json"
-        elif ablation == "no_filtering":
-            likert_file = rep_dir / "full_likert.json"
-        else:
-            likert_file = data_dir / "filtered_likert.json"
-        
-        if not likert_file.exists():
-            continue
-        
-        with open(likert_file, 'r') as f:
-            likert = json.load(f)
-        
-        # Iterate through samples
-        for sample_dir in sorted(data_dir.glob("sample*")):
-            results_file = sample_dir / "results.json"
-            if not results_file.exists():
-                continue
-            
-            with open(results_file, 'r') as f:
-                sample_results = json.load(f)
-            
-            # Load sampled persona indices
-            persona_file = sample_dir / "persona_indices.json"
-            if not persona_file.exists():
-                continue
-            
-            with open(persona_file, 'r') as f:
-                persona_indices = json.load(f)
-            
-            for method in VOTING_METHODS:
-                if method in sample_results:
-                    winner = sample_results[method].get("winner")
-                    if winner is not None:
-                        winner_idx = int(winner)
-                        # #region agent log
-                        _log_path = Path("/home/ec2-user/single-winner-generative-social-choice/.cursor/debug.log")
-                        _likert_rows = len(likert)
-                        _likert_cols = len(likert[0]) if likert else 0
-                        _max_p_idx = max(persona_indices) if persona_indices else -1
-                        _debug_data = {"topic": topic_slug, "ablation": ablation, "rep": rep_dir.name, "sample": sample_dir.name, "method": method, "winner_idx": winner_idx, "likert_rows": _likert_rows, "likert_cols": _likert_cols, "max_persona_idx": _max_p_idx, "likert_file": str(likert_file)}
-                        if winner_idx >= _likert_cols or _max_p_idx >= _likert_rows:
-                            with open(_log_path, 'a') as _f: _f.write(json.dumps({"hypothesisId": "A-E", "location": "visualizer.py:920", "message": "INDEX_OUT_OF_BOUNDS_SKIPPED", "data": _debug_data, "timestamp": int(__import__('time').time()*1000)}) + "\n")
-                            continue  # Skip this entry - data mismatch
-                        # #endregion
-                        # Average Likert rating for winner across sampled personas
-                        ratings = [likert[p_idx][winner_idx] for p_idx in persona_indices]
-                        avg_rating = np.mean(ratings)
-                        results[method].append(avg_rating)
-    
-    return results
+    return flatten_clustered(get_dataset(output_dir).likert(topic_slug, ablation))
 
 
 def collect_likert_clustered_for_topic(
@@ -1445,82 +1009,7 @@ def collect_likert_clustered_for_topic(
     Returns:
         Dict mapping method name to list of lists: outer list = outer reps, inner list = samples within rep
     """
-    results = {method: [] for method in VOTING_METHODS}
-    
-    topic_dir = output_dir / "data" / topic_slug
-    
-    if not topic_dir.exists():
-        return results
-    
-    for rep_dir in sorted(topic_dir.glob("rep*")):
-        if ablation != "full":
-            data_dir = rep_dir / f"ablation_{ablation}"
-        else:
-            data_dir = rep_dir
-        
-        if not data_dir.exists():
-            continue
-        
-        # Load Likert ratings - path depends on ablation type
-        if ablation == "full":
-            likert_file = data_dir / "filtered_likert.json"
-        elif ablation == "no_bridging":
-            likert_file = data_dir / "full_likert.json"
-        elif ablation == "no_filtering":
-            likert_file = rep_dir / "full_likert.json"
-        else:
-            likert_file = data_dir / "filtered_likert.json"
-        
-        if not likert_file.exists():
-            continue
-        
-        with open(likert_file, 'r') as f:
-            likert = json.load(f)
-        
-        # Collect all samples for this rep
-        rep_results = {method: [] for method in VOTING_METHODS}
-        
-        for sample_dir in sorted(data_dir.glob("sample*")):
-            results_file = sample_dir / "results.json"
-            if not results_file.exists():
-                continue
-            
-            with open(results_file, 'r') as f:
-                sample_results = json.load(f)
-            
-            # Load sampled persona indices
-            persona_file = sample_dir / "persona_indices.json"
-            if not persona_file.exists():
-                continue
-            
-            with open(persona_file, 'r') as f:
-                persona_indices = json.load(f)
-            
-            for method in VOTING_METHODS:
-                if method in sample_results:
-                    winner = sample_results[method].get("winner")
-                    if winner is not None:
-                        winner_idx = int(winner)
-                        # #region agent log
-                        _log_path = Path("/home/ec2-user/single-winner-generative-social-choice/.cursor/debug.log")
-                        _likert_rows = len(likert)
-                        _likert_cols = len(likert[0]) if likert else 0
-                        _max_p_idx = max(persona_indices) if persona_indices else -1
-                        _debug_data = {"topic": topic_slug, "ablation": ablation, "rep": rep_dir.name, "sample": sample_dir.name, "method": method, "winner_idx": winner_idx, "likert_rows": _likert_rows, "likert_cols": _likert_cols, "max_persona_idx": _max_p_idx, "likert_file": str(likert_file)}
-                        if winner_idx >= _likert_cols or _max_p_idx >= _likert_rows:
-                            with open(_log_path, 'a') as _f: _f.write(json.dumps({"hypothesisId": "A-E", "location": "visualizer.py:clustered", "message": "INDEX_OUT_OF_BOUNDS_SKIPPED", "data": _debug_data, "timestamp": int(__import__('time').time()*1000)}) + "\n")
-                            continue  # Skip this entry - data mismatch
-                        # #endregion
-                        ratings = [likert[p_idx][winner_idx] for p_idx in persona_indices]
-                        avg_rating = np.mean(ratings)
-                        rep_results[method].append(avg_rating)
-        
-        # Add this rep's results to the main results
-        for method in VOTING_METHODS:
-            if rep_results[method]:
-                results[method].append(rep_results[method])
-    
-    return results
+    return get_dataset(output_dir).likert(topic_slug, ablation)
 
 
 def collect_all_likert_clustered(
@@ -1543,20 +1032,9 @@ def collect_all_likert_clustered(
     """
     all_results = {method: [] for method in VOTING_METHODS}
     
-    data_dir = output_dir / "data"
-    if not data_dir.exists():
-        logger.warning(f"Data directory not found: {data_dir}")
-        return all_results
-    
-    # Get all topic directories
-    if topics is None:
-        topic_dirs = [d for d in data_dir.iterdir() if d.is_dir()]
-    else:
-        topic_dirs = [data_dir / t for t in topics if (data_dir / t).exists()]
-    
-    for topic_dir in topic_dirs:
+    for topic_slug in get_dataset(output_dir).topics(topics):
         topic_results = collect_likert_clustered_for_topic(
-            topic_dir.name, output_dir, ablation
+            topic_slug, output_dir, ablation
         )
         for method in VOTING_METHODS:
             all_results[method].extend(topic_results[method])
@@ -1589,10 +1067,12 @@ def plot_likert_barplot(
     method_keys = []  # Store method keys to find VBC later
     
     # Use custom order for bar plots
+    summaries = summarize_clusters(clustered_results)
     for method in BARPLOT_METHOD_ORDER:
         clusters = clustered_results.get(method, [])
         if clusters:
-            mean, ci, n_clusters = compute_cluster_ci(clusters)
+            summary = summaries[method]
+            mean, ci, n_clusters = summary.mean, summary.ci_half_width, summary.n_clusters
             if mean is not None:
                 methods.append(METHOD_NAMES.get(method, method))
                 means.append(mean)
@@ -2134,38 +1614,7 @@ def collect_results_for_n_personas_topic(
     Returns:
         Dict mapping method name to list of epsilon values
     """
-    results = {method: [] for method in VOTING_METHODS}
-    
-    topic_dir = output_dir / "data" / topic_slug
-    
-    if not topic_dir.exists():
-        logger.warning(f"Topic directory not found: {topic_dir}")
-        return results
-    
-    # Iterate through all rep directories
-    for rep_dir in sorted(topic_dir.glob("rep*")):
-        # Get sample results directory for this persona count
-        sample_base = get_sample_results_dir_for_n_personas(rep_dir, ablation, n_personas)
-        
-        if not sample_base.exists():
-            continue
-        
-        # Iterate through all sample directories
-        for sample_dir in sorted(sample_base.glob("sample*")):
-            results_file = sample_dir / "results.json"
-            if not results_file.exists():
-                continue
-            
-            with open(results_file, 'r') as f:
-                sample_results = json.load(f)
-            
-            for method in VOTING_METHODS:
-                if method in sample_results:
-                    epsilon = sample_results[method].get("epsilon")
-                    if epsilon is not None:
-                        results[method].append(epsilon)
-    
-    return results
+    return flatten_clustered(get_dataset(output_dir).epsilon(topic_slug, ablation, n_personas))
 
 
 def collect_results_for_n_personas_clustered_topic(
@@ -2186,45 +1635,7 @@ def collect_results_for_n_personas_clustered_topic(
     Returns:
         Dict mapping method name to list of lists (outer: reps, inner: samples)
     """
-    results = {method: [] for method in VOTING_METHODS}
-    
-    topic_dir = output_dir / "data" / topic_slug
-    
-    if not topic_dir.exists():
-        logger.warning(f"Topic directory not found: {topic_dir}")
-        return results
-    
-    # Iterate through all rep directories
-    for rep_dir in sorted(topic_dir.glob("rep*")):
-        # Get sample results directory for this persona count
-        sample_base = get_sample_results_dir_for_n_personas(rep_dir, ablation, n_personas)
-        
-        if not sample_base.exists():
-            continue
-        
-        # Collect all samples for this rep
-        rep_results = {method: [] for method in VOTING_METHODS}
-        
-        for sample_dir in sorted(sample_base.glob("sample*")):
-            results_file = sample_dir / "results.json"
-            if not results_file.exists():
-                continue
-            
-            with open(results_file, 'r') as f:
-                sample_results = json.load(f)
-            
-            for method in VOTING_METHODS:
-                if method in sample_results:
-                    epsilon = sample_results[method].get("epsilon")
-                    if epsilon is not None:
-                        rep_results[method].append(epsilon)
-        
-        # Add this rep's results to the clustered results
-        for method in VOTING_METHODS:
-            if rep_results[method]:
-                results[method].append(rep_results[method])
-    
-    return results
+    return get_dataset(output_dir).epsilon(topic_slug, ablation, n_personas)
 
 
 def collect_all_results_for_n_personas(
@@ -2247,20 +1658,9 @@ def collect_all_results_for_n_personas(
     """
     all_results = {method: [] for method in VOTING_METHODS}
     
-    data_dir = output_dir / "data"
-    if not data_dir.exists():
-        logger.warning(f"Data directory not found: {data_dir}")
-        return all_results
-    
-    # Get all topic directories
-    if topics is None:
-        topic_dirs = [d for d in data_dir.iterdir() if d.is_dir()]
-    else:
-        topic_dirs = [data_dir / t for t in topics if (data_dir / t).exists()]
-    
-    for topic_dir in topic_dirs:
+    for topic_slug in get_dataset(output_dir).topics(topics):
         topic_results = collect_results_for_n_personas_topic(
-            topic_dir.name, n_personas, output_dir, ablation
+            topic_slug, n_personas, output_dir, ablation
         )
         for method in VOTING_METHODS:
             all_results[method].extend(topic_results[method])
@@ -2288,20 +1688,9 @@ def collect_all_results_for_n_personas_clustered(
     """
     all_results = {method: [] for method in VOTING_METHODS}
     
-    data_dir = output_dir / "data"
-    if not data_dir.exists():
-        logger.warning(f"Data directory not found: {data_dir}")
-        return all_results
-    
-    # Get all topic directories
-    if topics is None:
-        topic_dirs = [d for d in data_dir.iterdir() if d.is_dir()]
-    else:
-        topic_dirs = [data_dir / t for t in topics if (data_dir / t).exists()]
-    
-    for topic_dir in topic_dirs:
+    for topic_slug in get_dataset(output_dir).topics(topics):
         topic_results = collect_results_for_n_personas_clustered_topic(
-            topic_dir.name, n_personas, output_dir, ablation
+            topic_slug, n_personas, output_dir, ablation
         )
         for method in VOTING_METHODS:
             all_results[method].extend(topic_results[method])
@@ -2344,11 +1733,12 @@ def plot_epsilon_multi_persona_barplot(
         
         means = []
         cis = []
+        summaries = summarize_clusters(clustered_results)
         
         for method in BARPLOT_METHOD_ORDER:
             clusters = clustered_results.get(method, [])
             if clusters:
-                mean, ci, _ = compute_cluster_ci(clusters)
+                mean, ci = summaries[method].mean, summaries[method].ci_half_width
                 means.append(mean if mean is not None else 0)
                 cis.append(ci if ci is not None else 0)
             else:
@@ -2484,22 +1874,34 @@ def plot_epsilon_multi_persona_stripplot(
 def generate_all_plots(
     output_dir: Path = OUTPUT_DIR,
     topics: Optional[List[str]] = None,
-    ablations: Optional[List[str]] = None
+    ablations: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    force: bool = False
 ) -> None:
     """
     Generate all plots for the experiment.
     
+    Figures whose input data and rendering parameters are unchanged since
+    they were last rendered are skipped; the rest render in parallel.
+    
     Args:
         output_dir: Output directory
         topics: List of topics (None = auto-detect)
         ablations: List of ablations to plot
+        max_workers: Rendering processes (None = CPU count, 0 = in-process)
+        force: Re-render every figure
     """
     figures_dir = output_dir / "figures"
     figures_dir.mkdir(parents=True, exist_ok=True)
+    build = FigureBuild(figures_dir, max_workers=max_workers, force=force)
     
     if ablations is None:
         ablations = ["full"]
     
+    # Rescan once (results may have been written since the tree was last
+    # scanned); every collector below then reads from the same dataset
+    get_dataset(output_dir, refresh=True)
+    
     for ablation in ablations:
         # Create subfolder for this ablation
         ablation_dir = figures_dir / ablation
@@ -2516,20 +1918,23 @@ def generate_all_plots(
         # Clustered results for barplots (95% CI)
         all_results_clustered = collect_all_results_clustered(output_dir, ablation, topics)
         
-        plot_epsilon_histogram(
+        build.add(
+            plot_epsilon_histogram,
             all_results,
             title=f"Epsilon Distribution by Voting Method{ablation_label}",
             output_path=aggregate_dir / "epsilon_histogram.png"
         )
         
-        plot_epsilon_barplot(
+        build.add(
+            plot_epsilon_barplot,
             all_results_clustered,
             title=f"Average Epsilon by Voting Method{ablation_label}",
             output_path=aggregate_dir / "epsilon_barplot.png"
         )
         
         # Aggregate strip plot (methods as rows)
-        plot_epsilon_stripplot(
+        build.add(
+            plot_epsilon_stripplot,
             all_results,
             title=f"Epsilon Distribution by Voting Method{ablation_label}",
             output_path=aggregate_dir / "epsilon_stripplot.png"
@@ -2549,7 +1954,8 @@ def generate_all_plots(
             method_by_topic = {k: v for k, v in method_by_topic.items() if v}
             if method_by_topic:
                 method_display = METHOD_NAMES.get(method, method)
-                plot_epsilon_stripplot_by_topic(
+                build.add(
+                    plot_epsilon_stripplot_by_topic,
                     method_by_topic,
                     method,
                     title=f"Epsilon by Topic: {method_display}{ablation_label}",
@@ -2561,7 +1967,8 @@ def generate_all_plots(
             method_values = all_results.get(method, [])
             if method_values:
                 method_display = METHOD_NAMES.get(method, method)
-                plot_single_method_histogram(
+                build.add(
+                    plot_single_method_histogram,
                     method_values,
                     method,
                     title=f"Epsilon: All Topics - {method_display}{ablation_label}",
@@ -2585,7 +1992,8 @@ def generate_all_plots(
         all_likert_results_clustered = collect_all_likert_clustered(output_dir, ablation, topics)
         
         # Aggregate Likert bar plot
-        plot_likert_barplot(
+        build.add(
+            plot_likert_barplot,
             all_likert_results_clustered,
             title=f"Average Likert Rating by Voting Method{ablation_label}",
             output_path=aggregate_dir / "likert_barplot.png"
@@ -2593,7 +2001,8 @@ def generate_all_plots(
         
         # Special plot for no_bridging with red line at VBC lower CI
         if ablation == "no_bridging":
-            plot_likert_barplot(
+            build.add(
+                plot_likert_barplot,
                 all_likert_results_clustered,
                 title=f"Average Likert Rating by Voting Method{ablation_label}",
                 output_path=aggregate_dir / "likert_barplot_vbc_highlight.png",
@@ -2601,7 +2010,8 @@ def generate_all_plots(
             )
         
         # Aggregate Likert strip plot (methods as rows)
-        plot_likert_stripplot(
+        build.add(
+            plot_likert_stripplot,
             all_likert_results,
             title=f"Likert Rating Distribution by Voting Method{ablation_label}",
             output_path=aggregate_dir / "likert_stripplot.png"
@@ -2610,25 +2020,29 @@ def generate_all_plots(
         # Cluster size strip plot (only for full ablation)
         if ablation == "full":
             all_cluster_sizes = collect_all_cluster_sizes(output_dir, ablation, topics)
-            plot_cluster_size_stripplot(
+            build.add(
+                plot_cluster_size_stripplot,
                 all_cluster_sizes,
                 title=f"Cluster Size Distribution by Voting Method{ablation_label}",
                 output_path=aggregate_dir / "cluster_size_stripplot.png",
                 use_log_scale=False
             )
-            plot_cluster_size_stripplot(
+            build.add(
+                plot_cluster_size_stripplot,
                 all_cluster_sizes,
                 title=f"Cluster Size Distribution by Voting Method (Log Scale){ablation_label}",
                 output_path=aggregate_dir / "cluster_size_stripplot_log.png",
                 use_log_scale=True
             )
-            plot_cluster_size_violinplot(
+            build.add(
+                plot_cluster_size_violinplot,
                 all_cluster_sizes,
                 title=f"Cluster Size Distribution by Voting Method{ablation_label}",
                 output_path=aggregate_dir / "cluster_size_violinplot.png",
                 use_log_scale=False
             )
-            plot_cluster_size_violinplot(
+            build.add(
+                plot_cluster_size_violinplot,
                 all_cluster_sizes,
                 title=f"Cluster Size Distribution by Voting Method (Log Scale){ablation_label}",
                 output_path=aggregate_dir / "cluster_size_violinplot_log.png",
@@ -2637,7 +2051,8 @@ def generate_all_plots(
             
             # Winner cluster percentile ranking bar plot
             all_percentile_clustered = collect_all_winner_cluster_percentile_clustered(output_dir, ablation, topics)
-            plot_winner_cluster_percentile_barplot(
+            build.add(
+                plot_winner_cluster_percentile_barplot,
                 all_percentile_clustered,
                 title=f"Winner Cluster Size Percentile Ranking by Voting Method{ablation_label}",
                 output_path=aggregate_dir / "winner_cluster_percentile_barplot.png"
@@ -2654,7 +2069,8 @@ def generate_all_plots(
             method_by_topic = {k: v for k, v in method_by_topic.items() if v}
             if method_by_topic:
                 method_display = METHOD_NAMES.get(method, method)
-                plot_likert_stripplot_by_topic(
+                build.add(
+                    plot_likert_stripplot_by_topic,
                     method_by_topic,
                     method,
                     title=f"Likert by Topic: {method_display}{ablation_label}",
@@ -2682,20 +2098,23 @@ def generate_all_plots(
             # Clustered results for barplots (95% CI)
             topic_results_clustered = collect_results_clustered_for_topic(topic, output_dir, ablation)
             
-            plot_epsilon_histogram(
+            build.add(
+                plot_epsilon_histogram,
                 topic_results,
                 title=f"Epsilon Distribution: {display_name}{ablation_label}",
                 output_path=topic_dir / "epsilon_histogram.png"
             )
             
-            plot_epsilon_barplot(
+            build.add(
+                plot_epsilon_barplot,
                 topic_results_clustered,
                 title=f"Average Epsilon: {display_name}{ablation_label}",
                 output_path=topic_dir / "epsilon_barplot.png"
             )
             
             # Per-topic epsilon strip plot (methods as rows)
-            plot_epsilon_stripplot(
+            build.add(
+                plot_epsilon_stripplot,
                 topic_results,
                 title=f"Epsilon Distribution: {display_name}{ablation_label}",
                 output_path=topic_dir / "epsilon_stripplot.png"
@@ -2706,7 +2125,8 @@ def generate_all_plots(
                 method_values = topic_results.get(method, [])
                 if method_values:
                     method_display = METHOD_NAMES.get(method, method)
-                    plot_single_method_histogram(
+                    build.add(
+                        plot_single_method_histogram,
                         method_values,
                         method,
                         title=f"Epsilon: {display_name} - {method_display}{ablation_label}",
@@ -2717,14 +2137,16 @@ def generate_all_plots(
             likert_results = collect_likert_for_topic(topic, output_dir, ablation)
             likert_results_clustered = collect_likert_clustered_for_topic(topic, output_dir, ablation)
             
-            plot_likert_barplot(
+            build.add(
+                plot_likert_barplot,
                 likert_results_clustered,
                 title=f"Average Likert Rating: {display_name}{ablation_label}",
                 output_path=topic_dir / "likert_barplot.png"
             )
             
             # Per-topic Likert strip plot (methods as rows)
-            plot_likert_stripplot(
+            build.add(
+                plot_likert_stripplot,
                 likert_results,
                 title=f"Likert Distribution: {display_name}{ablation_label}",
                 output_path=topic_dir / "likert_stripplot.png"
@@ -2733,25 +2155,29 @@ def generate_all_plots(
             # Cluster size strip plot (only for full ablation)
             if ablation == "full":
                 topic_cluster_sizes = collect_cluster_sizes_for_topic(topic, output_dir, ablation)
-                plot_cluster_size_stripplot(
+                build.add(
+                    plot_cluster_size_stripplot,
                     topic_cluster_sizes,
                     title=f"Cluster Size Distribution: {display_name}{ablation_label}",
                     output_path=topic_dir / "cluster_size_stripplot.png",
                     use_log_scale=False
                 )
-                plot_cluster_size_stripplot(
+                build.add(
+                    plot_cluster_size_stripplot,
                     topic_cluster_sizes,
                     title=f"Cluster Size Distribution: {display_name} (Log Scale){ablation_label}",
                     output_path=topic_dir / "cluster_size_stripplot_log.png",
                     use_log_scale=True
                 )
-                plot_cluster_size_violinplot(
+                build.add(
+                    plot_cluster_size_violinplot,
                     topic_cluster_sizes,
                     title=f"Cluster Size Distribution: {display_name}{ablation_label}",
                     output_path=topic_dir / "cluster_size_violinplot.png",
                     use_log_scale=False
                 )
-                plot_cluster_size_violinplot(
+                build.add(
+                    plot_cluster_size_violinplot,
                     topic_cluster_sizes,
                     title=f"Cluster Size Distribution: {display_name} (Log Scale){ablation_label}",
                     output_path=topic_dir / "cluster_size_violinplot_log.png",
@@ -2760,13 +2186,15 @@ def generate_all_plots(
                 
                 # Winner cluster percentile ranking bar plot
                 topic_percentile_clustered = collect_winner_cluster_percentile_clustered_for_topic(topic, output_dir, ablation)
-                plot_winner_cluster_percentile_barplot(
+                build.add(
+                    plot_winner_cluster_percentile_barplot,
                     topic_percentile_clustered,
                     title=f"Winner Cluster Size Percentile Ranking: {display_name}{ablation_label}",
                     output_path=topic_dir / "winner_cluster_percentile_barplot.png"
                 )
             
-            plot_likert_histogram(
+            build.add(
+                plot_likert_histogram,
                 likert_results,
                 title=f"Likert Distribution: {display_name}{ablation_label}",
                 output_path=topic_dir / "likert_histogram.png"
@@ -2777,7 +2205,8 @@ def generate_all_plots(
                 method_values = likert_results.get(method, [])
                 if method_values:
                     method_display = METHOD_NAMES.get(method, method)
-                    plot_single_method_likert_histogram(
+                    build.add(
+                        plot_single_method_likert_histogram,
                         method_values,
                         method,
                         title=f"Likert: {display_name} - {method_display}{ablation_label}",
@@ -2786,23 +2215,26 @@ def generate_all_plots(
         
         # Generate multi-persona plots for this ablation
         logger.info(f"Generating multi-persona plots for ablation: {ablation}")
-        _generate_multi_persona_plots_for_ablation(output_dir, topics, ablation)
+        _generate_multi_persona_plots_for_ablation(output_dir, topics, ablation, build)
     
+    build.run()
     logger.info(f"Generated all plots in {figures_dir}")
 
 
 def _generate_multi_persona_plots_for_ablation(
     output_dir: Path,
     topics: Optional[List[str]],
-    ablation: str
+    ablation: str,
+    build: FigureBuild
 ) -> None:
     """
-    Generate multi-persona comparison plots for a specific ablation.
+    Queue multi-persona comparison plots for a specific ablation.
     
     Args:
         output_dir: Output directory
         topics: List of topics
         ablation: Ablation type
+        build: Figure build the plots are added to
     """
     figures_dir = output_dir / "figures" / ablation / "aggregate"
     figures_dir.mkdir(parents=True, exist_ok=True)
@@ -2832,14 +2264,16 @@ def _generate_multi_persona_plots_for_ablation(
         return
     
     # Generate barplot
-    plot_epsilon_multi_persona_barplot(
+    build.add(
+        plot_epsilon_multi_persona_barplot,
         clustered_results_by_n,
         title=f"Average Epsilon by Persona Count{ablation_label}",
         output_path=figures_dir / "epsilon_multi_persona_barplot.png"
     )
     
     # Generate stripplot
-    plot_epsilon_multi_persona_stripplot(
+    build.add(
+        plot_epsilon_multi_persona_stripplot,
         flat_results_by_n,
         title=f"Epsilon Distribution by Persona Count{ablation_label}",
         output_path=figures_dir / "epsilon_multi_persona_stripplot.png"
@@ -2,16 +2,17 @@
 Run voting methods and compute epsilon-PVC.
 """
 
+from __future__ import annotations
+
 import json
 import random
 import logging
-from typing import List, Dict, Tuple
+from typing import TYPE_CHECKING, List, Dict, Tuple
 from pathlib import Path
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from openai import OpenAI
-from votekit import RankProfile, RankBallot
-from votekit.elections import Plurality, Borda, IRV, RankedPairs
-from pvc_toolbox import compute_critical_epsilon
+if TYPE_CHECKING:
+    from openai import OpenAI
+    from votekit import RankProfile
 
 import time
 
@@ -23,6 +24,9 @@ from .config import (
     VOTING_METHODS,
     api_timer,
 )
+from .epsilon_memo import EpsilonMemo
+from src.sampling_experiment.voting_executor import MethodTask, run_sample_methods
+from src.typed_responses import parse_response, selection_schema
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +57,41 @@ def sample_personas_for_voting(
     return indices
 
 
+def sample_nested_personas(
+    n_total: int,
+    counts: List[int],
+    seed: int = 42
+) -> Dict[int, List[int]]:
+    """
+    Sample persona indices for several persona counts from one seeded stream.
+    
+    The samples are nested: the personas for a smaller count are the first
+    draws of the larger ones. Draws are the ones random.sample makes for
+    small samples of a large population (uniform picks, rejecting repeats),
+    so for such sizes (e.g. 5, 10 and 20 of 100) each count gets exactly
+    the indices sample_personas_for_voting(n_total, count, seed) returns.
+    
+    Args:
+        n_total: Total number of personas
+        counts: Persona counts to sample
+        seed: Random seed
+    
+    Returns:
+        Dict mapping each count to its sorted persona indices
+    """
+    if max(counts) > n_total:
+        raise ValueError(f"Cannot sample {max(counts)} of {n_total} personas")
+    rng = random.Random(seed)
+    order = []
+    seen = set()
+    while len(order) < max(counts):
+        idx = rng.randrange(n_total)
+        if idx not in seen:
+            seen.add(idx)
+            order.append(idx)
+    return {count: sorted(order[:count]) for count in counts}
+
+
 def extract_sampled_preferences(
     preferences: List[List[str]],
     persona_indices: List[int]
@@ -89,6 +128,8 @@ def _preferences_to_votekit(preferences: List[List[str]]) -> Tuple[RankProfile,
     Returns:
         Tuple of (RankProfile, candidate_names)
     """
+    from votekit import RankProfile, RankBallot
+    
     n_statements = len(preferences)
     n_voters = len(preferences[0]) if preferences else 0
     
@@ -119,6 +160,8 @@ def _extract_winner(elected, prefix: str = "c") -> str:
 
 def run_schulze(preferences: List[List[str]]) -> Dict:
     """Run Schulze/RankedPairs method (Condorcet)."""
+    from votekit.elections import RankedPairs
+    
     try:
         profile, _ = _preferences_to_votekit(preferences)
         # Use RankedPairs as a Condorcet method (Schulze not available in this votekit version)
@@ -133,6 +176,8 @@ def run_schulze(preferences: List[List[str]]) -> Dict:
 
 def run_borda(preferences: List[List[str]]) -> Dict:
     """Run Borda count."""
+    from votekit.elections import Borda
+    
     try:
         profile, _ = _preferences_to_votekit(preferences)
         election = Borda(profile, m=1, tiebreak="random")
@@ -146,6 +191,8 @@ def run_borda(preferences: List[List[str]]) -> Dict:
 
 def run_irv(preferences: List[List[str]]) -> Dict:
     """Run Instant Runoff Voting."""
+    from votekit.elections import IRV
+    
     try:
         profile, _ = _preferences_to_votekit(preferences)
         election = IRV(profile, tiebreak="random")
@@ -159,6 +206,8 @@ def run_irv(preferences: List[List[str]]) -> Dict:
 
 def run_plurality(preferences: List[List[str]]) -> Dict:
     """Run Plurality voting."""
+    from votekit.elections import Plurality
+    
     try:
         profile, _ = _preferences_to_votekit(preferences)
         election = Plurality(profile, m=1, tiebreak="random")
@@ -228,6 +277,7 @@ Return your choice as a JSON object with this format:
 Where the value is the index (0-{n-1}) of the statement you select.
 Return only the JSON, no additional text."""
 
+    schema = selection_schema(n)
     try:
         start_time = time.time()
         response = openai_client.responses.create(
@@ -237,12 +287,12 @@ Return only the JSON, no additional text."""
                 {"role": "user", "content": user_prompt}
             ],
             temperature=TEMPERATURE,
-            reasoning={"effort": "minimal"}
+            reasoning={"effort": "minimal"},
+            text=schema.text_format,
         )
         api_timer.record(time.time() - start_time)
         
-        result = json.loads(response.output_text)
-        winner = str(result.get("selected_statement_index"))
+        winner = str(parse_response(response, schema))
         
         return {"winner": winner}
     except Exception as e:
@@ -300,6 +350,7 @@ Return your choice as a JSON object with this format:
 Where the value is the index (0-{n-1}) of the statement you select.
 Return only the JSON, no additional text."""
 
+    schema = selection_schema(n)
     try:
         start_time = time.time()
         response = openai_client.responses.create(
@@ -309,12 +360,12 @@ Return only the JSON, no additional text."""
                 {"role": "user", "content": user_prompt}
             ],
             temperature=TEMPERATURE,
-            reasoning={"effort": "minimal"}
+            reasoning={"effort": "minimal"},
+            text=schema.text_format,
         )
         api_timer.record(time.time() - start_time)
         
-        result = json.loads(response.output_text)
-        winner = str(result.get("selected_statement_index"))
+        winner = str(parse_response(response, schema))
         
         return {"winner": winner}
     except Exception as e:
@@ -367,6 +418,7 @@ Return your choice as a JSON object with this format:
 Where the value is the index (0-{n-1}) of the statement you select.
 Return only the JSON, no additional text."""
 
+    schema = selection_schema(n)
     try:
         start_time = time.time()
         response = openai_client.responses.create(
@@ -376,12 +428,12 @@ Return only the JSON, no additional text."""
                 {"role": "user", "content": user_prompt}
             ],
             temperature=TEMPERATURE,
-            reasoning={"effort": "minimal"}
+            reasoning={"effort": "minimal"},
+            text=schema.text_format,
         )
         api_timer.record(time.time() - start_time)
         
-        result = json.loads(response.output_text)
-        winner = str(result.get("selected_statement_index"))
+        winner = str(parse_response(response, schema))
         
         return {"winner": winner}
     except Exception as e:
@@ -395,47 +447,45 @@ Return only the JSON, no additional text."""
 
 def compute_epsilon_for_winner(
     preferences: List[List[str]],
-    winner: str
+    winner: str,
+    sample_dir: Path = None
 ) -> float:
     """
     Compute the critical epsilon for a winner.
     
+    Goes through the epsilon memo, so a profile's epsilon for a winner is
+    computed once per process (or once ever, with a sample_dir).
+    
     Args:
         preferences: Preference matrix [rank][voter]
         winner: Winner statement index (as string)
+        sample_dir: Optional sample directory whose epsilons.json memoizes the value
     
     Returns:
         Critical epsilon value
     """
     if winner is None:
         return None
-    
-    n_statements = len(preferences)
-    
-    # pvc_toolbox expects preferences[rank][voter] - which is exactly what we have
-    # alternatives should match the statement indices in preferences
-    alternatives = [str(i) for i in range(n_statements)]
-    
-    try:
-        epsilon = compute_critical_epsilon(preferences, alternatives, winner)
-        return epsilon
-    except Exception as e:
-        logger.error(f"Epsilon computation failed for winner {winner}: {e}")
-        return None
+    return EpsilonMemo(preferences, sample_dir).get(winner)
 
 
 # =============================================================================
 # Run All Methods
 # =============================================================================
 
-def run_all_voting_methods(
+def voting_method_tasks(
     preferences: List[List[str]],
     statements: List[Dict],
     openai_client: OpenAI,
     personas: List[str] = None
-) -> Dict[str, Dict]:
+) -> List[MethodTask]:
     """
-    Run all voting methods and compute epsilon for each winner.
+    Build the voting method tasks for one sample.
+    
+    Traditional methods are CPU bound; the ChatGPT methods run in threads.
+    The tasks only pick winners: epsilons are attached per sample, once all
+    winners are known, by EpsilonMemo(preferences, sample_dir).attach (pass
+    it to VotingExecutor.run as the sample's finalizer).
     
     Args:
         preferences: Preference matrix [rank][voter]
@@ -444,58 +494,54 @@ def run_all_voting_methods(
         personas: Optional list of persona descriptions for sampled voters
     
     Returns:
-        Dict mapping method name to result dict with winner and epsilon
+        List of MethodTask in result order
     """
-    results = {}
-    
-    # Schulze
-    logger.info("Running Schulze...")
-    results["schulze"] = run_schulze(preferences)
-    
-    # Borda
-    logger.info("Running Borda...")
-    results["borda"] = run_borda(preferences)
-    
-    # IRV
-    logger.info("Running IRV...")
-    results["irv"] = run_irv(preferences)
-    
-    # Plurality
-    logger.info("Running Plurality...")
-    results["plurality"] = run_plurality(preferences)
-    
-    # Veto by consumption
-    logger.info("Running Veto by Consumption...")
-    results["veto_by_consumption"] = run_veto_by_consumption(preferences)
-    
-    # ChatGPT
-    logger.info("Running ChatGPT...")
-    results["chatgpt"] = run_chatgpt(statements, openai_client)
-    
-    # ChatGPT with rankings
-    logger.info("Running ChatGPT with rankings...")
-    results["chatgpt_with_rankings"] = run_chatgpt_with_rankings(
-        statements, preferences, openai_client
-    )
-    
+    tasks = [
+        MethodTask(name, func, (preferences,), cpu_bound=True)
+        for name, func in [
+            ("schulze", run_schulze),
+            ("borda", run_borda),
+            ("irv", run_irv),
+            ("plurality", run_plurality),
+            ("veto_by_consumption", run_veto_by_consumption),
+        ]
+    ]
+    tasks.append(MethodTask("chatgpt", run_chatgpt, (statements, openai_client)))
+    tasks.append(MethodTask("chatgpt_with_rankings", run_chatgpt_with_rankings,
+                            (statements, preferences, openai_client)))
     # ChatGPT with personas (only if personas provided)
     if personas is not None:
-        logger.info("Running ChatGPT with personas...")
-        results["chatgpt_with_personas"] = run_chatgpt_with_personas(
-            statements, personas, openai_client
-        )
+        tasks.append(MethodTask("chatgpt_with_personas", run_chatgpt_with_personas,
+                                (statements, personas, openai_client)))
+    return tasks
+
+
+def run_all_voting_methods(
+    preferences: List[List[str]],
+    statements: List[Dict],
+    openai_client: OpenAI,
+    personas: List[str] = None,
+    sample_dir: Path = None
+) -> Dict[str, Dict]:
+    """
+    Run all voting methods concurrently and compute epsilon for each winner.
     
-    # Compute epsilon for each winner
-    logger.info("Computing epsilon values...")
-    for method, result in results.items():
-        winner = result.get("winner")
-        if winner is not None:
-            epsilon = compute_epsilon_for_winner(preferences, winner)
-            result["epsilon"] = epsilon
-            logger.info(f"  {method}: winner={winner}, epsilon={epsilon}")
-        else:
-            result["epsilon"] = None
+    Args:
+        preferences: Preference matrix [rank][voter]
+        statements: List of statement dicts
+        openai_client: OpenAI client
+        personas: Optional list of persona descriptions for sampled voters
+        sample_dir: Optional sample directory to persist the epsilons in
     
+    Returns:
+        Dict mapping method name to result dict with winner and epsilon
+    """
+    results = run_sample_methods(voting_method_tasks(
+        preferences, statements, openai_client, personas
+    ))
+    EpsilonMemo(preferences, sample_dir).attach(results)
+    for method, result in results.items():
+        logger.info(f"  {method}: winner={result.get('winner')}, epsilon={result.get('epsilon')}")
     return results
 
 
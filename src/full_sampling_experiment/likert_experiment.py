@@ -17,6 +17,7 @@ from openai import OpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from tqdm import tqdm
 
+from src.typed_responses import labeled_positions_schema, parse_response
 from .config import (
     MODEL_LIKERT,
     TEMPERATURE,
@@ -84,6 +85,7 @@ Return your ratings as a JSON object with statement IDs as keys:
 
 IMPORTANT: Each score must be an integer from 1 to 10. Include all {n} statements."""
 
+    schema = labeled_positions_schema({str(i): (1, 10) for i in range(n)}, name="likert_scores")
     start_time = time.time()
     response = openai_client.responses.create(
         model=model,
@@ -93,26 +95,11 @@ IMPORTANT: Each score must be an integer from 1 to 10. Include all {n} statement
         ],
         temperature=temperature,
         reasoning={"effort": "minimal"},
+        text=schema.text_format,
     )
     api_timer.record(time.time() - start_time)
     
-    result = json.loads(response.output_text)
-    
-    # Validate and convert to proper format
-    scores = {}
-    for i in range(n):
-        key = str(i)
-        if key in result:
-            score = int(result[key])
-            # Clamp to valid range
-            score = max(1, min(10, score))
-            scores[key] = score
-        else:
-            # Default to neutral if missing
-            logger.warning(f"Missing score for statement {i}, defaulting to 5")
-            scores[key] = 5
-    
-    return scores
+    return parse_response(response, schema)
 
 
 def collect_likert_scores(
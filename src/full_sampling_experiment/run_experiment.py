@@ -68,6 +68,8 @@ from src.sampling_experiment.epsilon_calculator import (
     load_precomputed_epsilons,
     get_mean_epsilon,
 )
+from src.figure_build import FigureBuild
+from src.typed_responses import format_stats
 from src.sampling_experiment.voting_methods import (
     run_schulze,
     run_borda,
@@ -581,7 +583,7 @@ def run_mini_variant(
 
 
 def generate_visualizations(output_dir: Path, topics: List[str], n_reps: int) -> None:
-    """Generate all visualizations after experiment completion."""
+    """Generate all visualizations after experiment completion (stale figures only)."""
     logger = logging.getLogger(__name__)
     
     logger.info("=" * 80)
@@ -590,6 +592,7 @@ def generate_visualizations(output_dir: Path, topics: List[str], n_reps: int) ->
     
     figures_dir = output_dir / "figures"
     figures_dir.mkdir(parents=True, exist_ok=True)
+    build = FigureBuild(figures_dir)
     
     # Collect Likert scores across all topics (only rep 0)
     all_topics_scores = {}
@@ -605,9 +608,10 @@ def generate_visualizations(output_dir: Path, topics: List[str], n_reps: int) ->
     # Plot Likert histograms
     if all_topics_scores:
         logger.info("Plotting Likert histograms...")
-        plot_likert_histograms(
+        build.add(
+            plot_likert_histograms,
             all_topics_scores,
-            figures_dir / "likert_histograms_all_topics.png"
+            output_path=figures_dir / "likert_histograms_all_topics.png"
         )
     
     # Mini variant comparison (if available)
@@ -625,14 +629,16 @@ def generate_visualizations(output_dir: Path, topics: List[str], n_reps: int) ->
         if mini_scores is not None and MINI_VARIANT_TOPIC in all_topics_scores:
             from .likert_experiment import plot_likert_comparison
             
-            plot_likert_comparison(
+            build.add(
+                plot_likert_comparison,
                 {MINI_VARIANT_TOPIC: all_topics_scores[MINI_VARIANT_TOPIC]},
                 {MINI_VARIANT_TOPIC: mini_scores.flatten()},
-                figures_dir / "mini_variant_comparison.png",
+                output_path=figures_dir / "mini_variant_comparison.png",
                 main_label="Original Statements",
                 variant_label="Bridging Statements"
             )
     
+    build.run()
     logger.info("Visualizations complete")
 
 
@@ -740,6 +746,7 @@ def main():
     
     logger.info("\n" + "=" * 80)
     logger.info("FULL EXPERIMENT COMPLETE")
+    format_stats.log_stats()
     logger.info(f"Finished at {datetime.now().isoformat()}")
     logger.info(f"Output directory: {args.output_dir}")
 
@@ -0,0 +1,89 @@
+"""
+Append-only JSONL checkpoints for resuming a pipeline step mid-way.
+
+Each step (statement generation, discriminative ranking, evaluative scoring)
+records one line per finished unit of work (a persona's statement, a
+persona's ranking, a single rating). An interrupted topic then resumes from
+the last completed unit instead of restarting the step.
+
+The first line of a checkpoint holds the step's metadata (e.g. number of
+personas and statements). If the metadata no longer matches, the stale
+checkpoint is set aside and the step starts fresh.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StepCheckpoint:
+    """Thread-safe append-only JSONL checkpoint for one pipeline step."""
+    
+    def __init__(self, path, meta: Optional[Dict] = None):
+        """
+        Args:
+            path: Checkpoint file path (.jsonl)
+            meta: Metadata identifying the step's inputs; a checkpoint
+                written with different metadata is discarded
+        """
+        self.path = Path(path)
+        self.meta = meta or {}
+        self._lock = threading.Lock()
+        self._records = self._read()
+    
+    def _read(self) -> List[Dict]:
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path) as f:
+            lines = f.read().splitlines()
+        if not lines or json.loads(lines[0]).get("meta") != self.meta:
+            stale = self.path.with_suffix(".stale.jsonl")
+            os.replace(self.path, stale)
+            logger.warning(f"Checkpoint {self.path} does not match current inputs; moved to {stale}")
+            return []
+        for line in lines[1:]:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Torn final line from an interrupted write; drop it so
+                # later appends start on a clean line
+                tmp = self.path.with_suffix(".tmp")
+                with open(tmp, 'w') as f:
+                    f.write("\n".join(lines[:len(records) + 1]) + "\n")
+                os.replace(tmp, self.path)
+                break
+        logger.info(f"Resuming from checkpoint {self.path}: {len(records)} completed")
+        return records
+    
+    @property
+    def records(self) -> List[Dict]:
+        """Records completed so far (including ones loaded from disk)."""
+        with self._lock:
+            return list(self._records)
+    
+    def append(self, record: Dict) -> None:
+        """Durably record one completed unit of work."""
+        line = json.dumps(record)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            new_file = not self.path.exists()
+            with open(self.path, 'a') as f:
+                if new_file:
+                    f.write(json.dumps({"meta": self.meta}) + "\n")
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._records.append(record)
+    
+    def remove(self) -> None:
+        """Delete the checkpoint once the step's output has been saved."""
+        with self._lock:
+            if self.path.exists():
+                self.path.unlink()
+            self._records = []
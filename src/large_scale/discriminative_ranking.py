@@ -4,16 +4,18 @@ Get preference rankings from discriminative personas using pairwise comparisons.
 
 import json
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional
 from openai import OpenAI
 from src.large_scale.pairwise_ranking import get_preference_matrix_pairwise
+from src.large_scale.checkpoint import StepCheckpoint
 
 
 def get_discriminative_rankings(
     personas: List[str],
     statements: List[Dict],
     topic: str,
-    openai_client: OpenAI
+    openai_client: OpenAI,
+    checkpoint: Optional[StepCheckpoint] = None
 ) -> List[List[str]]:
     """
     Get preference rankings from discriminative personas.
@@ -23,11 +25,12 @@ def get_discriminative_rankings(
         statements: List of statement dicts
         topic: The topic/question
         openai_client: OpenAI client instance
+        checkpoint: Optional per-persona checkpoint for resuming mid-step
     
     Returns:
         Preference matrix where preferences[rank][voter] is the alternative at rank 'rank' for voter 'voter'
     """
-    return get_preference_matrix_pairwise(personas, statements, topic, openai_client)
+    return get_preference_matrix_pairwise(personas, statements, topic, openai_client, checkpoint=checkpoint)
 
 
 def save_preferences(
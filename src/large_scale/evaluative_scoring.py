@@ -4,13 +4,17 @@ Get Likert scale ratings from evaluative personas (with parallelization).
 
 import json
 import os
-from typing import List, Dict
+import threading
+from typing import List, Dict, Optional
 from openai import OpenAI
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import logging
 
+from src.large_scale.checkpoint import StepCheckpoint
+from src.typed_responses import LIKERT_RATING, parse_response
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -77,16 +81,11 @@ Return only the JSON, no additional text."""
             input=[
                 {"role": "system", "content": "You are rating statements based on the given persona. Return ONLY valid JSON, no other text."},
                 {"role": "user", "content": prompt}
-            ]
+            ],
+            text=LIKERT_RATING.text_format,
         )
         
-        result = json.loads(response.output_text)
-        rating = result.get("rating", 3)
-        
-        # Ensure rating is in valid range
-        rating = max(1, min(5, int(rating)))
-        
-        return rating
+        return parse_response(response, LIKERT_RATING)
     except Exception as e:
         logger.error(f"Error getting rating from persona {persona_idx} for statement {stmt_idx}: {e}")
         raise
@@ -97,7 +96,8 @@ def get_all_ratings(
     statements: List[Dict],
     topic: str,
     openai_client: OpenAI,
-    max_workers: int = 20
+    max_workers: int = 20,
+    checkpoint: Optional[StepCheckpoint] = None
 ) -> List[Dict]:
     """
     Get Likert ratings from all evaluative personas for all statements (parallelized).
@@ -108,6 +108,8 @@ def get_all_ratings(
         topic: The topic/question
         openai_client: OpenAI client instance
         max_workers: Maximum number of parallel workers (default: 20)
+        checkpoint: Optional per-rating checkpoint; (persona, statement)
+            cells already recorded there are not re-requested
     
     Returns:
         List of rating dicts, each with:
@@ -129,11 +131,22 @@ def get_all_ratings(
     
     errors = []
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    done = 0
+    if checkpoint is not None:
+        for record in checkpoint.records:
+            all_ratings[record["p"]]["ratings"][record["s"]] = record["rating"]
+            done += 1
+    
+    with ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix=threading.current_thread().name
+    ) as executor:
         # Submit all rating tasks
         future_to_coords = {}
         for p_idx, persona in enumerate(personas):
             for s_idx, statement in enumerate(statements):
+                if all_ratings[p_idx]["ratings"][s_idx] is not None:
+                    continue
                 future = executor.submit(
                     get_likert_rating,
                     persona,
@@ -146,12 +159,14 @@ def get_all_ratings(
                 future_to_coords[future] = (p_idx, s_idx)
         
         # Process completed tasks with progress bar
-        with tqdm(total=total_tasks, desc="Getting evaluative ratings", unit="rating") as pbar:
+        with tqdm(total=total_tasks, initial=done, desc="Getting evaluative ratings", unit="rating") as pbar:
             for future in as_completed(future_to_coords):
                 p_idx, s_idx = future_to_coords[future]
                 try:
                     rating = future.result()
                     all_ratings[p_idx]["ratings"][s_idx] = rating
+                    if checkpoint is not None:
+                        checkpoint.append({"p": p_idx, "s": s_idx, "rating": rating})
                     pbar.update(1)
                 except Exception as e:
                     logger.error(f"Failed to get rating from persona {p_idx} for statement {s_idx}: {e}")
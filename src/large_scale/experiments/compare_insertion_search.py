@@ -0,0 +1,140 @@
+"""
+Compare pairwise search modes for hybrid insertion ranking.
+
+Runs rank_statements_hybrid for the same personas, statements and threshold
+under each search configuration and reports, per persona, the number of API
+calls, prompt/output tokens, wall-clock latency and critical-path length
+(sequential rounds):
+
+- binary: current hybrid (sequential binary search, then single call)
+- kary: k-1 concurrent pivot comparisons per level
+- binary+window / kary+window: additionally narrow until the single-call
+  sublist fits in --window-tokens
+- batchN: batch-merge insertion with chunks of --batch-size
+
+Usage:
+    uv run python -m src.large_scale.experiments.compare_insertion_search --personas 5 --statements 100
+    # Offline, against the local stand-in (python -m src.benchmarks.llm_standin):
+    uv run python -m src.large_scale.experiments.compare_insertion_search --base-url http://127.0.0.1:8765/v1 --synthetic
+"""
+
+import argparse
+import json
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from dotenv import load_dotenv
+import openai
+
+from src.large_scale.insertion_ranking import rank_statements_hybrid, DEFAULT_THRESHOLD, DEFAULT_K
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+STATEMENTS_FILE = Path("data/large_scale/prod/statements/what-should-guide-laws-concerning-abortion.json")
+PERSONAS_FILE = Path("data/personas/prod/discriminative.json")
+OUTPUT_DIR = Path("outputs/large_scale/insertion_search")
+TOPIC = "What should guide laws concerning abortion?"
+
+
+def load_inputs(n_personas: int, n_statements: int, seed: int, synthetic: bool) -> tuple[List[str], List[Dict]]:
+    """Load (or synthesize) personas and statements."""
+    if synthetic:
+        from src.benchmarks.throughput import make_synthetic_inputs
+        return make_synthetic_inputs(n_personas, n_statements, seed)
+    
+    with open(STATEMENTS_FILE) as f:
+        statements = json.load(f)[:n_statements]
+    with open(PERSONAS_FILE) as f:
+        personas = json.load(f)
+    random.seed(seed)
+    return random.sample(personas, min(n_personas, len(personas))), statements
+
+
+def run_configuration(
+    name: str,
+    client: openai.OpenAI,
+    personas: List[str],
+    statements: List[Dict],
+    threshold: int,
+    search_mode: str,
+    k: int,
+    window_tokens: int | None,
+    batch_size: int | None,
+    max_workers: int
+) -> List[Dict]:
+    """Rank all personas under one configuration and return per-persona usage."""
+    def process(idx: int) -> Dict:
+        _, usage = rank_statements_hybrid(
+            personas[idx], statements, TOPIC, client, threshold,
+            search_mode=search_mode, k=k, window_tokens=window_tokens,
+            batch_size=batch_size, return_stats=True
+        )
+        return {"config": name, "persona_idx": idx, **usage}
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(process, range(len(personas))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare hybrid insertion search modes")
+    parser.add_argument("--personas", type=int, default=5)
+    parser.add_argument("--statements", type=int, default=100)
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help="Arity for k-ary search")
+    parser.add_argument("--window-tokens", type=int, default=600,
+                        help="Token budget for the single-call step in window modes")
+    parser.add_argument("--batch-size", type=int, default=5, help="Chunk size for batch-merge mode")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-workers", type=int, default=10, help="Parallel personas")
+    parser.add_argument("--base-url", type=str, default=None, help="OpenAI-compatible base URL")
+    parser.add_argument("--synthetic", action="store_true", help="Use seeded synthetic personas/statements")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
+    client = openai.OpenAI(base_url=args.base_url) if args.base_url else openai.OpenAI()
+    personas, statements = load_inputs(args.personas, args.statements, args.seed, args.synthetic)
+    
+    configurations = [
+        ("binary", "binary", None, None),
+        (f"kary{args.k}", "kary", None, None),
+        ("binary+window", "binary", args.window_tokens, None),
+        (f"kary{args.k}+window", "kary", args.window_tokens, None),
+        (f"batch{args.batch_size}", "binary", None, args.batch_size),
+    ]
+    
+    rows = []
+    for name, mode, window, batch in configurations:
+        logger.info(f"Running {name} (threshold={args.threshold})")
+        rows.extend(run_configuration(
+            name, client, personas, statements, args.threshold,
+            mode, args.k, window, batch, args.max_workers
+        ))
+    
+    print(f"\nThreshold {args.threshold}, {len(personas)} personas x {len(statements)} statements (means per persona)")
+    print(f"{'Config':<18} {'Calls':>7} {'Input tok':>10} {'Output tok':>10} {'Wall s':>8} {'Crit path':>10}")
+    summary = {}
+    for name, *_ in configurations:
+        group = [r for r in rows if r["config"] == name]
+        mean = lambda key: sum(r[key] for r in group) / len(group)
+        summary[name] = {key: mean(key) for key in
+                         ["calls", "input_tokens", "output_tokens", "wall_seconds", "critical_path"]}
+        s = summary[name]
+        print(f"{name:<18} {s['calls']:>7.1f} {s['input_tokens']:>10.0f} {s['output_tokens']:>10.0f} "
+              f"{s['wall_seconds']:>8.1f} {s['critical_path']:>10.1f}")
+    
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output_file = OUTPUT_DIR / f"compare_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output_file, "w") as f:
+        json.dump({"args": vars(args), "summary": summary, "per_persona": rows}, f, indent=2)
+    print(f"\nSaved to {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,11 @@ import openai
 from tqdm import tqdm
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+from src.large_scale.pairwise_ranking import PREFERENCE_SCHEMA
+from src.typed_responses import parse_response
+
 # Load environment variables
 load_dotenv()
 
@@ -149,7 +154,8 @@ Return only JSON, no other text."""
         "input": [
             {"role": "system", "content": "You are evaluating statements. Return ONLY valid JSON."},
             {"role": "user", "content": prompt}
-        ]
+        ],
+        "text": PREFERENCE_SCHEMA.text_format,
     }
     
     # Add reasoning parameter if specified
@@ -158,8 +164,7 @@ Return only JSON, no other text."""
     
     response = client.responses.create(**api_params)
     
-    result = json.loads(response.output_text)
-    pref = result.get("preference", "equal").upper()
+    pref = parse_response(response, PREFERENCE_SCHEMA)
     
     if pref == "A":
         return -1
@@ -18,6 +18,7 @@ import random
 import logging
 from datetime import datetime
 from pathlib import Path
+from dataclasses import asdict
 from typing import List, Dict, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
@@ -27,6 +28,10 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 from tqdm import tqdm
 from dotenv import load_dotenv
 
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+from src.typed_responses import format_stats, pair_preferences_schema, parse_response
+
 # Load environment variables
 load_dotenv()
 
@@ -111,46 +116,26 @@ Compare these {len(batch)} pairs. For each, you MUST choose either A or B (no ti
 
 {comparisons_str}
 
-Return a JSON array with your preferred statement for each pair.
-Format: [{{"pair": 1, "preference": "A"}}, {{"pair": 2, "preference": "B"}}, ...]"""
+Return a JSON object with your preferred statement for each pair.
+Format: {{"comparisons": [{{"pair": 1, "preference": "A"}}, {{"pair": 2, "preference": "B"}}, ...]}}"""
 
+    schema = pair_preferences_schema(len(batch))
     try:
         response = client.responses.create(
             model="gpt-5-nano",
-            input=[{"role": "user", "content": prompt}]
+            input=[{"role": "user", "content": prompt}],
+            text=schema.text_format,
         )
         
-        # Find the actual content
-        content = None
-        if hasattr(response, 'output') and response.output:
-            # Look for a message output item (type='message', not 'reasoning')
-            for output_item in response.output:
-                item_type = getattr(output_item, 'type', None)
-                if item_type == 'message':
-                    # content is a list of ResponseOutputText objects
-                    if hasattr(output_item, 'content') and output_item.content:
-                        if isinstance(output_item.content, list) and len(output_item.content) > 0:
-                            # Extract text from first content item
-                            content = output_item.content[0].text
-                        else:
-                            content = output_item.content
-                        break
-        
-        if not content and hasattr(response, 'choices') and response.choices:
-            content = response.choices[0].message.content
-        
-        if not content:
-            logging.error(f"Could not find content in response")
-            raise ValueError("Could not extract content from response")
-        
-        result = json.loads(content)
+        result = parse_response(response, schema)
         
         # Validate result
-        if not isinstance(result, list) or len(result) != len(batch):
+        if len(result) != len(batch):
             logging.warning(f"Invalid response length: expected {len(batch)}, got {len(result)}")
+            format_stats.record_failure("pair_preferences", "wrong number of comparisons")
             raise ValueError("Invalid response format")
         
-        return result
+        return [asdict(preference) for preference in result]
         
     except Exception as e:
         logging.error(f"API call failed: {e}")
@@ -1,6 +1,11 @@
 """
 Run experiment with built-in sort for 100 statements and 25 discriminative personas.
 
+Pass --engine merge_insertion or --engine parallel_merge to rank with the
+alternative sort engines (src/large_scale/sort_engines.py); per-persona
+comparison counts and wall-clock time are saved in the JSON output under
+"sort_stats" for every engine, so runs are directly comparable.
+
 This script:
 - Loads first 100 statements for "What should guide laws concerning abortion?"
 - Samples 25 discriminative personas
@@ -73,18 +78,26 @@ def load_and_sample_personas(seed: int = 42, num_personas: int = 25) -> List[str
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 from src.large_scale.pairwise_ranking import rank_statements_pairwise
+from src.large_scale.sort_engines import SORT_ENGINES, DEFAULT_SORT_ENGINE
 from src.large_scale.biclique import compute_proportional_veto_core
+from src.typed_responses import parse_response, selection_schema
 
 
 def get_preference_rankings_parallel(
     personas: List[str],
     statements: List[Dict],
     topic: str,
-    max_workers: int = 25
+    max_workers: int = 25,
+    engine: str = DEFAULT_SORT_ENGINE,
+    sort_stats: List[Dict] = None
 ) -> List[List[str]]:
     """
     Get preference rankings from all personas in parallel.
     
+    Args:
+        engine: Sort engine used for each persona's ranking
+        sort_stats: If given, per-persona SortStats dicts are appended to it
+    
     Returns:
         Preference matrix where preferences[rank][voter] is the alternative at rank 'rank' for voter 'voter'
     """
@@ -97,7 +110,11 @@ def get_preference_rankings_parallel(
         """Process a single persona and return (index, ranking)."""
         idx, persona = args
         logging.info(f"Processing persona {idx+1}/{n_personas}")
-        ranking = rank_statements_pairwise(persona, statements, topic, client)
+        ranking, stats = rank_statements_pairwise(
+            persona, statements, topic, client, engine=engine, return_stats=True
+        )
+        if sort_stats is not None:
+            sort_stats.append({"persona_idx": idx, **stats})
         return idx, ranking
     
     rankings = [None] * n_personas
@@ -247,16 +264,17 @@ Return your choice as a JSON object with this format:
 Where the value is the index (0-{len(statements)-1}) of the statement you select.
 Return only the JSON, no additional text."""
 
+    schema = selection_schema(len(statements))
     try:
         response = client.responses.create(
             model="gpt-5-nano",
             input=[
                 {"role": "system", "content": "You are a helpful assistant that selects consensus statements. Return ONLY valid JSON, no other text."},
                 {"role": "user", "content": prompt}
-            ]
+            ],
+            text=schema.text_format,
         )
-        result = json.loads(response.output_text)
-        return {"winner_idx": result.get("selected_statement_index")}
+        return {"winner_idx": parse_response(response, schema)}
     except Exception as e:
         logging.error(f"ChatGPT baseline error: {e}")
         return {"winner_idx": None, "error": str(e)}
@@ -296,16 +314,17 @@ Return your choice as a JSON object with this format:
 Where the value is the index (0-{len(statements)-1}) of the statement you select.
 Return only the JSON, no additional text."""
 
+    schema = selection_schema(len(statements))
     try:
         response = client.responses.create(
             model="gpt-5-nano",
             input=[
                 {"role": "system", "content": "You are a helpful assistant that selects consensus statements. Return ONLY valid JSON, no other text."},
                 {"role": "user", "content": prompt}
-            ]
+            ],
+            text=schema.text_format,
         )
-        result = json.loads(response.output_text)
-        return {"winner_idx": result.get("selected_statement_index")}
+        return {"winner_idx": parse_response(response, schema)}
     except Exception as e:
         logging.error(f"ChatGPT+Rankings error: {e}")
         return {"winner_idx": None, "error": str(e)}
@@ -332,12 +351,39 @@ def generate_csv_table(results: Dict, pvc: List, output_file: str):
     logging.info(f"CSV table written to {output_file}")
 
 
-def run_experiment(num_statements: int = 100, num_personas: int = 25, seed: int = 42, max_workers: int = 25):
+def summarize_sort_stats(sort_stats: List[Dict]) -> Dict:
+    """Aggregate per-persona comparison counts and wall-clock time."""
+    if not sort_stats:
+        return {}
+    n = len(sort_stats)
+    calls = [s["llm_calls"] for s in sort_stats]
+    walls = [s["wall_seconds"] for s in sort_stats]
+    return {
+        "engine": sort_stats[0]["engine"],
+        "n_personas": n,
+        "total_comparisons": sum(calls),
+        "mean_comparisons_per_persona": sum(calls) / n,
+        "max_comparisons_per_persona": max(calls),
+        "memo_hits": sum(s["memo_hits"] for s in sort_stats),
+        "transitive_skips": sum(s["transitive_skips"] for s in sort_stats),
+        "mean_wall_seconds_per_persona": sum(walls) / n,
+        "max_wall_seconds_per_persona": max(walls),
+        "per_persona": sorted(sort_stats, key=lambda s: s["persona_idx"]),
+    }
+
+
+def run_experiment(
+    num_statements: int = 100,
+    num_personas: int = 25,
+    seed: int = 42,
+    max_workers: int = 25,
+    engine: str = DEFAULT_SORT_ENGINE
+):
     """Main function to run the experiment."""
     log_dir = setup_logging()
     logging.info("=" * 80)
     logging.info("STARTING BUILT-IN SORT EXPERIMENT")
-    logging.info(f"Statements: {num_statements}, Personas: {num_personas}, Seed: {seed}")
+    logging.info(f"Statements: {num_statements}, Personas: {num_personas}, Seed: {seed}, Engine: {engine}")
     logging.info("=" * 80)
     
     topic = "What should guide laws concerning abortion?"
@@ -349,7 +395,17 @@ def run_experiment(num_statements: int = 100, num_personas: int = 25, seed: int
     
     # Step 2: Get preference rankings (parallelized)
     logging.info("\n🗳️ Step 2: Getting preference rankings...")
-    preference_matrix = get_preference_rankings_parallel(personas, statements, topic, max_workers=max_workers)
+    sort_stats = []
+    preference_matrix = get_preference_rankings_parallel(
+        personas, statements, topic, max_workers=max_workers,
+        engine=engine, sort_stats=sort_stats
+    )
+    sort_summary = summarize_sort_stats(sort_stats)
+    if sort_summary:
+        logging.info(
+            f"Sort engine {engine}: {sort_summary['mean_comparisons_per_persona']:.1f} comparisons/persona, "
+            f"{sort_summary['mean_wall_seconds_per_persona']:.1f}s/persona"
+        )
     logging.info(f"Got preference matrix: {len(preference_matrix)} ranks x {len(preference_matrix[0])} voters")
     
     # Step 3: Compute PVC
@@ -387,17 +443,19 @@ def run_experiment(num_statements: int = 100, num_personas: int = 25, seed: int
     output_dir.mkdir(parents=True, exist_ok=True)
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    csv_file = output_dir / f"builtin_sort_experiment_{timestamp}.csv"
+    prefix = f"{engine}_sort_experiment"
+    csv_file = output_dir / f"{prefix}_{timestamp}.csv"
     generate_csv_table(results, pvc, str(csv_file))
     
     # Also save full results as JSON
-    json_file = output_dir / f"builtin_sort_experiment_{timestamp}.json"
+    json_file = output_dir / f"{prefix}_{timestamp}.json"
     full_results = {
         "topic": topic,
         "num_statements": num_statements,
         "num_personas": num_personas,
         "pvc": pvc,
         "pvc_size": len(pvc),
+        "sort_stats": sort_summary,
         "method_results": results,
         "preference_matrix": preference_matrix
     }
@@ -416,5 +474,12 @@ def run_experiment(num_statements: int = 100, num_personas: int = 25, seed: int
 
 
 if __name__ == "__main__":
-    run_experiment(num_statements=100, num_personas=25, seed=42, max_workers=25)
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Pairwise sort experiment")
+    parser.add_argument("--engine", choices=SORT_ENGINES, default=DEFAULT_SORT_ENGINE,
+                        help=f"Sort engine (default: {DEFAULT_SORT_ENGINE})")
+    args = parser.parse_args()
+    
+    run_experiment(num_statements=100, num_personas=25, seed=42, max_workers=25, engine=args.engine)
 
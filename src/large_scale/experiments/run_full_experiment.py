@@ -28,6 +28,14 @@ from tqdm import tqdm
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import numpy as np
 
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+from src.large_scale.pairwise_ranking import PREFERENCE_SCHEMA
+from src.typed_responses import LIKERT_RATING, choice_schema, parse_response
+
+# Evaluative comparisons allow no ties
+FORCED_PREFERENCE_SCHEMA = choice_schema("forced_preference", "preference", ["A", "B"])
+
 # Load environment variables
 load_dotenv()
 
@@ -132,11 +140,11 @@ Return only JSON, no other text."""
         input=[
             {"role": "system", "content": "You are evaluating statements. Return ONLY valid JSON."},
             {"role": "user", "content": prompt}
-        ]
+        ],
+        text=PREFERENCE_SCHEMA.text_format,
     )
     
-    result = json.loads(response.output_text)
-    pref = result.get("preference", "equal").upper()
+    pref = parse_response(response, PREFERENCE_SCHEMA)
     
     if pref == "A":
         return -1
@@ -256,12 +264,11 @@ Return only JSON."""
         input=[
             {"role": "system", "content": "You are rating statements. Return ONLY valid JSON."},
             {"role": "user", "content": prompt}
-        ]
+        ],
+        text=LIKERT_RATING.text_format,
     )
     
-    result = json.loads(response.output_text)
-    rating = result.get("rating", 3)
-    return max(1, min(5, int(rating)))
+    return parse_response(response, LIKERT_RATING)
 
 
 def get_evaluative_likert_ratings(
@@ -345,11 +352,11 @@ Return only JSON."""
         input=[
             {"role": "system", "content": "You are comparing statements. Return ONLY valid JSON."},
             {"role": "user", "content": prompt}
-        ]
+        ],
+        text=FORCED_PREFERENCE_SCHEMA.text_format,
     )
     
-    result = json.loads(response.output_text)
-    return result.get("preference", "A").upper()
+    return parse_response(response, FORCED_PREFERENCE_SCHEMA)
 
 
 def get_evaluative_pairwise(
@@ -414,14 +421,15 @@ def get_evaluative_pairwise(
 
 def run_topic_experiment(topic: str, disc_personas: List[str], eval_personas: List[str]) -> Dict:
     """Run full experiment for a single topic."""
+    from src.large_scale.results_store import save_result, load_result, BULKY_FIELDS
+    
     topic_slug = slugify(topic)
     results_file = OUTPUT_BASE / "results" / f"{topic_slug}.json"
     
     # Check if already completed
     if results_file.exists():
         logging.info(f"Topic {topic_slug}: loading from cache")
-        with open(results_file, 'r') as f:
-            return json.load(f)
+        return load_result(results_file, fields=BULKY_FIELDS)
     
     logging.info(f"\n{'='*80}")
     logging.info(f"TOPIC: {topic}")
@@ -438,8 +446,6 @@ def run_topic_experiment(topic: str, disc_personas: List[str], eval_personas: Li
     
     # Step 3: Compute PVC
     logging.info("\n🎯 Step 3: Computing PVC...")
-    import sys
-    sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
     from src.large_scale.biclique import compute_proportional_veto_core
     
     n_statements = len(preference_matrix)
@@ -498,10 +504,9 @@ def run_topic_experiment(topic: str, disc_personas: List[str], eval_personas: Li
         "preference_matrix": preference_matrix
     }
     
-    # Save results
+    # Save results (preference matrix goes to a sidecar file, see results_store)
     results_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(results_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    save_result(results, results_file)
     
     logging.info(f"✅ Topic completed: {topic_slug}")
     return results
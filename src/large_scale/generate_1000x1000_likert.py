@@ -3,6 +3,11 @@ Generate 1000x1000 Likert score matrices using GPT-5.2.
 
 Each of 1000 personas rates all 1000 statements on a 1-5 scale.
 Statements are batched (default 100 per API call) for efficiency.
+
+Progress is checkpointed in a memory-mapped uint8 matrix with a per-persona
+completion bitmap; finished matrices are exported as NPY, Parquet and CSV.
+Cells the model fails to rate are tracked in a validity mask and re-queried
+in a repair pass instead of being padded with neutral 3s.
 """
 
 import argparse
@@ -15,11 +20,14 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 from dotenv import load_dotenv
 from openai import OpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from tqdm import tqdm
 
+from src.typed_responses import format_stats, parse_response, ratings_schema
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -106,6 +114,19 @@ def load_statements_and_personas(topic_slug: str) -> Tuple[List[str], List[str]]
     return personas, statements
 
 
+def _valid_rating(value) -> Optional[int]:
+    """Return value as an int in 1-5, or None if it is not a valid rating."""
+    if isinstance(value, bool):
+        return None
+    try:
+        rating = int(value)
+    except (TypeError, ValueError):
+        return None
+    if isinstance(value, float) and value != rating:
+        return None
+    return rating if 1 <= rating <= 5 else None
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -119,10 +140,13 @@ def get_batched_likert_ratings(
     openai_client: OpenAI,
     persona_idx: int = None,
     batch_idx: int = None
-) -> List[int]:
+) -> List[Optional[int]]:
     """
     Get Likert scale ratings (1-5) from a persona for a batch of statements.
     
+    Cells the response does not answer validly are returned as None rather
+    than padded, so they can be masked and repaired later.
+    
     Args:
         persona: Persona string description
         statements: List of statement strings to rate
@@ -132,7 +156,7 @@ def get_batched_likert_ratings(
         batch_idx: Index of batch for logging
     
     Returns:
-        List of Likert ratings (1-5) for each statement
+        List of Likert ratings (1-5, or None if invalid) for each statement
     """
     # Build numbered statements list
     statements_text = "\n".join(
@@ -162,33 +186,32 @@ Statements:
 Return ONLY a JSON object with a "ratings" array containing {len(statements)} integers (1-5), one for each statement in order.
 Example format: {{"ratings": [4, 3, 5, 2, ...]}}"""
 
+    schema = ratings_schema(len(statements))
     try:
         response = openai_client.responses.create(
             model=MODEL,
             input=[
                 {"role": "system", "content": "You are rating statements based on the given persona. Return ONLY valid JSON, no other text."},
                 {"role": "user", "content": prompt}
-            ]
+            ],
+            text=schema.text_format,
         )
         
-        result = json.loads(response.output_text)
-        ratings = result.get("ratings", [])
+        ratings = parse_response(response, schema)
         
-        # Validate ratings
+        # Validate ratings; a wrong-length answer cannot be aligned with the
+        # statements, so every cell of the batch is marked invalid
         if len(ratings) != len(statements):
+            format_stats.record_failure(schema.name, f"{len(ratings)} ratings for {len(statements)} statements")
             logger.warning(
-                f"Persona {persona_idx} batch {batch_idx}: Expected {len(statements)} ratings, got {len(ratings)}. Padding/truncating."
+                f"Persona {persona_idx} batch {batch_idx}: Expected {len(statements)} ratings, got {len(ratings)}. Masking batch."
             )
-            # Pad with 3s if too short, truncate if too long
-            if len(ratings) < len(statements):
-                ratings.extend([3] * (len(statements) - len(ratings)))
-            else:
-                ratings = ratings[:len(statements)]
+            return [None] * len(statements)
         
-        # Ensure ratings are in valid range
-        ratings = [max(1, min(5, int(r))) for r in ratings]
-        
-        return ratings
+        valid = [_valid_rating(r) for r in ratings]
+        if None in valid:
+            format_stats.record_failure(schema.name, f"{valid.count(None)} invalid ratings")
+        return valid
         
     except Exception as e:
         logger.error(f"Error getting ratings from persona {persona_idx} batch {batch_idx}: {e}")
@@ -202,7 +225,7 @@ def process_persona(
     topic: str,
     openai_client: OpenAI,
     batch_size: int
-) -> Tuple[int, List[int]]:
+) -> Tuple[int, List[Optional[int]]]:
     """
     Process all statements for a single persona in batches.
     
@@ -215,7 +238,7 @@ def process_persona(
         batch_size: Number of statements per API call
     
     Returns:
-        Tuple of (persona_idx, all_ratings)
+        Tuple of (persona_idx, all_ratings); failed cells are None
     """
     all_ratings = []
     n_batches = (len(statements) + batch_size - 1) // batch_size
@@ -236,73 +259,240 @@ def process_persona(
             )
             all_ratings.extend(ratings)
         except Exception as e:
-            logger.error(f"Failed persona {persona_idx} batch {batch_idx}: {e}. Using default ratings.")
-            all_ratings.extend([3] * len(batch_statements))
+            logger.error(f"Failed persona {persona_idx} batch {batch_idx}: {e}. Masking batch for repair.")
+            all_ratings.extend([None] * len(batch_statements))
     
     return persona_idx, all_ratings
 
 
-def save_checkpoint(
-    matrix: List[List[int]],
-    completed_personas: int,
-    topic_slug: str,
-    output_dir: Path
-) -> None:
-    """Save a checkpoint of the current progress."""
-    checkpoint_path = output_dir / f"{topic_slug}_checkpoint.json"
+class LikertCheckpoint:
+    """
+    Memory-mapped checkpoint for one topic's Likert matrix.
+    
+    The matrix lives in a preallocated np.uint8 memmap (0 = not yet rated)
+    and completion is tracked in a one-byte-per-persona bitmap. A finished
+    persona's row is written in place and flushed immediately, so each
+    checkpoint costs O(row) and resuming reads only the bitmap.
+    
+    A validity mask of the same shape marks which cells hold a real rating;
+    cells the model failed to answer stay masked until repaired.
+    """
     
-    checkpoint_data = {
-        "completed_personas": completed_personas,
-        "matrix": matrix,
-        "timestamp": datetime.now().isoformat()
-    }
+    def __init__(self, topic_slug: str, output_dir: Path, n_personas: int, n_statements: int, resume: bool = True):
+        """
+        Args:
+            topic_slug: Topic being scored
+            output_dir: Directory for the checkpoint files
+            n_personas: Number of matrix rows
+            n_statements: Number of matrix columns
+            resume: Reuse existing checkpoint files if their shape matches
+        """
+        self.matrix_path = output_dir / f"{topic_slug}_checkpoint_matrix.u8"
+        self.done_path = output_dir / f"{topic_slug}_checkpoint_done.u8"
+        self.valid_path = output_dir / f"{topic_slug}_checkpoint_valid.u8"
+        self.meta_path = output_dir / f"{topic_slug}_checkpoint_meta.json"
+        self.shape = (n_personas, n_statements)
+    
+        reuse = resume and self._matches_existing()
+        mode = 'r+' if reuse else 'w+'
+        if not reuse:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.meta_path, 'w') as f:
+                json.dump({"n_personas": n_personas, "n_statements": n_statements, "model": MODEL,
+                           "created": datetime.now().isoformat()}, f)
+
+        self.matrix = np.memmap(self.matrix_path, dtype=np.uint8, mode=mode, shape=self.shape)
+        self.done = np.memmap(self.done_path, dtype=np.uint8, mode=mode, shape=(n_personas,))
+        self.valid = np.memmap(self.valid_path, dtype=np.uint8, mode=mode, shape=self.shape)
+
+    def _matches_existing(self) -> bool:
+        paths = (self.meta_path, self.matrix_path, self.done_path, self.valid_path)
+        if not all(path.exists() for path in paths):
+            return False
+        with open(self.meta_path, 'r') as f:
+            meta = json.load(f)
+        if (meta["n_personas"], meta["n_statements"]) != self.shape:
+            logger.warning(f"Checkpoint shape {meta['n_personas']}x{meta['n_statements']} does not match "
+                           f"{self.shape[0]}x{self.shape[1]}; starting fresh")
+            return False
+        return True
+    
+    def pending(self) -> List[int]:
+        """Persona indices not yet completed (reads only the bitmap)."""
+        return [int(i) for i in np.flatnonzero(self.done == 0)]
+    
+    def write_row(self, persona_idx: int, ratings: List[Optional[int]]) -> None:
+        """Write one persona's ratings (None = invalid) in place, then mark it complete."""
+        self.matrix[persona_idx, :] = [r or 0 for r in ratings]
+        self.valid[persona_idx, :] = [r is not None for r in ratings]
+        self.matrix.flush()
+        self.valid.flush()
+        self.done[persona_idx] = 1
+        self.done.flush()
+    
+    def write_cells(self, persona_idx: int, statement_indices: List[int], ratings: List[Optional[int]]) -> None:
+        """Fill in repaired cells of one row; cells still None stay masked."""
+        for s_idx, rating in zip(statement_indices, ratings):
+            if rating is not None:
+                self.matrix[persona_idx, s_idx] = rating
+                self.valid[persona_idx, s_idx] = 1
+        self.matrix.flush()
+        self.valid.flush()
+    
+    def masked_cells(self) -> Dict[int, List[int]]:
+        """Invalid cells of completed personas, as {persona_idx: [statement_idx, ...]}."""
+        masked = {}
+        for p_idx in np.flatnonzero(self.done):
+            cols = np.flatnonzero(self.valid[p_idx] == 0)
+            if len(cols):
+                masked[int(p_idx)] = [int(c) for c in cols]
+        return masked
+    
+    def remove(self) -> None:
+        """Delete the checkpoint files after a successful export."""
+        del self.matrix, self.done, self.valid
+        for path in (self.matrix_path, self.done_path, self.valid_path, self.meta_path):
+            if path.exists():
+                path.unlink()
+
+
+def plan_repair_batches(
+    masked: Dict[int, List[int]],
+    batch_size: int
+) -> List[Tuple[int, List[int]]]:
+    """
+    Regroup masked cells into full batches.
     
-    with open(checkpoint_path, 'w') as f:
-        json.dump(checkpoint_data, f)
+    A rating prompt carries one persona, so cells are packed per persona
+    across the original batch boundaries: a persona with 30 masked cells
+    scattered over 10 failed batches needs one call, not 10.
     
-    logger.info(f"Checkpoint saved: {completed_personas} personas completed")
+    Args:
+        masked: {persona_idx: [statement_idx, ...]} of invalid cells
+        batch_size: Maximum statements per call
+    
+    Returns:
+        List of (persona_idx, statement_indices) batches, largest first.
+    """
+    batches = []
+    for p_idx, cols in masked.items():
+        for start in range(0, len(cols), batch_size):
+            batches.append((p_idx, cols[start:start + batch_size]))
+    batches.sort(key=lambda b: -len(b[1]))
+    return batches
 
 
-def load_checkpoint(topic_slug: str, output_dir: Path) -> Optional[Dict]:
-    """Load a checkpoint if it exists."""
-    checkpoint_path = output_dir / f"{topic_slug}_checkpoint.json"
+def repair_masked_cells(
+    checkpoint: LikertCheckpoint,
+    personas: List[str],
+    statements: List[str],
+    topic: str,
+    openai_client: OpenAI,
+    batch_size: int,
+    max_workers: int,
+    max_rounds: int = 2
+) -> int:
+    """
+    Re-query only the masked cells of a checkpoint, writing repairs in place.
+    
+    Each repaired batch is flushed as it lands, so an interrupted repair
+    resumes from the remaining mask.
+    
+    Args:
+        checkpoint: Open LikertCheckpoint (completed personas are repaired)
+        personas: Persona strings (matrix rows)
+        statements: Statement strings (matrix columns)
+        topic: The topic question
+        openai_client: OpenAI client
+        batch_size: Statements per API call
+        max_workers: Maximum parallel API calls
+        max_rounds: Repair rounds (cells can fail again)
     
-    if checkpoint_path.exists():
-        with open(checkpoint_path, 'r') as f:
-            return json.load(f)
-    return None
+    Returns:
+        Number of cells still masked.
+    """
+    for round_idx in range(max_rounds):
+        masked = checkpoint.masked_cells()
+        n_masked = sum(len(cols) for cols in masked.values())
+        if n_masked == 0:
+            return 0
+        batches = plan_repair_batches(masked, batch_size)
+        logger.info(f"Repair round {round_idx + 1}: {n_masked} masked cells in {len(batches)} calls "
+                    f"across {len(masked)} personas")
+        
+        def repair(batch: Tuple[int, List[int]]) -> Tuple[int, List[int], List[Optional[int]]]:
+            p_idx, cols = batch
+            ratings = get_batched_likert_ratings(
+                persona=personas[p_idx],
+                statements=[statements[c] for c in cols],
+                topic=topic,
+                openai_client=openai_client,
+                persona_idx=p_idx,
+                batch_idx=-1
+            )
+            return p_idx, cols, ratings
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(repair, batch) for batch in batches]
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Repairing cells", unit="call"):
+                try:
+                    p_idx, cols, ratings = future.result()
+                    checkpoint.write_cells(p_idx, cols, ratings)
+                except Exception as e:
+                    logger.error(f"Repair call failed: {e}")
+    
+    return sum(len(cols) for cols in checkpoint.masked_cells().values())
 
 
 def save_results(
-    matrix: List[List[int]],
+    matrix: np.ndarray,
     personas: List[str],
     statements: List[str],
     topic_slug: str,
-    output_dir: Path
+    output_dir: Path,
+    valid: Optional[np.ndarray] = None
 ) -> None:
     """
-    Save results in both JSON and CSV formats.
+    Export the finished matrix as NPY and Parquet, plus CSV and a metadata JSON.
+    
+    Invalid cells (valid == 0) are 0 in the NPY file, with the mask saved
+    next to it, and null/empty in Parquet and CSV.
     """
-    output_dir.mkdir(parents=True, exist_ok=True)
+    import pandas as pd
     
-    # Save JSON (machine-readable)
-    json_path = output_dir / f"{topic_slug}_likert_matrix.json"
-    json_data = {
-        "metadata": {
+    output_dir.mkdir(parents=True, exist_ok=True)
+    matrix = np.asarray(matrix, dtype=np.uint8)
+    valid = np.ones(matrix.shape, dtype=bool) if valid is None else np.asarray(valid, dtype=bool)
+    
+    # NPY (fastest to load back)
+    npy_path = output_dir / f"{topic_slug}_likert_matrix.npy"
+    np.save(npy_path, matrix)
+    valid_path = output_dir / f"{topic_slug}_likert_valid.npy"
+    np.save(valid_path, valid)
+    logger.info(f"NPY saved to {npy_path} (validity mask: {valid_path})")
+    
+    # Parquet (columnar, one column per statement)
+    parquet_path = output_dir / f"{topic_slug}_likert_matrix.parquet"
+    df = pd.DataFrame(matrix, columns=[f"S{i}" for i in range(len(statements))]).astype("UInt8")
+    df = df.mask(~valid)
+    df.index.name = "persona_idx"
+    df.to_parquet(parquet_path)
+    logger.info(f"Parquet saved to {parquet_path}")
+    
+    # Metadata (small JSON, replaces the matrix-bearing JSON)
+    meta_path = output_dir / f"{topic_slug}_likert_matrix.meta.json"
+    with open(meta_path, 'w') as f:
+        json.dump({
             "topic": topic_slug,
             "topic_question": TOPIC_QUESTIONS.get(topic_slug, ""),
             "model": MODEL,
             "n_personas": len(personas),
             "n_statements": len(statements),
+            "dtype": "uint8",
+            "n_invalid_cells": int((~valid).sum()),
+            "files": {"npy": npy_path.name, "valid": valid_path.name, "parquet": parquet_path.name},
             "timestamp": datetime.now().isoformat()
-        },
-        "matrix": matrix
-    }
-    
-    with open(json_path, 'w') as f:
-        json.dump(json_data, f, indent=2)
-    
-    logger.info(f"JSON saved to {json_path}")
+        }, f, indent=2)
     
     # Save CSV (human-readable)
     csv_path = output_dir / f"{topic_slug}_likert_matrix.csv"
@@ -315,38 +505,35 @@ def save_results(
         writer.writerow(header)
         
         # Data rows
-        for idx, ratings in enumerate(matrix):
-            writer.writerow([idx] + ratings)
+        for idx, (ratings, row_valid) in enumerate(zip(matrix.tolist(), valid.tolist())):
+            writer.writerow([idx] + [r if ok else "" for r, ok in zip(ratings, row_valid)])
     
     logger.info(f"CSV saved to {csv_path}")
-    
-    # Remove checkpoint file after successful save
-    checkpoint_path = output_dir / f"{topic_slug}_checkpoint.json"
-    if checkpoint_path.exists():
-        checkpoint_path.unlink()
-        logger.info("Checkpoint file removed after successful completion")
 
 
 def run_topic(
     topic_slug: str,
     max_workers: int = 50,
     batch_size: int = 100,
-    checkpoint_interval: int = 100,
     n_personas: Optional[int] = None,
     n_statements: Optional[int] = None,
-    resume: bool = True
+    resume: bool = True,
+    repair_rounds: int = 2
 ) -> None:
     """
     Run Likert scoring for a single topic.
     
+    Rerunning a topic whose checkpoint still has masked cells skips the
+    completed personas and only repairs those cells.
+    
     Args:
         topic_slug: Topic to process
         max_workers: Maximum parallel API calls
         batch_size: Statements per API call
-        checkpoint_interval: Save checkpoint every N personas
         n_personas: Limit number of personas (for testing)
         n_statements: Limit number of statements (for testing)
         resume: Whether to resume from checkpoint
+        repair_rounds: Rounds of re-querying masked (invalid) cells
     """
     logger.info(f"Starting Likert scoring for topic: {topic_slug}")
     
@@ -370,17 +557,11 @@ def run_topic(
     logger.info(f"Batch size: {batch_size}, Batches per persona: {n_batches_per_persona}")
     logger.info(f"Total API calls: {total_api_calls}")
     
-    # Check for checkpoint
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    checkpoint = load_checkpoint(topic_slug, OUTPUT_DIR) if resume else None
-    
-    if checkpoint:
-        matrix = checkpoint["matrix"]
-        start_persona = checkpoint["completed_personas"]
-        logger.info(f"Resuming from checkpoint: {start_persona} personas already completed")
-    else:
-        matrix = []
-        start_persona = 0
+    # Open (or create) the memory-mapped checkpoint; resume reads only the bitmap
+    checkpoint = LikertCheckpoint(topic_slug, OUTPUT_DIR, n_total_personas, n_total_statements, resume=resume)
+    pending = checkpoint.pending()
+    if len(pending) < n_total_personas:
+        logger.info(f"Resuming from checkpoint: {n_total_personas - len(pending)} personas already completed")
     
     # Initialize OpenAI client
     openai_client = OpenAI()
@@ -389,7 +570,7 @@ def run_topic(
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         # Submit tasks for remaining personas
         futures = {}
-        for idx in range(start_persona, n_total_personas):
+        for idx in pending:
             future = executor.submit(
                 process_persona,
                 idx,
@@ -401,39 +582,32 @@ def run_topic(
             )
             futures[future] = idx
         
-        # Track progress
-        completed_since_checkpoint = 0
-        
-        with tqdm(total=n_total_personas - start_persona, desc="Processing personas", unit="persona") as pbar:
+        with tqdm(total=len(pending), desc="Processing personas", unit="persona") as pbar:
             for future in as_completed(futures):
                 try:
                     persona_idx, ratings = future.result()
-                    
-                    # Ensure matrix is large enough
-                    while len(matrix) <= persona_idx:
-                        matrix.append(None)
-                    matrix[persona_idx] = ratings
-                    
+                    checkpoint.write_row(persona_idx, ratings)
                     pbar.update(1)
-                    completed_since_checkpoint += 1
-                    
-                    # Save checkpoint periodically
-                    if completed_since_checkpoint >= checkpoint_interval:
-                        completed_count = sum(1 for m in matrix if m is not None)
-                        save_checkpoint(matrix, completed_count, topic_slug, OUTPUT_DIR)
-                        completed_since_checkpoint = 0
-                        
                 except Exception as e:
                     persona_idx = futures[future]
                     logger.error(f"Failed to process persona {persona_idx}: {e}")
-                    # Use default ratings
-                    while len(matrix) <= persona_idx:
-                        matrix.append(None)
-                    matrix[persona_idx] = [3] * n_total_statements
+                    # Mask the whole row for the repair pass
+                    checkpoint.write_row(persona_idx, [None] * n_total_statements)
                     pbar.update(1)
     
-    # Final save
-    save_results(matrix, personas, statements, topic_slug, OUTPUT_DIR)
+    # Re-query only the cells that came back invalid
+    remaining = repair_masked_cells(
+        checkpoint, personas, statements, topic_question, openai_client,
+        batch_size, max_workers, max_rounds=repair_rounds
+    )
+    
+    # Final export; keep the checkpoint while masked cells remain so a rerun can repair them
+    save_results(checkpoint.matrix, personas, statements, topic_slug, OUTPUT_DIR, valid=checkpoint.valid)
+    if remaining:
+        logger.warning(f"{remaining} cells still invalid; checkpoint kept, rerun to repair them")
+    else:
+        checkpoint.remove()
+        logger.info("Checkpoint files removed after successful completion")
     
     logger.info(f"Completed topic: {topic_slug}")
 
@@ -464,12 +638,6 @@ def main():
         default=100,
         help="Statements per API call (default: 100)"
     )
-    parser.add_argument(
-        "--checkpoint-interval",
-        type=int,
-        default=100,
-        help="Save checkpoint every N personas (default: 100)"
-    )
     parser.add_argument(
         "--n-personas",
         type=int,
@@ -480,6 +648,12 @@ def main():
         type=int,
         help="Limit number of statements (for testing)"
     )
+    parser.add_argument(
+        "--repair-rounds",
+        type=int,
+        default=2,
+        help="Rounds of re-querying invalid cells after the main pass (default: 2)"
+    )
     parser.add_argument(
         "--no-resume",
         action="store_true",
@@ -503,10 +677,10 @@ def main():
             topic_slug=topic,
             max_workers=args.max_workers,
             batch_size=args.batch_size,
-            checkpoint_interval=args.checkpoint_interval,
             n_personas=args.n_personas,
             n_statements=args.n_statements,
-            resume=not args.no_resume
+            resume=not args.no_resume,
+            repair_rounds=args.repair_rounds
         )
 
 
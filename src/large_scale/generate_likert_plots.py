@@ -6,13 +6,14 @@ Creates:
 2. Individual plots for each of the 13 topics
 """
 
-import json
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 from typing import Dict, List
 from scipy import stats
 
+from src.large_scale import results_store
+
 
 OUTPUT_BASE = Path("data/large_scale/gen-200-disc-50-eval-50-nano-low")
 RESULTS_DIR = OUTPUT_BASE / "results"
@@ -40,14 +41,8 @@ COLORS = {
 
 
 def load_all_results() -> List[Dict]:
-    """Load all topic result files."""
-    results = []
-    for f in sorted(RESULTS_DIR.glob("*.json")):
-        if f.stem == "all_topics_summary":
-            continue
-        with open(f, 'r') as fp:
-            results.append(json.load(fp))
-    return results
+    """Load the summary fields of all topic result files (no preference matrices)."""
+    return results_store.load_results(RESULTS_DIR)
 
 
 def compute_mean_and_ci(ratings: List[float], confidence: float = 0.95) -> tuple:
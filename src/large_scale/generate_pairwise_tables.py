@@ -7,11 +7,12 @@ Creates:
 """
 
 import csv
-import json
 import numpy as np
 from pathlib import Path
 from typing import Dict, List
 
+from src.large_scale import results_store
+
 
 OUTPUT_BASE = Path("data/large_scale/gen-200-disc-50-eval-50-nano-low")
 RESULTS_DIR = OUTPUT_BASE / "results"
@@ -29,14 +30,8 @@ METHOD_LABELS = {
 
 
 def load_all_results() -> List[Dict]:
-    """Load all topic result files."""
-    results = []
-    for f in sorted(RESULTS_DIR.glob("*.json")):
-        if f.stem == "all_topics_summary":
-            continue
-        with open(f, 'r') as fp:
-            results.append(json.load(fp))
-    return results
+    """Load the summary fields of all topic result files (no preference matrices)."""
+    return results_store.load_results(RESULTS_DIR)
 
 
 def build_pairwise_matrix(pairwise_results: Dict, num_personas: int) -> np.ndarray:
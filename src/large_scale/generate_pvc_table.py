@@ -7,6 +7,8 @@ import json
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from src.large_scale import results_store
+
 # Global cache for topic mappings
 _TOPIC_MAPPINGS: Optional[Dict[str, str]] = None
 
@@ -30,20 +32,12 @@ def load_topic_mappings() -> Dict[str, str]:
 
 
 def load_results(results_dir: str = "data/large_scale/results") -> List[Dict]:
-    """Load all result JSON files."""
-    results: List[Dict] = []
-    results_path = Path(results_dir)
-    
-    if not results_path.exists():
+    """Load the summary fields of all result JSON files (no bulky arrays)."""
+    if not Path(results_dir).exists():
         print(f"Results directory {results_dir} does not exist")
-        return results
-    
-    for json_file in sorted(results_path.glob("*.json")):
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-            results.append(data)
+        return []
     
-    return results
+    return results_store.load_results(results_dir)
 
 
 def shorten_topic(topic: str, max_length: int = 50) -> str:
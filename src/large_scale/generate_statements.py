@@ -4,13 +4,16 @@ Generate statements from personas using OpenAI API (scaled version with parallel
 
 import json
 import os
-from typing import List, Dict
+import threading
+from typing import List, Dict, Optional
 from openai import OpenAI
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import logging
 
+from src.large_scale.checkpoint import StepCheckpoint
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -77,7 +80,8 @@ def generate_all_statements(
     topic: str,
     personas: List[str],
     openai_client: OpenAI,
-    max_workers: int = 20
+    max_workers: int = 20,
+    checkpoint: Optional[StepCheckpoint] = None
 ) -> List[Dict]:
     """
     Generate statements from all personas on a given topic (parallelized).
@@ -87,6 +91,8 @@ def generate_all_statements(
         personas: List of persona string descriptions
         openai_client: OpenAI client instance
         max_workers: Maximum number of parallel workers (default: 20)
+        checkpoint: Optional per-persona checkpoint; personas already
+            recorded there are not regenerated
     
     Returns:
         List of statement dicts, each with:
@@ -99,7 +105,15 @@ def generate_all_statements(
     statements = [None] * len(personas)  # Pre-allocate to maintain order
     errors = []
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    if checkpoint is not None:
+        for record in checkpoint.records:
+            statements[record["idx"]] = record["statement"]
+    pending = [i for i in range(len(personas)) if statements[i] is None]
+    
+    with ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix=threading.current_thread().name
+    ) as executor:
         # Submit all tasks
         future_to_idx = {
             executor.submit(
@@ -109,16 +123,19 @@ def generate_all_statements(
                 openai_client,
                 i
             ): i
-            for i in range(len(personas))
+            for i in pending
         }
         
         # Process completed tasks with progress bar
-        with tqdm(total=len(personas), desc="Generating statements", unit="stmt") as pbar:
+        with tqdm(total=len(personas), initial=len(personas) - len(pending),
+                  desc="Generating statements", unit="stmt") as pbar:
             for future in as_completed(future_to_idx):
                 idx = future_to_idx[future]
                 try:
                     result = future.result()
                     statements[idx] = result
+                    if checkpoint is not None:
+                        checkpoint.append({"idx": idx, "statement": result})
                     pbar.update(1)
                 except Exception as e:
                     logger.error(f"Failed to generate statement for persona {idx} after retries: {e}")
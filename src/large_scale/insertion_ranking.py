@@ -7,21 +7,51 @@ This module implements a hybrid sorting approach that optimizes API costs:
   then switch to single-call when range drops below threshold
 
 This is more economical than pure pairwise comparison sorting for n < 70.
+
+Search options for the pairwise phase:
+- search_mode="binary": one comparison per step (original behaviour)
+- search_mode="kary": k-1 pivot comparisons fired concurrently per level,
+  so the sequential depth is log_k instead of log_2
+- window_tokens: keep narrowing with pairwise comparisons until the
+  remaining sublist fits in this many (estimated) prompt tokens, so the
+  single-call step only sees a bounded neighborhood
+
+Batch-merge mode (batch_size > 1) inserts several statements per round:
+each chunk of new statements is ranked with one call, then merged into the
+sorted list with one position-assignment call. Only items whose returned
+positions are inconsistent with the chunk order fall back to hybrid
+insertion, so the critical path drops from O(n) to O(n / batch_size) rounds.
+
+Pass an InsertionStats to collect per-persona call counts, tokens, latency
+and critical-path length.
 """
 
-import json
+from __future__ import annotations
+
 import logging
+import threading
 import time
-from typing import List, Dict, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Dict, Callable, Optional
 from functools import cmp_to_key
-from openai import OpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import numpy as np
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 # Import pairwise_compare from existing module for binary search comparisons
 from src.large_scale.pairwise_ranking import pairwise_compare
 # Import api_timer for timing tracking
 from src.full_experiment.config import api_timer
+from src.typed_responses import (
+    ResponseSchema,
+    candidate_labels,
+    format_stats,
+    index_ranking_schema,
+    labeled_positions_schema,
+    parse_response,
+    position_schema,
+)
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -30,6 +60,87 @@ logger = logging.getLogger(__name__)
 # Default threshold for switching between binary search and single-call
 DEFAULT_THRESHOLD = 70
 
+# Pairwise search modes and defaults
+SEARCH_MODES = ["binary", "kary"]
+DEFAULT_SEARCH_MODE = "binary"
+DEFAULT_K = 4           # Arity for k-ary search (k-1 concurrent pivots per level)
+CHARS_PER_TOKEN = 4     # Rough prompt-size estimate for window_tokens
+
+
+class InsertionStats:
+    """
+    Thread-safe per-persona tracker for insertion-ranking API usage.
+    
+    critical_path counts sequential rounds: each binary-search comparison,
+    each k-ary level (however many pivots) and each single call is one round.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = {"pairwise": 0, "single_call": 0}
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.api_seconds = 0.0
+        self.critical_path = 0
+    
+    def record(self, kind: str, response, duration: float) -> None:
+        """Record one API call of the given kind with its token usage."""
+        usage = getattr(response, "usage", None)
+        with self._lock:
+            self.calls[kind] = self.calls.get(kind, 0) + 1
+            self.input_tokens += getattr(usage, "input_tokens", 0) or 0
+            self.output_tokens += getattr(usage, "output_tokens", 0) or 0
+            self.api_seconds += duration
+    
+    def add_round(self, n: int = 1) -> None:
+        """Count n sequential rounds on the critical path."""
+        with self._lock:
+            self.critical_path += n
+    
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "calls": sum(self.calls.values()),
+                "calls_by_kind": dict(self.calls),
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "api_seconds": self.api_seconds,
+                "critical_path": self.critical_path,
+            }
+
+
+def _estimate_tokens(statements: List[Dict]) -> int:
+    """Rough prompt-token estimate for listing these statements."""
+    return sum(len(stmt["statement"]) + 6 for stmt in statements) // CHARS_PER_TOKEN
+
+
+def _call_typed(
+    prompt: str,
+    openai_client: OpenAI,
+    schema: ResponseSchema,
+    kind: str,
+    model_name: str,
+    temperature: float,
+    stats: Optional[InsertionStats]
+):
+    """Send one persona prompt and decode the schema-constrained answer."""
+    start_time = time.time()
+    response = openai_client.responses.create(
+        model=model_name,
+        input=[
+            {"role": "system", "content": "You are evaluating statements based on the given persona. Return ONLY valid JSON."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=temperature,
+        reasoning={"effort": "minimal"},
+        text=schema.text_format,
+    )
+    duration = time.time() - start_time
+    api_timer.record(duration)
+    if stats is not None:
+        stats.record(kind, response, duration)
+    return parse_response(response, schema)
+
 
 @retry(
     stop=stop_after_attempt(3),
@@ -44,7 +155,8 @@ def find_insertion_position_single_call(
     topic: str,
     openai_client: OpenAI,
     model_name: str = "gpt-5-nano",
-    temperature: float = 1.0
+    temperature: float = 1.0,
+    stats: Optional[InsertionStats] = None
 ) -> int:
     """
     Single LLM call to find where to insert a new statement into a sorted list.
@@ -57,6 +169,7 @@ def find_insertion_position_single_call(
         openai_client: OpenAI client instance
         model_name: Name of the model to use (default: gpt-5-nano)
         temperature: Temperature for sampling (default: 1.0)
+        stats: Optional InsertionStats to record usage in
     
     Returns:
         Index where the new statement should be inserted (0 = most preferred position)
@@ -92,25 +205,55 @@ Determine where this new statement should be inserted to maintain your preferenc
 Return your answer as JSON: {{"position": <number>}}
 Return only JSON, no other text."""
 
-    start_time = time.time()
-    response = openai_client.responses.create(
-        model=model_name,
-        input=[
-            {"role": "system", "content": "You are evaluating statements based on the given persona. Return ONLY valid JSON."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=temperature,
-        reasoning={"effort": "minimal"}
-    )
-    api_timer.record(time.time() - start_time)
-    
-    result = json.loads(response.output_text)
-    position = result.get("position", n // 2)
-    
-    # Clamp position to valid range
-    position = max(0, min(n, int(position)))
+    return _call_typed(prompt, openai_client, position_schema(n), "single_call", model_name, temperature, stats)
+
+
+def _kary_narrow(
+    persona: str,
+    sorted_statements: List[Dict],
+    new_statement: Dict,
+    topic: str,
+    openai_client: OpenAI,
+    left: int,
+    right: int,
+    k: int,
+    model_name: str,
+    temperature: float,
+    stats: Optional[InsertionStats]
+) -> tuple[int, int]:
+    """
+    One k-ary search level: compare against k-1 evenly spaced pivots concurrently.
     
-    return position
+    Returns:
+        The narrowed (left, right) range.
+    """
+    size = right - left
+    pivots = sorted({left + (j * size) // k for j in range(1, k)})
+    
+    with ThreadPoolExecutor(
+        max_workers=len(pivots),
+        thread_name_prefix=threading.current_thread().name
+    ) as executor:
+        comparisons = list(executor.map(
+            lambda pivot: pairwise_compare(
+                persona, new_statement, sorted_statements[pivot], topic, openai_client,
+                model_name=model_name, temperature=temperature, stats=stats
+            ),
+            pivots
+        ))
+    if stats is not None:
+        stats.add_round()
+    
+    # First pivot the new statement is preferred over (or equal to) bounds the range
+    # from the right; the last pivot before it that beat the new statement bounds it
+    # from the left. Inconsistent answers resolve towards the first such pivot.
+    new_left, new_right = left, right
+    for pivot, comparison in zip(pivots, comparisons):
+        if comparison <= 0:
+            new_right = pivot
+            break
+        new_left = pivot + 1
+    return new_left, new_right
 
 
 def find_insertion_position_hybrid(
@@ -121,12 +264,16 @@ def find_insertion_position_hybrid(
     openai_client: OpenAI,
     threshold: int = DEFAULT_THRESHOLD,
     model_name: str = "gpt-5-nano",
-    temperature: float = 1.0
+    temperature: float = 1.0,
+    search_mode: str = DEFAULT_SEARCH_MODE,
+    k: int = DEFAULT_K,
+    window_tokens: Optional[int] = None,
+    stats: Optional[InsertionStats] = None
 ) -> int:
     """
     Find insertion position using hybrid approach:
-    - Binary search with pairwise comparisons while range >= threshold
-    - Single LLM call when range < threshold
+    - Pairwise search while range >= threshold (or exceeds window_tokens)
+    - Single LLM call on the remaining range
     
     Args:
         persona: Persona string description
@@ -137,31 +284,59 @@ def find_insertion_position_hybrid(
         threshold: Size threshold for switching to single-call (default 70)
         model_name: Name of the model to use (default: gpt-5-nano)
         temperature: Temperature for sampling (default: 1.0)
+        search_mode: "binary" (one comparison per step) or "kary"
+            (k-1 concurrent comparisons per level)
+        k: Arity for k-ary search
+        window_tokens: If set, also narrow until the sublist sent to the
+            single call fits in this many estimated prompt tokens
+        stats: Optional InsertionStats to record usage in
     
     Returns:
         Index where the new statement should be inserted
     """
+    if search_mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode '{search_mode}'. Choose from {SEARCH_MODES}")
+    
     n = len(sorted_statements)
     
+    def needs_narrowing(left: int, right: int) -> bool:
+        if right - left >= threshold:
+            return True
+        return (
+            window_tokens is not None and right - left > 1
+            and _estimate_tokens(sorted_statements[left:right]) > window_tokens
+        )
+    
     # If list is small enough, use single call directly
-    if n < threshold:
+    if not needs_narrowing(0, n):
+        if stats is not None:
+            stats.add_round()
         return find_insertion_position_single_call(
             persona, sorted_statements, new_statement, topic, openai_client,
-            model_name=model_name, temperature=temperature
+            model_name=model_name, temperature=temperature, stats=stats
         )
     
-    # Binary search until range is small enough
+    # Pairwise search until range is small enough
     left, right = 0, n
     
-    while (right - left) >= threshold:
+    while needs_narrowing(left, right):
+        if search_mode == "kary" and right - left > k:
+            left, right = _kary_narrow(
+                persona, sorted_statements, new_statement, topic, openai_client,
+                left, right, k, model_name, temperature, stats
+            )
+            continue
+        
         mid = (left + right) // 2
         
         # Compare new_statement vs statement at mid
         # pairwise_compare returns -1 if first is preferred, 1 if second is preferred
         comparison = pairwise_compare(
             persona, new_statement, sorted_statements[mid], topic, openai_client,
-            model_name=model_name, temperature=temperature
+            model_name=model_name, temperature=temperature, stats=stats
         )
+        if stats is not None:
+            stats.add_round()
         
         if comparison <= 0:
             # new_statement is preferred over or equal to mid, go left
@@ -170,20 +345,269 @@ def find_insertion_position_hybrid(
             # mid is preferred over new_statement, go right
             left = mid + 1
     
-    # Range is now < threshold, use single call on the sublist
+    # Range is now small enough, use single call on the sublist
     sublist = sorted_statements[left:right]
     
     if len(sublist) == 0:
         return left
     
+    if stats is not None:
+        stats.add_round()
     relative_pos = find_insertion_position_single_call(
         persona, sublist, new_statement, topic, openai_client,
-        model_name=model_name, temperature=temperature
+        model_name=model_name, temperature=temperature, stats=stats
     )
     
     return left + relative_pos
 
 
+# =============================================================================
+# Batch-merge insertion
+# =============================================================================
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=2, max=10),
+    retry=retry_if_exception_type((Exception,)),
+    reraise=True
+)
+def rank_chunk_single_call(
+    persona: str,
+    chunk: List[Dict],
+    topic: str,
+    openai_client: OpenAI,
+    model_name: str = "gpt-5-nano",
+    temperature: float = 1.0,
+    stats: Optional[InsertionStats] = None
+) -> Optional[List[int]]:
+    """
+    Single LLM call to rank a small chunk of statements.
+    
+    Args:
+        persona: Persona string description
+        chunk: Statement dicts to rank
+        topic: The topic/question being discussed
+        openai_client: OpenAI client instance
+        model_name: Name of the model to use (default: gpt-5-nano)
+        temperature: Temperature for sampling (default: 1.0)
+        stats: Optional InsertionStats to record usage in
+    
+    Returns:
+        Chunk indices from most to least preferred, or None if the answer
+        is not a permutation of the chunk.
+    """
+    m = len(chunk)
+    statements_list = "\n".join(f"{i}. {stmt['statement']}" for i, stmt in enumerate(chunk))
+    
+    prompt = f"""You are a person with the following characteristics:
+{persona}
+
+Given the topic: "{topic}"
+
+Rank these {m} statements from MOST preferred to LEAST preferred:
+
+{statements_list}
+
+Return your answer as JSON: {{"ranking": [<all {m} numbers, most preferred first>]}}
+Return only JSON, no other text."""
+
+    schema = index_ranking_schema(m)
+    ranking = _call_typed(prompt, openai_client, schema, "rank_chunk", model_name, temperature, stats)
+    if sorted(ranking) != list(range(m)):
+        format_stats.record_failure(schema.name, "not a permutation of the chunk")
+        return None
+    return ranking
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=2, max=10),
+    retry=retry_if_exception_type((Exception,)),
+    reraise=True
+)
+def assign_positions_single_call(
+    persona: str,
+    sorted_statements: List[Dict],
+    sorted_chunk: List[Dict],
+    topic: str,
+    openai_client: OpenAI,
+    model_name: str = "gpt-5-nano",
+    temperature: float = 1.0,
+    stats: Optional[InsertionStats] = None
+) -> List[int]:
+    """
+    Single LLM call assigning an insertion position to each item of an ordered chunk.
+    
+    Args:
+        persona: Persona string description
+        sorted_statements: Statements already sorted (most preferred first)
+        sorted_chunk: New statements, already sorted among themselves
+        topic: The topic/question being discussed
+        openai_client: OpenAI client instance
+        model_name: Name of the model to use (default: gpt-5-nano)
+        temperature: Temperature for sampling (default: 1.0)
+        stats: Optional InsertionStats to record usage in
+    
+    Returns:
+        One position (0..n) per chunk item.
+    """
+    n = len(sorted_statements)
+    labels = candidate_labels(len(sorted_chunk))
+    statements_list = "\n".join(f"{i}. {stmt['statement']}" for i, stmt in enumerate(sorted_statements))
+    new_list = "\n".join(f"{label}. {stmt['statement']}" for label, stmt in zip(labels, sorted_chunk))
+    
+    prompt = f"""You are a person with the following characteristics:
+{persona}
+
+Given the topic: "{topic}"
+
+Below is a list of statements ranked from MOST preferred (position 0) to LEAST preferred:
+
+{statements_list}
+
+NEW STATEMENTS to insert (already ordered from most to least preferred):
+
+{new_list}
+
+For each new statement, determine where it should be inserted to maintain your preference order.
+- Use 0 if it should become the MOST preferred (before position 0)
+- Use {n} if it should become the LEAST preferred (after position {n-1})
+- Use any position 1 to {n-1} to insert between existing statements
+- The new statements are already in order, so positions must not decrease from {labels[0]} to {labels[-1]}
+
+Return your answer as JSON: {{"positions": {{{", ".join(f'"{label}": <number>' for label in labels)}}}}}
+Return only JSON, no other text."""
+
+    schema = labeled_positions_schema({label: (0, n) for label in labels}, key="positions")
+    positions = _call_typed(prompt, openai_client, schema, "merge", model_name, temperature, stats)
+    return [positions[label] for label in labels]
+
+
+def _consistent_subset(positions: List[int]) -> List[int]:
+    """Indices of the longest non-decreasing run of positions (chunk order)."""
+    best_len = {}
+    prev = {}
+    for i in range(len(positions)):
+        best_len[i], prev[i] = 1, None
+        for j in range(i):
+            if positions[j] <= positions[i] and best_len[j] + 1 > best_len[i]:
+                best_len[i], prev[i] = best_len[j] + 1, j
+    if not best_len:
+        return []
+    end = max(best_len, key=lambda i: best_len[i])
+    keep = []
+    while end is not None:
+        keep.append(end)
+        end = prev[end]
+    return keep[::-1]
+
+
+def insertion_sort_batch_merge(
+    items: List[Dict],
+    persona: str,
+    topic: str,
+    openai_client: OpenAI,
+    batch_size: int,
+    threshold: int = DEFAULT_THRESHOLD,
+    model_name: str = "gpt-5-nano",
+    temperature: float = 1.0,
+    search_mode: str = DEFAULT_SEARCH_MODE,
+    k: int = DEFAULT_K,
+    window_tokens: Optional[int] = None,
+    stats: Optional[InsertionStats] = None
+) -> List[Dict]:
+    """
+    Sort items by ranking chunks in one call and merging each with one call.
+    
+    All chunk rankings run concurrently up front; the merges are sequential.
+    Items whose merge positions are out of order (relative to the chunk
+    ranking) are inserted afterwards with find_insertion_position_hybrid;
+    chunks whose ranking is invalid are sorted with hybrid insertion instead.
+    
+    Args:
+        items: List of items to sort
+        persona: Persona string description
+        topic: The topic/question being discussed
+        openai_client: OpenAI client instance
+        batch_size: Number of new items ranked and merged per round
+        threshold, model_name, temperature, search_mode, k, window_tokens:
+            Passed to the hybrid fallback
+        stats: Optional InsertionStats to record usage in
+    
+    Returns:
+        Sorted list of items (most preferred first)
+    """
+    hybrid_kwargs = dict(
+        threshold=threshold, model_name=model_name, temperature=temperature,
+        search_mode=search_mode, k=k, window_tokens=window_tokens, stats=stats
+    )
+    chunks = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+    
+    # 1. Rank every chunk with one call each; chunks are independent, so all
+    #    ranking calls run concurrently (one round on the critical path)
+    def rank_chunk(chunk: List[Dict]) -> List[Dict]:
+        if len(chunk) <= 1:
+            return chunk
+        order = rank_chunk_single_call(
+            persona, chunk, topic, openai_client,
+            model_name=model_name, temperature=temperature, stats=stats
+        )
+        if order is None:
+            logger.debug("    Invalid chunk ranking, sorting chunk by hybrid insertion")
+            return insertion_sort_hybrid(chunk, persona, topic, openai_client, **hybrid_kwargs)
+        return [chunk[i] for i in order]
+    
+    with ThreadPoolExecutor(
+        max_workers=len(chunks),
+        thread_name_prefix=threading.current_thread().name
+    ) as executor:
+        sorted_chunks = list(executor.map(rank_chunk, chunks))
+    if stats is not None:
+        stats.add_round()
+    
+    sorted_list: List[Dict] = []
+    n_fallback = 0
+    
+    for sorted_chunk in sorted_chunks:
+        if not sorted_list:
+            sorted_list = sorted_chunk
+            continue
+        
+        # 2. Merge the ranked chunk into the sorted list (one call)
+        if stats is not None:
+            stats.add_round()
+        positions = assign_positions_single_call(
+            persona, sorted_list, sorted_chunk, topic, openai_client,
+            model_name=model_name, temperature=temperature, stats=stats
+        )
+        keep = _consistent_subset(positions)
+        keep_set = set(keep)
+        
+        merged: List[Dict] = []
+        cursor = 0
+        for idx in keep:
+            merged.extend(sorted_list[cursor:positions[idx]])
+            cursor = max(cursor, positions[idx])
+            merged.append(sorted_chunk[idx])
+        merged.extend(sorted_list[cursor:])
+        sorted_list = merged
+        
+        # 3. Fall back to hybrid insertion for inconsistent items
+        for idx, item in enumerate(sorted_chunk):
+            if idx in keep_set:
+                continue
+            n_fallback += 1
+            position = find_insertion_position_hybrid(
+                persona, sorted_list, item, topic, openai_client, **hybrid_kwargs
+            )
+            sorted_list.insert(position, item)
+    
+    if n_fallback:
+        logger.debug(f"    Batch merge: {n_fallback}/{len(items)} items fell back to hybrid insertion")
+    
+    return sorted_list
+
+
 def insertion_sort_hybrid(
     items: List[Dict],
     persona: str,
@@ -191,13 +615,18 @@ def insertion_sort_hybrid(
     openai_client: OpenAI,
     threshold: int = DEFAULT_THRESHOLD,
     model_name: str = "gpt-5-nano",
-    temperature: float = 1.0
+    temperature: float = 1.0,
+    search_mode: str = DEFAULT_SEARCH_MODE,
+    k: int = DEFAULT_K,
+    window_tokens: Optional[int] = None,
+    stats: Optional[InsertionStats] = None,
+    batch_size: Optional[int] = None
 ) -> List[Dict]:
     """
     Sort items using hybrid insertion sort.
     
     Builds a sorted list by inserting items one at a time using the hybrid
-    position-finding approach.
+    position-finding approach (or several at a time with batch_size).
     
     Args:
         items: List of items to sort
@@ -207,6 +636,11 @@ def insertion_sort_hybrid(
         threshold: Size threshold for switching to single-call
         model_name: Name of the model to use (default: gpt-5-nano)
         temperature: Temperature for sampling (default: 1.0)
+        search_mode: Pairwise search mode ("binary" or "kary")
+        k: Arity for k-ary search
+        window_tokens: Token budget for the single-call step (None = no limit)
+        stats: Optional InsertionStats to record usage in
+        batch_size: If > 1, use batch-merge insertion with chunks of this size
     
     Returns:
         Sorted list of items (most preferred first)
@@ -214,6 +648,13 @@ def insertion_sort_hybrid(
     if len(items) <= 1:
         return items.copy()
     
+    if batch_size is not None and batch_size > 1:
+        return insertion_sort_batch_merge(
+            items, persona, topic, openai_client, batch_size, threshold,
+            model_name=model_name, temperature=temperature,
+            search_mode=search_mode, k=k, window_tokens=window_tokens, stats=stats
+        )
+    
     # Start with first item
     sorted_list = [items[0]]
     
@@ -221,7 +662,8 @@ def insertion_sort_hybrid(
     for i, item in enumerate(items[1:], start=1):
         position = find_insertion_position_hybrid(
             persona, sorted_list, item, topic, openai_client, threshold,
-            model_name=model_name, temperature=temperature
+            model_name=model_name, temperature=temperature,
+            search_mode=search_mode, k=k, window_tokens=window_tokens, stats=stats
         )
         sorted_list.insert(position, item)
         
@@ -238,8 +680,13 @@ def rank_statements_hybrid(
     openai_client: OpenAI,
     threshold: int = DEFAULT_THRESHOLD,
     model_name: str = "gpt-5-nano",
-    temperature: float = 1.0
-) -> List[int]:
+    temperature: float = 1.0,
+    search_mode: str = DEFAULT_SEARCH_MODE,
+    k: int = DEFAULT_K,
+    window_tokens: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    return_stats: bool = False
+):
     """
     Rank statements using hybrid insertion sort.
     
@@ -255,9 +702,16 @@ def rank_statements_hybrid(
         threshold: Size threshold for single-call approach (default 70)
         model_name: Name of the model to use (default: gpt-5-nano)
         temperature: Temperature for sampling (default: 1.0)
+        search_mode: Pairwise search mode ("binary" or "kary")
+        k: Arity for k-ary search
+        window_tokens: Token budget for the single-call step (None = no limit)
+        batch_size: If > 1, use batch-merge insertion with chunks of this size
+        return_stats: If True, also return per-persona usage (InsertionStats dict
+            plus wall_seconds)
     
     Returns:
-        List of statement indices in order from most to least preferred
+        List of statement indices in order from most to least preferred,
+        or (ranking, stats) if return_stats is True
     """
     # Add indices to statements for tracking
     indexed_statements = [
@@ -275,20 +729,33 @@ def rank_statements_hybrid(
         binary_calls_per_insert = max(0, np.log2(n / threshold))
         expected_calls = int((n - 1) * (binary_calls_per_insert + 1))
     
-    logger.info(f"  Ranking {n} statements with hybrid sort (threshold={threshold})")
+    logger.info(
+        f"  Ranking {n} statements with hybrid sort "
+        f"(threshold={threshold}, search={search_mode}, batch_size={batch_size})"
+    )
     logger.info(f"  Expected API calls: ~{expected_calls}")
     
     # Sort using hybrid insertion sort
+    stats = InsertionStats()
+    start_time = time.time()
     sorted_statements = insertion_sort_hybrid(
         indexed_statements, persona, topic, openai_client, threshold,
-        model_name=model_name, temperature=temperature
+        model_name=model_name, temperature=temperature,
+        search_mode=search_mode, k=k, window_tokens=window_tokens, stats=stats,
+        batch_size=batch_size
     )
+    usage = {**stats.to_dict(), "wall_seconds": time.time() - start_time}
     
     # Extract indices
     ranking = [stmt["index"] for stmt in sorted_statements]
     
-    logger.info(f"  Completed hybrid ranking for {n} statements")
+    logger.info(
+        f"  Completed hybrid ranking for {n} statements: {usage['calls']} calls, "
+        f"{usage['input_tokens']} input tokens, critical path {usage['critical_path']}"
+    )
     
+    if return_stats:
+        return ranking, usage
     return ranking
 
 
@@ -300,7 +767,11 @@ def get_preference_matrix_hybrid(
     threshold: int = DEFAULT_THRESHOLD,
     max_workers: int = 20,
     model_name: str = "gpt-5-nano",
-    temperature: float = 1.0
+    temperature: float = 1.0,
+    search_mode: str = DEFAULT_SEARCH_MODE,
+    k: int = DEFAULT_K,
+    window_tokens: Optional[int] = None,
+    batch_size: Optional[int] = None
 ) -> List[List[str]]:
     """
     Get preference matrix using hybrid insertion sort for all personas.
@@ -314,6 +785,10 @@ def get_preference_matrix_hybrid(
         max_workers: Maximum parallel workers for persona processing
         model_name: Name of the model to use (default: gpt-5-nano)
         temperature: Temperature for sampling (default: 1.0)
+        search_mode: Pairwise search mode ("binary" or "kary")
+        k: Arity for k-ary search
+        window_tokens: Token budget for the single-call step (None = no limit)
+        batch_size: If > 1, use batch-merge insertion with chunks of this size
     
     Returns:
         Preference matrix where preferences[rank][voter] is the alternative 
@@ -335,12 +810,17 @@ def get_preference_matrix_hybrid(
         logger.info(f"Processing persona {idx+1}/{n_personas}")
         ranking = rank_statements_hybrid(
             persona, statements, topic, openai_client, threshold,
-            model_name=model_name, temperature=temperature
+            model_name=model_name, temperature=temperature,
+            search_mode=search_mode, k=k, window_tokens=window_tokens,
+            batch_size=batch_size
         )
         return idx, ranking
     
     rankings = [None] * n_personas
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    with ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix=threading.current_thread().name
+    ) as executor:
         futures = {
             executor.submit(process_persona, (i, persona)): i 
             for i, persona in enumerate(personas)
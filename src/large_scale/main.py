@@ -3,10 +3,11 @@ Main orchestration script for large-scale social choice experiment pipeline.
 """
 
 import argparse
-import json
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict
@@ -20,10 +21,12 @@ log_dir = f'logs/{timestamp}'
 os.makedirs(log_dir, exist_ok=True)
 log_file = f'{log_dir}/experiment.log'
 
-# Set up logging
+# Set up logging. Topics run concurrently, so each record carries its thread
+# name: a topic's thread is named after its slug and every pool it starts
+# names its workers <slug>_<n>.
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format='%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.FileHandler(log_file),
         logging.StreamHandler()
@@ -48,7 +51,11 @@ from src.large_scale.discriminative_ranking import get_discriminative_rankings,
 from src.large_scale.evaluative_scoring import get_all_ratings, save_evaluations, load_evaluations
 from src.large_scale.voting_methods import evaluate_all_methods
 from src.large_scale.biclique import compute_proportional_veto_core
+from src.large_scale.results_store import save_result, load_result, BULKY_FIELDS
+from src.large_scale.checkpoint import StepCheckpoint
+from src.api_budget import BudgetedClient
 from src.compute_pvc import compute_pvc  # For successive veto
+from src.typed_responses import format_stats
 
 
 def slugify(text: str) -> str:
@@ -103,12 +110,14 @@ def run_experiment(
     # Check if file exists and skip if requested
     if skip_if_exists and os.path.exists(output_path):
         logger.info(f"⏭️  Skipping {topic_slug} (result file already exists)")
-        with open(output_path, 'r') as f:
-            return json.load(f)
+        return load_result(output_path, fields=BULKY_FIELDS)
     
     # Determine base directory based on test_mode
     base_dir = "data/large_scale/test" if test_mode else "data/large_scale/prod"
     
+    # Per-step checkpoints let an interrupted topic resume mid-step
+    checkpoint_dir = f"{base_dir}/checkpoints/{topic_slug}"
+    
     # Step 1: Generate statements
     logger.info(f"\n📝 Step 1: Generating statements from {len(generative_personas)} generative personas...")
     step_start = time.time()
@@ -117,35 +126,63 @@ def run_experiment(
         logger.info(f"  ✓ Loading existing statements from {statements_path}")
         statements = load_statements(topic_slug, input_dir=f"{base_dir}/statements")
     else:
-        statements = generate_all_statements(topic, generative_personas, openai_client)
+        checkpoint = StepCheckpoint(
+            f"{checkpoint_dir}/statements.jsonl",
+            meta={"topic": topic, "n_personas": len(generative_personas)}
+        )
+        statements = generate_all_statements(topic, generative_personas, openai_client, checkpoint=checkpoint)
         save_statements(statements, topic_slug, output_dir=f"{base_dir}/statements")
+        checkpoint.remove()
     logger.info(f"  ⏱️  Step 1 completed in {time.time() - step_start:.1f}s")
     
-    # Step 2: Get discriminative rankings
-    logger.info(f"\n🗳️  Step 2: Getting preference rankings from {len(discriminative_personas)} discriminative personas...")
-    step_start = time.time()
-    preferences_path = f"{base_dir}/preferences/{topic_slug}.json"
-    if os.path.exists(preferences_path):
-        logger.info(f"  ✓ Loading existing preferences from {preferences_path}")
-        preference_matrix = load_preferences(topic_slug, input_dir=f"{base_dir}/preferences")
-    else:
-        preference_matrix = get_discriminative_rankings(
-            discriminative_personas, statements, topic, openai_client
-        )
-        save_preferences(preference_matrix, topic_slug, output_dir=f"{base_dir}/preferences")
-    logger.info(f"  ⏱️  Step 2 completed in {time.time() - step_start:.1f}s")
+    # Steps 2 and 3 depend only on the statements, so they run concurrently
+    step_meta = {"topic": topic, "n_statements": len(statements)}
     
-    # Step 3: Get evaluative ratings
-    logger.info(f"\n⭐ Step 3: Getting Likert ratings from {len(evaluative_personas)} evaluative personas...")
-    step_start = time.time()
-    evaluations_path = f"{base_dir}/evaluations/{topic_slug}.json"
-    if os.path.exists(evaluations_path):
-        logger.info(f"  ✓ Loading existing evaluations from {evaluations_path}")
-        evaluations = load_evaluations(topic_slug, input_dir=f"{base_dir}/evaluations")
-    else:
-        evaluations = get_all_ratings(evaluative_personas, statements, topic, openai_client)
-        save_evaluations(evaluations, topic_slug, output_dir=f"{base_dir}/evaluations")
-    logger.info(f"  ⏱️  Step 3 completed in {time.time() - step_start:.1f}s")
+    def run_step_2() -> List[List[str]]:
+        logger.info(f"\n🗳️  Step 2: Getting preference rankings from {len(discriminative_personas)} discriminative personas...")
+        step_start = time.time()
+        preferences_path = f"{base_dir}/preferences/{topic_slug}.json"
+        if os.path.exists(preferences_path):
+            logger.info(f"  ✓ Loading existing preferences from {preferences_path}")
+            preference_matrix = load_preferences(topic_slug, input_dir=f"{base_dir}/preferences")
+        else:
+            checkpoint = StepCheckpoint(
+                f"{checkpoint_dir}/preferences.jsonl",
+                meta={**step_meta, "n_personas": len(discriminative_personas)}
+            )
+            preference_matrix = get_discriminative_rankings(
+                discriminative_personas, statements, topic, openai_client, checkpoint=checkpoint
+            )
+            save_preferences(preference_matrix, topic_slug, output_dir=f"{base_dir}/preferences")
+            checkpoint.remove()
+        logger.info(f"  ⏱️  Step 2 completed in {time.time() - step_start:.1f}s")
+        return preference_matrix
+    
+    def run_step_3() -> List[Dict]:
+        logger.info(f"\n⭐ Step 3: Getting Likert ratings from {len(evaluative_personas)} evaluative personas...")
+        step_start = time.time()
+        evaluations_path = f"{base_dir}/evaluations/{topic_slug}.json"
+        if os.path.exists(evaluations_path):
+            logger.info(f"  ✓ Loading existing evaluations from {evaluations_path}")
+            evaluations = load_evaluations(topic_slug, input_dir=f"{base_dir}/evaluations")
+        else:
+            checkpoint = StepCheckpoint(
+                f"{checkpoint_dir}/evaluations.jsonl",
+                meta={**step_meta, "n_personas": len(evaluative_personas)}
+            )
+            evaluations = get_all_ratings(
+                evaluative_personas, statements, topic, openai_client, checkpoint=checkpoint
+            )
+            save_evaluations(evaluations, topic_slug, output_dir=f"{base_dir}/evaluations")
+            checkpoint.remove()
+        logger.info(f"  ⏱️  Step 3 completed in {time.time() - step_start:.1f}s")
+        return evaluations
+    
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix=topic_slug) as executor:
+        step_2 = executor.submit(run_step_2)
+        step_3 = executor.submit(run_step_3)
+        preference_matrix = step_2.result()
+        evaluations = step_3.result()
     
     # Step 4: Compute PVC using biclique algorithm
     logger.info(f"\n🎯 Step 4: Computing PVC...")
@@ -209,18 +246,24 @@ def run_experiment(
         "method_results": method_results
     }
     
-    # Save results
+    # Save results (bulky arrays go to sidecar files, see results_store)
     os.makedirs(output_dir, exist_ok=True)
-    with open(output_path, 'w') as f:
-        json.dump(results, f, indent=2)
+    save_result(results, output_path)
     
     total_time = time.time() - start_time
     logger.info(f"\n✅ Experiment completed in {total_time:.1f}s ({total_time/60:.1f} minutes)")
     logger.info(f"   Results saved to: {output_path}")
+    format_stats.log_stats()
     
     return results
 
 
+def run_topic(topic: str, *args, **kwargs) -> Dict:
+    """run_experiment in a thread named after the topic slug (see the log format)."""
+    threading.current_thread().name = slugify(topic)
+    return run_experiment(topic, *args, **kwargs)
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description="Run large-scale social choice experiment pipeline")
@@ -245,6 +288,18 @@ def main():
         default="data/large_scale/results",
         help="Output directory for results (default: data/large_scale/results)"
     )
+    parser.add_argument(
+        "--parallel-topics",
+        type=int,
+        default=3,
+        help="Number of topics to run concurrently (default: 3)"
+    )
+    parser.add_argument(
+        "--max-concurrent-requests",
+        type=int,
+        default=100,
+        help="Global cap on in-flight API requests across all topics and steps (default: 100)"
+    )
     
     args = parser.parse_args()
     
@@ -254,8 +309,8 @@ def main():
     if not api_key:
         raise ValueError("OPENAI_API_KEY not found in .env file")
     
-    # Initialize OpenAI client
-    openai_client = OpenAI(api_key=api_key)
+    # Initialize OpenAI client; all topics and steps share one request budget
+    openai_client = BudgetedClient(OpenAI(api_key=api_key), args.max_concurrent_requests)
     
     # Determine persona counts based on mode
     if args.test_mode:
@@ -300,11 +355,14 @@ def main():
         topics = [topics[args.topic_index]]
         print(f"Running only topic at index {args.topic_index}")
     
-    # Run experiments
+    # Run experiments, several topics at a time
     all_results = []
-    for i, topic in enumerate(topics):
-        try:
-            result = run_experiment(
+    print(f"Running up to {args.parallel_topics} topics concurrently, "
+          f"max {args.max_concurrent_requests} in-flight API requests")
+    with ThreadPoolExecutor(max_workers=args.parallel_topics) as executor:
+        future_to_topic = {
+            executor.submit(
+                run_topic,
                 topic,
                 generative_personas,
                 discriminative_personas,
@@ -312,14 +370,19 @@ def main():
                 openai_client,
                 output_dir=args.output_dir,
                 test_mode=args.test_mode
-            )
-            if result:
-                all_results.append(result)
-        except Exception as e:
-            print(f"\nERROR processing topic {i} ({topic}): {e}")
-            import traceback
-            traceback.print_exc()
-            continue
+            ): (i, topic)
+            for i, topic in enumerate(topics)
+        }
+        for future in as_completed(future_to_topic):
+            i, topic = future_to_topic[future]
+            try:
+                result = future.result()
+                if result:
+                    all_results.append(result)
+            except Exception as e:
+                print(f"\nERROR processing topic {i} ({topic}): {e}")
+                import traceback
+                traceback.print_exc()
     
     print(f"\n{'='*80}")
     print(f"Completed {len(all_results)}/{len(topics)} experiments")
@@ -1,14 +1,18 @@
 """
-Implement pairwise comparison-based ranking using Python's built-in sort.
+Implement pairwise comparison-based ranking using a pluggable sort engine.
+
+The default engine is Python's built-in sort; see sort_engines.py for
+Ford-Johnson merge-insertion and level-parallel merge sort.
 """
 
-import json
+from __future__ import annotations
+
 import time
-from functools import cmp_to_key
-from typing import List, Dict, Callable
-from openai import OpenAI
+from typing import TYPE_CHECKING, List, Dict, Callable
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import logging
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -16,6 +20,10 @@ logger = logging.getLogger(__name__)
 
 # Import api_timer for timing tracking
 from src.full_experiment.config import api_timer
+from src.large_scale.sort_engines import sort_with_engine, DEFAULT_SORT_ENGINE
+from src.typed_responses import choice_schema, parse_response
+
+PREFERENCE_SCHEMA = choice_schema("pairwise_preference", "preference", ["A", "B", "equal"])
 
 
 @retry(
@@ -31,7 +39,8 @@ def pairwise_compare(
     topic: str,
     openai_client: OpenAI,
     model_name: str = "gpt-5-nano",
-    temperature: float = 1.0
+    temperature: float = 1.0,
+    stats=None
 ) -> int:
     """
     Ask persona to compare two statements and return preference.
@@ -44,6 +53,8 @@ def pairwise_compare(
         openai_client: OpenAI client instance
         model_name: Name of the model to use (default: gpt-5-nano)
         temperature: Temperature for sampling (default: 1.0)
+        stats: Optional tracker with record(kind, response, duration)
+            (e.g. insertion_ranking.InsertionStats)
     
     Returns:
         -1 if persona prefers A, 1 if persona prefers B, 0 if equal
@@ -79,16 +90,19 @@ Return only the JSON, no additional text."""
             {"role": "user", "content": prompt}
         ],
         temperature=temperature,
-        reasoning={"effort": "minimal"}
+        reasoning={"effort": "minimal"},
+        text=PREFERENCE_SCHEMA.text_format,
     )
-    api_timer.record(time.time() - start_time)
+    duration = time.time() - start_time
+    api_timer.record(duration)
+    if stats is not None:
+        stats.record("pairwise", response, duration)
     
-    result = json.loads(response.output_text)
-    preference = result.get("preference", "equal").lower()
+    preference = parse_response(response, PREFERENCE_SCHEMA)
     
-    if preference == "a":
+    if preference == "A":
         return -1
-    elif preference == "b":
+    elif preference == "B":
         return 1
     else:
         return 0
@@ -142,42 +156,44 @@ def rank_statements_pairwise(
     persona: str,
     statements: List[Dict],
     topic: str,
-    openai_client: OpenAI
-) -> List[int]:
+    openai_client: OpenAI,
+    engine: str = DEFAULT_SORT_ENGINE,
+    max_workers: int = 16,
+    return_stats: bool = False
+):
     """
-    Rank statements using pairwise comparisons with Python's built-in sort.
+    Rank statements using pairwise comparisons.
     
     Args:
         persona: Persona string description
         statements: List of statement dicts
         topic: The topic/question
         openai_client: OpenAI client instance
+        engine: Sort engine ("builtin", "merge_insertion" or "parallel_merge")
+        max_workers: Concurrent comparisons per merge level (parallel_merge only)
+        return_stats: If True, also return the SortStats dict
     
     Returns:
-        List of statement indices in order from most to least preferred
+        List of statement indices in order from most to least preferred,
+        or (ranking, stats) if return_stats is True
     """
-    # Add indices to statements for tracking
-    indexed_statements = [
-        {"index": i, "statement": stmt["statement"]}
-        for i, stmt in enumerate(statements)
-    ]
-    
-    # Track comparison count
-    comparison_count = [0]
-    
-    def compare_with_persona(a: Dict, b: Dict) -> int:
-        """Wrapper to compare two statements using the persona."""
-        comparison_count[0] += 1
-        return pairwise_compare(persona, a, b, topic, openai_client)
+    def compare_with_persona(i: int, j: int) -> int:
+        """Compare two statements (by index) using the persona."""
+        return pairwise_compare(persona, statements[i], statements[j], topic, openai_client)
     
-    # Sort using Python's built-in sort with cmp_to_key
-    sorted_statements = sorted(indexed_statements, key=cmp_to_key(compare_with_persona))
-    
-    # Extract indices
-    ranking = [stmt["index"] for stmt in sorted_statements]
+    ranking, stats = sort_with_engine(
+        list(range(len(statements))), compare_with_persona,
+        engine=engine, max_workers=max_workers
+    )
     
-    logger.info(f"  Completed ranking with {comparison_count[0]} pairwise comparisons (expected ~{len(statements)*np.log2(len(statements)):.0f})")
+    logger.info(
+        f"  Completed ranking ({engine}) with {stats.llm_calls} pairwise comparisons "
+        f"(+{stats.memo_hits} memoized, +{stats.transitive_skips} by transitivity; "
+        f"expected ~{len(statements)*np.log2(max(len(statements), 1)):.0f}) in {stats.wall_seconds:.1f}s"
+    )
     
+    if return_stats:
+        return ranking, stats.to_dict()
     return ranking
 
 
@@ -189,7 +205,9 @@ def get_preference_matrix_pairwise(
     personas: List[str],
     statements: List[Dict],
     topic: str,
-    openai_client: OpenAI
+    openai_client: OpenAI,
+    engine: str = DEFAULT_SORT_ENGINE,
+    checkpoint=None
 ) -> List[List[str]]:
     """
     Get preference matrix using pairwise comparisons for all personas.
@@ -199,6 +217,9 @@ def get_preference_matrix_pairwise(
         statements: List of statement dicts
         topic: The topic/question
         openai_client: OpenAI client instance
+        engine: Sort engine (see sort_engines.SORT_ENGINES)
+        checkpoint: Optional checkpoint.StepCheckpoint; personas whose
+            ranking is already recorded there are not re-ranked
     
     Returns:
         Preference matrix where preferences[rank][voter] is the alternative at rank 'rank' for voter 'voter'
@@ -214,25 +235,37 @@ def get_preference_matrix_pairwise(
     
     # Get ranking from each persona (parallelized)
     from tqdm import tqdm
+    import threading
     from concurrent.futures import ThreadPoolExecutor, as_completed
     
     def process_persona(persona_idx_pair):
         """Process a single persona and return (index, ranking)."""
         idx, persona = persona_idx_pair
         logger.info(f"Processing persona {idx+1}/{n_personas}")
-        ranking = rank_statements_pairwise(persona, statements, topic, openai_client)
+        ranking = rank_statements_pairwise(persona, statements, topic, openai_client, engine=engine)
         return idx, ranking
     
     rankings = [None] * n_personas
-    with ThreadPoolExecutor(max_workers=20) as executor:
+    if checkpoint is not None:
+        for record in checkpoint.records:
+            rankings[record["idx"]] = record["ranking"]
+    pending = [i for i in range(n_personas) if rankings[i] is None]
+    
+    with ThreadPoolExecutor(
+        max_workers=20,
+        thread_name_prefix=threading.current_thread().name
+    ) as executor:
         futures = {
-            executor.submit(process_persona, (i, persona)): i 
-            for i, persona in enumerate(personas)
+            executor.submit(process_persona, (i, personas[i])): i 
+            for i in pending
         }
         
-        for future in tqdm(as_completed(futures), total=len(futures), desc="Ranking personas", unit="persona"):
+        for future in tqdm(as_completed(futures), total=n_personas, initial=n_personas - len(pending),
+                           desc="Ranking personas", unit="persona"):
             idx, ranking = future.result()
             rankings[idx] = ranking
+            if checkpoint is not None:
+                checkpoint.append({"idx": idx, "ranking": ranking})
     
     # Convert to preference matrix format: preferences[rank][voter]
     preferences = []
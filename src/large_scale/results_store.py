@@ -0,0 +1,398 @@
+"""
+Split-layout storage and field-selective loading for large_scale result files.
+
+A topic result document mixes a few small fields (topic, pvc, method_results,
+likert_ratings, ...) with bulky arrays (statements, preference_matrix,
+evaluations). The table and figure generators only need the small fields, so
+result files are written in a split layout:
+    
+    results/
+        <slug>.json                       # summary fields + "_sidecars" map
+        _arrays/<slug>/preference_matrix.npy
+        _arrays/<slug>/evaluation_ratings.npy   # [statement][persona], int8, -1 = missing
+        _arrays/<slug>/evaluation_personas.json
+        _arrays/<slug>/statements.json
+        _arrays/summary_index.json        # cached summaries, keyed by file stamp
+
+The summary JSON stays a valid result document (minus the bulky keys), so
+existing glob("*.json") readers keep working. Legacy monolithic files are
+still readable; index_results_dir caches their summaries in the index (it is
+only written by this module's CLI, never by a load), so later generator runs
+touch kilobytes per topic instead of megabytes.
+
+Usage:
+    from src.large_scale.results_store import load_results, load_winner_ratings
+    
+    results = load_results("data/large_scale/results")                    # summaries only
+    results = load_results(results_dir, fields=["preference_matrix"])    # + one bulky field
+    
+    # Convert legacy monolithic files in place:
+    uv run python -m src.large_scale.results_store data/large_scale/results
+    
+    # Or keep them and only index their summaries:
+    uv run python -m src.large_scale.results_store --index-only data/large_scale/results
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BULKY_FIELDS = ("statements", "preference_matrix", "evaluations")
+SIDECAR_DIRNAME = "_arrays"
+INDEX_FILENAME = "summary_index.json"
+SKIP_STEMS = {"all_topics_summary"}
+MISSING_RATING = -1
+
+# In-process summary cache: resolved path -> (stamp, summary)
+_SUMMARY_CACHE: Dict[str, tuple] = {}
+_CACHE_LOCK = threading.Lock()
+
+# Last fully parsed legacy document, so per-method lookups parse it only once
+_LEGACY_DOC: Dict[str, tuple] = {}
+
+
+def _stamp(path: Path) -> List[int]:
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _sidecar_dir(path: Path) -> Path:
+    return path.parent / SIDECAR_DIRNAME / path.stem
+
+
+def _atomic_write_json(data, path: Path, indent: Optional[int] = None) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp, path)
+
+
+def _atomic_save_npy(array: np.ndarray, path: Path) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+# =============================================================================
+# Writing
+# =============================================================================
+
+def _write_preference_matrix(matrix: List[List], sidecar: Path) -> str:
+    """Write the [rank][voter] matrix as int32 .npy, or JSON if not integral."""
+    try:
+        array = np.asarray([[int(x) for x in row] for row in matrix], dtype=np.int32)
+    except (TypeError, ValueError):
+        _atomic_write_json(matrix, sidecar / "preference_matrix.json")
+        return "preference_matrix.json"
+    _atomic_save_npy(array, sidecar / "preference_matrix.npy")
+    return "preference_matrix.npy"
+
+
+def _write_evaluations(evaluations: List[Dict], sidecar: Path) -> Dict[str, str]:
+    """
+    Write evaluations as a statement-major int8 ratings array plus personas.
+    
+    Ratings are stored transposed ([statement][persona]) so the ratings for
+    one statement are a contiguous row; missing ratings are stored as
+    MISSING_RATING and read back as None.
+    """
+    ratings = [[r if r is not None else MISSING_RATING for r in e.get("ratings", [])] for e in evaluations]
+    array = np.asarray(ratings, dtype=np.int8).T if ratings and ratings[0] else np.zeros((0, 0), np.int8)
+    _atomic_save_npy(np.ascontiguousarray(array), sidecar / "evaluation_ratings.npy")
+    _atomic_write_json([e.get("persona") for e in evaluations], sidecar / "evaluation_personas.json")
+    return {"ratings": "evaluation_ratings.npy", "personas": "evaluation_personas.json"}
+
+
+def save_result(results: Dict, output_path) -> None:
+    """
+    Save a topic result document in the split layout.
+    
+    Bulky fields are written to sidecar files first and the summary JSON
+    last, so a summary file on disk always points at complete sidecars.
+    
+    Args:
+        results: Full result document
+        output_path: Path of the summary JSON (e.g. results/<slug>.json)
+    """
+    output_path = Path(output_path)
+    sidecar = _sidecar_dir(output_path)
+    sidecar.mkdir(parents=True, exist_ok=True)
+    
+    summary = {k: v for k, v in results.items() if k not in BULKY_FIELDS}
+    sidecars = {}
+    if "statements" in results:
+        _atomic_write_json(results["statements"], sidecar / "statements.json")
+        sidecars["statements"] = "statements.json"
+    if "preference_matrix" in results:
+        sidecars["preference_matrix"] = _write_preference_matrix(results["preference_matrix"], sidecar)
+    if "evaluations" in results:
+        sidecars["evaluations"] = _write_evaluations(results["evaluations"], sidecar)
+    summary["_sidecars"] = sidecars
+    
+    _atomic_write_json(summary, output_path, indent=2)
+
+
+# =============================================================================
+# Loading
+# =============================================================================
+
+def _ratings_list(row: np.ndarray) -> List[Optional[int]]:
+    """Ratings with missing entries as None (files written as uint8 used 0)."""
+    missing = 0 if row.dtype == np.uint8 else MISSING_RATING
+    return [int(r) if r != missing else None for r in row]
+
+
+def _read_sidecar(path: Path, field: str, ref) -> object:
+    """Load one bulky field from its sidecar file(s)."""
+    sidecar = _sidecar_dir(path)
+    if field == "evaluations":
+        ratings = np.load(sidecar / ref["ratings"])
+        with open(sidecar / ref["personas"]) as f:
+            personas = json.load(f)
+        return [
+            {"persona": persona, "ratings": _ratings_list(ratings[:, p_idx])}
+            for p_idx, persona in enumerate(personas)
+        ]
+    if ref.endswith(".npy"):
+        return [[str(x) for x in row] for row in np.load(sidecar / ref).tolist()]
+    with open(sidecar / ref) as f:
+        return json.load(f)
+
+
+def is_split(summary: Dict) -> bool:
+    """True if the document was written by save_result."""
+    return "_sidecars" in summary
+
+
+def load_summary(path) -> Dict:
+    """
+    Load the summary (non-bulky) fields of a result file, with caching.
+    
+    Works for both layouts; for legacy monolithic files the full file is
+    parsed once and the bulky keys are dropped from the cached copy.
+    
+    Args:
+        path: Result JSON path
+    
+    Returns:
+        Summary dictionary (shared cached object; do not mutate).
+    """
+    path = Path(path)
+    key = str(path.resolve())
+    stamp = _stamp(path)
+    with _CACHE_LOCK:
+        cached = _SUMMARY_CACHE.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+    
+    with open(path) as f:
+        data = json.load(f)
+    summary = {k: v for k, v in data.items() if k not in BULKY_FIELDS}
+    if not is_split(summary):
+        summary["_legacy_fields"] = [k for k in BULKY_FIELDS if k in data]
+    
+    with _CACHE_LOCK:
+        _SUMMARY_CACHE[key] = (stamp, summary)
+    return summary
+
+
+def _load_legacy(path: Path) -> Dict:
+    """Parse a monolithic result file, keeping only the most recent one."""
+    key, stamp = str(path.resolve()), _stamp(path)
+    with _CACHE_LOCK:
+        cached = _LEGACY_DOC.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+    with open(path) as f:
+        data = json.load(f)
+    with _CACHE_LOCK:
+        _LEGACY_DOC.clear()
+        _LEGACY_DOC[key] = (stamp, data)
+    return data
+
+
+def load_result(path, fields: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Load a result document with only the requested bulky fields.
+    
+    Args:
+        path: Result JSON path
+        fields: Bulky fields to include (subset of BULKY_FIELDS); summary
+            fields are always included. None loads the summary only.
+    
+    Returns:
+        New result dictionary.
+    """
+    path = Path(path)
+    fields = [f for f in (fields or []) if f in BULKY_FIELDS]
+    summary = load_summary(path)
+    result = {k: v for k, v in summary.items() if k not in ("_sidecars", "_legacy_fields")}
+    if not fields:
+        return result
+    
+    if is_split(summary):
+        for field in fields:
+            ref = summary["_sidecars"].get(field)
+            if ref is not None:
+                result[field] = _read_sidecar(path, field, ref)
+    else:
+        data = _load_legacy(path)
+        for field in fields:
+            if field in data:
+                result[field] = data[field]
+    return result
+
+
+def load_winner_ratings(path, statement_idx: int) -> List[Optional[int]]:
+    """
+    Load all evaluative ratings for one statement.
+    
+    For split files this memory-maps the ratings array and reads a single
+    contiguous row.
+    
+    Args:
+        path: Result JSON path
+        statement_idx: Statement index (e.g. a method's winner)
+    
+    Returns:
+        Ratings for that statement, one per evaluative persona (None if missing).
+    """
+    path = Path(path)
+    summary = load_summary(path)
+    if is_split(summary):
+        ref = summary["_sidecars"].get("evaluations")
+        if ref is None:
+            return []
+        ratings = np.load(_sidecar_dir(path) / ref["ratings"], mmap_mode='r')
+        if statement_idx >= ratings.shape[0]:
+            return []
+        return _ratings_list(ratings[statement_idx])
+    
+    evaluations = load_result(path, ["evaluations"]).get("evaluations", [])
+    return [e["ratings"][statement_idx] for e in evaluations if statement_idx < len(e.get("ratings", []))]
+
+
+def result_files(results_dir) -> List[Path]:
+    """Topic result files in a directory, sorted by name."""
+    results_path = Path(results_dir)
+    if not results_path.exists():
+        return []
+    return [p for p in sorted(results_path.glob("*.json")) if p.stem not in SKIP_STEMS]
+
+
+def _warm_from_index(results_dir: Path, files: List[Path]) -> None:
+    """Seed the in-process cache from the on-disk summary index."""
+    index_path = results_dir / SIDECAR_DIRNAME / INDEX_FILENAME
+    if not index_path.exists():
+        return
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return
+    with _CACHE_LOCK:
+        for path in files:
+            entry = index.get(path.name)
+            if entry is not None and entry["stamp"] == _stamp(path):
+                _SUMMARY_CACHE.setdefault(str(path.resolve()), (entry["stamp"], entry["summary"]))
+
+
+def index_results_dir(results_dir) -> int:
+    """
+    Persist the summaries of legacy files so generators skip the full parse.
+    
+    Args:
+        results_dir: Directory of topic result JSON files
+    
+    Returns:
+        Number of legacy files indexed.
+    """
+    results_path = Path(results_dir)
+    files = result_files(results_path)
+    _warm_from_index(results_path, files)
+    index = {}
+    for path in files:
+        summary = load_summary(path)
+        if not is_split(summary):
+            index[path.name] = {"stamp": _stamp(path), "summary": summary}
+    if index:
+        (results_path / SIDECAR_DIRNAME).mkdir(parents=True, exist_ok=True)
+        _atomic_write_json(index, results_path / SIDECAR_DIRNAME / INDEX_FILENAME)
+    return len(index)
+
+
+def load_results(results_dir, fields: Optional[Iterable[str]] = None) -> List[Dict]:
+    """
+    Load all topic results in a directory with only the requested bulky fields.
+    
+    Args:
+        results_dir: Directory of topic result JSON files
+        fields: Bulky fields to include (see load_result)
+    
+    Returns:
+        List of result dictionaries, sorted by filename. Each has a
+        "_path" key so callers can fetch more fields later.
+    """
+    results_path = Path(results_dir)
+    files = result_files(results_path)
+    _warm_from_index(results_path, files)
+    
+    results = []
+    for path in files:
+        result = load_result(path, fields)
+        result["_path"] = str(path)
+        results.append(result)
+    return results
+
+
+def migrate_results_dir(results_dir) -> int:
+    """
+    Rewrite legacy monolithic result files in the split layout.
+    
+    Args:
+        results_dir: Directory of topic result JSON files
+    
+    Returns:
+        Number of files converted.
+    """
+    converted = 0
+    for path in result_files(results_dir):
+        with open(path) as f:
+            data = json.load(f)
+        if is_split(data) or not any(k in data for k in BULKY_FIELDS):
+            continue
+        size_before = path.stat().st_size
+        save_result(data, path)
+        converted += 1
+        logger.info(f"Split {path.name}: {size_before / 1e6:.1f} MB -> {path.stat().st_size / 1e3:.1f} KB summary")
+    return converted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert large_scale result files to the split layout")
+    parser.add_argument("results_dirs", nargs="+", help="Result directories to convert")
+    parser.add_argument("--index-only", action="store_true",
+                        help="Keep legacy files and only cache their summaries in the index")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    for results_dir in args.results_dirs:
+        if args.index_only:
+            n = index_results_dir(results_dir)
+            print(f"{results_dir}: indexed {n} legacy file(s)")
+        else:
+            n = migrate_results_dir(results_dir)
+            print(f"{results_dir}: converted {n} file(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Comparison-minimizing sort engines for LLM pairwise ranking.
+
+Every comparison is an LLM call, so the engines here are chosen to minimize
+either the number of comparisons or the sequential depth:
+
+- builtin: Python's sorted() with cmp_to_key (the original behaviour)
+- merge_insertion: Ford-Johnson merge-insertion sort, close to the
+  information-theoretic minimum of ceil(log2(n!)) comparisons
+- parallel_merge: bottom-up merge sort where all merges of a level run
+  concurrently, so the sequential depth is ~2n calls instead of ~n log n
+
+The new engines go through a ComparisonCache that memoizes symmetric
+comparisons (compare(b, a) is answered from compare(a, b)) and skips pairs
+implied by transitivity of earlier strict answers. builtin calls the
+comparator directly, so every comparison sorted() asks for is an LLM call,
+as before. Items must be hashable (the ranking code sorts statement indices).
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from functools import cmp_to_key
+from typing import Callable, Hashable, List, Sequence, Tuple
+
+SORT_ENGINES = ["builtin", "merge_insertion", "parallel_merge"]
+DEFAULT_SORT_ENGINE = "builtin"
+
+
+@dataclass
+class SortStats:
+    """Comparison counts and timing for one sort."""
+    engine: str
+    n_items: int
+    comparisons: int = 0        # Comparisons requested by the algorithm
+    llm_calls: int = 0          # Comparisons that reached the comparator
+    memo_hits: int = 0          # Answered from an earlier (possibly reversed) call
+    transitive_skips: int = 0   # Answered by transitivity of earlier answers
+    wall_seconds: float = 0.0
+    
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class ComparisonCache:
+    """
+    Thread-safe comparator wrapper with memoization and transitivity.
+    
+    Strict answers are stored as edges "winner -> loser" in a preference
+    graph; a pair is answered without a call if one item reaches the other.
+    Ties are memoized but not propagated. Because implied pairs are never
+    asked, the recorded answers can never form a cycle.
+    """
+    
+    def __init__(self, compare_func: Callable[[Hashable, Hashable], int], stats: SortStats):
+        self._compare = compare_func
+        self._stats = stats
+        self._memo: dict[Tuple[Hashable, Hashable], int] = {}
+        self._beats: dict[Hashable, set] = {}
+        self._lock = threading.Lock()
+    
+    def _reaches(self, src: Hashable, dst: Hashable) -> bool:
+        """True if src is (transitively) preferred over dst."""
+        stack, seen = [src], {src}
+        while stack:
+            node = stack.pop()
+            for nxt in self._beats.get(node, ()):
+                if nxt == dst:
+                    return True
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return False
+    
+    def _known(self, a: Hashable, b: Hashable) -> int | None:
+        if (a, b) in self._memo:
+            self._stats.memo_hits += 1
+            return self._memo[(a, b)]
+        if (b, a) in self._memo:
+            self._stats.memo_hits += 1
+            return -self._memo[(b, a)]
+        if self._reaches(a, b):
+            self._stats.transitive_skips += 1
+            return -1
+        if self._reaches(b, a):
+            self._stats.transitive_skips += 1
+            return 1
+        return None
+    
+    def __call__(self, a: Hashable, b: Hashable) -> int:
+        """Compare a and b: -1 if a is preferred, 1 if b is preferred, 0 if equal."""
+        with self._lock:
+            self._stats.comparisons += 1
+            known = self._known(a, b)
+        if known is not None:
+            return known
+        
+        result = self._compare(a, b)
+        
+        with self._lock:
+            self._stats.llm_calls += 1
+            self._memo[(a, b)] = result
+            if result < 0:
+                self._beats.setdefault(a, set()).add(b)
+            elif result > 0:
+                self._beats.setdefault(b, set()).add(a)
+        return result
+
+
+class CountingComparator:
+    """Comparator wrapper that only counts calls (no memoization)."""
+    
+    def __init__(self, compare_func: Callable[[Hashable, Hashable], int], stats: SortStats):
+        self._compare = compare_func
+        self._stats = stats
+        self._lock = threading.Lock()
+    
+    def __call__(self, a: Hashable, b: Hashable) -> int:
+        result = self._compare(a, b)
+        with self._lock:
+            self._stats.comparisons += 1
+            self._stats.llm_calls += 1
+        return result
+
+
+# =============================================================================
+# Engines
+# =============================================================================
+
+def _builtin_sort(items: List, compare: Callable, max_workers: int) -> List:
+    return sorted(items, key=cmp_to_key(compare))
+
+
+def _binary_insert(chain: List, item, bound: int, compare: Callable) -> None:
+    """Insert item into chain[:bound] by binary search (ties go after)."""
+    lo, hi = 0, bound
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if compare(item, chain[mid]) < 0:
+            hi = mid
+        else:
+            lo = mid + 1
+    chain.insert(lo, item)
+
+
+def _insertion_order(n_pending: int) -> List[int]:
+    """
+    Ford-Johnson insertion order over pending elements 2..n_pending+1.
+    
+    Groups end at Jacobsthal numbers (3, 5, 11, 21, 43, ...) and are inserted
+    from their high end down, so every binary search runs over at most
+    2^k - 1 elements.
+    """
+    order = []
+    prev, k = 1, 2
+    last = n_pending + 1
+    while prev < last:
+        jacobsthal = (2 ** (k + 1) + (-1) ** k) // 3
+        top = min(jacobsthal, last)
+        order.extend(range(top, prev, -1))
+        prev = top
+        k += 1
+    return order
+
+
+def _merge_insertion_sort(items: List, compare: Callable, max_workers: int) -> List:
+    n = len(items)
+    if n <= 1:
+        return list(items)
+    
+    # 1. Pair up; the less preferred element of each pair joins the main chain
+    preferred_of: dict = {}
+    chain_items = []
+    for i in range(0, n - 1, 2):
+        a, b = items[i], items[i + 1]
+        if compare(a, b) <= 0:
+            chain_items.append(b)
+            preferred_of[b] = a
+        else:
+            chain_items.append(a)
+            preferred_of[a] = b
+    leftover = items[-1] if n % 2 else None
+    
+    # 2. Recursively sort the main chain
+    chain = _merge_insertion_sort(chain_items, compare, max_workers)
+    
+    # 3. Pending partners in chain order; the first goes on top of the chain for free
+    pending = [preferred_of[c] for c in chain]
+    partners = list(chain)
+    chain = [pending[0]] + chain
+    if leftover is not None:
+        pending.append(leftover)
+        partners.append(None)
+    
+    # 4. Insert the rest in Jacobsthal order, each bounded by its partner's position
+    for idx in _insertion_order(len(pending) - 1):
+        item, partner = pending[idx - 1], partners[idx - 1]
+        bound = chain.index(partner) if partner is not None else len(chain)
+        _binary_insert(chain, item, bound, compare)
+    
+    return chain
+
+
+def _merge(left: List, right: List, compare: Callable) -> List:
+    merged = []
+    i, j = 0, 0
+    while i < len(left) and j < len(right):
+        if compare(left[i], right[j]) <= 0:
+            merged.append(left[i])
+            i += 1
+        else:
+            merged.append(right[j])
+            j += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return merged
+
+
+def _parallel_merge_sort(items: List, compare: Callable, max_workers: int) -> List:
+    runs = [[item] for item in items]
+    if not runs:
+        return []
+    with ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix=threading.current_thread().name
+    ) as executor:
+        while len(runs) > 1:
+            pairs = [(runs[i], runs[i + 1]) for i in range(0, len(runs) - 1, 2)]
+            merged = list(executor.map(lambda p: _merge(p[0], p[1], compare), pairs))
+            if len(runs) % 2:
+                merged.append(runs[-1])
+            runs = merged
+    return runs[0]
+
+
+_ENGINES = {
+    "builtin": _builtin_sort,
+    "merge_insertion": _merge_insertion_sort,
+    "parallel_merge": _parallel_merge_sort,
+}
+
+# Engines that keep the original behaviour of one comparator call per comparison
+_UNCACHED_ENGINES = {"builtin"}
+
+
+def sort_with_engine(
+    items: Sequence[Hashable],
+    compare_func: Callable[[Hashable, Hashable], int],
+    engine: str = DEFAULT_SORT_ENGINE,
+    max_workers: int = 16
+) -> Tuple[List, SortStats]:
+    """
+    Sort items (most preferred first) with the given engine.
+    
+    Args:
+        items: Hashable items to sort
+        compare_func: Returns -1 if the first item is preferred, 1 if the
+            second is, 0 if equal. Must be thread-safe for parallel_merge.
+        engine: One of SORT_ENGINES
+        max_workers: Concurrent comparisons per level (parallel_merge only)
+    
+    Returns:
+        Tuple of (sorted items, SortStats).
+    """
+    if engine not in _ENGINES:
+        raise ValueError(f"Unknown sort engine '{engine}'. Choose from {SORT_ENGINES}")
+    
+    stats = SortStats(engine=engine, n_items=len(items))
+    if engine in _UNCACHED_ENGINES:
+        compare = CountingComparator(compare_func, stats)
+    else:
+        compare = ComparisonCache(compare_func, stats)
+    
+    start = time.time()
+    result = _ENGINES[engine](list(items), compare, max_workers)
+    stats.wall_seconds = time.time() - start
+    
+    return result, stats
+
+
+if __name__ == "__main__":
+    # Self-check against a noiseless comparator
+    import math
+    import random
+    
+    rng = random.Random(0)
+    for n in [0, 1, 2, 3, 5, 12, 21, 100]:
+        items = list(range(n))
+        rng.shuffle(items)
+        for engine in SORT_ENGINES:
+            result, stats = sort_with_engine(items, lambda a, b: (a > b) - (a < b), engine)
+            assert result == sorted(items), (engine, n, result)
+            if engine == "merge_insertion" and n > 1:
+                # Ford-Johnson worst case is within a few comparisons of log2(n!)
+                assert stats.llm_calls <= math.ceil(math.log2(math.factorial(n))) + n // 10 + 1, (n, stats)
+        print(f"n={n}: " + ", ".join(
+            f"{e}={sort_with_engine(items, lambda a, b: (a > b) - (a < b), e)[1].llm_calls}"
+            for e in SORT_ENGINES
+        ))
+    print("All sort engine checks passed.")
@@ -2,12 +2,13 @@
 Evaluate alternative voting methods using VoteKit and OpenAI (with ChatGPT variants and successive veto).
 """
 
-import json
 from typing import List, Dict
 from openai import OpenAI
 from votekit import RankProfile, RankBallot
 from votekit.elections import Plurality, Borda, IRV, RankedPairs, Schulze
 
+from src.typed_responses import parse_response, selection_schema
+
 
 def evaluate_all_methods(
     preference_matrix: List[List[str]],
@@ -194,7 +195,7 @@ Where the value is the index (0-{len(statements)-1}) of the statement you select
 Return only the JSON, no additional text."""
 
     try:
-        return _execute_chatgpt_selection(prompt, openai_client)
+        return _execute_chatgpt_selection(prompt, openai_client, len(statements))
     except Exception as e:
         return {"winner": None, "error": str(e), "in_pvc": None}
 
@@ -250,7 +251,7 @@ Where the value is the index (0-{len(statements)-1}) of the statement you select
 Return only the JSON, no additional text."""
 
     try:
-        return _execute_chatgpt_selection(prompt, openai_client)
+        return _execute_chatgpt_selection(prompt, openai_client, len(statements))
     except Exception as e:
         return {"winner": None, "error": str(e), "in_pvc": None}
 
@@ -303,7 +304,7 @@ Where the value is the index (0-{len(statements)-1}) of the statement you select
 Return only the JSON, no additional text."""
 
     try:
-        return _execute_chatgpt_selection(prompt, openai_client)
+        return _execute_chatgpt_selection(prompt, openai_client, len(statements))
     except Exception as e:
         return {"winner": None, "error": str(e), "in_pvc": None}
 
@@ -374,35 +375,35 @@ Where the value is the index (0-{len(statements)-1}) of the statement you select
 Return only the JSON, no additional text."""
 
     try:
-        return _execute_chatgpt_selection(prompt, openai_client)
+        return _execute_chatgpt_selection(prompt, openai_client, len(statements))
     except Exception as e:
         return {"winner": None, "error": str(e), "in_pvc": None}
 
 
-def _execute_chatgpt_selection(prompt: str, openai_client: OpenAI) -> Dict:
+def _execute_chatgpt_selection(prompt: str, openai_client: OpenAI, n_statements: int) -> Dict:
     """
     Execute ChatGPT selection with given prompt.
     
     Args:
         prompt: The prompt to send to ChatGPT
         openai_client: OpenAI client instance
+        n_statements: Number of statements to select from
     
     Returns:
         Dict with winner and in_pvc flag
     """
+    schema = selection_schema(n_statements)
     response = openai_client.responses.create(
         model="gpt-5-nano",
         input=[
             {"role": "system", "content": "You are a helpful assistant that selects consensus statements. Return ONLY valid JSON, no other text."},
             {"role": "user", "content": prompt}
-        ]
+        ],
+        text=schema.text_format,
     )
     
-    result = json.loads(response.output_text)
-    selected_idx = result.get("selected_statement_index")
-    
     return {
-        "winner": str(selected_idx) if selected_idx is not None else None,
+        "winner": str(parse_response(response, schema)),
         "in_pvc": None
     }
 
@@ -0,0 +1,49 @@
+"""
+Lazy submodule loading for package __init__ files.
+
+Importing a package used to import every submodule it lists, and with them
+openai, votekit, matplotlib and friends, even when the caller only needed
+config. lazy_submodules gives a package a PEP 562 module __getattr__ that
+imports a listed submodule the first time it is accessed, so
+`from src.sample_alt_voters import config` stays cheap while
+`pkg.alternative_generators.persona_context` still works as before.
+
+Heavy third-party packages used only inside a few functions are imported
+in those functions (votekit, for instance, pulls in pandas, scipy and
+matplotlib, and is only needed once a voting rule runs; pvc_toolbox only
+once an epsilon is computed); names used only in annotations are imported
+under TYPE_CHECKING (with `from __future__ import annotations`).
+
+Usage (in a package __init__.py):
+    __all__ = ["config", "alternative_generators"]
+    __getattr__, __dir__ = lazy_submodules(__name__, __all__)
+"""
+
+import importlib
+import sys
+from typing import Callable, Iterable, List, Tuple
+
+
+def lazy_submodules(package: str, names: Iterable[str]) -> Tuple[Callable, Callable]:
+    """
+    Build module-level __getattr__/__dir__ that import submodules on access.
+    
+    Args:
+        package: The package's __name__
+        names: Submodule names to expose lazily
+    
+    Returns:
+        (__getattr__, __dir__) to assign in the package namespace
+    """
+    names = frozenset(names)
+    
+    def __getattr__(name: str):
+        if name in names:
+            # import_module sets the attribute on the package, so this runs once per name
+            return importlib.import_module(f"{package}.{name}")
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+    
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | names)
+    
+    return __getattr__, __dir__
@@ -11,14 +11,17 @@ Key components:
 - alternative_generators: Four methods for generating statements
 - verbalized_sampling: Utilities for parsing verbalized sampling responses
 - generate_statements: CLI for pre-generating Alt1 and Alt4 statements
+
+Components are imported on first access, so `python -m src.sample_alt_voters.<cli>`
+only loads what that CLI uses.
 """
 
-from . import config
-from . import alternative_generators
-from . import verbalized_sampling
+from src.lazy_import import lazy_submodules
 
 __all__ = [
     "config",
     "alternative_generators",
     "verbalized_sampling",
 ]
+
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
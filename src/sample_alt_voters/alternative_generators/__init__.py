@@ -6,12 +6,11 @@ This module contains four alternative (statement) distribution methods:
 - persona_context: Alt2 - Persona sees 100 statements then generates (Ben's bridging)
 - no_persona_context: Alt3 - No persona, sees 100 statements, uses verbalized sampling
 - no_persona_no_context: Alt4 - No persona, no context, uses verbalized sampling
+
+Submodules are imported on first access (they pull in openai and tenacity).
 """
 
-from . import persona_no_context
-from . import persona_context
-from . import no_persona_context
-from . import no_persona_no_context
+from src.lazy_import import lazy_submodules
 
 __all__ = [
     "persona_no_context",
@@ -19,3 +18,5 @@ __all__ = [
     "no_persona_context",
     "no_persona_no_context",
 ]
+
+__getattr__, __dir__ = lazy_submodules(__name__, __all__)
@@ -10,16 +10,19 @@ Key features:
 - 815 total statements = 163 API calls (163 * 5 = 815)
 """
 
+from __future__ import annotations
+
 import json
 import logging
 import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from openai import OpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from tqdm import tqdm
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 from ..config import (
     MODEL,
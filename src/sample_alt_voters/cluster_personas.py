@@ -24,7 +24,8 @@ from dotenv import load_dotenv
 from openai import OpenAI
 from sklearn.cluster import KMeans
 from sklearn.decomposition import PCA
-from tqdm import tqdm
+
+from .embedding_store import EmbeddingStore
 
 # Load environment variables from .env file
 load_dotenv()
@@ -70,35 +71,28 @@ def generate_embeddings(
     """
     Generate embeddings for all personas using OpenAI API.
     
-    Caches embeddings to avoid re-computation.
+    Embeddings come from the shared content-addressed EmbeddingStore, so
+    only personas not embedded before (by any personas file) are requested.
+    The persona-ordered array is also saved to persona_embeddings.npy; an
+    existing one is imported into the store before anything is requested.
     """
     embeddings_dir.mkdir(parents=True, exist_ok=True)
     embeddings_file = embeddings_dir / "persona_embeddings.npy"
     
-    if embeddings_file.exists() and not force_regenerate:
-        logger.info(f"Loading cached embeddings from {embeddings_file}")
-        embeddings = np.load(embeddings_file)
-        if len(embeddings) == len(personas):
-            return embeddings
-        logger.warning("Cached embeddings size mismatch, regenerating...")
-    
-    logger.info(f"Generating embeddings for {len(personas)} personas...")
-    all_embeddings = []
-    
-    # Process in batches
-    for i in tqdm(range(0, len(personas), BATCH_SIZE), desc="Embedding batches"):
-        batch = personas[i:i + BATCH_SIZE]
-        response = client.embeddings.create(
-            model=EMBEDDING_MODEL,
-            input=batch,
-        )
-        batch_embeddings = [item.embedding for item in response.data]
-        all_embeddings.extend(batch_embeddings)
-    
-    embeddings = np.array(all_embeddings)
-    logger.info(f"Generated embeddings with shape {embeddings.shape}")
+    store = EmbeddingStore(EMBEDDING_MODEL, dim=EMBEDDING_DIM)
+    if embeddings_file.exists() and not force_regenerate and store.missing(personas):
+        legacy = np.load(embeddings_file)
+        if len(legacy) == len(personas):
+            try:
+                n_added = store.add(personas, legacy)
+                logger.info(f"Imported {n_added} embeddings from {embeddings_file} into the store")
+            except ValueError as e:
+                logger.warning(f"Not importing {embeddings_file}: {e}")
+        else:
+            logger.warning(f"Cached embeddings size mismatch in {embeddings_file}, not importing")
+    embeddings = store.embed(personas, client, batch_size=BATCH_SIZE, refresh=force_regenerate)
+    logger.info(f"Embeddings shape {embeddings.shape}")
     
-    # Cache embeddings
     np.save(embeddings_file, embeddings)
     logger.info(f"Saved embeddings to {embeddings_file}")
     
@@ -12,6 +12,8 @@ import logging
 import threading
 from pathlib import Path
 
+from src.typed_responses import format_stats
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -74,6 +76,9 @@ PHASE2_FIGURES_DIR = RESULTS_DIR / "figures"
 # Logs directory
 LOGS_DIR = PROJECT_ROOT / "logs"
 
+# Content-addressed embedding store shared by every persona/statement file
+EMBEDDING_STORE_DIR = DATA_DIR / "embedding_store"
+
 # =============================================================================
 # Topic Configuration
 # =============================================================================
@@ -120,6 +125,8 @@ VOTER_DISTRIBUTIONS = ["uniform", "clustered"]
 # Parallelization
 # =============================================================================
 MAX_WORKERS = 50  # Maximum parallel API calls for statement generation
+EMBEDDING_BATCH_SIZE = 100   # Texts per embeddings request
+EMBEDDING_MAX_WORKERS = 8    # Concurrent embeddings requests
 
 # =============================================================================
 # API Timing Tracker
@@ -144,6 +151,7 @@ class APITimer:
                 logger.info(
                     f"[API Stats] {len(self._times)} calls, avg {avg:.2f}s/call"
                 )
+                format_stats.log_stats()
     
     def get_stats(self) -> dict:
         """Get current timing statistics."""
@@ -0,0 +1,226 @@
+"""
+Content-addressed embedding store.
+
+Embeddings are kept as float16 rows in a single append-only memmap file per
+embedding model, with a JSON index mapping the SHA-256 of each text to its
+row. Asking the store for a list of texts embeds only the texts it has not
+seen (new or edited personas/statements), in concurrent batches, and
+appends each batch as it completes, so an interrupted run keeps its
+progress. A new persona or statement file therefore only pays for its
+delta, and every file embedded with the same model shares one store.
+
+float16 keeps ~3 significant digits, far below the noise k-means or cosine
+similarity care about, at half the size of float32.
+
+Layout (under EMBEDDING_STORE_DIR/<model>/):
+    vectors.f16   rows x dim float16, row-major
+    index.json    {"model", "dim", "rows", "hashes": {sha256: row}}
+
+Usage:
+    store = EmbeddingStore("text-embedding-3-small")
+    embeddings = store.embed(personas, client)   # (len(personas), dim) float32
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from openai import OpenAI
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tqdm import tqdm
+
+from .config import EMBEDDING_STORE_DIR, EMBEDDING_BATCH_SIZE, EMBEDDING_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILENAME = "vectors.f16"
+INDEX_FILENAME = "index.json"
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of a text, used as its key in the store."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=2, max=10),
+    retry=retry_if_exception_type((Exception,)),
+    reraise=True
+)
+def _embed_batch(client: OpenAI, model: str, texts: List[str]) -> List[List[float]]:
+    response = client.embeddings.create(model=model, input=texts)
+    return [item.embedding for item in response.data]
+
+
+class EmbeddingStore:
+    """Float16 memmap of embeddings keyed by content hash, for one model."""
+    
+    def __init__(
+        self,
+        model: str,
+        store_dir: Path = EMBEDDING_STORE_DIR,
+        dim: Optional[int] = None
+    ):
+        """
+        Args:
+            model: Embedding model name (one store per model)
+            store_dir: Root directory of all stores
+            dim: Embedding dimension (None = taken from the first response)
+        """
+        self.model = model
+        self.dir = Path(store_dir) / model.replace("/", "_")
+        self.vectors_path = self.dir / VECTORS_FILENAME
+        self.index_path = self.dir / INDEX_FILENAME
+        self._lock = threading.Lock()
+        
+        self.dim = dim
+        self.rows = 0
+        self.hashes: Dict[str, int] = {}
+        self._load()
+    
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+    
+    def _load(self) -> None:
+        if not self.index_path.exists():
+            return
+        with open(self.index_path) as f:
+            index = json.load(f)
+        if self.dim is not None and index["dim"] != self.dim:
+            raise ValueError(
+                f"Embedding store {self.dir} has dim {index['dim']}, expected {self.dim}"
+            )
+        self.dim = index["dim"]
+        self.rows = index["rows"]
+        self.hashes = index["hashes"]
+        
+        # Rows appended after the last index write are not indexed; drop them
+        expected = self.rows * self.dim * 2
+        if self.vectors_path.exists() and self.vectors_path.stat().st_size > expected:
+            logger.warning(f"Truncating unindexed rows from {self.vectors_path}")
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(expected)
+    
+    def _write_index(self) -> None:
+        tmp = self.index_path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"model": self.model, "dim": self.dim, "rows": self.rows, "hashes": self.hashes}, f)
+        os.replace(tmp, self.index_path)
+    
+    def _append(self, hashes: List[str], vectors: List[List[float]]) -> None:
+        """Append a batch of rows and index them (caller holds the lock)."""
+        block = np.asarray(vectors, dtype=np.float16)
+        if self.dim is None:
+            self.dim = block.shape[1]
+        elif block.shape[1] != self.dim:
+            raise ValueError(f"Embedding dim {block.shape[1]} != store dim {self.dim}")
+        
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with open(self.vectors_path, "ab") as f:
+            f.write(block.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        for h in hashes:
+            self.hashes[h] = self.rows
+            self.rows += 1
+        self._write_index()
+    
+    def _matrix(self) -> np.ndarray:
+        return np.memmap(self.vectors_path, dtype=np.float16, mode="r", shape=(self.rows, self.dim))
+    
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+    
+    def missing(self, texts: List[str]) -> List[str]:
+        """Unique texts that are not in the store yet, in first-seen order."""
+        seen = set()
+        result = []
+        for text in texts:
+            h = content_hash(text)
+            if h not in self.hashes and h not in seen:
+                seen.add(h)
+                result.append(text)
+        return result
+    
+    def add(self, texts: List[str], embeddings: np.ndarray) -> int:
+        """
+        Store precomputed embeddings (e.g. a legacy per-file .npy) without requests.
+        
+        Args:
+            texts: Texts in the order of the embeddings rows
+            embeddings: (len(texts), dim) array
+        
+        Returns:
+            Number of rows added (texts already in the store are skipped)
+        """
+        if len(texts) != len(embeddings):
+            raise ValueError(f"{len(texts)} texts but {len(embeddings)} embeddings")
+        with self._lock:
+            hashes, rows = [], []
+            for text, vector in zip(texts, embeddings):
+                h = content_hash(text)
+                if h not in self.hashes and h not in hashes:
+                    hashes.append(h)
+                    rows.append(vector)
+            if hashes:
+                self._append(hashes, rows)
+        return len(hashes)
+    
+    def embed(
+        self,
+        texts: List[str],
+        client: OpenAI,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_workers: int = EMBEDDING_MAX_WORKERS,
+        refresh: bool = False
+    ) -> np.ndarray:
+        """
+        Embed texts, requesting only the ones the store has not seen.
+        
+        Args:
+            texts: Texts to embed
+            client: OpenAI client
+            batch_size: Texts per embeddings request
+            max_workers: Concurrent embeddings requests
+            refresh: Re-embed every text even if stored (new rows replace old ones)
+        
+        Returns:
+            (len(texts), dim) float32 array in the order of texts
+        """
+        if refresh:
+            todo = list(dict.fromkeys(texts))
+        else:
+            todo = self.missing(texts)
+        
+        if todo:
+            logger.info(
+                f"Embedding {len(todo)} new text(s) with {self.model} "
+                f"({len(texts) - len(todo)} cached)"
+            )
+            batches = [todo[i:i + batch_size] for i in range(0, len(todo), batch_size)]
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(_embed_batch, client, self.model, batch): batch
+                    for batch in batches
+                }
+                for future in tqdm(as_completed(futures), total=len(futures), desc="Embedding batches"):
+                    batch = futures[future]
+                    vectors = future.result()
+                    with self._lock:
+                        self._append([content_hash(t) for t in batch], vectors)
+        else:
+            logger.info(f"All {len(texts)} embeddings cached in {self.dir}")
+        
+        if not texts:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        rows = [self.hashes[content_hash(t)] for t in texts]
+        return np.asarray(self._matrix()[rows], dtype=np.float32)
@@ -14,13 +14,17 @@ Usage:
     uv run python -m src.sample_alt_voters.generate_statements --all
 """
 
+from __future__ import annotations
+
 import argparse
 import json
 import logging
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from openai import OpenAI
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 from .config import (
     PERSONAS_PATH,
@@ -148,6 +152,7 @@ def main():
     topic_map = {v: k for k, v in TOPIC_SHORT_NAMES.items()}
     
     # Initialize OpenAI client
+    from openai import OpenAI
     client = OpenAI()
     
     if args.all:
@@ -12,14 +12,17 @@ Key features:
 - Parallel execution with configurable workers
 """
 
+from __future__ import annotations
+
 import json
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import TYPE_CHECKING, List, Dict, Tuple, Optional
 
-from openai import OpenAI
 from tqdm import tqdm
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 from src.degeneracy_mitigation.iterative_ranking_star import rank_voter
 from src.degeneracy_mitigation.config import HASH_SEED
@@ -17,8 +17,14 @@ Usage:
     
     # Run clustered voter distribution
     uv run python -m src.sample_alt_voters.run_experiment --voter-dist clustered --all-topics --all-alts
+    
+    # Split across machines sharing the data dir (static shard, or dynamic claiming)
+    uv run python -m src.sample_alt_voters.run_experiment --voter-dist uniform --all-topics --all-alts --shard 0/4
+    uv run python -m src.sample_alt_voters.run_experiment --voter-dist uniform --all-topics --all-alts --claim
 """
 
+from __future__ import annotations
+
 import argparse
 import json
 import logging
@@ -28,10 +34,9 @@ import sys
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
-from openai import OpenAI
 
 from .config import (
     PERSONAS_PATH,
@@ -52,6 +57,7 @@ from .config import (
     IDEOLOGY_CLUSTERS,
     REASONING_EFFORT,
     BASE_SEED,
+    MAX_WORKERS,
 )
 from .voter_samplers import sample_uniform, sample_from_cluster
 from .preference_builder_iterative import (
@@ -76,6 +82,12 @@ from src.sampling_experiment.voting_methods import (
     run_chatgpt_with_rankings,
     run_chatgpt_with_personas,
 )
+from src.api_budget import BudgetedClient
+from src.sampling_experiment.voting_executor import MethodTask, VotingExecutor, run_sample_methods
+from src.typed_responses import format_stats
+from src.work_claims import CLAIMS_DIRNAME, Shard, WorkClaims, add_distribution_args, run_grid
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 # Load environment variables
 load_dotenv()
@@ -172,19 +184,35 @@ TRADITIONAL_METHODS = {
 }
 
 
+def traditional_voting_tasks(preferences: List[List[str]]) -> List[MethodTask]:
+    """Traditional voting methods (CPU bound) for one preference profile."""
+    return [
+        MethodTask(name, method, (preferences,), cpu_bound=True)
+        for name, method in TRADITIONAL_METHODS.items()
+    ]
+
+
+def chatgpt_voting_tasks(
+    statements: List[Dict],
+    preferences: List[List[str]],
+    voter_personas: List[str],
+    openai_client: OpenAI
+) -> List[MethodTask]:
+    """ChatGPT-based voting methods for one preference profile."""
+    return [
+        MethodTask("chatgpt", run_chatgpt, (statements, openai_client)),
+        MethodTask("chatgpt_rankings", run_chatgpt_with_rankings,
+                   (statements, preferences, openai_client)),
+        MethodTask("chatgpt_personas", run_chatgpt_with_personas,
+                   (statements, voter_personas, openai_client)),
+    ]
+
+
 def run_traditional_voting_methods(
     preferences: List[List[str]]
 ) -> Dict[str, Dict]:
     """Run all traditional voting methods on a preference profile."""
-    results = {}
-    for name, method in TRADITIONAL_METHODS.items():
-        try:
-            result = method(preferences)
-            results[name] = result
-        except Exception as e:
-            logger.error(f"Error running {name}: {e}")
-            results[name] = {"winner": None, "error": str(e)}
-    return results
+    return run_sample_methods(traditional_voting_tasks(preferences))
 
 
 def run_chatgpt_voting_methods(
@@ -193,66 +221,30 @@ def run_chatgpt_voting_methods(
     voter_personas: List[str],
     openai_client: OpenAI
 ) -> Dict[str, Dict]:
-    """Run ChatGPT-based voting methods."""
-    results = {}
-    
-    # Base ChatGPT
-    try:
-        results["chatgpt"] = run_chatgpt(statements, openai_client)
-    except Exception as e:
-        logger.error(f"Error running chatgpt: {e}")
-        results["chatgpt"] = {"winner": None, "error": str(e)}
-    
-    # ChatGPT with rankings
-    try:
-        results["chatgpt_rankings"] = run_chatgpt_with_rankings(
-            statements, preferences, openai_client
-        )
-    except Exception as e:
-        logger.error(f"Error running chatgpt_rankings: {e}")
-        results["chatgpt_rankings"] = {"winner": None, "error": str(e)}
-    
-    # ChatGPT with personas
-    try:
-        results["chatgpt_personas"] = run_chatgpt_with_personas(
-            statements, voter_personas, openai_client
-        )
-    except Exception as e:
-        logger.error(f"Error running chatgpt_personas: {e}")
-        results["chatgpt_personas"] = {"winner": None, "error": str(e)}
-    
-    return results
+    """Run ChatGPT-based voting methods concurrently."""
+    return run_sample_methods(chatgpt_voting_tasks(
+        statements, preferences, voter_personas, openai_client
+    ))
 
 
 # =============================================================================
 # Mini-Rep Evaluation
 # =============================================================================
 
-def run_mini_rep(
+def prepare_mini_rep(
     full_preferences: List[List[str]],
-    full_epsilons: Dict[str, float],
     statements: List[Dict],
     voter_personas: List[str],
     mini_rep_id: int,
     openai_client: OpenAI,
     run_chatgpt_methods: bool = True
-) -> Dict:
+) -> Tuple[Dict, List[MethodTask]]:
     """
-    Run voting evaluation on a mini-rep (20×20 subsample).
+    Subsample a mini-rep (20×20) and build its voting method tasks.
     
-    Args:
-        full_preferences: Full 100×100 preference matrix
-        full_epsilons: Precomputed epsilons for all 100 alternatives
-        statements: All 100 statements
-        voter_personas: All 100 voter persona strings
-        mini_rep_id: Index of this mini-rep (0-4)
-        openai_client: OpenAI client
-        run_chatgpt_methods: Whether to run ChatGPT-based methods
-        
     Returns:
-        Dict with results for all voting methods
+        Tuple of (mini-rep info with voter/alt indices, tasks to run)
     """
-    # Subsample to 20×20
     seed = BASE_SEED + mini_rep_id * 100
     sample_prefs, voter_indices, alt_indices = subsample_preferences(
         full_preferences,
@@ -265,18 +257,27 @@ def run_mini_rep(
     sample_statements = [statements[i] for i in alt_indices]
     sample_personas = [voter_personas[i] for i in voter_indices]
     
-    # Run traditional voting methods
-    results = run_traditional_voting_methods(sample_prefs)
-    
-    # Run ChatGPT methods if requested
+    tasks = traditional_voting_tasks(sample_prefs)
     if run_chatgpt_methods:
-        chatgpt_results = run_chatgpt_voting_methods(
+        tasks += chatgpt_voting_tasks(
             sample_statements, sample_prefs, sample_personas, openai_client
         )
-        results.update(chatgpt_results)
     
-    # Look up epsilon for each winner
-    # Map back from sample index to full index
+    info = {
+        "mini_rep_id": mini_rep_id,
+        "voter_indices": voter_indices,
+        "alt_indices": alt_indices,
+    }
+    return info, tasks
+
+
+def finish_mini_rep(
+    info: Dict,
+    results: Dict[str, Dict],
+    full_epsilons: Dict[str, float]
+) -> Dict:
+    """Map each winner back to the full 100 alternatives and look up its epsilon."""
+    alt_indices = info["alt_indices"]
     alt_mapping = {str(i): str(alt_indices[i]) for i in range(len(alt_indices))}
     
     for method_name, result in results.items():
@@ -287,12 +288,38 @@ def run_mini_rep(
             result["epsilon"] = epsilon
             result["full_winner_idx"] = full_winner
     
-    return {
-        "mini_rep_id": mini_rep_id,
-        "voter_indices": voter_indices,
-        "alt_indices": alt_indices,
-        "results": results
-    }
+    return {**info, "results": results}
+
+
+def run_mini_rep(
+    full_preferences: List[List[str]],
+    full_epsilons: Dict[str, float],
+    statements: List[Dict],
+    voter_personas: List[str],
+    mini_rep_id: int,
+    openai_client: OpenAI,
+    run_chatgpt_methods: bool = True
+) -> Dict:
+    """
+    Run voting evaluation on a mini-rep (20×20 subsample).
+    
+    Args:
+        full_preferences: Full 100×100 preference matrix
+        full_epsilons: Precomputed epsilons for all 100 alternatives
+        statements: All 100 statements
+        voter_personas: All 100 voter persona strings
+        mini_rep_id: Index of this mini-rep (0-4)
+        openai_client: OpenAI client
+        run_chatgpt_methods: Whether to run ChatGPT-based methods
+        
+    Returns:
+        Dict with results for all voting methods
+    """
+    info, tasks = prepare_mini_rep(
+        full_preferences, statements, voter_personas,
+        mini_rep_id, openai_client, run_chatgpt_methods
+    )
+    return finish_mini_rep(info, run_sample_methods(tasks), full_epsilons)
 
 
 # =============================================================================
@@ -387,21 +414,24 @@ def run_single_condition(
     epsilons = precompute_all_epsilons(preferences)
     save_precomputed_epsilons(epsilons, output_dir)
     
-    # Run mini-reps
+    # Run mini-reps: every method of every mini-rep is submitted at once
     logger.info(f"Running {N_SAMPLES_PER_REP} mini-reps...")
-    mini_rep_results = []
-    
+    mini_rep_infos = {}
+    mini_rep_tasks = {}
     for mini_rep_id in range(N_SAMPLES_PER_REP):
-        logger.info(f"  Mini-rep {mini_rep_id}...")
-        result = run_mini_rep(
+        mini_rep_infos[mini_rep_id], mini_rep_tasks[mini_rep_id] = prepare_mini_rep(
             full_preferences=preferences,
-            full_epsilons=epsilons,
             statements=statements,
             voter_personas=voter_personas,
             mini_rep_id=mini_rep_id,
             openai_client=openai_client,
             run_chatgpt_methods=run_chatgpt_methods
         )
+    
+    mini_rep_results = []
+    
+    def save_mini_rep(mini_rep_id: int, results: Dict[str, Dict]) -> None:
+        result = finish_mini_rep(mini_rep_infos[mini_rep_id], results, epsilons)
         mini_rep_results.append(result)
         
         # Save mini-rep result
@@ -409,6 +439,10 @@ def run_single_condition(
         mini_rep_dir.mkdir(exist_ok=True)
         with open(mini_rep_dir / "results.json", 'w') as f:
             json.dump(result, f, indent=2)
+        logger.info(f"  Mini-rep {mini_rep_id} done")
+    
+    with VotingExecutor() as executor:
+        executor.run(mini_rep_tasks, on_sample_done=save_mini_rep)
     
     # Compile summary
     summary = {
@@ -440,7 +474,9 @@ def run_all_conditions(
     reps: Optional[List[int]] = None,
     openai_client: OpenAI = None,
     skip_if_exists: bool = True,
-    run_chatgpt_methods: bool = True
+    run_chatgpt_methods: bool = True,
+    shard: Optional[Shard] = None,
+    claims: Optional[WorkClaims] = None
 ):
     """
     Run all conditions for a voter distribution.
@@ -453,6 +489,8 @@ def run_all_conditions(
         openai_client: OpenAI client
         skip_if_exists: Skip conditions that already have results
         run_chatgpt_methods: Whether to run ChatGPT-based methods
+        shard: Only run the conditions of this static shard (index, count)
+        claims: Work claims shared with other workers (see work_claims.py)
     """
     if topics is None:
         topics = TOPICS
@@ -476,29 +514,44 @@ def run_all_conditions(
     completed = 0
     skipped = 0
     
-    for topic in topics:
-        for alt_dist in alt_dists:
-            for rep_id in reps:
-                result = run_single_condition(
-                    topic_slug=topic,
-                    alt_dist=alt_dist,
-                    voter_dist=voter_dist,
-                    rep_id=rep_id,
-                    personas=personas,
-                    openai_client=openai_client,
-                    skip_if_exists=skip_if_exists,
-                    run_chatgpt_methods=run_chatgpt_methods
-                )
-                
-                if result is None:
-                    skipped += 1
-                else:
-                    completed += 1
-                
-                logger.info(f"Progress: {completed + skipped}/{n_conditions} "
-                          f"(completed={completed}, skipped={skipped})")
+    def run_condition(condition: Tuple[str, str, int]):
+        nonlocal completed, skipped
+        topic, alt_dist, rep_id = condition
+        result = run_single_condition(
+            topic_slug=topic,
+            alt_dist=alt_dist,
+            voter_dist=voter_dist,
+            rep_id=rep_id,
+            personas=personas,
+            openai_client=openai_client,
+            skip_if_exists=skip_if_exists,
+            run_chatgpt_methods=run_chatgpt_methods
+        )
+        
+        if result is None:
+            skipped += 1
+        else:
+            completed += 1
+        
+        logger.info(f"Progress: {completed + skipped}/{n_conditions} "
+                    f"(completed={completed}, skipped={skipped})")
+    
+    conditions = [
+        (topic, alt_dist, rep_id)
+        for topic in topics
+        for alt_dist in alt_dists
+        for rep_id in reps
+    ]
+    run_grid(
+        conditions,
+        key=lambda c: f"{voter_dist}/{c[0]}/{c[1]}/rep{c[2]}",
+        fn=run_condition,
+        shard=shard,
+        claims=claims
+    )
     
     logger.info(f"\nDone! Completed={completed}, Skipped={skipped}")
+    format_stats.log_stats()
 
 
 # =============================================================================
@@ -562,6 +615,7 @@ def main():
         action="store_true",
         help="Verbose logging"
     )
+    add_distribution_args(parser)
     
     args = parser.parse_args()
     
@@ -608,21 +662,29 @@ def main():
         logger.error("OPENAI_API_KEY not set in environment")
         sys.exit(1)
     
-    client = OpenAI(api_key=api_key)
+    from openai import OpenAI
+    client = BudgetedClient(OpenAI(api_key=api_key), MAX_WORKERS)
     
     # Run
     skip_existing = not args.force
     run_chatgpt_methods = not args.no_chatgpt
     
-    run_all_conditions(
-        voter_dist=args.voter_dist,
-        topics=topics,
-        alt_dists=alt_dists,
-        reps=reps,
-        openai_client=client,
-        skip_if_exists=skip_existing,
-        run_chatgpt_methods=run_chatgpt_methods
-    )
+    claims = WorkClaims(PHASE2_DATA_DIR / CLAIMS_DIRNAME) if args.claim else None
+    try:
+        run_all_conditions(
+            voter_dist=args.voter_dist,
+            topics=topics,
+            alt_dists=alt_dists,
+            reps=reps,
+            openai_client=client,
+            skip_if_exists=skip_existing,
+            run_chatgpt_methods=run_chatgpt_methods,
+            shard=args.shard,
+            claims=claims
+        )
+    finally:
+        if claims is not None:
+            claims.close()
 
 
 if __name__ == "__main__":
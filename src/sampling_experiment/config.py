@@ -6,6 +6,8 @@ import logging
 import threading
 from pathlib import Path
 
+from src.typed_responses import format_stats
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -149,6 +151,11 @@ ALL_METHODS = (
 # =============================================================================
 MAX_WORKERS = 100  # Maximum parallel API calls
 
+# =============================================================================
+# New-Statement Insertion (ChatGPT** / ChatGPT***)
+# =============================================================================
+INSERTION_N_BUCKETS = 10   # Representatives per ranking for the coarse step (deciles)
+
 
 # =============================================================================
 # API Timing Tracker
@@ -173,6 +180,7 @@ class APITimer:
                 logger.info(
                     f"[API Stats] {len(self._times)} calls, avg {avg:.2f}s/call"
                 )
+                format_stats.log_stats()
     
     def get_stats(self) -> dict:
         """Get current timing statistics."""
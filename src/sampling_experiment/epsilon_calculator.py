@@ -14,15 +14,6 @@ from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
-from pvc_toolbox import compute_critical_epsilon
-
-# Import FlowNetwork for custom epsilon computation
-try:
-    from pvc_toolbox._flow import FlowNetwork
-    _HAS_FLOW = True
-except ImportError:
-    _HAS_FLOW = False
-
 from .config import N_ALT_POOL
 
 logger = logging.getLogger(__name__)
@@ -58,7 +49,9 @@ def _compute_critical_epsilon_with_m(
     Returns:
         Critical epsilon value
     """
-    if not _HAS_FLOW:
+    try:
+        from pvc_toolbox._flow import FlowNetwork
+    except ImportError:
         raise ImportError("pvc_toolbox._flow not available for custom epsilon computation")
     
     # Build flow network
@@ -169,6 +162,209 @@ def compute_critical_epsilon_custom(
     )
 
 
+# =============================================================================
+# Incremental Epsilon for Inserted Statements
+# =============================================================================
+
+def _suffix_max_flow(
+    suffixes: List[Sequence[int]],
+    supply: int,
+    capacity: int,
+    n_candidates: int
+) -> int:
+    """
+    Max flow of S -> voter -> candidate -> T where each voter reaches a suffix of its ranking.
+    
+    This is the network of _compute_critical_epsilon_with_m for an alternative
+    that every voter ranks at some position: voter -> candidate edges are
+    unbounded, so only the S -> voter (supply) and candidate -> T (capacity)
+    residuals and the per-edge flows need to be tracked. Edges are never
+    materialized; a voter's neighbours are its cached ranking from the
+    insertion position on.
+    
+    Args:
+        suffixes: Per voter, the candidate indices ranked below the alternative
+        supply: Capacity of each S -> voter edge
+        capacity: Capacity of each candidate -> T edge
+        n_candidates: Number of candidate nodes
+    
+    Returns:
+        Maximum flow value
+    """
+    n = len(suffixes)
+    supply_left = [supply] * n
+    capacity_left = [capacity] * n_candidates
+    inflow: List[Dict[int, int]] = [{} for _ in range(n_candidates)]  # candidate -> {voter: flow}
+    total = 0
+    
+    # Greedy phase: fill each voter's suffix in order
+    for v, suffix in enumerate(suffixes):
+        for d in suffix:
+            if supply_left[v] == 0:
+                break
+            pushed = min(supply_left[v], capacity_left[d])
+            if pushed:
+                supply_left[v] -= pushed
+                capacity_left[d] -= pushed
+                inflow[d][v] = inflow[d].get(v, 0) + pushed
+                total += pushed
+    
+    # Augmenting phase: BFS from every voter with supply left, through
+    # candidates and back along voters already sending flow to them
+    while True:
+        via = [-1] * n_candidates     # voter that reached candidate
+        back = [-1] * n               # candidate a voter was reached from (-1 = source)
+        seen = [False] * n
+        queue = [v for v in range(n) if supply_left[v] > 0]
+        for v in queue:
+            seen[v] = True
+        
+        end = -1
+        head = 0
+        while head < len(queue) and end < 0:
+            v = queue[head]
+            head += 1
+            for d in suffixes[v]:
+                if via[d] >= 0:
+                    continue
+                via[d] = v
+                if capacity_left[d] > 0:
+                    end = d
+                    break
+                for u, f in inflow[d].items():
+                    if f > 0 and not seen[u]:
+                        seen[u] = True
+                        back[u] = d
+                        queue.append(u)
+        
+        if end < 0:
+            return total
+        
+        # Bottleneck along the path, then augment
+        delta = capacity_left[end]
+        d = end
+        while True:
+            v = via[d]
+            if back[v] < 0:
+                delta = min(delta, supply_left[v])
+                break
+            d = back[v]
+            delta = min(delta, inflow[d][v])
+        
+        capacity_left[end] -= delta
+        d = end
+        while True:
+            v = via[d]
+            inflow[d][v] = inflow[d].get(v, 0) + delta
+            if back[v] < 0:
+                supply_left[v] -= delta
+                break
+            d = back[v]
+            inflow[d][v] -= delta
+        total += delta
+
+
+class InsertionEpsilonProfile:
+    """
+    Cached profile for the epsilon of statements inserted into a rep's rankings.
+    
+    compute_epsilon_for_new_statement transposes the updated 101-alternative
+    matrix, rebuilds per-voter position dicts and a fresh flow network for
+    every generated statement. This keeps each voter's ranking of the
+    original alternatives once per rep; a new statement is then described
+    only by where each voter inserted it, and its epsilon (with m_override)
+    costs O(n) setup plus the max flow.
+    
+    Usage:
+        profile = InsertionEpsilonProfile(full_preferences)
+        epsilon = profile.epsilon(voter_indices, positions)
+    """
+    
+    def __init__(self, preferences: Sequence[Sequence[str]]):
+        """
+        Args:
+            preferences: Full preference matrix [rank][voter] of the original alternatives
+        """
+        self.n_alternatives = len(preferences)
+        self.n_voters = len(preferences[0]) if preferences else 0
+        self.alternatives = sorted((row[0] for row in preferences), key=int) if self.n_voters else []
+        index = {a: i for i, a in enumerate(self.alternatives)}
+        # rankings[voter] = dense candidate indices, most to least preferred
+        self.rankings: List[List[int]] = [
+            [index[preferences[rank][voter]] for rank in range(self.n_alternatives)]
+            for voter in range(self.n_voters)
+        ]
+    
+    def epsilon(
+        self,
+        voter_indices: Sequence[int],
+        positions: Sequence[int],
+        m_override: Optional[int] = N_ALT_POOL
+    ) -> float:
+        """
+        Compute the critical epsilon of a new statement from its insertion positions.
+        
+        Equivalent to compute_critical_epsilon_custom on the profile of the
+        given voters with the statement inserted at each position.
+        
+        Args:
+            voter_indices: Voters (columns of the cached profile) that ranked the statement
+            positions: Per voter, the rank the statement was inserted at
+                (0 = most preferred, n_alternatives = least preferred)
+            m_override: m for veto power (None = number of alternatives incl. the new one)
+        
+        Returns:
+            Critical epsilon value
+        """
+        if len(voter_indices) != len(positions):
+            raise ValueError("voter_indices and positions must have the same length")
+        
+        n = len(voter_indices)
+        m_actual = self.n_alternatives + 1
+        m_for_veto = m_override if m_override is not None else m_actual
+        if m_actual == 1:
+            return -1.0
+        
+        suffixes = [
+            self.rankings[v][max(0, min(self.n_alternatives, int(p))):]
+            for v, p in zip(voter_indices, positions)
+        ]
+        F = _suffix_max_flow(suffixes, m_for_veto, n, self.n_alternatives)
+        
+        total_vertices = m_for_veto * n + (m_actual - 1) * n
+        return (total_vertices - F) / (m_for_veto * n) - 1.0
+    
+    def epsilon_from_preferences(
+        self,
+        updated_preferences: Sequence[Sequence[str]],
+        voter_indices: Sequence[int],
+        new_statement_index: int,
+        m_override: Optional[int] = N_ALT_POOL
+    ) -> float:
+        """
+        Compute the critical epsilon of a new statement from an updated matrix.
+        
+        For callers that only have the matrix returned by
+        insert_new_statement_into_rankings; only the new statement's row per
+        voter is read.
+        
+        Args:
+            updated_preferences: Matrix [rank][voter] with the new statement inserted
+            voter_indices: Cached-profile voter of each column
+            new_statement_index: Index of the new statement
+            m_override: m for veto power
+        
+        Returns:
+            Critical epsilon value
+        """
+        new_id = str(new_statement_index)
+        positions = [
+            next(rank for rank, row in enumerate(updated_preferences) if row[col] == new_id)
+            for col in range(len(voter_indices))
+        ]
+        return self.epsilon(voter_indices, positions, m_override)
+
+
 def compute_epsilon_for_alternative(
     preferences: List[List[str]],
     alt_index: int,
@@ -191,6 +387,8 @@ def compute_epsilon_for_alternative(
     alternatives = [str(i) for i in range(n_alternatives)]
     winner = str(alt_index)
     
+    from pvc_toolbox import compute_critical_epsilon
+    
     try:
         epsilon = compute_critical_epsilon(preferences, alternatives, winner)
         return epsilon
@@ -0,0 +1,289 @@
+"""
+Compact insertion of new statements into existing voter rankings.
+
+insert_statement_into_ranking sends a voter's whole ranking (100 full
+statement texts) to get back one insert position. The InsertionService
+instead finds the position coarse-to-fine, with two small calls per voter
+no matter how many new statements are inserted:
+
+1. Bucket: the voter sees only the decile representatives of their ranking
+   (the statements at ranks 10, 20, ..., 100) and places every new
+   statement between two consecutive representatives.
+2. Window: for each new statement, the voter sees only the statements
+   between those two representatives and picks the exact slot.
+
+Each voter's ranking, representatives and rendered representative list are
+cached, so inserting further statements for the same rep reuses them.
+Positions are exact ranks in the original ranking (0 = most preferred,
+n = least preferred), the same as insert_statement_into_ranking returns.
+
+Usage:
+    service = InsertionService(all_statements, full_preferences, topic, openai_client)
+    positions = service.insert_for_voters(new_statements, voter_indices, personas)
+    # positions[c][i] = rank of new_statements[c] for voter_indices[i]
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Sequence
+
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tqdm import tqdm
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+from .config import MODEL, TEMPERATURE, INSERTION_N_BUCKETS, MAX_WORKERS, api_timer
+from src.typed_responses import ResponseSchema, candidate_labels, labeled_positions_schema, parse_response
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VoterContext:
+    """Cached ranking context for one voter."""
+    ranking: List[int]              # Statement indices, most to least preferred
+    representatives: List[int]      # Rank positions of the decile representatives
+    representatives_text: str       # Rendered representative list for the bucket prompt
+
+
+class InsertionService:
+    """Coarse-to-fine insertion of new statements into a rep's voter rankings."""
+    
+    def __init__(
+        self,
+        statements: List[Dict],
+        preferences: Sequence[Sequence[str]],
+        topic: str,
+        openai_client: OpenAI,
+        n_buckets: int = INSERTION_N_BUCKETS,
+        model: str = MODEL,
+        temperature: float = TEMPERATURE
+    ):
+        """
+        Args:
+            statements: Original statement dicts (indexed by the ranking entries)
+            preferences: Full preference matrix [rank][voter]
+            topic: The topic/question
+            openai_client: OpenAI client instance
+            n_buckets: Number of representatives per ranking (10 = deciles)
+            model: Model to use
+            temperature: Temperature for sampling
+        """
+        self.statements = statements
+        self.preferences = preferences
+        self.topic = topic
+        self.openai_client = openai_client
+        self.n_buckets = n_buckets
+        self.model = model
+        self.temperature = temperature
+        self._contexts: Dict[int, VoterContext] = {}
+        self._lock = threading.Lock()
+    
+    # -------------------------------------------------------------------------
+    # Context
+    # -------------------------------------------------------------------------
+    
+    def context(self, voter_idx: int) -> VoterContext:
+        """Get (building on first use) the cached context of a voter."""
+        with self._lock:
+            ctx = self._contexts.get(voter_idx)
+        if ctx is not None:
+            return ctx
+        
+        n = len(self.preferences)
+        ranking = [int(self.preferences[rank][voter_idx]) for rank in range(n)]
+        n_reps = min(self.n_buckets, n)
+        # Last statement of each bucket: ranks 10, 20, ..., 100 for n=100
+        representatives = [((j + 1) * n) // n_reps - 1 for j in range(n_reps)]
+        representatives_text = "\n".join(
+            f"R{j + 1} (rank {pos + 1}): {self.statements[ranking[pos]]['statement']}"
+            for j, pos in enumerate(representatives)
+        )
+        ctx = VoterContext(ranking, representatives, representatives_text)
+        
+        with self._lock:
+            self._contexts.setdefault(voter_idx, ctx)
+        return ctx
+    
+    def _window(self, ctx: VoterContext, bucket: int) -> tuple:
+        """Rank range [lo, hi) of the statements between representatives bucket-1 and bucket."""
+        lo = ctx.representatives[bucket - 1] + 1 if bucket > 0 else 0
+        hi = ctx.representatives[bucket] if bucket < len(ctx.representatives) else len(ctx.ranking)
+        return lo, hi
+    
+    # -------------------------------------------------------------------------
+    # API calls
+    # -------------------------------------------------------------------------
+    
+    def _call(self, system_prompt: str, user_prompt: str, schema: ResponseSchema) -> Dict[str, int]:
+        start_time = time.time()
+        response = self.openai_client.responses.create(
+            model=self.model,
+            input=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=self.temperature,
+            reasoning={"effort": "low"},
+            text=schema.text_format,
+        )
+        api_timer.record(time.time() - start_time)
+        return parse_response(response, schema)
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type((Exception,)),
+        reraise=True
+    )
+    def _choose_buckets(self, persona: str, ctx: VoterContext, new_statements: List[str]) -> List[int]:
+        """Place every new statement between two consecutive representatives."""
+        n_reps = len(ctx.representatives)
+        labels = candidate_labels(len(new_statements))
+        candidates_text = "\n".join(
+            f"NEW {label}: {stmt}" for label, stmt in zip(labels, new_statements)
+        )
+        
+        system_prompt = "You are placing new statements into your preference ranking. Return ONLY valid JSON."
+        
+        user_prompt = f"""You are a person with the following characteristics:
+{persona}
+
+Given the topic: "{self.topic}"
+
+You previously ranked {len(ctx.ranking)} statements. These are the statements at every {len(ctx.ranking) // n_reps}th rank, from most to least preferred:
+
+{ctx.representatives_text}
+
+NEW STATEMENTS:
+{candidates_text}
+
+For each new statement, return how many of R1..R{n_reps} you prefer over it:
+- 0 to place it before R1 (you prefer it over all of them)
+- k to place it between Rk and R(k+1) (you prefer R1..Rk over it, and it over the rest)
+- {n_reps} to place it after R{n_reps} (you prefer all of them over it)
+
+Return JSON: {{{", ".join(f'"{label}": <number>' for label in labels)}}}"""
+        
+        schema = labeled_positions_schema({label: (0, n_reps) for label in labels})
+        result = self._call(system_prompt, user_prompt, schema)
+        return [result[label] for label in labels]
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type((Exception,)),
+        reraise=True
+    )
+    def _choose_offsets(
+        self,
+        persona: str,
+        ctx: VoterContext,
+        new_statements: List[str],
+        windows: List[tuple]
+    ) -> List[int]:
+        """Pick each new statement's exact slot inside its window."""
+        labels = candidate_labels(len(new_statements))
+        blocks = []
+        for label, stmt, (lo, hi) in zip(labels, new_statements, windows):
+            listed = "\n".join(
+                f"  {offset}: (rank {lo + offset + 1}) {self.statements[ctx.ranking[lo + offset]]['statement']}"
+                for offset in range(hi - lo)
+            )
+            blocks.append(
+                f"NEW {label}: {stmt}\n"
+                f"Statements you ranked between where it goes (most to least preferred):\n{listed}\n"
+                f"Return 0 to put NEW {label} before all of these, {hi - lo} to put it after all of them."
+            )
+        
+        system_prompt = "You are inserting new statements into your preference ranking. Return ONLY valid JSON."
+        
+        user_prompt = f"""You are a person with the following characteristics:
+{persona}
+
+Given the topic: "{self.topic}"
+
+{chr(10).join(blocks)}
+
+Return JSON: {{{", ".join(f'"{label}": <number>' for label in labels)}}}"""
+        
+        schema = labeled_positions_schema({
+            label: (0, hi - lo) for label, (lo, hi) in zip(labels, windows)
+        })
+        result = self._call(system_prompt, user_prompt, schema)
+        return [result[label] for label in labels]
+    
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+    
+    def insert_for_voter(self, voter_idx: int, persona: str, new_statements: List[str]) -> List[int]:
+        """
+        Find where one voter ranks each new statement.
+        
+        Args:
+            voter_idx: Voter column in the preference matrix
+            persona: The voter's persona string
+            new_statements: New statement texts
+        
+        Returns:
+            Per new statement, its insert position in the voter's ranking
+        """
+        ctx = self.context(voter_idx)
+        buckets = self._choose_buckets(persona, ctx, new_statements)
+        windows = [self._window(ctx, b) for b in buckets]
+        
+        # Statements whose window is empty are already placed exactly
+        pending = [c for c, (lo, hi) in enumerate(windows) if hi > lo]
+        positions = [lo for lo, _ in windows]
+        if pending:
+            offsets = self._choose_offsets(
+                persona, ctx,
+                [new_statements[c] for c in pending],
+                [windows[c] for c in pending]
+            )
+            for c, offset in zip(pending, offsets):
+                positions[c] = windows[c][0] + offset
+        return positions
+    
+    def insert_for_voters(
+        self,
+        new_statements: List[str],
+        voter_indices: List[int],
+        voter_personas: List[str],
+        max_workers: int = MAX_WORKERS,
+        desc: str = "Inserting statements"
+    ) -> List[List[int]]:
+        """
+        Find where each voter ranks each new statement.
+        
+        Args:
+            new_statements: New statement texts
+            voter_indices: Voter columns in the preference matrix
+            voter_personas: Persona string of each voter in voter_indices
+            max_workers: Maximum parallel voters
+            desc: Progress bar label
+        
+        Returns:
+            positions[c][i] = insert position of new_statements[c] for voter_indices[i]
+        """
+        logger.info(
+            f"Inserting {len(new_statements)} new statement(s) into rankings "
+            f"for {len(voter_indices)} voters..."
+        )
+        per_voter = [None] * len(voter_indices)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.insert_for_voter, voter_idx, persona, new_statements): i
+                for i, (voter_idx, persona) in enumerate(zip(voter_indices, voter_personas))
+            }
+            for future in tqdm(as_completed(futures), total=len(futures), desc=desc, unit="voter"):
+                per_voter[futures[future]] = future.result()
+        
+        return [[positions[c] for positions in per_voter] for c in range(len(new_statements))]
@@ -2,11 +2,12 @@
 Build preference profiles using single-call sorting.
 """
 
+from __future__ import annotations
+
 import json
 import logging
-from typing import List, Dict
+from typing import TYPE_CHECKING, List, Dict
 from pathlib import Path
-from openai import OpenAI
 
 from .config import (
     MODEL,
@@ -15,6 +16,8 @@ from .config import (
     TOPIC_QUESTIONS,
 )
 from .single_call_ranking import get_preference_matrix_single_call
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
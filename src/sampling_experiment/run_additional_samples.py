@@ -19,11 +19,14 @@ from typing import Dict, List
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from src.api_budget import BudgetedClient
+
 # Load environment variables
 load_dotenv()
 
 from .config import (
     OUTPUT_DIR,
+    MAX_WORKERS,
     TEST_TOPIC,
     N_REPS,
     N_VOTER_POOL,
@@ -164,8 +167,7 @@ def run_single_sample(
     # ChatGPT** methods
     double_star_results = run_chatgpt_double_star_methods(
         alt_statements, sample_statements, sample_prefs, sample_personas,
-        full_preferences, voter_sample, voter_personas, topic,
-        precomputed_epsilons, openai_client
+        full_preferences, voter_sample, voter_personas, topic, openai_client
     )
     results.update(double_star_results)
     
@@ -292,7 +294,7 @@ def main():
     logger.info(f"Starting at {datetime.now().isoformat()}")
     
     # Create OpenAI client
-    openai_client = OpenAI(timeout=120.0)
+    openai_client = BudgetedClient(OpenAI(timeout=120.0), MAX_WORKERS)
     
     # Run additional samples
     run_additional_samples(
@@ -6,20 +6,25 @@ Runs the experiment on the public trust topic only.
 Usage:
     uv run python -m src.sampling_experiment.run_experiment
     uv run python -m src.sampling_experiment.run_experiment --test
+    uv run python -m src.sampling_experiment.run_experiment --claim   # one of several workers
 """
 
+from __future__ import annotations
+
 import argparse
 import json
 import logging
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple, Optional
 from dotenv import load_dotenv
-from openai import OpenAI
 
 # Load environment variables
 load_dotenv()
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 from .config import (
     OUTPUT_DIR,
@@ -54,7 +59,7 @@ from .preference_builder import build_full_preferences
 from .epsilon_calculator import (
     precompute_all_epsilons,
     lookup_epsilon,
-    compute_epsilon_for_new_statement,
+    InsertionEpsilonProfile,
     save_precomputed_epsilons,
     load_precomputed_epsilons,
     get_mean_epsilon,
@@ -74,9 +79,13 @@ from .voting_methods import (
     run_chatgpt_double_star,
     run_chatgpt_double_star_with_rankings,
     run_chatgpt_double_star_with_personas,
-    insert_new_statement_into_rankings,
+    get_insertion_positions,
 )
-from .visualizer import generate_all_visualizations
+from .insertion_service import InsertionService
+from .voting_executor import MethodTask, VotingExecutor, run_sample_methods
+from src.api_budget import BudgetedClient
+from src.typed_responses import format_stats
+from src.work_claims import CLAIMS_DIRNAME, Shard, WorkClaims, add_distribution_args, run_grid
 
 
 def setup_logging(output_dir: Path, test_mode: bool = False) -> None:
@@ -112,61 +121,162 @@ def setup_logging(output_dir: Path, test_mode: bool = False) -> None:
     logging.info(f"Logging to {log_file}")
 
 
-def run_traditional_methods(
-    sample_preferences: List[List[str]],
+def _attach_sample_epsilon(
     alt_mapping: Dict[int, int],
-    precomputed_epsilons: Dict[str, float]
-) -> Dict[str, Dict]:
-    """Run traditional voting methods and look up epsilons."""
-    logger = logging.getLogger(__name__)
-    results = {}
-    
-    # Schulze
-    logger.info("  Running Schulze...")
-    result = run_schulze(sample_preferences)
-    if result["winner"] is not None:
-        full_winner = str(alt_mapping[int(result["winner"])])
-        result["winner_full"] = full_winner
-        result["epsilon"] = lookup_epsilon(precomputed_epsilons, full_winner)
-    results["schulze"] = result
-    
-    # Borda
-    logger.info("  Running Borda...")
-    result = run_borda(sample_preferences)
-    if result["winner"] is not None:
-        full_winner = str(alt_mapping[int(result["winner"])])
-        result["winner_full"] = full_winner
-        result["epsilon"] = lookup_epsilon(precomputed_epsilons, full_winner)
-    results["borda"] = result
-    
-    # IRV
-    logger.info("  Running IRV...")
-    result = run_irv(sample_preferences)
-    if result["winner"] is not None:
-        full_winner = str(alt_mapping[int(result["winner"])])
-        result["winner_full"] = full_winner
-        result["epsilon"] = lookup_epsilon(precomputed_epsilons, full_winner)
-    results["irv"] = result
-    
-    # Plurality
-    logger.info("  Running Plurality...")
-    result = run_plurality(sample_preferences)
+    precomputed_epsilons: Dict[str, float],
+    result: Dict
+) -> Dict:
+    """Map a sample-index winner to the full pool and look up its epsilon."""
     if result["winner"] is not None:
         full_winner = str(alt_mapping[int(result["winner"])])
         result["winner_full"] = full_winner
         result["epsilon"] = lookup_epsilon(precomputed_epsilons, full_winner)
-    results["plurality"] = result
-    
-    # Veto by Consumption
-    logger.info("  Running Veto by Consumption...")
-    result = run_veto_by_consumption(sample_preferences)
+    return result
+
+
+def _attach_pool_epsilon(precomputed_epsilons: Dict[str, float], result: Dict) -> Dict:
+    """Look up epsilon for a winner that is already a full-pool index."""
     if result["winner"] is not None:
-        full_winner = str(alt_mapping[int(result["winner"])])
-        result["winner_full"] = full_winner
-        result["epsilon"] = lookup_epsilon(precomputed_epsilons, full_winner)
-    results["veto_by_consumption"] = result
-    
-    return results
+        result["epsilon"] = lookup_epsilon(precomputed_epsilons, result["winner"])
+    return result
+
+
+def _run_double_star(
+    generate: Callable[..., Dict],
+    generate_args: tuple,
+    all_statements: List[Dict],
+    voter_sample_indices: List[int],
+    voter_personas: List[str],
+    full_preferences: List[List[str]],
+    topic: str,
+    insertion_profile: InsertionEpsilonProfile,
+    insertion_service: InsertionService,
+    openai_client: OpenAI
+) -> Dict:
+    """Generate a new statement, ask the voters where it ranks and compute its epsilon."""
+    logger = logging.getLogger(__name__)
+    result = generate(*generate_args)
+    if result.get("new_statement"):
+        # Re-query voters to insert new statement
+        logger.info("    Inserting new statement into rankings...")
+        selected_personas = [voter_personas[i] for i in voter_sample_indices]
+        positions = get_insertion_positions(
+            result["new_statement"], all_statements, selected_personas,
+            voter_sample_indices, full_preferences, topic, openai_client,
+            service=insertion_service
+        )
+        # Compute epsilon with m=100 (no veto power for new alt)
+        result["epsilon"] = insertion_profile.epsilon(voter_sample_indices, positions)
+    return result
+
+
+def traditional_method_tasks(
+    sample_preferences: List[List[str]],
+    alt_mapping: Dict[int, int],
+    precomputed_epsilons: Dict[str, float]
+) -> List[MethodTask]:
+    """Traditional voting methods (CPU bound) for one sample."""
+    attach = partial(_attach_sample_epsilon, alt_mapping, precomputed_epsilons)
+    return [
+        MethodTask(name, func, (sample_preferences,), cpu_bound=True, finalize=attach)
+        for name, func in [
+            ("schulze", run_schulze),
+            ("borda", run_borda),
+            ("irv", run_irv),
+            ("plurality", run_plurality),
+            ("veto_by_consumption", run_veto_by_consumption),
+        ]
+    ]
+
+
+def chatgpt_method_tasks(
+    sample_statements: List[Dict],
+    sample_preferences: List[List[str]],
+    sample_personas: List[str],
+    alt_mapping: Dict[int, int],
+    precomputed_epsilons: Dict[str, float],
+    openai_client: OpenAI
+) -> List[MethodTask]:
+    """ChatGPT methods (select from P alternatives) for one sample."""
+    attach = partial(_attach_sample_epsilon, alt_mapping, precomputed_epsilons)
+    return [
+        MethodTask("chatgpt", run_chatgpt, (sample_statements, openai_client), finalize=attach),
+        MethodTask("chatgpt_rankings", run_chatgpt_with_rankings,
+                   (sample_statements, sample_preferences, openai_client), finalize=attach),
+        MethodTask("chatgpt_personas", run_chatgpt_with_personas,
+                   (sample_statements, sample_personas, openai_client), finalize=attach),
+    ]
+
+
+def chatgpt_star_method_tasks(
+    all_statements: List[Dict],
+    sample_statements: List[Dict],
+    sample_preferences: List[List[str]],
+    sample_personas: List[str],
+    precomputed_epsilons: Dict[str, float],
+    openai_client: OpenAI
+) -> List[MethodTask]:
+    """ChatGPT* methods (select from all 100 alternatives) for one sample."""
+    attach = partial(_attach_pool_epsilon, precomputed_epsilons)
+    return [
+        MethodTask("chatgpt_star", run_chatgpt_star,
+                   (all_statements, sample_statements, openai_client), finalize=attach),
+        MethodTask("chatgpt_star_rankings", run_chatgpt_star_with_rankings,
+                   (all_statements, sample_statements, sample_preferences, openai_client), finalize=attach),
+        MethodTask("chatgpt_star_personas", run_chatgpt_star_with_personas,
+                   (all_statements, sample_personas, openai_client), finalize=attach),
+    ]
+
+
+def chatgpt_double_star_method_tasks(
+    all_statements: List[Dict],
+    sample_statements: List[Dict],
+    sample_preferences: List[List[str]],
+    sample_personas: List[str],
+    full_preferences: List[List[str]],
+    voter_sample_indices: List[int],
+    voter_personas: List[str],
+    topic: str,
+    openai_client: OpenAI,
+    insertion_profile: Optional[InsertionEpsilonProfile] = None,
+    insertion_service: Optional[InsertionService] = None
+) -> List[MethodTask]:
+    """ChatGPT** methods (generate new statement) for one sample."""
+    if insertion_profile is None:
+        insertion_profile = InsertionEpsilonProfile(full_preferences)
+    if insertion_service is None:
+        insertion_service = InsertionService(all_statements, full_preferences, topic, openai_client)
+    insert_args = (
+        all_statements, voter_sample_indices, voter_personas, full_preferences,
+        topic, insertion_profile, insertion_service, openai_client
+    )
+    variants = [
+        ("chatgpt_double_star", run_chatgpt_double_star, (
+            sample_statements, all_statements, sample_personas,
+            full_preferences, voter_sample_indices, topic, openai_client
+        )),
+        ("chatgpt_double_star_rankings", run_chatgpt_double_star_with_rankings, (
+            sample_statements, sample_preferences, all_statements, sample_personas,
+            full_preferences, voter_sample_indices, topic, openai_client
+        )),
+        ("chatgpt_double_star_personas", run_chatgpt_double_star_with_personas, (
+            sample_statements, sample_personas, all_statements,
+            full_preferences, voter_sample_indices, topic, openai_client
+        )),
+    ]
+    return [
+        MethodTask(name, _run_double_star, (generate, generate_args, *insert_args))
+        for name, generate, generate_args in variants
+    ]
+
+
+def run_traditional_methods(
+    sample_preferences: List[List[str]],
+    alt_mapping: Dict[int, int],
+    precomputed_epsilons: Dict[str, float]
+) -> Dict[str, Dict]:
+    """Run traditional voting methods and look up epsilons."""
+    return run_sample_methods(traditional_method_tasks(sample_preferences, alt_mapping, precomputed_epsilons))
 
 
 def run_chatgpt_methods(
@@ -177,38 +287,11 @@ def run_chatgpt_methods(
     precomputed_epsilons: Dict[str, float],
     openai_client: OpenAI
 ) -> Dict[str, Dict]:
-    """Run ChatGPT methods (select from P alternatives)."""
-    logger = logging.getLogger(__name__)
-    results = {}
-    
-    # ChatGPT baseline
-    logger.info("  Running ChatGPT...")
-    result = run_chatgpt(sample_statements, openai_client)
-    if result["winner"] is not None:
-        full_winner = str(alt_mapping[int(result["winner"])])
-        result["winner_full"] = full_winner
-        result["epsilon"] = lookup_epsilon(precomputed_epsilons, full_winner)
-    results["chatgpt"] = result
-    
-    # ChatGPT with rankings
-    logger.info("  Running ChatGPT+Rankings...")
-    result = run_chatgpt_with_rankings(sample_statements, sample_preferences, openai_client)
-    if result["winner"] is not None:
-        full_winner = str(alt_mapping[int(result["winner"])])
-        result["winner_full"] = full_winner
-        result["epsilon"] = lookup_epsilon(precomputed_epsilons, full_winner)
-    results["chatgpt_rankings"] = result
-    
-    # ChatGPT with personas
-    logger.info("  Running ChatGPT+Personas...")
-    result = run_chatgpt_with_personas(sample_statements, sample_personas, openai_client)
-    if result["winner"] is not None:
-        full_winner = str(alt_mapping[int(result["winner"])])
-        result["winner_full"] = full_winner
-        result["epsilon"] = lookup_epsilon(precomputed_epsilons, full_winner)
-    results["chatgpt_personas"] = result
-    
-    return results
+    """Run ChatGPT methods (select from P alternatives) concurrently."""
+    return run_sample_methods(chatgpt_method_tasks(
+        sample_statements, sample_preferences, sample_personas,
+        alt_mapping, precomputed_epsilons, openai_client
+    ))
 
 
 def run_chatgpt_star_methods(
@@ -219,34 +302,11 @@ def run_chatgpt_star_methods(
     precomputed_epsilons: Dict[str, float],
     openai_client: OpenAI
 ) -> Dict[str, Dict]:
-    """Run ChatGPT* methods (select from all 100 alternatives)."""
-    logger = logging.getLogger(__name__)
-    results = {}
-    
-    # ChatGPT*
-    logger.info("  Running ChatGPT*...")
-    result = run_chatgpt_star(all_statements, sample_statements, openai_client)
-    if result["winner"] is not None:
-        result["epsilon"] = lookup_epsilon(precomputed_epsilons, result["winner"])
-    results["chatgpt_star"] = result
-    
-    # ChatGPT* with rankings
-    logger.info("  Running ChatGPT*+Rankings...")
-    result = run_chatgpt_star_with_rankings(
-        all_statements, sample_statements, sample_preferences, openai_client
-    )
-    if result["winner"] is not None:
-        result["epsilon"] = lookup_epsilon(precomputed_epsilons, result["winner"])
-    results["chatgpt_star_rankings"] = result
-    
-    # ChatGPT* with personas
-    logger.info("  Running ChatGPT*+Personas...")
-    result = run_chatgpt_star_with_personas(all_statements, sample_personas, openai_client)
-    if result["winner"] is not None:
-        result["epsilon"] = lookup_epsilon(precomputed_epsilons, result["winner"])
-    results["chatgpt_star_personas"] = result
-    
-    return results
+    """Run ChatGPT* methods (select from all 100 alternatives) concurrently."""
+    return run_sample_methods(chatgpt_star_method_tasks(
+        all_statements, sample_statements, sample_preferences, sample_personas,
+        precomputed_epsilons, openai_client
+    ))
 
 
 def run_chatgpt_double_star_methods(
@@ -258,67 +318,16 @@ def run_chatgpt_double_star_methods(
     voter_sample_indices: List[int],
     voter_personas: List[str],
     topic: str,
-    precomputed_epsilons: Dict[str, float],
-    openai_client: OpenAI
+    openai_client: OpenAI,
+    insertion_profile: Optional[InsertionEpsilonProfile] = None,
+    insertion_service: Optional[InsertionService] = None
 ) -> Dict[str, Dict]:
-    """Run ChatGPT** methods (generate new statement)."""
-    logger = logging.getLogger(__name__)
-    results = {}
-    
-    # ChatGPT**
-    logger.info("  Running ChatGPT**...")
-    result = run_chatgpt_double_star(
-        sample_statements, all_statements, sample_personas,
-        full_preferences, voter_sample_indices, topic, openai_client
-    )
-    if result.get("new_statement"):
-        # Re-query voters to insert new statement
-        logger.info("    Inserting new statement into rankings...")
-        selected_personas = [voter_personas[i] for i in voter_sample_indices]
-        updated_prefs = insert_new_statement_into_rankings(
-            result["new_statement"], all_statements, selected_personas,
-            voter_sample_indices, full_preferences, topic, openai_client
-        )
-        # Compute epsilon with m=100 (no veto power for new alt)
-        epsilon = compute_epsilon_for_new_statement(updated_prefs, len(all_statements))
-        result["epsilon"] = epsilon
-    results["chatgpt_double_star"] = result
-    
-    # ChatGPT** with rankings
-    logger.info("  Running ChatGPT**+Rankings...")
-    result = run_chatgpt_double_star_with_rankings(
-        sample_statements, sample_preferences, all_statements, sample_personas,
-        full_preferences, voter_sample_indices, topic, openai_client
-    )
-    if result.get("new_statement"):
-        logger.info("    Inserting new statement into rankings...")
-        selected_personas = [voter_personas[i] for i in voter_sample_indices]
-        updated_prefs = insert_new_statement_into_rankings(
-            result["new_statement"], all_statements, selected_personas,
-            voter_sample_indices, full_preferences, topic, openai_client
-        )
-        epsilon = compute_epsilon_for_new_statement(updated_prefs, len(all_statements))
-        result["epsilon"] = epsilon
-    results["chatgpt_double_star_rankings"] = result
-    
-    # ChatGPT** with personas
-    logger.info("  Running ChatGPT**+Personas...")
-    result = run_chatgpt_double_star_with_personas(
-        sample_statements, sample_personas, all_statements,
-        full_preferences, voter_sample_indices, topic, openai_client
-    )
-    if result.get("new_statement"):
-        logger.info("    Inserting new statement into rankings...")
-        selected_personas = [voter_personas[i] for i in voter_sample_indices]
-        updated_prefs = insert_new_statement_into_rankings(
-            result["new_statement"], all_statements, selected_personas,
-            voter_sample_indices, full_preferences, topic, openai_client
-        )
-        epsilon = compute_epsilon_for_new_statement(updated_prefs, len(all_statements))
-        result["epsilon"] = epsilon
-    results["chatgpt_double_star_personas"] = result
-    
-    return results
+    """Run ChatGPT** methods (generate new statement) concurrently."""
+    return run_sample_methods(chatgpt_double_star_method_tasks(
+        all_statements, sample_statements, sample_preferences, sample_personas,
+        full_preferences, voter_sample_indices, voter_personas, topic, openai_client,
+        insertion_profile, insertion_service
+    ))
 
 
 def run_single_rep(
@@ -385,9 +394,15 @@ def run_single_rep(
     mean_eps = get_mean_epsilon(precomputed_epsilons)
     logger.info(f"  Mean epsilon: {mean_eps:.4f}")
     
+    # Cached profile and voter contexts for ChatGPT**, shared by every sample of the rep
+    insertion_profile = InsertionEpsilonProfile(full_preferences)
+    insertion_service = InsertionService(alt_statements, full_preferences, topic, openai_client)
+    
     # Step 4: Run samples
     logger.info("Step 4: Running (K, P) samples...")
     
+    # Collect every pending sample's methods, then evaluate them all at once
+    pending_samples = {}
     for k in K_VALUES:
         for p in P_VALUES:
             for sample_idx in range(N_SAMPLES_PER_KP):
@@ -397,7 +412,7 @@ def run_single_rep(
                     logger.info(f"  K={k}, P={p}, Sample {sample_idx}: cached, skipping")
                     continue
                 
-                logger.info(f"  K={k}, P={p}, Sample {sample_idx}: Running...")
+                logger.info(f"  K={k}, P={p}, Sample {sample_idx}: Queued...")
                 sample_dir.mkdir(parents=True, exist_ok=True)
                 
                 # Sample K voters and P alternatives
@@ -424,46 +439,37 @@ def run_single_rep(
                         "alt_mapping": {str(k): v for k, v in alt_mapping.items()},
                     }, f, indent=2)
                 
-                # Run all methods
-                results = {}
-                
-                # Traditional methods
-                trad_results = run_traditional_methods(
-                    sample_prefs, alt_mapping, precomputed_epsilons
-                )
-                results.update(trad_results)
-                
-                # ChatGPT methods
-                chatgpt_results = run_chatgpt_methods(
-                    sample_statements, sample_prefs, sample_personas,
-                    alt_mapping, precomputed_epsilons, openai_client
-                )
-                results.update(chatgpt_results)
-                
-                # ChatGPT* methods
-                star_results = run_chatgpt_star_methods(
-                    alt_statements, sample_statements, sample_prefs, sample_personas,
-                    precomputed_epsilons, openai_client
+                pending_samples[sample_dir] = (
+                    traditional_method_tasks(sample_prefs, alt_mapping, precomputed_epsilons)
+                    + chatgpt_method_tasks(
+                        sample_statements, sample_prefs, sample_personas,
+                        alt_mapping, precomputed_epsilons, openai_client
+                    )
+                    + chatgpt_star_method_tasks(
+                        alt_statements, sample_statements, sample_prefs, sample_personas,
+                        precomputed_epsilons, openai_client
+                    )
+                    + chatgpt_double_star_method_tasks(
+                        alt_statements, sample_statements, sample_prefs, sample_personas,
+                        full_preferences, voter_sample, voter_personas, topic, openai_client,
+                        insertion_profile, insertion_service
+                    )
                 )
-                results.update(star_results)
-                
-                # ChatGPT** methods
-                double_star_results = run_chatgpt_double_star_methods(
-                    alt_statements, sample_statements, sample_prefs, sample_personas,
-                    full_preferences, voter_sample, voter_personas, topic,
-                    precomputed_epsilons, openai_client
-                )
-                results.update(double_star_results)
-                
-                # Save results
-                with open(sample_dir / "results.json", 'w') as f:
-                    json.dump(results, f, indent=2)
-                
-                # Log summary
-                logger.info(f"    Results: " + ", ".join(
-                    f"{m}={r.get('epsilon', 'N/A'):.3f}" if r.get('epsilon') else f"{m}=N/A"
-                    for m, r in list(results.items())[:5]
-                ))
+    
+    def save_sample(sample_dir: Path, results: Dict[str, Dict]) -> None:
+        with open(sample_dir / "results.json", 'w') as f:
+            json.dump(results, f, indent=2)
+        
+        # Log summary
+        logger.info(f"    {sample_dir.parent.name}/{sample_dir.name} results: " + ", ".join(
+            f"{m}={r.get('epsilon', 'N/A'):.3f}" if r.get('epsilon') else f"{m}=N/A"
+            for m, r in list(results.items())[:5]
+        ))
+    
+    if pending_samples:
+        logger.info(f"  Evaluating {len(pending_samples)} samples concurrently...")
+        with VotingExecutor(llm_workers=MAX_WORKERS) as executor:
+            executor.run(pending_samples, on_sample_done=save_sample)
     
     logger.info(f"Completed rep {rep_idx}")
 
@@ -472,9 +478,16 @@ def run_experiment(
     topic_slug: str,
     output_dir: Path,
     openai_client: OpenAI,
-    n_reps: int = N_REPS
+    n_reps: int = N_REPS,
+    shard: Optional[Shard] = None,
+    claims: Optional[WorkClaims] = None
 ) -> None:
-    """Run the full experiment for a single topic."""
+    """
+    Run the full experiment for a single topic.
+    
+    With a shard or claims, other workers share the reps and the
+    visualizations are left to a final unsharded run.
+    """
     logger = logging.getLogger(__name__)
     
     logger.info("=" * 80)
@@ -489,7 +502,7 @@ def run_experiment(
     all_entries = load_all_entries(topic_slug)
     
     # Run each rep
-    for rep_idx in range(n_reps):
+    def run_rep(rep_idx: int) -> None:
         try:
             run_single_rep(topic_slug, rep_idx, all_entries, openai_client, output_dir)
         except Exception as e:
@@ -497,9 +510,25 @@ def run_experiment(
             import traceback
             logger.error(traceback.format_exc())
     
+    run_grid(
+        range(n_reps),
+        key=lambda rep_idx: f"{topic_slug}/rep{rep_idx}",
+        fn=run_rep,
+        shard=shard,
+        claims=claims
+    )
+    format_stats.log_stats()
+    
+    if shard is not None or claims is not None:
+        logger.info("\nSharded run: skipping visualizations (run once unsharded to generate them)")
+        logger.info("\nEXPERIMENT COMPLETE")
+        return
+    
     # Generate visualizations
     logger.info("\nGenerating visualizations...")
     try:
+        # matplotlib/seaborn are only needed here
+        from .visualizer import generate_all_visualizations
         generate_all_visualizations(output_dir, topic_slug, n_reps)
     except Exception as e:
         logger.error(f"Visualization failed: {e}")
@@ -520,6 +549,7 @@ def main():
         default=OUTPUT_DIR,
         help="Output directory"
     )
+    add_distribution_args(parser)
     
     args = parser.parse_args()
     
@@ -535,10 +565,17 @@ def main():
     logger.info(f"Number of reps: {n_reps}")
     
     # Create OpenAI client
-    openai_client = OpenAI(timeout=120.0)
+    from openai import OpenAI
+    # One request budget shared by all methods and their per-voter pools
+    openai_client = BudgetedClient(OpenAI(timeout=120.0), MAX_WORKERS)
     
     # Run experiment on public trust topic
-    run_experiment(TEST_TOPIC, args.output_dir, openai_client, n_reps)
+    claims = WorkClaims(args.output_dir / CLAIMS_DIRNAME) if args.claim else None
+    try:
+        run_experiment(TEST_TOPIC, args.output_dir, openai_client, n_reps, shard=args.shard, claims=claims)
+    finally:
+        if claims is not None:
+            claims.close()
 
 
 if __name__ == "__main__":
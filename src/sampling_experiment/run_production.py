@@ -16,11 +16,14 @@ from datetime import datetime
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from src.api_budget import BudgetedClient
+
 # Load environment variables
 load_dotenv()
 
 from .config import (
     OUTPUT_DIR,
+    MAX_WORKERS,
     ALL_TOPICS,
     N_REPS,
     K_VALUES,
@@ -88,7 +91,7 @@ def main():
     logger.info(f"Total samples per topic: {len(K_VALUES) * len(P_VALUES) * args.reps}")
     
     # Create OpenAI client
-    openai_client = OpenAI(timeout=120.0)
+    openai_client = BudgetedClient(OpenAI(timeout=120.0), MAX_WORKERS)
     
     # Run experiment on each topic
     for idx, topic_slug in enumerate(topics):
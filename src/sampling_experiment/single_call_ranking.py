@@ -5,14 +5,23 @@ Instead of pairwise comparisons or insertion sort, we ask the model to
 rank all statements in a single API call and return sorted IDs.
 """
 
-import json
+from __future__ import annotations
+
 import logging
 import time
-from typing import List, Dict
-from openai import OpenAI
+from typing import TYPE_CHECKING, List, Dict
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 from .config import MODEL, TEMPERATURE, api_timer
+from src.typed_responses import (
+    ResponseFormatError,
+    format_stats,
+    labeled_positions_schema,
+    parse_response,
+    position_schema,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +31,13 @@ INVALID_RANKING_VALUE = -999
 MAX_RANKING_RETRIES = 10
 
 
+def _rank_assignment_schema(n: int):
+    """{"1": idx, ..., str(n): idx} with statement indices 0..n-1."""
+    return labeled_positions_schema(
+        {str(rank): (0, n - 1) for rank in range(1, n + 1)}, name="rank_assignment"
+    )
+
+
 def _make_single_ranking_api_call(
     persona: str,
     statements: List[Dict],
@@ -62,6 +78,7 @@ IMPORTANT:
 - Each statement index must appear exactly once
 Return only the JSON, no additional text."""
 
+    schema = _rank_assignment_schema(n)
     start_time = time.time()
     response = openai_client.responses.create(
         model=model,
@@ -71,10 +88,11 @@ Return only the JSON, no additional text."""
         ],
         temperature=temperature,
         reasoning={"effort": "low"},
+        text=schema.text_format,
     )
     api_timer.record(time.time() - start_time)
     
-    result = json.loads(response.output_text)
+    result = parse_response(response, schema)
     # Convert {"1": idx, "2": idx, ...} to [idx_at_rank1, idx_at_rank2, ...]
     ranking = [result[str(i)] for i in range(1, n + 1)]
     
@@ -129,6 +147,7 @@ def rank_all_statements_single_call(
                     logger.info(f"Valid ranking obtained on attempt {attempt}")
                 return ranking
             else:
+                format_stats.record_failure("rank_assignment", "not a permutation")
                 # Log the invalid ranking details
                 actual_len = len(ranking) if isinstance(ranking, list) else "N/A"
                 has_duplicates = len(ranking) != len(set(ranking)) if isinstance(ranking, list) else "N/A"
@@ -138,8 +157,8 @@ def rank_all_statements_single_call(
                     f"ranking={ranking[:20]}..." if len(str(ranking)) > 100 else f"ranking={ranking}"
                 )
                 
-        except json.JSONDecodeError as e:
-            logger.warning(f"JSON decode error on attempt {attempt}/{MAX_RANKING_RETRIES}: {e}")
+        except ResponseFormatError as e:
+            logger.warning(f"Format error on attempt {attempt}/{MAX_RANKING_RETRIES}: {e}")
         except Exception as e:
             logger.warning(f"API error on attempt {attempt}/{MAX_RANKING_RETRIES}: {type(e).__name__}: {e}")
     
@@ -303,6 +322,7 @@ Where should this new statement be inserted in your ranking?
 
 Return JSON: {{"insert_position": <number>}}"""
 
+    schema = position_schema(n, key="insert_position")
     start_time = time.time()
     response = openai_client.responses.create(
         model=model,
@@ -312,14 +332,11 @@ Return JSON: {{"insert_position": <number>}}"""
         ],
         temperature=temperature,
         reasoning={"effort": "low"},
+        text=schema.text_format,
     )
     api_timer.record(time.time() - start_time)
     
-    result = json.loads(response.output_text)
-    position = result.get("insert_position", n // 2)
-    
-    # Clamp position to valid range
-    position = max(0, min(n, int(position)))
+    position = parse_response(response, schema)
     
     # Insert new statement at position
     new_ranking = current_ranking.copy()
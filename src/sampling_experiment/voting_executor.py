@@ -0,0 +1,253 @@
+"""
+Concurrent evaluation of voting methods across the samples of a rep.
+
+LLM-based methods (ChatGPT, ChatGPT*, ChatGPT** and their variants) spend
+their time waiting on the API and run in a thread pool. Traditional
+methods and epsilon computation are CPU bound and run in a process pool.
+Every method of every pending sample is submitted at once, and each
+sample's results are handed to a callback (which writes results.json) as
+soon as its last method finishes, optionally after a per-sample finalizer
+(e.g. attaching the epsilons of all of the sample's winners at once). A
+rep's evaluation phase then takes roughly the slowest method's latency
+instead of the sum over samples and methods.
+
+LLM methods may fan out further (ChatGPT** asks every voter where the new
+statement ranks), so callers pass a src.api_budget.BudgetedClient to cap
+the API requests in flight across all of them.
+
+Usage:
+    tasks = {sample_dir: [MethodTask("borda", run_borda, (prefs,), cpu_bound=True), ...]}
+    with VotingExecutor() as executor:
+        executor.run(tasks, on_sample_done=lambda key, results: save(key, results))
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LLM_WORKERS = 32
+
+
+@dataclass
+class MethodTask:
+    """
+    One voting method to run for one sample.
+    
+    func(*args) must return a result dict with a "winner" key. CPU-bound
+    functions, their args and CPU-bound finalizers must be picklable
+    (module-level functions or functools.partial of them).
+    """
+    method: str
+    func: Callable[..., Dict]
+    args: tuple = ()
+    cpu_bound: bool = False
+    finalize: Optional[Callable[[Dict], Dict]] = None   # e.g. attach epsilon
+    finalize_cpu_bound: bool = False
+
+
+def _run_guarded(method: str, func: Callable[..., Dict], args: tuple) -> Dict:
+    """Run a method, turning exceptions into an error result."""
+    try:
+        return func(*args)
+    except Exception as e:
+        logger.error(f"Error running {method}: {e}")
+        return {"winner": None, "error": str(e)}
+
+
+def _finalize_guarded(method: str, finalize: Callable[[Dict], Dict], result: Dict) -> Dict:
+    """Apply a finalizer, keeping the method's result if it fails."""
+    try:
+        return finalize(result)
+    except Exception as e:
+        logger.error(f"Error finalizing {method}: {e}")
+        return {**result, "finalize_error": str(e)}
+
+
+def _finalize_sample_guarded(
+    finalize: Callable[[Dict[str, Dict]], Dict[str, Dict]],
+    results: Dict[str, Dict]
+) -> Dict[str, Dict]:
+    """Apply a sample finalizer, keeping the methods' results if it fails."""
+    try:
+        return finalize(results)
+    except Exception as e:
+        logger.error(f"Error finalizing sample: {e}")
+        return {method: {**result, "finalize_error": str(e)} for method, result in results.items()}
+
+
+class VotingExecutor:
+    """Thread pool for LLM methods plus process pool for CPU-bound methods."""
+    
+    def __init__(self, llm_workers: int = DEFAULT_LLM_WORKERS, cpu_workers: Optional[int] = None):
+        """
+        Args:
+            llm_workers: Concurrent LLM-based method calls
+            cpu_workers: Worker processes for CPU-bound methods (None = CPU
+                count, 0 = run them in the thread pool instead)
+        """
+        self.llm_workers = llm_workers
+        self.cpu_workers = cpu_workers
+        self._threads = None
+        self._processes = None
+    
+    def __enter__(self):
+        self._threads = ThreadPoolExecutor(max_workers=self.llm_workers)
+        if self.cpu_workers != 0:
+            # spawn, not fork: the parent has live HTTP client threads
+            self._processes = ProcessPoolExecutor(
+                max_workers=self.cpu_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self
+    
+    def __exit__(self, *exc):
+        self._threads.shutdown(wait=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=True)
+        self._threads = self._processes = None
+        return False
+    
+    def _submit(self, cpu_bound: bool, fn: Callable, *args):
+        if cpu_bound and self._processes is not None:
+            try:
+                return self._processes.submit(fn, *args)
+            except BrokenProcessPool as e:
+                # A worker died; run the remaining CPU-bound work in threads
+                logger.warning(f"Process pool unusable, falling back to threads: {e}")
+                self._processes.shutdown(wait=False)
+                self._processes = None
+        return self._threads.submit(fn, *args)
+    
+    def submit(self, fn: Callable, *args, cpu_bound: bool = False):
+        """
+        Submit a standalone job alongside the method tasks (e.g. a batched
+        computation covering many samples).
+        
+        Args:
+            fn: Function to call (picklable if cpu_bound)
+            *args: Its arguments
+            cpu_bound: Run in the process pool instead of the thread pool
+        
+        Returns:
+            concurrent.futures.Future of fn(*args)
+        """
+        if self._threads is None:
+            raise RuntimeError(
+                "VotingExecutor.submit needs an active executor (use it as a context manager)"
+            )
+        return self._submit(cpu_bound, fn, *args)
+    
+    def run(
+        self,
+        samples: Dict[Hashable, List[MethodTask]],
+        on_sample_done: Optional[Callable[[Hashable, Dict[str, Dict]], None]] = None,
+        sample_finalizers: Optional[
+            Dict[Hashable, Callable[[Dict[str, Dict]], Dict[str, Dict]]]
+        ] = None
+    ) -> Dict[Hashable, Dict[str, Dict]]:
+        """
+        Run every method of every sample concurrently.
+        
+        Args:
+            samples: Sample key -> methods to run for that sample
+            on_sample_done: Called from the calling thread with (key, results)
+                as soon as all of a sample's methods have finished
+            sample_finalizers: Sample key -> CPU-bound function applied to the
+                sample's {method: result} once all its methods have finished,
+                before on_sample_done (must be picklable)
+        
+        Returns:
+            Sample key -> {method: result}, methods in task order.
+        """
+        if self._threads is None:
+            with self:
+                return self.run(samples, on_sample_done, sample_finalizers)
+        
+        sample_finalizers = sample_finalizers or {}
+        partial_results: Dict[Hashable, Dict[str, Dict]] = {key: {} for key in samples}
+        remaining = {key: len(tasks) for key, tasks in samples.items()}
+        completed: Dict[Hashable, Dict[str, Dict]] = {}
+        futures = {}
+        
+        def finish(key: Hashable) -> None:
+            results = {t.method: partial_results[key][t.method] for t in samples[key]}
+            if key in sample_finalizers:
+                future = self._submit(
+                    True, _finalize_sample_guarded, sample_finalizers[key], results
+                )
+                futures[future] = (key, None, "sample")
+                return
+            done_sample(key, results)
+        
+        def done_sample(key: Hashable, results: Dict[str, Dict]) -> None:
+            completed[key] = results
+            if on_sample_done is not None:
+                on_sample_done(key, results)
+        
+        for key, tasks in samples.items():
+            if not tasks:
+                finish(key)
+            for task in tasks:
+                future = self._submit(
+                    task.cpu_bound, _run_guarded, task.method, task.func, task.args
+                )
+                futures[future] = (key, task, "run")
+        
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, task, stage = futures.pop(future)
+                if stage == "sample":
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        logger.error(f"Error finalizing sample {key}: {e}")
+                        results = {t.method: partial_results[key][t.method] for t in samples[key]}
+                    done_sample(key, results)
+                    continue
+                
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Pickling errors or a broken worker process
+                    logger.error(f"Error running {task.method}: {e}")
+                    result = {"winner": None, "error": str(e)}
+                
+                if stage == "run" and task.finalize is not None:
+                    future = self._submit(task.finalize_cpu_bound, _finalize_guarded,
+                                          task.method, task.finalize, result)
+                    futures[future] = (key, task, "finalize")
+                    continue
+                
+                partial_results[key][task.method] = result
+                remaining[key] -= 1
+                if remaining[key] == 0:
+                    finish(key)
+        
+        return completed
+
+
+def run_sample_methods(
+    tasks: List[MethodTask],
+    llm_workers: int = DEFAULT_LLM_WORKERS
+) -> Dict[str, Dict]:
+    """
+    Run one sample's methods concurrently, all in threads.
+    
+    For single-sample call sites; starting worker processes per sample
+    would cost more than the CPU-bound methods themselves.
+    
+    Args:
+        tasks: Methods to run
+        llm_workers: Maximum concurrent methods
+    
+    Returns:
+        Dict mapping method name to result, in task order.
+    """
+    with VotingExecutor(llm_workers=llm_workers, cpu_workers=0) as executor:
+        return executor.run({0: tasks})[0]
@@ -8,18 +8,20 @@ Includes:
 - ChatGPT** methods: Generate a new statement
 """
 
-import json
+from __future__ import annotations
+
 import logging
 import time
-from typing import List, Dict, Optional, Tuple
-from openai import OpenAI
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from votekit import RankProfile, RankBallot
-from votekit.elections import Plurality, Borda, IRV, RankedPairs
+if TYPE_CHECKING:
+    from openai import OpenAI
+    from votekit import RankProfile
 
 from src.compute_pvc import compute_pvc
 from .config import MODEL, TEMPERATURE, api_timer
-from .single_call_ranking import insert_statement_into_ranking
+from .insertion_service import InsertionService
+from src.typed_responses import BRIDGING_STATEMENT, NEW_STATEMENT, parse_response, selection_schema
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +40,8 @@ def _preferences_to_votekit(preferences: List[List[str]]) -> Tuple[RankProfile,
     Returns:
         Tuple of (RankProfile, candidate_names)
     """
+    from votekit import RankProfile, RankBallot
+    
     n_statements = len(preferences)
     n_voters = len(preferences[0]) if preferences else 0
     
@@ -70,6 +74,8 @@ def _extract_winner(elected, prefix: str = "c") -> Optional[str]:
 
 def run_schulze(preferences: List[List[str]]) -> Dict:
     """Run Schulze/RankedPairs method (Condorcet)."""
+    from votekit.elections import RankedPairs
+    
     try:
         profile, _ = _preferences_to_votekit(preferences)
         election = RankedPairs(profile, tiebreak="random")
@@ -83,6 +89,8 @@ def run_schulze(preferences: List[List[str]]) -> Dict:
 
 def run_borda(preferences: List[List[str]]) -> Dict:
     """Run Borda count."""
+    from votekit.elections import Borda
+    
     try:
         profile, _ = _preferences_to_votekit(preferences)
         election = Borda(profile, m=1, tiebreak="random")
@@ -96,6 +104,8 @@ def run_borda(preferences: List[List[str]]) -> Dict:
 
 def run_irv(preferences: List[List[str]]) -> Dict:
     """Run Instant Runoff Voting."""
+    from votekit.elections import IRV
+    
     try:
         profile, _ = _preferences_to_votekit(preferences)
         election = IRV(profile, tiebreak="random")
@@ -109,6 +119,8 @@ def run_irv(preferences: List[List[str]]) -> Dict:
 
 def run_plurality(preferences: List[List[str]]) -> Dict:
     """Run Plurality voting."""
+    from votekit.elections import Plurality
+    
     try:
         profile, _ = _preferences_to_votekit(preferences)
         election = Plurality(profile, m=1, tiebreak="random")
@@ -169,6 +181,7 @@ Consider which one best represents a reasonable middle ground that could satisfy
 Return your choice as JSON: {{"selected_statement_index": <index>}}
 Where the value is the index (0-{n-1}) of the statement you select."""
 
+    schema = selection_schema(n)
     try:
         start_time = time.time()
         response = openai_client.responses.create(
@@ -179,11 +192,11 @@ Where the value is the index (0-{n-1}) of the statement you select."""
             ],
             temperature=temperature,
             reasoning={"effort": "minimal"},
+            text=schema.text_format,
         )
         api_timer.record(time.time() - start_time)
         
-        result = json.loads(response.output_text)
-        winner = str(result.get("selected_statement_index"))
+        winner = str(parse_response(response, schema))
         return {"winner": winner}
     except Exception as e:
         logger.error(f"ChatGPT failed: {e}")
@@ -238,6 +251,7 @@ Based on both the statements and the preference rankings, which statement would
 Return your choice as JSON: {{"selected_statement_index": <index>}}
 Where the value is the index (0-{n-1}) of the statement you select."""
 
+    schema = selection_schema(n)
     try:
         start_time = time.time()
         response = openai_client.responses.create(
@@ -248,11 +262,11 @@ Where the value is the index (0-{n-1}) of the statement you select."""
             ],
             temperature=temperature,
             reasoning={"effort": "minimal"},
+            text=schema.text_format,
         )
         api_timer.record(time.time() - start_time)
         
-        result = json.loads(response.output_text)
-        winner = str(result.get("selected_statement_index"))
+        winner = str(parse_response(response, schema))
         return {"winner": winner}
     except Exception as e:
         logger.error(f"ChatGPT with rankings failed: {e}")
@@ -305,6 +319,7 @@ Based on both the statements and the voter personas, which statement would be th
 Return your choice as JSON: {{"selected_statement_index": <index>}}
 Where the value is the index (0-{n-1}) of the statement you select."""
 
+    schema = selection_schema(n)
     try:
         start_time = time.time()
         response = openai_client.responses.create(
@@ -315,11 +330,11 @@ Where the value is the index (0-{n-1}) of the statement you select."""
             ],
             temperature=temperature,
             reasoning={"effort": "minimal"},
+            text=schema.text_format,
         )
         api_timer.record(time.time() - start_time)
         
-        result = json.loads(response.output_text)
-        winner = str(result.get("selected_statement_index"))
+        winner = str(parse_response(response, schema))
         return {"winner": winner}
     except Exception as e:
         logger.error(f"ChatGPT with personas failed: {e}")
@@ -377,6 +392,7 @@ You may choose any statement, not just the samples shown above.
 
 Return your choice as JSON: {{"selected_statement_index": <index>}}"""
 
+    schema = selection_schema(n_all)
     try:
         start_time = time.time()
         response = openai_client.responses.create(
@@ -387,16 +403,11 @@ Return your choice as JSON: {{"selected_statement_index": <index>}}"""
             ],
             temperature=temperature,
             reasoning={"effort": "minimal"},
+            text=schema.text_format,
         )
         api_timer.record(time.time() - start_time)
         
-        result = json.loads(response.output_text)
-        winner = str(result.get("selected_statement_index"))
-        
-        # Validate winner is in range
-        if not winner.isdigit() or int(winner) >= n_all:
-            logger.warning(f"Invalid winner {winner}, returning None")
-            return {"winner": None, "error": "Invalid selection"}
+        winner = str(parse_response(response, schema))
         
         return {"winner": winner}
     except Exception as e:
@@ -450,6 +461,7 @@ Which statement (from 0-{n_all-1}) would be the best choice as a consensus/bridg
 
 Return your choice as JSON: {{"selected_statement_index": <index>}}"""
 
+    schema = selection_schema(n_all)
     try:
         start_time = time.time()
         response = openai_client.responses.create(
@@ -460,11 +472,11 @@ Return your choice as JSON: {{"selected_statement_index": <index>}}"""
             ],
             temperature=temperature,
             reasoning={"effort": "minimal"},
+            text=schema.text_format,
         )
         api_timer.record(time.time() - start_time)
         
-        result = json.loads(response.output_text)
-        winner = str(result.get("selected_statement_index"))
+        winner = str(parse_response(response, schema))
         
         if not winner.isdigit() or int(winner) >= n_all:
             return {"winner": None, "error": "Invalid selection"}
@@ -520,6 +532,7 @@ Which statement (from 0-{n_all-1}) would be the best choice as a consensus/bridg
 
 Return your choice as JSON: {{"selected_statement_index": <index>}}"""
 
+    schema = selection_schema(n_all)
     try:
         start_time = time.time()
         response = openai_client.responses.create(
@@ -530,11 +543,11 @@ Return your choice as JSON: {{"selected_statement_index": <index>}}"""
             ],
             temperature=temperature,
             reasoning={"effort": "minimal"},
+            text=schema.text_format,
         )
         api_timer.record(time.time() - start_time)
         
-        result = json.loads(response.output_text)
-        winner = str(result.get("selected_statement_index"))
+        winner = str(parse_response(response, schema))
         
         if not winner.isdigit() or int(winner) >= n_all:
             return {"winner": None, "error": "Invalid selection"}
@@ -594,11 +607,11 @@ Return your new statement as JSON: {{"new_statement": "<your statement>"}}"""
             ],
             temperature=temperature,
             reasoning={"effort": "minimal"},
+            text=NEW_STATEMENT.text_format,
         )
         api_timer.record(time.time() - start_time)
         
-        result = json.loads(response.output_text)
-        return result.get("new_statement")
+        return parse_response(response, NEW_STATEMENT)
     except Exception as e:
         logger.error(f"Generate new statement failed: {e}")
         return None
@@ -662,11 +675,11 @@ Return your new statement as JSON: {{"new_statement": "<your statement>"}}"""
             ],
             temperature=temperature,
             reasoning={"effort": "minimal"},
+            text=NEW_STATEMENT.text_format,
         )
         api_timer.record(time.time() - start_time)
         
-        result = json.loads(response.output_text)
-        return result.get("new_statement")
+        return parse_response(response, NEW_STATEMENT)
     except Exception as e:
         logger.error(f"Generate new statement with rankings failed: {e}")
         return None
@@ -730,11 +743,11 @@ Return your new statement as JSON: {{"new_statement": "<your statement>"}}"""
             ],
             temperature=temperature,
             reasoning={"effort": "minimal"},
+            text=NEW_STATEMENT.text_format,
         )
         api_timer.record(time.time() - start_time)
         
-        result = json.loads(response.output_text)
-        return result.get("new_statement")
+        return parse_response(response, NEW_STATEMENT)
     except Exception as e:
         logger.error(f"Generate new statement with personas failed: {e}")
         return None
@@ -821,6 +834,54 @@ def run_chatgpt_double_star_with_personas(
     }
 
 
+def get_insertion_positions(
+    new_statement: str,
+    all_statements: List[Dict],
+    voter_personas: List[str],
+    voter_indices: List[int],
+    full_preferences: List[List[str]],
+    topic: str,
+    openai_client: OpenAI,
+    max_workers: int = 100,
+    model: str = MODEL,
+    temperature: float = TEMPERATURE,
+    desc: str = "Inserting statement",
+    service: Optional[InsertionService] = None
+) -> List[int]:
+    """
+    Ask each sampled voter where a new statement goes in their ranking.
+    
+    Uses the coarse-to-fine InsertionService (decile bucket, then window)
+    rather than sending every voter's full ranking.
+    
+    Args:
+        new_statement: The newly generated statement text
+        all_statements: Original list of statement dicts
+        voter_personas: Persona strings for the K sampled voters
+        voter_indices: Indices of sampled voters in the full preference matrix
+        full_preferences: Full 100x100 preference matrix
+        topic: Topic string
+        openai_client: OpenAI client
+        max_workers: Max parallel workers
+        model: Model to use
+        temperature: Temperature
+        desc: Progress bar label
+        service: Shared InsertionService for the rep (reuses cached voter context)
+    
+    Returns:
+        Per sampled voter, the rank the new statement was inserted at
+        (0 = most preferred)
+    """
+    if service is None:
+        service = InsertionService(
+            all_statements, full_preferences, topic, openai_client,
+            model=model, temperature=temperature
+        )
+    return service.insert_for_voters(
+        [new_statement], voter_indices, voter_personas, max_workers, desc
+    )[0]
+
+
 def insert_new_statement_into_rankings(
     new_statement: str,
     all_statements: List[Dict],
@@ -837,6 +898,8 @@ def insert_new_statement_into_rankings(
     Insert a new statement into the rankings of sampled voters.
     
     Re-queries each voter to find where to insert the new statement.
+    Callers that only need the new statement's epsilon should use
+    get_insertion_positions with an InsertionEpsilonProfile instead.
     
     Args:
         new_statement: The newly generated statement text
@@ -853,56 +916,23 @@ def insert_new_statement_into_rankings(
     Returns:
         Updated preference matrix with new statement (101 alternatives)
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    from tqdm import tqdm
-    
-    n_voters = len(voter_indices)
     n_alts = len(all_statements)
-    new_idx = n_alts  # Index for new statement
-    
-    logger.info(f"Inserting new statement into rankings for {n_voters} voters...")
-    
-    def process_voter(args):
-        """Process a single voter to insert new statement."""
-        local_idx, voter_idx, persona = args
-        
-        # Get this voter's current ranking
-        current_ranking = [int(full_preferences[rank][voter_idx]) 
-                         for rank in range(n_alts)]
-        
-        # Insert new statement
-        new_ranking = insert_statement_into_ranking(
-            persona, current_ranking, all_statements, new_statement,
-            topic, openai_client, model, temperature
-        )
-        
-        return local_idx, new_ranking
-    
-    # Process all voters
-    updated_rankings = [None] * n_voters
+    positions = get_insertion_positions(
+        new_statement, all_statements, voter_personas, voter_indices,
+        full_preferences, topic, openai_client, max_workers, model, temperature
+    )
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {
-            executor.submit(process_voter, (i, voter_idx, voter_personas[i])): i
-            for i, voter_idx in enumerate(voter_indices)
-        }
-        
-        for future in tqdm(as_completed(futures), total=len(futures),
-                          desc="Inserting statement", unit="voter"):
-            local_idx, new_ranking = future.result()
-            updated_rankings[local_idx] = new_ranking
+    updated_rankings = []
+    for voter_idx, position in zip(voter_indices, positions):
+        ranking = [full_preferences[rank][voter_idx] for rank in range(n_alts)]
+        ranking.insert(position, str(n_alts))
+        updated_rankings.append(ranking)
     
     # Convert to preference matrix format [rank][voter]
-    n_total_alts = n_alts + 1
-    updated_preferences = []
-    for rank in range(n_total_alts):
-        rank_row = []
-        for voter in range(n_voters):
-            alt_idx = updated_rankings[voter][rank]
-            rank_row.append(str(alt_idx))
-        updated_preferences.append(rank_row)
-    
-    return updated_preferences
+    return [
+        [ranking[rank] for ranking in updated_rankings]
+        for rank in range(n_alts + 1)
+    ]
 
 
 # =============================================================================
@@ -957,11 +987,11 @@ Return your statement as JSON: {{"bridging_statement": "<your statement>"}}"""
             ],
             temperature=temperature,
             reasoning={"effort": "minimal"},
+            text=BRIDGING_STATEMENT.text_format,
         )
         api_timer.record(time.time() - start_time)
         
-        result = json.loads(response.output_text)
-        return result.get("bridging_statement")
+        return parse_response(response, BRIDGING_STATEMENT)
     except Exception as e:
         logger.error(f"Generate bridging statement (no context) failed: {e}")
         return None
@@ -998,18 +1028,17 @@ def run_chatgpt_triple_star(
     Returns:
         Dict with average epsilon, individual epsilons, and generated statements
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    from tqdm import tqdm
-    from src.sampling_experiment.epsilon_calculator import compute_epsilon_for_new_statement
+    from src.sampling_experiment.epsilon_calculator import InsertionEpsilonProfile
     
     n_voters = len(voter_personas)
-    n_alts = len(all_statements)
+    all_voters = list(range(n_voters))
+    
+    # Profile structures are built once and shared by every generation
+    insertion_profile = InsertionEpsilonProfile(full_preferences)
     
     logger.info(f"ChatGPT***: Generating {n_generations} blind bridging statements...")
     
     generated_statements = []
-    epsilons = []
-    
     for gen_idx in range(n_generations):
         logger.info(f"  Generation {gen_idx + 1}/{n_generations}...")
         
@@ -1025,52 +1054,23 @@ def run_chatgpt_triple_star(
         generated_statements.append(new_statement)
         logger.info(f"  Generated: {new_statement[:100]}...")
         
-        # Insert into all 100 voters' rankings
-        logger.info(f"  Inserting into {n_voters} voters' rankings...")
-        
-        def process_voter(args):
-            """Process a single voter to insert new statement."""
-            voter_idx, persona = args
-            
-            # Get this voter's current ranking
-            current_ranking = [int(full_preferences[rank][voter_idx]) 
-                             for rank in range(n_alts)]
-            
-            # Insert new statement
-            new_ranking = insert_statement_into_ranking(
-                persona, current_ranking, all_statements, new_statement,
-                topic, openai_client, model, temperature
-            )
-            
-            return voter_idx, new_ranking
-        
-        updated_rankings = [None] * n_voters
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(process_voter, (i, voter_personas[i])): i
-                for i in range(n_voters)
-            }
-            
-            for future in tqdm(as_completed(futures), total=len(futures),
-                              desc=f"  Inserting gen {gen_idx + 1}", unit="voter"):
-                voter_idx, new_ranking = future.result()
-                updated_rankings[voter_idx] = new_ranking
-        
-        # Convert to preference matrix format [rank][voter]
-        n_total_alts = n_alts + 1
-        updated_preferences = []
-        for rank in range(n_total_alts):
-            rank_row = []
-            for voter in range(n_voters):
-                alt_idx = updated_rankings[voter][rank]
-                rank_row.append(str(alt_idx))
-            updated_preferences.append(rank_row)
+    # Insert every generation into all 100 voters' rankings at once
+    epsilons = []
+    if generated_statements:
+        logger.info(f"  Inserting {len(generated_statements)} statements into {n_voters} voters' rankings...")
+        service = InsertionService(
+            all_statements, full_preferences, topic, openai_client,
+            model=model, temperature=temperature
+        )
+        all_positions = service.insert_for_voters(
+            generated_statements, all_voters, voter_personas, max_workers
+        )
         
         # Compute epsilon with m=100 (no veto power for new statement)
-        epsilon = compute_epsilon_for_new_statement(updated_preferences, n_alts)
-        epsilons.append(epsilon)
-        logger.info(f"  Epsilon for generation {gen_idx + 1}: {epsilon:.4f}")
+        for gen_idx, positions in enumerate(all_positions):
+            epsilon = insertion_profile.epsilon(all_voters, positions)
+            epsilons.append(epsilon)
+            logger.info(f"  Epsilon for generated statement {gen_idx + 1}: {epsilon:.4f}")
     
     if not epsilons:
         return {
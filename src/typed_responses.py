@@ -0,0 +1,444 @@
+"""
+Schema-constrained LLM responses decoded into typed values.
+
+Call sites used to ask for JSON in the prompt, json.loads(response.output_text)
+and rely on tenacity retries (or padding) when the model got the format
+wrong; a missing key silently became "None". A ResponseSchema declares the
+JSON schema of one call type, is passed to responses.create as
+text=schema.text_format so the model's output is constrained to it, and
+decodes the answer into a small dataclass or plain value. Responses that
+still cannot be decoded (refusals, truncated output, models without
+structured outputs) raise ResponseFormatError and are counted per schema in
+format_stats, so retries spent on formatting stay measurable.
+
+Usage:
+    schema = selection_schema(len(statements))
+    response = client.responses.create(model=MODEL, input=..., text=schema.text_format)
+    index = parse_response(response, schema)
+    format_stats.get_stats()   # {"selection": {"responses": 120, "failures": 0, ...}}
+"""
+
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ResponseFormatError(ValueError):
+    """A response that does not match its schema."""
+
+
+@dataclass(frozen=True)
+class ResponseSchema(Generic[T]):
+    """JSON schema of one call type and the decoder of its answers."""
+    name: str                       # Schema name sent to the API (also the stats key)
+    schema: Dict[str, Any]          # Strict JSON schema; the root must be an object
+    decode: Callable[[Any], T]      # Parsed JSON -> typed value (raises on a bad shape)
+    
+    @property
+    def text_format(self) -> Dict[str, Any]:
+        """The text argument of responses.create requesting schema-constrained output."""
+        return {
+            "format": {
+                "type": "json_schema",
+                "name": self.name,
+                "schema": self.schema,
+                "strict": True,
+            }
+        }
+
+
+# =============================================================================
+# Format Failure Tracker
+# =============================================================================
+
+class FormatStats:
+    """Thread-safe count of decoded responses and format failures per schema."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._responses: Dict[str, int] = {}
+        self._failures: Dict[str, int] = {}
+    
+    def record(self, name: str) -> None:
+        """Record a response of a schema."""
+        with self._lock:
+            self._responses[name] = self._responses.get(name, 0) + 1
+    
+    def record_failure(self, name: str, reason: str) -> None:
+        """Record that a recorded response could not be used (bad format or content)."""
+        with self._lock:
+            self._failures[name] = self._failures.get(name, 0) + 1
+            failures, responses = self._failures[name], self._responses.get(name, 0)
+        logger.warning(f"[Format] {name} response rejected ({reason}); "
+                       f"{failures}/{responses} failed so far")
+    
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per schema: responses, failures and failure rate."""
+        with self._lock:
+            return {
+                name: {
+                    "responses": count,
+                    "failures": self._failures.get(name, 0),
+                    "failure_rate": self._failures.get(name, 0) / count,
+                }
+                for name, count in sorted(self._responses.items())
+            }
+    
+    def log_stats(self) -> None:
+        """Log the failure counts of every schema seen so far (nothing if none)."""
+        stats = self.get_stats()
+        if stats:
+            logger.info("[Format Stats] " + ", ".join(
+                f"{name} {s['failures']}/{s['responses']} rejected" for name, s in stats.items()
+            ))
+    
+    def reset(self) -> None:
+        """Reset all counts."""
+        with self._lock:
+            self._responses = {}
+            self._failures = {}
+
+
+# Global tracker instance
+format_stats = FormatStats()
+
+
+# =============================================================================
+# Decoding
+# =============================================================================
+
+def response_text(response: Any) -> str:
+    """
+    Text of a Responses API result's message output.
+    
+    Args:
+        response: Responses API result
+    
+    Returns:
+        The output text
+    
+    Raises:
+        ResponseFormatError: If the model refused or produced no text
+    """
+    for item in getattr(response, "output", None) or []:
+        if getattr(item, "type", None) != "message":
+            continue
+        for part in getattr(item, "content", None) or []:
+            if getattr(part, "type", None) == "refusal":
+                raise ResponseFormatError(f"refusal: {getattr(part, 'refusal', '')}")
+    
+    text = getattr(response, "output_text", None)
+    if not text:
+        status = getattr(response, "status", None)
+        details = getattr(response, "incomplete_details", None)
+        reason = getattr(details, "reason", None)
+        raise ResponseFormatError(f"no output text (status={status}, reason={reason})")
+    return text
+
+
+def parse_response(response: Any, schema: ResponseSchema[T]) -> T:
+    """
+    Decode a response requested with schema.text_format.
+    
+    Args:
+        response: Responses API result
+        schema: Schema the response was requested with
+    
+    Returns:
+        The decoded value
+    
+    Raises:
+        ResponseFormatError: If the response cannot be decoded (counted in format_stats)
+    """
+    format_stats.record(schema.name)
+    try:
+        return schema.decode(json.loads(response_text(response)))
+    except (ValueError, KeyError, TypeError) as e:
+        format_stats.record_failure(schema.name, str(e)[:200])
+        if isinstance(e, ResponseFormatError):
+            raise
+        raise ResponseFormatError(f"{schema.name}: {e}") from e
+
+
+# =============================================================================
+# Schema Builders
+# =============================================================================
+
+def _object(**properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Strict object schema: every property required, no others allowed."""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def _array(items: Dict[str, Any], length: Optional[int] = None) -> Dict[str, Any]:
+    schema = {"type": "array", "items": items}
+    if length is not None:
+        schema["minItems"] = schema["maxItems"] = length
+    return schema
+
+
+def _integer(low: Optional[int] = None, high: Optional[int] = None) -> Dict[str, Any]:
+    schema = {"type": "integer"}
+    if low is not None:
+        schema["minimum"] = low
+    if high is not None:
+        schema["maximum"] = high
+    return schema
+
+
+def _code(codes: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    return {"type": "string", "enum": list(codes)} if codes else {"type": "string"}
+
+
+def _require(data: Any, key: str, kind: type) -> Any:
+    """data[key], checked to be of the given type."""
+    if not isinstance(data, dict) or key not in data:
+        raise ResponseFormatError(f"missing {key!r}")
+    value = data[key]
+    if kind is int and isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise ResponseFormatError(f"{key!r} is not {kind.__name__}: {value!r}")
+    return value
+
+
+def _in_range(value: int, key: str, low: Optional[int], high: Optional[int]) -> int:
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise ResponseFormatError(f"{key!r} out of range [{low}, {high}]: {value}")
+    return value
+
+
+# =============================================================================
+# Call Types
+# =============================================================================
+
+@dataclass
+class TopBottom:
+    """Top and bottom picks (statement codes) of one ranking round."""
+    top: List[str]
+    bottom: List[str]
+
+
+@dataclass
+class ClusterAssignment:
+    """Cluster of one statement and whether it represents its cluster."""
+    statement_idx: int
+    cluster_id: int
+    keep: int
+
+
+@dataclass
+class PairPreference:
+    """Preferred side of one numbered statement pair."""
+    pair: int
+    preference: str     # "A" or "B"
+
+
+def integer_schema(name: str, key: str, low: Optional[int] = None, high: Optional[int] = None) -> ResponseSchema[int]:
+    """{key: int in [low, high]} -> int."""
+    return ResponseSchema(
+        name=name,
+        schema=_object(**{key: _integer(low, high)}),
+        decode=lambda data: _in_range(_require(data, key, int), key, low, high),
+    )
+
+
+def text_schema(name: str, key: str) -> ResponseSchema[str]:
+    """{key: str} -> the stripped string."""
+    return ResponseSchema(
+        name=name,
+        schema=_object(**{key: {"type": "string"}}),
+        decode=lambda data: _require(data, key, str).strip(),
+    )
+
+
+def choice_schema(name: str, key: str, options: Sequence[str]) -> ResponseSchema[str]:
+    """{key: one of options} -> the chosen option."""
+    def decode(data: Any) -> str:
+        choice = _require(data, key, str)
+        if choice not in options:
+            raise ResponseFormatError(f"{key!r} is not one of {list(options)}: {choice!r}")
+        return choice
+    
+    return ResponseSchema(
+        name=name,
+        schema=_object(**{key: {"type": "string", "enum": list(options)}}),
+        decode=decode,
+    )
+
+
+def selection_schema(n: Optional[int] = None) -> ResponseSchema[int]:
+    """{"selected_statement_index": 0..n-1} -> index of the selected statement."""
+    return integer_schema("selection", "selected_statement_index", 0, n - 1 if n else None)
+
+
+def position_schema(n: int, key: str = "position") -> ResponseSchema[int]:
+    """{key: 0..n} -> insertion position into a list of n statements."""
+    return integer_schema("insertion_position", key, 0, n)
+
+
+LIKERT_RATING = integer_schema("likert_rating", "rating", 1, 5)
+NEW_STATEMENT = text_schema("new_statement", "new_statement")
+BRIDGING_STATEMENT = text_schema("bridging_statement", "bridging_statement")
+
+
+def ratings_schema(n: int, low: int = 1, high: int = 5) -> ResponseSchema[List[int]]:
+    """{"ratings": [n integers in low..high]} -> the ratings (unchecked)."""
+    def decode(data: Any) -> List[int]:
+        # Cells are checked by the caller, which may mask a bad one instead of retrying
+        return list(_require(data, "ratings", list))
+    
+    return ResponseSchema(
+        name="likert_ratings",
+        schema=_object(ratings=_array({"type": "integer", "enum": list(range(low, high + 1))}, n)),
+        decode=decode,
+    )
+
+
+def scores_schema(codes: Sequence[str], low: float = -100, high: float = 100) -> ResponseSchema[Dict[str, float]]:
+    """{code: score for every code} -> code -> score."""
+    def decode(data: Any) -> Dict[str, float]:
+        if not isinstance(data, dict):
+            raise ResponseFormatError("scores are not an object")
+        return {code: float(score) for code, score in data.items()}
+    
+    return ResponseSchema(
+        name="scores",
+        schema=_object(**{code: {"type": "number", "minimum": low, "maximum": high} for code in codes}),
+        decode=decode,
+    )
+
+
+def ranking_schema(codes: Optional[Sequence[str]] = None, key: str = "ranking") -> ResponseSchema[List[str]]:
+    """{key: [codes, most preferred first]} -> the ranking."""
+    def decode(data: Any) -> List[str]:
+        return [str(code) for code in _require(data, key, list)]
+    
+    return ResponseSchema(
+        name="ranking",
+        schema=_object(**{key: _array(_code(codes), len(codes) if codes else None)}),
+        decode=decode,
+    )
+
+
+def index_ranking_schema(m: int, key: str = "ranking") -> ResponseSchema[List[int]]:
+    """{key: [m indices 0..m-1, most preferred first]} -> the indices."""
+    def decode(data: Any) -> List[int]:
+        return [_require({"index": i}, "index", int) for i in _require(data, key, list)]
+    
+    return ResponseSchema(
+        name="index_ranking",
+        schema=_object(**{key: _array(_integer(0, m - 1), m)}),
+        decode=decode,
+    )
+
+
+def candidate_labels(n: int) -> List[str]:
+    """Labels A, B, ..., Z, AA, AB, ... for n items (valid schema property names)."""
+    labels = []
+    for i in range(1, n + 1):
+        label = ""
+        while i:
+            i, r = divmod(i - 1, 26)
+            label = chr(ord("A") + r) + label
+        labels.append(label)
+    return labels
+
+
+def labeled_positions_schema(
+    bounds: Dict[str, Tuple[int, int]],
+    key: Optional[str] = None,
+    name: str = "labeled_positions"
+) -> ResponseSchema[Dict[str, int]]:
+    """{label: position in [low, high] per label} (nested under key if given) -> label -> position."""
+    def decode(data: Any) -> Dict[str, int]:
+        positions = _require(data, key, dict) if key is not None else data
+        return {
+            label: _in_range(_require(positions, label, int), label, low, high)
+            for label, (low, high) in bounds.items()
+        }
+    
+    positions_schema = _object(**{label: _integer(low, high) for label, (low, high) in bounds.items()})
+    return ResponseSchema(
+        name=name,
+        schema=_object(**{key: positions_schema}) if key is not None else positions_schema,
+        decode=decode,
+    )
+
+
+def top_bottom_schema(
+    top_key: str,
+    bottom_key: str,
+    codes: Optional[Sequence[str]] = None,
+    n_top: Optional[int] = None,
+    n_bottom: Optional[int] = None
+) -> ResponseSchema[TopBottom]:
+    """{top_key: [n_top codes], bottom_key: [n_bottom codes]} -> TopBottom."""
+    def decode(data: Any) -> TopBottom:
+        return TopBottom(
+            top=[str(code) for code in _require(data, top_key, list)],
+            bottom=[str(code) for code in _require(data, bottom_key, list)],
+        )
+    
+    return ResponseSchema(
+        name="top_bottom",
+        schema=_object(**{
+            top_key: _array(_code(codes), n_top),
+            bottom_key: _array(_code(codes), n_bottom),
+        }),
+        decode=decode,
+    )
+
+
+def cluster_schema(n: int) -> ResponseSchema[List[ClusterAssignment]]:
+    """{"assignments": [n statement assignments]} -> ClusterAssignments."""
+    def decode(data: Any) -> List[ClusterAssignment]:
+        return [
+            ClusterAssignment(
+                statement_idx=_require(a, "statement_idx", int),
+                cluster_id=_require(a, "cluster_id", int),
+                keep=_in_range(_require(a, "keep", int), "keep", 0, 1),
+            )
+            for a in _require(data, "assignments", list)
+        ]
+    
+    return ResponseSchema(
+        name="cluster_assignments",
+        schema=_object(assignments=_array(_object(
+            statement_idx=_integer(0, n - 1),
+            cluster_id=_integer(0),
+            keep={"type": "integer", "enum": [0, 1]},
+        ), n)),
+        decode=decode,
+    )
+
+
+def pair_preferences_schema(n: int) -> ResponseSchema[List[PairPreference]]:
+    """{"comparisons": [n {"pair", "preference": "A"|"B"}]} -> PairPreferences."""
+    def decode(data: Any) -> List[PairPreference]:
+        preferences = []
+        for item in _require(data, "comparisons", list):
+            preference = _require(item, "preference", str)
+            if preference not in ("A", "B"):
+                raise ResponseFormatError(f"preference is not A or B: {preference!r}")
+            preferences.append(PairPreference(pair=_require(item, "pair", int), preference=preference))
+        return preferences
+    
+    return ResponseSchema(
+        name="pair_preferences",
+        schema=_object(comparisons=_array(_object(
+            pair=_integer(1, n),
+            preference={"type": "string", "enum": ["A", "B"]},
+        ), n)),
+        decode=decode,
+    )
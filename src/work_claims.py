@@ -0,0 +1,387 @@
+"""
+Sharding and work claiming for experiment grids.
+
+The experiment runners iterate a grid of cells (e.g. topic x rep) whose only
+coordination was "skip if the outputs exist", which races when several
+machines share an output directory: two workers that start the same cell
+both pay for its API calls. run_grid adds two ways to split a grid:
+
+- static sharding (--shard i/N): a worker only runs the cells whose key
+  hashes to its shard, so N workers partition the grid without talking
+- work claiming (--claim): before running a cell, a worker atomically
+  creates a lock file for it in a shared claims directory (O_CREAT|O_EXCL,
+  which is atomic on local and NFS filesystems). The owner refreshes the
+  lock's mtime every HEARTBEAT_INTERVAL seconds while it works; a lock not
+  refreshed for STALE_AFTER seconds belongs to a dead worker and is taken
+  over (renamed away; a worker that finds it moved a fresh lock instead
+  puts it back, so only one worker wins the takeover). A cell that ran to
+  completion gets a done marker before its lock is released. Cells held by
+  other workers are polled until they are done, or are claimed again when
+  their owner failed (lock released without a marker) or went stale, so a
+  grid is finished even if a worker dies or a cell raises.
+
+Done markers only answer "did the cell held by another worker finish?":
+claiming a cell clears its marker, and a worker that reaches a cell in its
+first pass claims it again and relies on the runner's own output caches to
+make the rerun a no-op.
+
+Usage:
+    claims = WorkClaims(output_dir / CLAIMS_DIRNAME) if args.claim else None
+    run_grid(cells, key=lambda c: f"{c[0]}/rep{c[1]}", fn=run_cell,
+             shard=args.shard, claims=claims)
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+CLAIMS_DIRNAME = ".claims"
+HEARTBEAT_INTERVAL = 30.0   # Seconds between refreshes of a held claim
+STALE_AFTER = 300.0         # Seconds without a refresh before a claim is taken over
+
+T = TypeVar("T")
+Shard = Tuple[int, int]
+
+
+# =============================================================================
+# Static sharding
+# =============================================================================
+
+def parse_shard(value: str) -> Shard:
+    """
+    Parse a "--shard i/N" argument (0 <= i < N).
+    
+    Args:
+        value: Shard spec, e.g. "0/4"
+    
+    Returns:
+        (index, count)
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Shard must look like i/N, got {value!r}")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"Shard index must be in [0, {count}), got {value!r}")
+    return index, count
+
+
+def in_shard(key: str, shard: Optional[Shard]) -> bool:
+    """Whether a cell belongs to a shard (stable across machines and runs)."""
+    if shard is None:
+        return True
+    index, count = shard
+    digest = hashlib.sha1(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count == index
+
+
+def add_distribution_args(parser: argparse.ArgumentParser) -> None:
+    """Add the --shard and --claim options of a grid runner."""
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        metavar="I/N",
+        help="Only run the grid cells of static shard I of N (0-based)"
+    )
+    parser.add_argument(
+        "--claim",
+        action="store_true",
+        help="Claim grid cells through lock files in the output directory, "
+             "so several workers can share one experiment"
+    )
+
+
+# =============================================================================
+# Work claims
+# =============================================================================
+
+class WorkClaims:
+    """Lock-file claims on grid cells in a directory shared by all workers."""
+    
+    def __init__(
+        self,
+        claims_dir: Path,
+        owner: Optional[str] = None,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL,
+        stale_after: float = STALE_AFTER
+    ):
+        """
+        Args:
+            claims_dir: Directory holding the lock files (on the shared filesystem)
+            owner: Identity written into this worker's locks (default host:pid:random)
+            heartbeat_interval: Seconds between refreshes of held claims
+            stale_after: Seconds without a refresh before a claim is taken over
+        """
+        self.claims_dir = Path(claims_dir)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self._held: Dict[str, Path] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+    
+    def _path(self, key: str, suffix: str = ".lock") -> Path:
+        return self.claims_dir / (re.sub(r"[^A-Za-z0-9._-]+", "__", key) + suffix)
+    
+    def _done_path(self, key: str) -> Path:
+        return self._path(key, ".done")
+    
+    def _read_lock(self, path: Path) -> Optional[dict]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _read_owner(self, path: Path) -> Optional[str]:
+        return (self._read_lock(path) or {}).get("owner")
+    
+    def _create(self, key: str, path: Path) -> bool:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w") as f:
+            json.dump({"owner": self.owner, "key": key, "claimed_at": time.time()}, f)
+        return True
+    
+    def _take_over_if_stale(self, path: Path) -> bool:
+        """Remove a stale lock; True if this worker removed it."""
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return True
+        if age <= self.stale_after:
+            return False
+        stale = self._read_lock(path)
+        # Rename first: of several workers racing for the takeover only one succeeds
+        grave = path.with_name(f"{path.name}.stale-{uuid.uuid4().hex[:8]}")
+        try:
+            os.rename(path, grave)
+        except FileNotFoundError:
+            return False
+        # Between the stat and the rename another worker may have taken the stale
+        # lock over and created its own: the rename then moved that fresh lock
+        try:
+            moved_age = time.time() - grave.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        if moved_age <= self.stale_after or self._read_lock(grave) != stale:
+            try:
+                os.link(grave, path)
+            except FileExistsError:
+                logger.warning(f"Could not restore claim {path.name} of {self._read_owner(grave)}: "
+                               f"it was claimed again meanwhile")
+            grave.unlink(missing_ok=True)
+            return False
+        logger.warning(f"Taking over stale claim {path.name} from {(stale or {}).get('owner')} "
+                       f"(no heartbeat for {age:.0f}s)")
+        grave.unlink(missing_ok=True)
+        return True
+    
+    def try_claim(self, key: str) -> bool:
+        """
+        Claim a cell unless another live worker holds it.
+        
+        Args:
+            key: Cell key
+        
+        Returns:
+            True if this worker now holds the claim
+        """
+        self.claims_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        if not self._create(key, path):
+            if not self._take_over_if_stale(path) or not self._create(key, path):
+                return False
+        with self._lock:
+            self._held[key] = path
+        # A marker left by an earlier holder no longer says anything about this run
+        self._done_path(key).unlink(missing_ok=True)
+        self._start_heartbeat()
+        return True
+    
+    def mark_done(self, key: str) -> None:
+        """Record that a held cell ran to completion (before releasing it)."""
+        with open(self._done_path(key), "w") as f:
+            json.dump({"owner": self.owner, "key": key, "done_at": time.time()}, f)
+    
+    def release(self, key: str) -> None:
+        """Release a held claim (leaving it alone if another worker took it over)."""
+        with self._lock:
+            path = self._held.pop(key, None)
+        if path is None:
+            return
+        if self._read_owner(path) == self.owner:
+            path.unlink(missing_ok=True)
+        else:
+            logger.warning(f"Claim {key} was taken over by another worker while held")
+    
+    def take_over(self, key: str) -> Optional[bool]:
+        """
+        Poll a cell held by another worker.
+        
+        Args:
+            key: Cell key
+        
+        Returns:
+            None if its owner finished it, True if this worker now holds it
+            (the owner failed or went stale), False if a live worker still
+            holds it
+        """
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime <= self.stale_after:
+                return False
+        except FileNotFoundError:
+            # Released: finished if the owner marked it done, failed otherwise
+            if self._done_path(key).exists():
+                return None
+        return self.try_claim(key)
+    
+    @contextmanager
+    def claim(self, key: str, claimed: Optional[bool] = None) -> Iterator[bool]:
+        """
+        Hold the claim on a cell for the duration of the block.
+        
+        The cell is marked done if the block exits normally while holding
+        the claim; if it raises, the claim is released without a marker so
+        waiting workers run the cell again.
+        
+        Args:
+            key: Cell key
+            claimed: Whether the claim is already held (None = try to claim it)
+        
+        Yields:
+            Whether the claim is held
+        """
+        if claimed is None:
+            claimed = self.try_claim(key)
+        try:
+            yield claimed
+            if claimed:
+                self.mark_done(key)
+        finally:
+            if claimed:
+                self.release(key)
+    
+    # -------------------------------------------------------------------------
+    # Heartbeat
+    # -------------------------------------------------------------------------
+    
+    def _start_heartbeat(self) -> None:
+        with self._lock:
+            if self._heartbeat is not None:
+                return
+            self._heartbeat = threading.Thread(target=self._beat, name="work-claims-heartbeat", daemon=True)
+            self._heartbeat.start()
+    
+    def _beat(self) -> None:
+        while not self._stop.wait(self.heartbeat_interval):
+            with self._lock:
+                held = list(self._held.items())
+            for key, path in held:
+                try:
+                    os.utime(path)
+                except FileNotFoundError:
+                    logger.warning(f"Claim {key} disappeared while held (taken over as stale?)")
+    
+    def close(self) -> None:
+        """Stop the heartbeat thread (held claims are not released)."""
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+
+
+# =============================================================================
+# Grid driver
+# =============================================================================
+
+def run_grid(
+    cells: Iterable[T],
+    key: Callable[[T], str],
+    fn: Callable[[T], Any],
+    shard: Optional[Shard] = None,
+    claims: Optional[WorkClaims] = None,
+    poll_interval: Optional[float] = None
+) -> Dict[str, int]:
+    """
+    Run fn on every cell of a grid that belongs to this worker.
+    
+    Cells outside the static shard are skipped. With claims, each cell is
+    run while holding its claim and marked done when fn returns; cells held
+    by other workers are polled after the first pass until they are done
+    there, or are claimed and run here when their owner failed or went
+    stale. Exceptions from fn release the claim without a done marker and
+    propagate.
+    
+    Args:
+        cells: Grid cells in run order
+        key: Stable string key of a cell (the same on every worker)
+        fn: Runs one cell
+        shard: Static shard (index, count), or None for all cells
+        claims: Work claims shared with the other workers, or None
+        poll_interval: Seconds between retries of cells held elsewhere
+            (default: the claims' heartbeat interval)
+    
+    Returns:
+        Counts of cells "run" here, in an "other_shard", and "elsewhere"
+        (done by another worker)
+    """
+    counts = Counter(run=0, other_shard=0, elsewhere=0)
+    waiting = []
+    
+    for cell in cells:
+        cell_key = key(cell)
+        if not in_shard(cell_key, shard):
+            counts["other_shard"] += 1
+            continue
+        if claims is None:
+            fn(cell)
+            counts["run"] += 1
+            continue
+        with claims.claim(cell_key) as claimed:
+            if claimed:
+                fn(cell)
+                counts["run"] += 1
+            else:
+                logger.info(f"Cell {cell_key} is claimed by another worker; will retry")
+                waiting.append((cell, cell_key))
+    
+    if waiting:
+        logger.info(f"Waiting for {len(waiting)} cell(s) held by other workers...")
+    while waiting:
+        time.sleep(poll_interval if poll_interval is not None else claims.heartbeat_interval)
+        still_waiting = []
+        for cell, cell_key in waiting:
+            taken = claims.take_over(cell_key)
+            if taken is None:
+                counts["elsewhere"] += 1
+            elif not taken:
+                still_waiting.append((cell, cell_key))
+            else:
+                with claims.claim(cell_key, claimed=True):
+                    fn(cell)
+                    counts["run"] += 1
+        waiting = still_waiting
+    
+    logger.info(
+        f"Grid done: {counts['run']} cells run here, {counts['elsewhere']} by other workers, "
+        f"{counts['other_shard']} in other shards"
+    )
+    return dict(counts)